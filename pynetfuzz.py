@@ -2,14 +2,87 @@
 """
 CLI run script
 """
+# Python library imports
+import sys
+import time
 # Package imports
-from pynetfuzz.arguments import parse_args
-from pynetfuzz.run import run
+from pynetfuzz.arguments import (
+    Args, parse_args, parse_campaign_args, parse_coordinator_args, parse_agent_args,
+    parse_pregenerate_args,
+)
+from pynetfuzz.campaign import Campaign, PhasePlan
+from pynetfuzz.corpus import Corpus, write_corpus, np
+from pynetfuzz.distributed import Coordinator, Agent
+from pynetfuzz.run import run, run_campaign, configure_logging
+
+
+def campaign(argv: list):
+    """ Campaign command method, compiles a campaign file and runs its phases"""
+    args = parse_campaign_args(argv)
+    plan = Campaign.from_file(args.file)
+    if args.check:
+        print(plan)
+        for phase in plan.phases:
+            print(f"  {phase}")
+        return
+    run_campaign(plan)
+
+
+def coordinator(argv: list):
+    """ Coordinator command method, splits a run between agents"""
+    args = parse_coordinator_args(argv)
+    listener = configure_logging()
+    try:
+        plan = Coordinator(Args(vars(args.run)), args.agents, args.listen)
+        print(f"Waiting for {args.agents} agents on {plan.address[0]}:{plan.address[1]}")
+        for name, stats in plan.serve().items():
+            print(f"  {name}: Sent: {stats['sent']}, Time: {stats['elapsed']:.1f}s, "
+                f"Done: {stats['done']}")
+        print(f"[Completed] {plan}")
+    finally:
+        listener.stop()
+
+
+def agent(argv: list):
+    """ Agent command method, runs the share assigned by a coordinator"""
+    args = parse_agent_args(argv)
+    options = {key: getattr(args, key) for key in ('metrics_port', 'journal')
+        if getattr(args, key) is not None}
+    Agent(args.coordinator, args.network_interface, args.name, options).serve()
+
+
+def pregenerate(argv: list):
+    """ Pregenerate command method, renders packets into a corpus file"""
+    args = parse_pregenerate_args(argv)
+    plan = PhasePlan('pregenerate', Args(vars(args.run)))
+    seed = plan.args.seed if plan.args.seed is not None else int(time.time())
+    started = time.time()
+    count = write_corpus(args.file, plan.target, plan.details, plan.args.n_packets,
+        plan.source, seed, plan.sweep, args.processes)
+    with Corpus(args.file) as corpus:
+        bad = corpus.verify() if np is not None else []
+        print(f"[Completed] {corpus}, Time: {time.time() - started:.1f}s")
+    if bad:
+        print(f"[Failed] {len(bad)} of {count} frames do not match their checksums")
+        sys.exit(1)
+
+
+# Subcommands, any other first argument is a target IP address
+COMMANDS = {
+    'campaign': campaign,
+    'coordinator': coordinator,
+    'agent': agent,
+    'pregenerate': pregenerate,
+}
 
 
 def main():
     """ Commandline run method"""
-    args = parse_args()
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+    args = parse_args(argv)
     run(args)
 
 if __name__ == "__main__":
@@ -1,11 +1,34 @@
 """
 Export module packages
 """
+import pynetfuzz.affinity
 import pynetfuzz.arguments
+import pynetfuzz.campaign
+import pynetfuzz.casts
+import pynetfuzz.checkpoint
+import pynetfuzz.checksum
 import pynetfuzz.const
+import pynetfuzz.corpus
+import pynetfuzz.cycle
+import pynetfuzz.distributed
 import pynetfuzz.exceptions
+import pynetfuzz.fragments
 import pynetfuzz.hosts
+import pynetfuzz.journal
+import pynetfuzz.metrics
 import pynetfuzz.packet_generator
 import pynetfuzz.packet
+import pynetfuzz.payloads
+import pynetfuzz.pool
+import pynetfuzz.profiling
+import pynetfuzz.ring
 import pynetfuzz.run
+import pynetfuzz.scopes
+import pynetfuzz.seeds
+import pynetfuzz.session
+import pynetfuzz.sweep
+import pynetfuzz.tcp_state
+import pynetfuzz.tracing
+import pynetfuzz.txmon
 import pynetfuzz.validation
+import pynetfuzz.workers
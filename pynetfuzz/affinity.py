@@ -0,0 +1,152 @@
+"""
+Contains CpuPlacement class - NUMA aware CPU affinity of the sender and worker processes
+"""
+# Python library imports
+import logging
+import os
+# Package imports
+import pynetfuzz.exceptions as ex
+from .validation import valid_number
+
+SYSFS_NET = '/sys/class/net'
+SYSFS_NODE = '/sys/devices/system/node'
+
+
+def parse_cpulist(string: str) -> tuple:
+    """ Parses a kernel cpulist string (e.g. '0-3,8,10-11')
+
+    Parameters:
+        string (str): cpulist string
+
+    Returns:
+        tuple: Ascending CPU numbers
+    """
+    cpus = set()
+    for part in string.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cpus.update(range(int(first), int(last or first) + 1))
+    return tuple(sorted(cpus))
+
+
+def read_sysfs(path: str) -> str:
+    """ Reads a sysfs attribute
+
+    Parameters:
+        path (str): Attribute file path
+
+    Returns:
+        str: Attribute value, None if it does not exist
+    """
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def interface_numa_node(interface: str) -> int:
+    """ Gets the NUMA node the interface's device is attached to
+
+    Parameters:
+        interface (str): Network interface name
+
+    Returns:
+        int: NUMA node, None for virtual interfaces or machines without NUMA
+    """
+    value = read_sysfs(os.path.join(SYSFS_NET, interface, 'device', 'numa_node'))
+    if value is None or int(value) < 0:
+        return None
+    return int(value)
+
+
+def node_cpus(node: int) -> tuple:
+    """ Gets the CPUs of a NUMA node
+
+    Parameters:
+        node (int): NUMA node
+
+    Returns:
+        tuple: Ascending CPU numbers, empty if the node does not exist
+    """
+    value = read_sysfs(os.path.join(SYSFS_NODE, f'node{node}', 'cpulist'))
+    return parse_cpulist(value) if value else ()
+
+
+def available_cpus() -> tuple:
+    """ Gets the CPUs this process may run on
+
+    Returns:
+        tuple: Ascending CPU numbers
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return tuple(sorted(os.sched_getaffinity(0)))
+    return tuple(range(os.cpu_count() or 1)) # pragma: no cover
+
+
+def pin(cpu: int) -> bool:
+    """ Pins the calling process to a single CPU
+
+    Parameters:
+        cpu (int): CPU number
+
+    Returns:
+        bool: False if the platform does not support setting CPU affinity
+    """
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    os.sched_setaffinity(0, {cpu})
+    return True
+
+
+class CpuPlacement():
+    """ Placement of the sender and each generator worker on its own CPU.
+
+    CPUs local to the interface's NUMA node are preferred, so frames are
+    generated, handed over and sent without crossing sockets. The sender gets
+    the first CPU and the workers the following ones. When there are more
+    processes than CPUs the workers share the remaining CPUs, never the
+    sender's unless it is the only one, and a warning is logged. Without NUMA information (virtual
+    interfaces, single node machines) every available CPU is used.
+    """
+
+    def __init__(self, workers: int=0, interface: str=None, cpus: tuple=None) -> None:
+        """ CpuPlacement class built-in initialiser
+
+        Parameters:
+            workers (int): Number of generator worker processes
+            interface (str): Optional interface whose NUMA node CPUs are preferred
+            cpus (tuple): Optional CPUs to place on instead of the available ones
+        """
+        self.workers = valid_number(workers, minimum=0)
+        available = available_cpus()
+        if cpus is not None:
+            missing = sorted(set(cpus) - set(available))
+            if missing:
+                raise ex.CpuNotAvailableError(
+                    f'CPUs are not available to this process. Received: {missing} '
+                    f'Available: {list(available)}')
+            available = tuple(sorted(set(cpus)))
+        self.node = interface_numa_node(interface) if interface else None
+        local = set(node_cpus(self.node)) if self.node is not None else set()
+        self.cpus = tuple(cpu for cpu in available if cpu in local) or available
+        self.sender = self.cpus[0]
+        # The sender keeps its CPU to itself unless it is the only one
+        worker_cpus = self.cpus[1:] or self.cpus
+        self.worker_cpus = [worker_cpus[worker % len(worker_cpus)]
+            for worker in range(self.workers)]
+        self.shared = self.workers + 1 > len(self.cpus)
+        if self.shared:
+            logging.warning("%s processes placed on %s CPUs, CPUs are shared (%s)",
+                self.workers + 1, len(self.cpus), list(self.cpus))
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'CpuPlacement - Node: ({self.node}), Sender: ({self.sender}), ' \
+            f'Workers: ({self.worker_cpus})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.node}, {self.sender}, ' \
+            f'{self.worker_cpus})'
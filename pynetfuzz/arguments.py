@@ -3,13 +3,20 @@ Methods for parsing command line arguments with argument check methods
 """
 # Python library imports
 import argparse
+import ipaddress
 import re
 # Package imports
+import pynetfuzz.exceptions as ex
+from .validation import valid_extended_scope_ip, valid_seed
+from .affinity import parse_cpulist
+from .tracing import parse_filter
 from .const import (
-    REGEX_SPECIFIC_IP, REGEX_SCOPE_IP, REGEX_MAC,
-    INTERNET_PROTOCOLS, INTERNET_PROTOCOLS_INFO,
+    REGEX_SPECIFIC_IP, REGEX_SCOPE_IP, REGEX_MAC, REGEX_CPULIST,
+    INTERNET_PROTOCOLS_INFO,
     TRANSPORT_PROTOCOLS, TRANSPORT_PROTOCOLS_INFO,
-    MAX_PORT, CAST_TYPES
+    MAX_PORT, CAST_TYPES, DEFAULT_LENGTH_BUCKETS, CHECKPOINT_INTERVAL, DEFAULT_RING_SLOTS,
+    PROFILE_SAMPLE_INTERVAL, DISTRIBUTED_PORT, PREGENERATE_UNSUPPORTED_OPTIONS,
+    CYCLE_MAX_PACKETS, CYCLE_INTERVAL, PAYLOAD_TYPES, FRAGMENT_TYPES, TRACE_SAMPLE_INTERVAL,
 )
 
 
@@ -19,19 +26,126 @@ def parse_args(args=None):
     Returns:
         Class: Argparse namespace class with command line arguments.
     """
+    return build_parser().parse_args(args)
 
+
+def parse_campaign_args(args=None):
+    """Parse the arguments of the campaign command (campaign <file> [--check]).
+
+    Returns:
+        Class: Argparse namespace class with the campaign file path and check flag.
+    """
+    parser = argparse.ArgumentParser(
+        prog='Network Fuzzing campaign',
+        description='Runs every phase of a JSON or YAML campaign file in one process.',
+        epilog='For more detail go to the ReadMe file in main directory.')
+    parser.add_argument('file', help='Path of the campaign file')
+    parser.add_argument('-ck', '--check',
+        help='Validate and print the compiled campaign without sending packets',
+        action='store_true')
+    return parser.parse_args(args)
+
+
+def parse_coordinator_args(args=None):
+    """Parse the arguments of the coordinator command (coordinator <agents> [--listen]
+    <run arguments>).
+
+    Returns:
+        Class: Argparse namespace class with the number of agents, listen address and the
+            run's arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog='Network Fuzzing coordinator',
+        description='Splits a run between agents on other nodes and stops them all when '
+        'the target goes offline.',
+        epilog='For more detail go to the ReadMe file in main directory.')
+    parser.add_argument('agents', help='Number of agents to wait for',
+        type=check_arg_positive_int)
+    parser.add_argument('-l', '--listen',
+        help=f'Address to listen for agents on [host:port] (default: 0.0.0.0:{DISTRIBUTED_PORT})',
+        type=check_arg_address, metavar='', default=('0.0.0.0', DISTRIBUTED_PORT))
+    # Every other argument is the run's, as for a single node run
+    namespace, run_args = parser.parse_known_args(args)
+    namespace.run = build_parser().parse_args(run_args)
+    return namespace
+
+
+def parse_agent_args(args=None):
+    """Parse the arguments of the agent command (agent <coordinator> <network interface>).
+
+    Returns:
+        Class: Argparse namespace class with the coordinator address, network interface,
+            agent name and the agent's own run options.
+    """
+    parser = argparse.ArgumentParser(
+        prog='Network Fuzzing agent',
+        description='Runs the share of a distributed run assigned by a coordinator.',
+        epilog='For more detail go to the ReadMe file in main directory.')
+    parser.add_argument('coordinator', help='Address of the coordinator [host:port]',
+        type=check_arg_address)
+    parser.add_argument('network_interface',
+        help='Name of the interface connected to the local network', type=check_arg_name)
+    parser.add_argument('-n', '--name', help='Name reported to the coordinator '
+        '(default: Hostname)', metavar='')
+    parser.add_argument('-mp', '--metrics_port',
+        help='Serve Prometheus metrics on localhost:<port>/metrics (default: Disabled)',
+        type=check_arg_port, metavar='')
+    parser.add_argument('-j', '--journal',
+        help='Append a compact binary record of every sent packet to a file '
+        '(default: Disabled)', metavar='')
+    return parser.parse_args(args)
+
+
+def parse_pregenerate_args(args=None):
+    """Parse the arguments of the pregenerate command (pregenerate <corpus file>
+    [--processes] <run arguments>).
+
+    Returns:
+        Class: Argparse namespace class with the corpus file path, number of processes and
+            the arguments of the generated packets.
+    """
+    parser = argparse.ArgumentParser(
+        prog='Network Fuzzing pregenerate',
+        description='Renders packets into a corpus file, replayed with --corpus.',
+        epilog='For more detail go to the ReadMe file in main directory.')
+    parser.add_argument('file', help='Path of the corpus file to write')
+    parser.add_argument('-p', '--processes',
+        help='Number of generator processes (default: CPU count)',
+        type=check_arg_positive_int, metavar='')
+    # Every other argument is the run's, as for a single node run
+    namespace, run_args = parser.parse_known_args(args)
+    namespace.run = build_parser().parse_args(run_args)
+    unsupported = [key for key in PREGENERATE_UNSUPPORTED_OPTIONS
+        if getattr(namespace.run, key) is not None]
+    if unsupported:
+        parser.error(f'{", ".join(unsupported)} can not be used to pregenerate a corpus')
+    return namespace
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser, shared by campaign files to validate
+    their phases the same way as the command line.
+
+    Returns:
+        ArgumentParser: Parser of the run's positional and optional arguments
+    """
     parser = argparse.ArgumentParser(
         prog='Network Fuzzing',
         usage='\n[Filename] %(prog)s \n[Positional arguments] <target IP> ' \
             '<Network interface> <N packets> \n[Optional arguments] [source_ip' \
             ' | target_mac | source_mac | target_port | source_port | ' \
             'int_protocol | trans_protocol | cast | headers | vlan | min_packet' \
-            ' | max_packet | seed]',
+            ' | max_packet | seed | sweep | buckets | shard | metrics_port | journal' \
+            ' | checkpoint | checkpoint_interval | resume | pool | bad_checksum | workers' \
+            ' | ring_slots | affinity | cpus | profile | profile_output' \
+            ' | profile_interval | tcp_state | corpus | cycle_length | cycle_interval' \
+            ' | payload | fragments | trace | trace_every | trace_interval | trace_filter' \
+            ' | tx_monitor | seed_priority | seed_skip]',
         description='Creates and sends suedo-random network packets as part of a Fuzz Test.',
         epilog='For more detail go to the ReadMe file in main directory.')
 
     # Positional arguments
-    parser.add_argument('target_ip', help='IP address of target on network',
+    parser.add_argument('target_ip', help='IPv4 or IPv6 address of target on network',
         type=check_arg_specific_ip)
     parser.add_argument('network_interface',
         help='Name of the interface connected to the local network', type=check_arg_name)
@@ -40,7 +154,8 @@ def parse_args(args=None):
 
     # Optional arguments
     parser.add_argument('-sip', '--source_ip',
-        help='IP address of source on network (default: Random)',
+        help='IP address scope of source on network [X.X.X.* / X.X.X.X/N / '
+        'X.X.X.X-X.X.X.X / IPv6 prefix] (default: Random)',
         type=check_arg_scope_ip, metavar='')
     parser.add_argument('-tm', '--target_mac',
         help='MAC address of target on network [Self / valid MAC address] (default: Random)',
@@ -53,7 +168,8 @@ def parse_args(args=None):
     parser.add_argument('-s_p', '--source_port',
         help='Port of source on network (default: Random)', type=check_arg_port, metavar='')
     parser.add_argument('-ip', '--int_protocol',
-        help='Specify the internet protocol [IPv4 / IPv6] (default: Random)',
+        help='Specify the internet protocol [IPv4 / IPv6 / Jumbo] (default: The target IP '
+        'address version, Jumbo frames are only sent when given)',
         type=check_arg_iprotocol, metavar='')
     parser.add_argument('-tp', '--trans_protocol',
         help='Specify the transport protocol [TCP / UDP] (default: Random)',
@@ -64,6 +180,8 @@ def parse_args(args=None):
     parser.add_argument('-hd', '--headers',
         help='Disable randomised headers (default: Random)', action='store_false')
     parser.add_argument('-vl', '--vlan', help='adds vlan tag', action='store_true')
+    parser.add_argument('-bc', '--bad_checksum',
+        help='Deliberately corrupt IP and/or transport checksums', action='store_true')
     parser.add_argument('-min', '--min_length',
         help='Specify minimum packet length (default: Ethertype minimum)',
         type=check_arg_packet_length_int, metavar='')
@@ -71,14 +189,108 @@ def parse_args(args=None):
         help='Specify maximum packet length (default: Ethertype maximum)',
         type=check_arg_packet_length_int, metavar='')
     parser.add_argument('-s', '--seed',
-        help='Specify seed to generate packets (default: Random seed)',
+        help='Master seed the seed of every cycle is derived from (default: Random seed)',
         type=check_arg_positive_int, metavar='')
-
-    return parser.parse_args(args)
+    parser.add_argument('-sw', '--sweep',
+        help='Sweep every protocol, cast, vlan, headers and length bucket combination',
+        action='store_true')
+    parser.add_argument('-b', '--buckets',
+        help='Number of length buckets in sweep mode (default: 4)',
+        type=check_arg_positive_int, metavar='', default=DEFAULT_LENGTH_BUCKETS)
+    parser.add_argument('-sh', '--shard',
+        help='Shard of the sweep run by this worker [index/count] (default: 0/1)',
+        type=check_arg_shard, metavar='')
+    parser.add_argument('-mp', '--metrics_port',
+        help='Serve Prometheus metrics on localhost:<port>/metrics (default: Disabled)',
+        type=check_arg_port, metavar='')
+    parser.add_argument('-j', '--journal',
+        help='Append a compact binary record of every sent packet to a file '
+        '(default: Disabled)', metavar='')
+    parser.add_argument('-cp', '--checkpoint',
+        help='Periodically write a resumable checkpoint to a file (default: Disabled)',
+        metavar='')
+    parser.add_argument('-ci', '--checkpoint_interval',
+        help='Number of packets between checkpoints (default: 10000)',
+        type=check_arg_positive_int, metavar='', default=CHECKPOINT_INTERVAL)
+    parser.add_argument('-r', '--resume',
+        help='Resume a run from a checkpoint file, which keeps being updated unless '
+        '--checkpoint is given (default: Disabled)', metavar='')
+    parser.add_argument('-pl', '--pool',
+        help='Reuse packets from a pre-allocated pool of this size (default: Disabled)',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-w', '--workers',
+        help='Generate packets in this many worker processes, handing frames to the sender '
+        'through shared memory rings (default: Disabled)',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-rs', '--ring_slots',
+        help=f'Number of frame slots in each worker ring (default: {DEFAULT_RING_SLOTS})',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-af', '--affinity',
+        help='Pin the sender and each worker to its own CPU local to the interface\'s '
+        'NUMA node', action='store_true')
+    parser.add_argument('-cpu', '--cpus',
+        help='CPUs to pin the sender and workers to [cpulist e.g. 0-3,8] (default: All)',
+        type=check_arg_cpulist, metavar='')
+    parser.add_argument('-pf', '--profile',
+        help='Time each pipeline stage of sampled packets and report them at the end',
+        action='store_true')
+    parser.add_argument('-pfo', '--profile_output',
+        help='Profile the run with cProfile, writing <path>.pstats and a flamegraph '
+        'collapsed stack file <path>.collapsed (default: Disabled)', metavar='')
+    parser.add_argument('-pfi', '--profile_interval',
+        help=f'Time the stages of every Nth packet (default: {PROFILE_SAMPLE_INTERVAL})',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-ts', '--tcp_state',
+        help='Open this many TCP connections to the target port and fuzz segments inside '
+        'their windows, source ports are taken from 10000 up (default: Disabled)',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-co', '--corpus',
+        help='Replay the frames of a corpus file written by the pregenerate command instead '
+        'of generating packets (default: Disabled)', metavar='')
+    parser.add_argument('-cl', '--cycle_length',
+        help='Most packets sent between liveness checks, cycles grow to it while the target '
+        f'is stable (default: {CYCLE_MAX_PACKETS})', type=check_arg_positive_int, metavar='')
+    parser.add_argument('-cyi', '--cycle_interval',
+        help='Longest time between liveness checks in seconds, cycles grow to it while the '
+        f'target is stable (default: {CYCLE_INTERVAL})', type=check_arg_positive_float,
+        metavar='')
+    parser.add_argument('-pa', '--payload',
+        help='Payload strategy [random / dns / http / ntp / pattern / format / overflow / '
+        'mixed] (default: random)', type=check_arg_payload, metavar='')
+    parser.add_argument('-fr', '--fragments',
+        help='Send each IPv4 datagram as a train of fragments [in_order / reversed / '
+        'overlapping / tiny / missing_last / mixed] (default: Disabled)',
+        type=check_arg_fragments, metavar='')
+    parser.add_argument('-tr', '--trace',
+        help='Write sampled frames to a file, as pcap if it ends in .pcap, otherwise as a '
+        'hexdump (default: Disabled)', metavar='')
+    parser.add_argument('-tre', '--trace_every',
+        help='Trace every Nth frame matching the trace filter (default: 1 with a trace '
+        f'interval or filter, otherwise {TRACE_SAMPLE_INTERVAL})',
+        type=check_arg_positive_int, metavar='')
+    parser.add_argument('-tri', '--trace_interval',
+        help='Least seconds between traced frames (default: Disabled)',
+        type=check_arg_positive_float, metavar='')
+    parser.add_argument('-trf', '--trace_filter',
+        help='Only trace frames matching comma separated field=value terms of int_protocol, '
+        'trans_protocol, cast, min_length and max_length e.g. trans_protocol=tcp,'
+        'min_length=1000 (default: Disabled)', type=check_arg_trace_filter, metavar='')
+    parser.add_argument('-txm', '--tx_monitor',
+        help='Compare the interface\'s transmit counters with the frames sent every this many '
+        'seconds, pacing the sender when the kernel drops frames (default: Disabled)',
+        type=check_arg_positive_float, metavar='')
+    parser.add_argument('-spr', '--seed_priority',
+        help='Seeds to run first, before those derived from the seed [comma separated list] '
+        '(default: None)', type=check_arg_seed_list, metavar='')
+    parser.add_argument('-ssk', '--seed_skip',
+        help='Seeds never to run [comma separated list] (default: None)',
+        type=check_arg_seed_list, metavar='')
+
+    return parser
 
 
 def check_arg_specific_ip(string: str) -> str:
-    """ Argument check method for specific IP form
+    """ Argument check method for specific IP form, an IPv4 or IPv6 address
 
     Parameters:
         string (str): String to check if in correct form
@@ -86,6 +298,14 @@ def check_arg_specific_ip(string: str) -> str:
     Returns:
         string (str): Valid string in correct form
     """
+    if isinstance(string, str) and ':' in string:
+        try:
+            ipaddress.IPv6Address(string)
+        except ValueError as exception:
+            raise argparse.ArgumentTypeError(
+                'Not a valid IPv6 address. Required to be in standard format X:X::X'
+            ) from exception
+        return string
     if len(string) > 17 or len(string) < 7 or not isinstance(string, str) or \
             not re.search(REGEX_SPECIFIC_IP, string):
         raise argparse.ArgumentTypeError(
@@ -103,6 +323,14 @@ def check_arg_scope_ip(string: str) -> str:
     Returns:
         string (str): Valid string in correct form
     """
+    if isinstance(string, str) and any(char in string for char in '/-:'):
+        try:
+            return valid_extended_scope_ip(string)
+        except ex.BaseValidationError as exception:
+            raise argparse.ArgumentTypeError(
+                'Not a valid IP address scope. Required to be in format X.X.X.*, '
+                'X.X.X.X/N, X.X.X.X-X.X.X.X or an IPv6 address or prefix'
+            ) from exception
     if len(string) > 17 or len(string) < 7 or not isinstance(string, str) or \
             not re.search(REGEX_SCOPE_IP, string):
         raise argparse.ArgumentTypeError(
@@ -158,7 +386,7 @@ def check_arg_iprotocol(string: str) -> int:
         value (int): Valid sex value of internet protocol
     """
     if len(string) > 5 or not isinstance(string, str) or \
-            string.lower() not in INTERNET_PROTOCOLS:
+            string.lower() not in INTERNET_PROTOCOLS_INFO:
         raise argparse.ArgumentTypeError(
             'Not a supported internet protocol input. Required to be IPv4, IPv6 or Jumbo'
         )
@@ -221,6 +449,53 @@ def check_arg_cast(string: str) -> str:
     return string.lower()
 
 
+def check_arg_payload(string: str) -> str:
+    """ Argument check method for payload strategy
+
+    Parameters:
+        string (str): String to check if is a valid option
+
+    Returns:
+        str (str): Valid payload strategy option
+    """
+    if not isinstance(string, str) or string.lower() not in PAYLOAD_TYPES:
+        raise argparse.ArgumentTypeError(
+            f'Not a supported payload input. Required to be one of {", ".join(PAYLOAD_TYPES)}'
+        )
+    return string.lower()
+
+
+def check_arg_fragments(string: str) -> str:
+    """ Argument check method for fragment mode
+
+    Parameters:
+        string (str): String to check if is a valid option
+
+    Returns:
+        str (str): Valid fragment mode option
+    """
+    if not isinstance(string, str) or string.lower() not in FRAGMENT_TYPES:
+        raise argparse.ArgumentTypeError(
+            f'Not a supported fragments input. Required to be one of {", ".join(FRAGMENT_TYPES)}'
+        )
+    return string.lower()
+
+
+def check_arg_trace_filter(string: str) -> dict:
+    """ Argument check method for trace filter
+
+    Parameters:
+        string (str): String to check if is a valid trace filter
+
+    Returns:
+        dict: Value of each filtered field
+    """
+    try:
+        return parse_filter(string)
+    except ex.TraceFilterError as exception:
+        raise argparse.ArgumentTypeError(str(exception)) from exception
+
+
 def check_arg_positive_int(string: str) -> int:
     """ Argument check method for argument to be a positive integer
 
@@ -244,6 +519,29 @@ def check_arg_positive_int(string: str) -> int:
     return value
 
 
+def check_arg_positive_float(string: str) -> float:
+    """ Argument check method for argument to be a positive number
+
+    Parameters:
+        string (str): String to check if is a valid option
+
+    Returns:
+        value (float): A valid positive number
+    """
+    try:
+        value = float(string)
+    except Exception as exception:
+        raise argparse.ArgumentTypeError(
+            'You must enter a number.'
+        ) from exception
+    else:
+        if not value > 0 or value == float('inf'):
+            raise argparse.ArgumentTypeError(
+                'You must enter a positive number.'
+            )
+    return value
+
+
 def check_arg_packet_length_int(string):
     """ Argument check method for packet length (Must be between 48 and 9000)
 
@@ -267,6 +565,84 @@ def check_arg_packet_length_int(string):
     return value
 
 
+def check_arg_shard(string: str) -> tuple:
+    """ Argument check method for sweep shard in index/count form
+
+    Parameters:
+        string (str): String to check if in correct form
+
+    Returns:
+        tuple: Valid (index, count) shard pair
+    """
+    try:
+        index, count = (int(value) for value in string.split('/'))
+    except Exception as exception:
+        raise argparse.ArgumentTypeError(
+            'Not a valid shard. Required to be in format index/count e.g. 0/4'
+        ) from exception
+    if count < 1 or index < 0 or index >= count:
+        raise argparse.ArgumentTypeError(
+            'Not a valid shard. Index must be between 0 and count - 1'
+        )
+    return index, count
+
+
+def check_arg_address(string: str) -> tuple:
+    """ Argument check method for a host:port address, IPv6 hosts in brackets
+
+    Parameters:
+        string (str): String to check if in correct form
+
+    Returns:
+        tuple: Valid (host, port) address
+    """
+    host, _, port = string.rpartition(':')
+    host = host[1:-1] if host.startswith('[') and host.endswith(']') else host
+    if not host:
+        raise argparse.ArgumentTypeError(
+            'Not a valid address. Required to be in format host:port or [IPv6]:port')
+    return host, check_arg_port(port)
+
+
+def check_arg_cpulist(string: str) -> tuple:
+    """ Argument check method for a kernel cpulist (e.g. 0-3,8,10-11)
+
+    Parameters:
+        string (str): String to check if in correct form
+
+    Returns:
+        tuple: Valid ascending CPU numbers
+    """
+    if not re.search(REGEX_CPULIST, string):
+        raise argparse.ArgumentTypeError(
+            'Not a valid CPU list. Required to be in format 0-3,8,10-11'
+        )
+    for part in string.split(','):
+        first, _, last = part.partition('-')
+        if last and int(last) < int(first):
+            raise argparse.ArgumentTypeError(
+                'Not a valid CPU list. Ranges must be ascending e.g. 0-3'
+            )
+    return parse_cpulist(string)
+
+
+def check_arg_seed_list(string: str) -> tuple:
+    """ Argument check method for a comma separated list of seeds
+
+    Parameters:
+        string (str): String to check if in correct form
+
+    Returns:
+        tuple: Valid seeds in the given order
+    """
+    try:
+        return tuple(valid_seed(part.strip()) for part in string.split(','))
+    except ex.BaseValidationError as exception:
+        raise argparse.ArgumentTypeError(
+            'Not a valid seed list. Required to be non-negative integers e.g. 5,12,99'
+        ) from exception
+
+
 class Args():
     """ Argument Class to store run arguments"""
 
@@ -285,9 +661,39 @@ class Args():
         self.cast = None
         self.headers = None
         self.vlan = None
+        self.bad_checksum = None
         self.min_length = None
         self.max_length = None
         self.seed = None
+        self.sweep = None
+        self.buckets = None
+        self.shard = None
+        self.metrics_port = None
+        self.journal = None
+        self.checkpoint = None
+        self.checkpoint_interval = None
+        self.resume = None
+        self.pool = None
+        self.workers = None
+        self.ring_slots = None
+        self.affinity = None
+        self.cpus = None
+        self.profile = None
+        self.profile_output = None
+        self.profile_interval = None
+        self.tcp_state = None
+        self.corpus = None
+        self.cycle_length = None
+        self.cycle_interval = None
+        self.payload = None
+        self.fragments = None
+        self.trace = None
+        self.trace_every = None
+        self.trace_interval = None
+        self.trace_filter = None
+        self.tx_monitor = None
+        self.seed_priority = None
+        self.seed_skip = None
 
         for key, value in args.items():
             if key in self.__dict__:
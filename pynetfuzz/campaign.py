@@ -0,0 +1,276 @@
+"""
+Contains Campaign and PhasePlan classes - multi-phase campaign files compiled into run plans
+"""
+# Python library imports
+from typing import Callable
+import json
+import os
+# Package imports
+import pynetfuzz.exceptions as ex
+from .arguments import Args, build_parser
+from .hosts import Host
+from .packet import PacketDetails
+from .scopes import compile_scope
+from .sweep import Sweep
+from .const import (
+    INTERNET_PROTOCOLS_INFO, TRANSPORT_PROTOCOLS_INFO, DEFAULT_LENGTH_BUCKETS,
+    CAMPAIGN_OPTIONS, CAMPAIGN_UNSUPPORTED_OPTIONS, CORPUS_UNSUPPORTED_OPTIONS,
+    FRAGMENT_UNSUPPORTED_OPTIONS,
+)
+
+try:
+    import yaml
+except ImportError: # pragma: no cover
+    yaml = None
+
+
+def load_campaign(path: str) -> dict:
+    """ Loads a campaign file, YAML (.yaml / .yml, requires PyYAML) or JSON
+
+    Parameters:
+        path (str): Path of the campaign file
+
+    Returns:
+        dict: Campaign configuration
+    """
+    with open(path, encoding='utf-8') as campaign_file:
+        text = campaign_file.read()
+    try:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ex.CampaignFormatError(
+                    f'YAML campaign files require PyYAML, use JSON instead. ({path})')
+            return yaml.safe_load(text)
+        return json.loads(text)
+    except ValueError as exception:
+        if isinstance(exception, ex.BaseValidationError):
+            raise
+        raise ex.CampaignFormatError(
+            f'Not a valid campaign file. ({path}) {exception}') from exception
+
+
+class PhasePlan():
+    """ Validated and compiled generator configuration of one run or campaign phase.
+
+    The hosts, packet details and sweep are built once from the phase's
+    arguments, so every phase of a campaign is checked (including remote MAC
+    lookups) before the first packet is sent.
+    """
+
+    def __init__(self, name: str, args: Args, target: Host=None, source: Host=None,
+            factory: Callable=PacketDetails) -> None:
+        """ PhasePlan class built-in initialiser
+
+        Parameters:
+            name (str): Name of the phase
+            args (Args): Arguments of the phase, as for run
+            target (Host): Optional prebuilt target host, built from args if not given
+            source (Host): Optional prebuilt source host, built from args if not given
+            factory (Callable): Builds the packet details from their info dict
+        """
+        if args.workers is not None and \
+                any(value is not None for value in (args.journal, args.checkpoint, args.resume)):
+            raise ex.WorkerOptionsError(
+                'Journal, checkpoint and resume are not supported with worker processes.')
+        if args.corpus is not None:
+            unsupported = [key for key in CORPUS_UNSUPPORTED_OPTIONS
+                if getattr(args, key) not in (None, False)]
+            if unsupported:
+                raise ex.CorpusOptionsError(
+                    f'{", ".join(unsupported)} are not supported when replaying a corpus.')
+        if args.fragments is not None:
+            unsupported = [key for key in FRAGMENT_UNSUPPORTED_OPTIONS
+                if getattr(args, key) not in (None, False)]
+            if unsupported:
+                raise ex.FragmentOptionsError(
+                    f'{", ".join(unsupported)} are not supported when fragmenting.')
+        self.name = name
+        self.args = args
+        for host in (target, source):
+            if host is not None and not isinstance(host, Host):
+                raise ex.InvalidHostError(
+                    f'Not a valid Host object. Received: {host} ({type(host)})')
+        self.target = target if target is not None else \
+            Host(args.target_ip, args.target_mac, args.target_port)
+        self.source = source if source is not None else \
+            Host(args.source_ip, args.source_mac, args.source_port)
+        int_protocol = args.int_protocol
+        ipv6 = INTERNET_PROTOCOLS_INFO['ipv6']['value']
+        version = compile_scope(self.target.ip).version
+        # IPv6 packets are only sent between IPv6 hosts, IPv4 addresses are never mapped
+        if int_protocol is None:
+            int_protocol = ipv6 if version == 6 else INTERNET_PROTOCOLS_INFO['ipv4']['value']
+        elif (int_protocol == ipv6) != (version == 6):
+            raise ex.InternetProtocolInvalidValueError(
+                f'The internet protocol does not match the target IPv{version} address. '
+                f'({self.target.ip})')
+        if self.source.is_ip() and compile_scope(self.source.ip).version != version:
+            raise ex.InternetProtocolInvalidValueError(
+                f'Source scope must be the same IP version as the target. ({self.source.ip})')
+        if args.fragments is not None and int_protocol == ipv6:
+            raise ex.FragmentOptionsError('Only IPv4 datagrams are fragmented.')
+        trans_protocol, cast = args.trans_protocol, args.cast
+        if args.tcp_state is not None:
+            trans_protocol, cast = self.check_tcp_state(args)
+        self.details = factory({
+            'int_protocol': int_protocol,
+            'trans_protocol': trans_protocol,
+            'cast': cast,
+            'headers': args.headers,
+            'vlan': args.vlan,
+            'min_length': args.min_length,
+            'max_length': args.max_length,
+            'bad_checksum': args.bad_checksum,
+            'payload': args.payload,
+        })
+
+        self.sweep = None
+        if args.sweep:
+            shard, shards = args.shard if args.shard is not None else (0, 1)
+            # Flags left at their defaults are swept, explicitly set flags are held fixed
+            self.sweep = Sweep(PacketDetails({
+                'int_protocol': int_protocol,
+                'trans_protocol': trans_protocol,
+                'cast': cast,
+                'headers': None if args.headers else False,
+                'vlan': True if args.vlan else None,
+                'min_length': args.min_length,
+                'max_length': args.max_length,
+                'bad_checksum': args.bad_checksum,
+                'payload': args.payload,
+            }), args.buckets or DEFAULT_LENGTH_BUCKETS, shard, shards)
+
+    def check_tcp_state(self, args: Args) -> tuple:
+        """ Checks the options of stateful TCP. Its packets are unicast TCP from the
+        local interface, unless a source IP and MAC are given.
+
+        Parameters:
+            args (Args): Arguments of the phase
+
+        Returns:
+            tuple: (transport protocol, cast type) of the phase
+        """
+        tcp = TRANSPORT_PROTOCOLS_INFO['tcp']['value']
+        if args.trans_protocol not in (None, tcp) or args.cast not in (None, 'unicast'):
+            raise ex.TcpStateOptionsError('Stateful TCP only sends unicast TCP packets.')
+        if args.workers is not None:
+            raise ex.TcpStateOptionsError(
+                'Stateful TCP is not supported with worker processes.')
+        if not self.target.is_port() or not self.target.is_mac():
+            raise ex.TcpStateHostError('Stateful TCP needs a target port and MAC address.')
+        if not self.source.is_ip() or not self.source.is_mac():
+            local = Host(None, None, None, args.network_interface)
+            self.source = Host(self.source.ip or local.ip, self.source.mac or local.mac, None)
+        if compile_scope(self.source.ip).version != compile_scope(self.target.ip).version:
+            raise ex.TcpStateHostError(
+                f'Stateful TCP needs a source IP of the target\'s version. ({self.source.ip})')
+        return tcp, 'unicast'
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'PhasePlan - Name: ({self.name}), Packets: ({self.args.n_packets}), ' \
+            f'Target: ({self.target.ip}), Details: ({self.details})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.name}, {self.args.n_packets})'
+
+
+class Campaign():
+    """ Multi-phase campaign compiled into an execution plan of PhasePlans.
+
+    Options at the top level of the campaign apply to every phase unless the
+    phase sets its own. Each phase is validated by the command line parser,
+    so phases accept the same options and values as the command line. The
+    metrics, journal, profile and trace options belong to the whole campaign and
+    are only accepted at the top level.
+    """
+
+    def __init__(self, config: dict) -> None:
+        """ Campaign class built-in initialiser
+
+        Parameters:
+            config (dict): Campaign configuration with a 'phases' list of option dicts
+        """
+        if not isinstance(config, dict) or not isinstance(config.get('phases'), list) or \
+                not config['phases']:
+            raise ex.CampaignFormatError(
+                'A campaign requires a non-empty "phases" list of phase options.')
+        defaults = {key: value for key, value in config.items() if key != 'phases'}
+        options = {key: defaults.pop(key) for key in CAMPAIGN_OPTIONS if key in defaults}
+        self.phases = []
+        for index, phase in enumerate(config['phases']):
+            if not isinstance(phase, dict):
+                raise ex.CampaignFormatError(f'Phase {index} is not a mapping of options.')
+            phase = dict(phase)
+            name = str(phase.pop('name', f'phase {index}'))
+            misplaced = sorted(set(phase) & set(CAMPAIGN_OPTIONS))
+            if misplaced:
+                raise ex.CampaignFormatError(
+                    f'Phase "{name}": {", ".join(misplaced)} can only be set for the '
+                    f'whole campaign.')
+            self.phases.append(PhasePlan(name, self.parse_phase(name,
+                {**defaults, **phase, **options})))
+        # Campaign options are validated with each phase and are the same in all of them
+        self.options = Args({key: getattr(self.phases[0].args, key) for key in CAMPAIGN_OPTIONS})
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Campaign':
+        """ Loads and compiles a campaign file
+
+        Parameters:
+            path (str): Path of a JSON or YAML campaign file
+
+        Returns:
+            Campaign: Compiled campaign
+        """
+        return cls(load_campaign(path))
+
+    @staticmethod
+    def parse_phase(name: str, options: dict) -> Args:
+        """ Validates a phase's options with the command line parser
+
+        Parameters:
+            name (str): Name of the phase, used in error messages
+            options (dict): Option names and values of the phase
+
+        Returns:
+            Args: Validated arguments of the phase
+        """
+        unsupported = sorted(set(options) & set(CAMPAIGN_UNSUPPORTED_OPTIONS))
+        if unsupported:
+            raise ex.CampaignFormatError(
+                f'Phase "{name}": {", ".join(unsupported)} are not supported in campaigns.')
+        parser = build_parser()
+
+        def error(message: str) -> None:
+            raise ex.CampaignPhaseError(f'Phase "{name}": {message}')
+        parser.error = error
+
+        argv = [str(options.get(key)) for key in ('target_ip', 'network_interface', 'n_packets')
+            if options.get(key) is not None]
+        for key, value in options.items():
+            if key in ('target_ip', 'network_interface', 'n_packets') or value is None:
+                continue
+            default = parser.get_default(key)
+            if isinstance(default, bool): # Flags are given by a boolean
+                if not isinstance(value, bool):
+                    error(f'{key} must be true or false. Received: {value}')
+                if value != default:
+                    argv.append(f'--{key}')
+            else:
+                argv += [f'--{key}', str(value)]
+        return Args(vars(parser.parse_args(argv)))
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return len(self.phases)
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Campaign - Phases: ({len(self.phases)}), Packets: ' \
+            f'({sum(phase.args.n_packets for phase in self.phases)})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({len(self.phases)})'
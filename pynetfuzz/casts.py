@@ -0,0 +1,98 @@
+"""
+Contains CastTable class - precomputed destination addresses of each cast type
+"""
+# Python library imports
+import ipaddress
+# Package imports
+from .hosts import Host
+from .packet import PacketDetails
+from .randomiser import Randomiser
+from .const import CAST_TYPES_INFO, INTERNET_PROTOCOLS_INFO
+
+
+def multicast_mac(ip: str) -> str:
+    """ Derives the Ethernet MAC address of a multicast group. IPv4 groups map their low
+    23 bits onto 01:00:5E:00:00:00 (RFC 1112), IPv6 groups their low 32 bits onto
+    33:33:00:00:00:00 (RFC 2464).
+
+    Parameters:
+        ip (str): IPv4 or IPv6 multicast group address string
+
+    Returns:
+        str: Multicast MAC address string
+    """
+    address = ipaddress.ip_address(ip)
+    if address.version == 4:
+        value = 0x01005E000000 | (int(address) & 0x7FFFFF)
+    else:
+        value = 0x333300000000 | (int(address) & 0xFFFFFFFF)
+    return ':'.join(f'{(value >> shift) & 0xFF:02X}' for shift in range(40, -8, -8))
+
+
+class CastTable():
+    """ Precomputed (IP, MAC) destination tables of each cast type and internet protocol.
+
+    Broadcast and multicast packets have their destination drawn from the
+    tables instead of the target's scope, so they cost a single random draw.
+    Unicast packets have no table and keep the destination drawn from the
+    target's scope. IPv6 has no broadcast so the all nodes group is used.
+    """
+
+    def __init__(self) -> None:
+        """ CastTable class built-in initialiser"""
+        self.tables = {}
+        for name, info in INTERNET_PROTOCOLS_INFO.items():
+            family = 'ipv6' if name == 'ipv6' else 'ipv4' # jumbo frames carry IPv4
+            multicast = CAST_TYPES_INFO[family]['multicast']
+            broadcast = CAST_TYPES_INFO[family]['broadcast']
+            self.tables[(info['value'], 'multicast')] = tuple(
+                (str(ipaddress.ip_address(group)), multicast_mac(group))
+                for group in multicast['groups'])
+            self.tables[(info['value'], 'broadcast')] = (
+                (str(ipaddress.ip_address(broadcast['IP'])), broadcast['MAC']),)
+
+    def table(self, int_protocol: int, cast: str) -> tuple:
+        """ Gets the destination table of a cast type
+
+        Parameters:
+            int_protocol (int): Internet protocol value
+            cast (str): Cast type
+
+        Returns:
+            tuple: (IP, MAC) destinations, None for unicast
+        """
+        return self.tables.get((int_protocol, cast))
+
+    def destination(self, randomiser: Randomiser, details: PacketDetails,
+            random_target: Host) -> Host:
+        """ Sets a randomised target's destination addresses from its cast type
+
+        Parameters:
+            randomiser (Randomiser): Randomiser used to draw from the table
+            details (PacketDetails): Packet details with protocols and cast set
+            random_target (Host): Randomised target Host object, updated in place
+
+        Returns:
+            random_target (Host): Target with broadcast or multicast destination addresses
+        """
+        table = self.tables.get((details.int_protocol, details.cast))
+        if table is not None:
+            random_target.ip, random_target.mac = table[0] if len(table) == 1 else \
+                randomiser.choose(table)
+        return random_target
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return sum(len(table) for table in self.tables.values())
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'CastTable - Tables: ({len(self.tables)}), Addresses: ({len(self)})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({len(self.tables)})'
+
+
+# Shared table, the addresses never change so it is built once per process
+CAST_TABLE = CastTable()
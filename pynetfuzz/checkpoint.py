@@ -0,0 +1,148 @@
+"""
+Contains Checkpoint class - periodic run state snapshots for resuming runs
+"""
+# Python library imports
+from collections import deque
+import json
+import os
+import tempfile
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import CHECKPOINT_VERSION, CHECKPOINT_LIVENESS_EVENTS, PACKETS_PER_SEED
+
+
+class Checkpoint():
+    """ Snapshot of a run's progress.
+
+    Holds the seed and random number generator state of the current packet
+    generator and how far through it the run is, so a resumed run continues
+    from the exact next packet without regenerating the ones already sent.
+    The master seed of the run's seed schedule is kept so the following
+    cycles take the same seeds.
+    Only target liveness transitions are kept, and only the most recent
+    CHECKPOINT_LIVENESS_EVENTS of them, so the file stays a fixed size however
+    long the run.
+    """
+
+    def __init__(self, seed: int=None) -> None:
+        """ Checkpoint class built-in initialiser
+
+        Parameters:
+            seed (int): Seed of the current packet generator
+        """
+        self.seed = seed
+        self.master = None # Master seed of the run's SeedSchedule
+        self.offset = 0
+        self.state = None
+        self.packet_count = 0
+        self.gen_count = 0
+        self.elapsed = 0.0
+        self.cycle = PACKETS_PER_SEED
+        self.liveness = deque(maxlen=CHECKPOINT_LIVENESS_EVENTS)
+
+    def update(self, seed: int, offset: int, state: tuple, packet_count: int,
+            gen_count: int, elapsed: float, cycle: int=PACKETS_PER_SEED) -> None:
+        """ Updates the checkpoint with the current run progress
+
+        Parameters:
+            seed (int): Seed of the current packet generator
+            offset (int): Number of packets already created by the current generator
+            state (tuple): Random number generator state after the last packet
+            packet_count (int): Number of packets sent
+            gen_count (int): Number of completed packet generators
+            elapsed (float): Seconds spent running
+            cycle (int): Length of the current generator cycle, a resumed run finishes
+                the cycle at the same packet
+        """
+        self.seed = seed
+        self.offset = offset
+        self.state = state
+        self.packet_count = packet_count
+        self.gen_count = gen_count
+        self.elapsed = elapsed
+        self.cycle = cycle
+
+    def record_liveness(self, timestamp: float, online: bool) -> None:
+        """ Records a target liveness check, keeping only changes of state
+
+        Parameters:
+            timestamp (float): Time of the check
+            online (bool): Whether the target was online
+        """
+        if not self.liveness or self.liveness[-1][1] != online:
+            self.liveness.append((timestamp, online))
+
+    def save(self, path: str) -> None:
+        """ Atomically writes the checkpoint to a file. The checkpoint is written to a
+        temporary file in the same directory and renamed over the previous one, so a
+        crash never leaves a partially written checkpoint.
+
+        Parameters:
+            path (str): File path of the checkpoint
+        """
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'seed': self.seed,
+            'master': self.master,
+            'offset': self.offset,
+            'state': self.state,
+            'packet_count': self.packet_count,
+            'gen_count': self.gen_count,
+            'elapsed': self.elapsed,
+            'cycle': self.cycle,
+            'liveness': list(self.liveness),
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        """ Reads a checkpoint from a file
+
+        Parameters:
+            path (str): File path of the checkpoint
+
+        Returns:
+            Checkpoint: Restored checkpoint
+        """
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError) as exception:
+            raise ex.CheckpointFormatError(
+                f'Can not read checkpoint file. ({path})') from exception
+        if not isinstance(data, dict) or data.get('version') != CHECKPOINT_VERSION:
+            raise ex.CheckpointFormatError(
+                f'Not a version {CHECKPOINT_VERSION} checkpoint file. ({path})')
+
+        checkpoint = cls(data['seed'])
+        state = data['state']
+        if state is not None:
+            # JSON turns the random module's nested state tuples into lists
+            version, internal, gauss_next = state
+            state = (version, tuple(internal), gauss_next)
+        checkpoint.update(data['seed'], data['offset'], state, data['packet_count'],
+            data['gen_count'], data['elapsed'], data.get('cycle', PACKETS_PER_SEED))
+        checkpoint.master = data.get('master')
+        checkpoint.liveness.extend(tuple(event) for event in data['liveness'])
+        return checkpoint
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Checkpoint - Pkt: ({self.packet_count}), Gen: ({self.gen_count}), ' \
+            f'Seed: ({self.seed}), Offset: ({self.offset}/{self.cycle})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.seed}, {self.offset}, ' \
+            f'{self.packet_count}, {self.gen_count})'
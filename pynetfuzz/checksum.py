@@ -0,0 +1,206 @@
+"""
+Contains Internet checksum methods - full, incremental (RFC 1624) and batched
+"""
+# Python library imports
+import struct
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import (
+    INTERNET_PROTOCOLS_INFO, TRANSPORT_PROTOCOLS_INFO, IPV6_EXTENSION_HEADERS,
+    IPV6_EXTENSION_LENGTH,
+)
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+ETHER_VLAN = 0x8100
+IPV4_VALUE = INTERNET_PROTOCOLS_INFO['ipv4']['value']
+IPV6_VALUE = INTERNET_PROTOCOLS_INFO['ipv6']['value']
+TCP_VALUE = TRANSPORT_PROTOCOLS_INFO['tcp']['value']
+UDP_VALUE = TRANSPORT_PROTOCOLS_INFO['udp']['value']
+IPV6_FRAGMENT = IPV6_EXTENSION_HEADERS['fragment']
+IPV6_EXTENSIONS = frozenset(IPV6_EXTENSION_HEADERS.values())
+# Offset of the checksum field within each transport header
+TRANSPORT_CHECKSUM_OFFSET = {TCP_VALUE: 16, UDP_VALUE: 6}
+
+
+def fold(value: int) -> int:
+    """ Folds carries of a ones' complement sum into 16 bits
+
+    Parameters:
+        value (int): Unfolded sum
+
+    Returns:
+        int: 16 bit ones' complement sum
+    """
+    while value > 0xFFFF:
+        value = (value & 0xFFFF) + (value >> 16)
+    return value
+
+
+def ones_complement_sum(data: bytes) -> int:
+    """ Ones' complement sum of big endian 16 bit words, odd lengths are zero padded
+
+    Parameters:
+        data (bytes): Data to sum
+
+    Returns:
+        int: 16 bit ones' complement sum
+    """
+    if len(data) % 2:
+        data = bytes(data) + b'\x00'
+    return fold(sum(struct.unpack(f'!{len(data) // 2}H', data)))
+
+
+def checksum(data: bytes) -> int:
+    """ Internet checksum (RFC 1071) of data
+
+    Parameters:
+        data (bytes): Data to checksum
+
+    Returns:
+        int: 16 bit checksum
+    """
+    return ~ones_complement_sum(data) & 0xFFFF
+
+
+def update(old_checksum: int, old_data: bytes, new_data: bytes) -> int:
+    """ Incrementally updates a checksum after a field changes (RFC 1624 eqn. 3):
+    HC' = ~(~HC + ~m + m'), applied to every 16 bit word of the field.
+
+    Parameters:
+        old_checksum (int): Checksum before the change
+        old_data (bytes): Previous value of the changed field (even length)
+        new_data (bytes): New value of the changed field (same length)
+
+    Returns:
+        int: Updated 16 bit checksum
+    """
+    if len(old_data) != len(new_data) or len(old_data) % 2:
+        raise ex.ChecksumFieldLengthError(
+            f'Changed field must be the same even length. '
+            f'Received: {len(old_data)} and {len(new_data)} bytes')
+    words = len(old_data) // 2
+    total = ~old_checksum & 0xFFFF
+    for old, new in zip(struct.unpack(f'!{words}H', old_data),
+            struct.unpack(f'!{words}H', new_data)):
+        total += (~old & 0xFFFF) + new
+    return ~fold(total) & 0xFFFF
+
+
+def frame_offsets(frame: bytes) -> tuple:
+    """ Locates the internet and transport headers of an Ethernet frame, following
+    any VLAN tags and IPv6 extension header chain
+
+    Parameters:
+        frame (bytes): Ethernet frame
+
+    Returns:
+        tuple: (ether type, IP header offset, transport protocol, transport header offset)
+    """
+    ip_offset = 14
+    ether_type = struct.unpack_from('!H', frame, 12)[0]
+    while ether_type == ETHER_VLAN:
+        ether_type = struct.unpack_from('!H', frame, ip_offset + 2)[0]
+        ip_offset += 4
+    if ether_type == IPV6_VALUE:
+        protocol, offset = frame[ip_offset + 6], ip_offset + 40
+        while protocol in IPV6_EXTENSIONS and offset + 1 < len(frame):
+            length = IPV6_EXTENSION_LENGTH if protocol == IPV6_FRAGMENT else \
+                (frame[offset + 1] + 1) * IPV6_EXTENSION_LENGTH
+            protocol, offset = frame[offset], offset + length
+        return ether_type, ip_offset, protocol, offset
+    return ether_type, ip_offset, frame[ip_offset + 9], ip_offset + (frame[ip_offset] & 0x0F) * 4
+
+
+def patch_checksum(frame: bytearray, checksum_offset: int, old_sum: int, new_sum: int,
+        optional: bool=False) -> None:
+    """ Incrementally updates a checksum in a frame after data it covers changes
+    (RFC 1624 eqn. 3 applied to ones' complement sums of the old and new data)
+
+    Parameters:
+        frame (bytearray): Built Ethernet frame, modified in place
+        checksum_offset (int): Offset of the checksum in the frame
+        old_sum (int): Ones' complement sum of the data before the change
+        new_sum (int): Ones' complement sum of the data after the change
+        optional (bool): True for UDP checksums, where zero means no checksum. A zero
+            checksum is then left untouched and a result of zero is sent as 0xFFFF.
+    """
+    old_checksum = struct.unpack_from('!H', frame, checksum_offset)[0]
+    if optional and old_checksum == 0:
+        return
+    new_checksum = ~fold((~old_checksum & 0xFFFF) + (~old_sum & 0xFFFF) + new_sum) & 0xFFFF
+    if optional and new_checksum == 0:
+        new_checksum = 0xFFFF
+    struct.pack_into('!H', frame, checksum_offset, new_checksum)
+
+
+def patch_field(frame: bytearray, offset: int, new_data: bytes, checksum_offsets: tuple,
+        optional: tuple=()) -> None:
+    """ Overwrites a field of a built frame, incrementally updating the checksums covering it
+
+    Parameters:
+        frame (bytearray): Built Ethernet frame, modified in place
+        offset (int): Offset of the field in the frame
+        new_data (bytes): New value of the field (even length, at an even offset from
+            the start of each checksummed region)
+        checksum_offsets (tuple): Offsets of the checksums covering the field
+        optional (tuple): Offsets of UDP checksums, see patch_checksum
+    """
+    old_data = bytes(frame[offset:offset + len(new_data)])
+    if len(old_data) != len(new_data) or len(new_data) % 2:
+        raise ex.ChecksumFieldLengthError(
+            f'Changed field must be the same even length. '
+            f'Received: {len(old_data)} and {len(new_data)} bytes')
+    if old_data == new_data:
+        return
+    old_sum, new_sum = ones_complement_sum(old_data), ones_complement_sum(new_data)
+    for checksum_offset in checksum_offsets:
+        patch_checksum(frame, checksum_offset, old_sum, new_sum, checksum_offset in optional)
+    frame[offset:offset + len(new_data)] = new_data
+
+
+def patch_payload(frame: bytearray, offset: int, new_payload: bytes, checksum_offsets: tuple,
+        optional: tuple=()) -> None:
+    """ Replaces everything from offset to the end of a built frame, which may change its
+    length, incrementally updating the checksums covering it. Length fields are not
+    updated, patch them with patch_field and patch_checksum.
+
+    Parameters:
+        frame (bytearray): Built Ethernet frame, modified in place
+        offset (int): Offset of the payload, at an even offset from the start of each
+            checksummed region
+        new_payload (bytes): New payload
+        checksum_offsets (tuple): Offsets of the checksums covering the payload
+        optional (tuple): Offsets of UDP checksums, see patch_checksum
+    """
+    old_sum = ones_complement_sum(frame[offset:])
+    new_sum = ones_complement_sum(new_payload)
+    for checksum_offset in checksum_offsets:
+        patch_checksum(frame, checksum_offset, old_sum, new_sum, checksum_offset in optional)
+    frame[offset:] = new_payload
+
+
+def batch_checksums(frames, start: int=0, end: int=None):
+    """ Vectorised ones' complement checksums of the same byte range of many frames
+
+    Parameters:
+        frames (numpy.ndarray): 2D uint8 array with one frame per row
+        start (int): First byte of the checksummed range
+        end (int): End of the checksummed range (default: end of the rows)
+
+    Returns:
+        numpy.ndarray: uint16 checksum of each row
+    """
+    if np is None:
+        raise ImportError('NumPy is required for batched checksums.')
+    region = np.ascontiguousarray(frames[:, start:end], dtype=np.uint8)
+    if region.shape[1] % 2:
+        region = np.pad(region, ((0, 0), (0, 1)))
+    words = region.view('>u2').astype(np.uint64)
+    total = words.sum(axis=1)
+    while np.any(total > 0xFFFF):
+        total = (total & 0xFFFF) + (total >> 16)
+    return (~total & 0xFFFF).astype(np.uint16)
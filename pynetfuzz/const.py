@@ -7,10 +7,9 @@ CAST_TYPES = (
     'multicast',
     'unicast',
 )
-INTERNET_PROTOCOLS = (
+INTERNET_PROTOCOLS = ( # Jumbo frames are only sent when asked for (-ip jumbo)
     'ipv4',
     'ipv6',
-    #'jumbo',
 )
 TRANSPORT_PROTOCOLS = (
     'tcp',
@@ -22,13 +21,40 @@ CAST_TYPES_INFO = {
     'ipv4': {
         'multicast': {
             'IP': '224.0.0.1',
-            'MAC': '01:00:5E:00:00:01'},
+            'MAC': '01:00:5E:00:00:01',
+            'groups': (
+                '224.0.0.1', # All hosts
+                '224.0.0.2', # All routers
+                '224.0.0.5', # OSPF routers
+                '224.0.0.6', # OSPF designated routers
+                '224.0.0.9', # RIPv2
+                '224.0.0.18', # VRRP
+                '224.0.0.22', # IGMPv3
+                '224.0.0.251', # mDNS
+                '224.0.0.252', # LLMNR
+                '224.0.1.1', # NTP
+                '239.255.255.250')}, # SSDP
         'broadcast': {
             'IP': '255.255.255.255',
             'MAC': 'FF:FF:FF:FF:FF:FF'}
     },
     'ipv6': {
         'multicast': {
+            'IP': 'FF02:0:0:0:0:0:0:1',
+            'MAC': '33:33:00:00:00:01',
+            'groups': (
+                'FF02::1', # All nodes
+                'FF02::2', # All routers
+                'FF02::5', # OSPFv3 routers
+                'FF02::6', # OSPFv3 designated routers
+                'FF02::9', # RIPng
+                'FF02::D', # PIM routers
+                'FF02::16', # MLDv2 reports
+                'FF02::FB', # mDNS
+                'FF02::1:2', # DHCPv6 agents
+                'FF02::1:3', # LLMNR
+                'FF05::1:3')}, # DHCPv6 servers
+        'broadcast': { # IPv6 has no broadcast, the all nodes group is used instead
             'IP': 'FF02:0:0:0:0:0:0:1',
             'MAC': '33:33:00:00:00:01'}
     }
@@ -38,14 +64,17 @@ CAST_TYPES_INFO = {
 INTERNET_PROTOCOLS_INFO = {
     'ipv4': {
         'value': 0x800,
+        'ether_type': 0x800,
         'max_length': 1500,
         'header_length': 20},
     'ipv6': {
         'value': 0x86DD,
+        'ether_type': 0x86DD,
         'max_length': 1500,
         'header_length': 40},
     'jumbo': {
         'value': 0x8870,
+        'ether_type': 0x800, # IPv4 carried in a 9000 byte MTU frame
         'max_length': 9000,
         'header_length': 20}
 }
@@ -60,9 +89,47 @@ TRANSPORT_PROTOCOLS_INFO = {
         'header_length': 20}
 }
 
+# Ether type sent on the wire by internet protocol value
+ETHER_TYPES = {info['value']: info['ether_type'] for info in INTERNET_PROTOCOLS_INFO.values()}
+
+# IPv6 extension headers (Next header values) and chain limits
+IPV6_EXTENSION_HEADERS = {
+    'hop_by_hop': 0,
+    'routing': 43,
+    'fragment': 44,
+    'destination': 60,
+}
+IPV6_EXTENSION_LENGTH = 8
+IPV6_MAX_EXTENSIONS = 3
+IPV6_MAX_OPTION_UNITS = 4 # Options headers fuzzed up to 4 * 8 bytes
+IPV6_MAX_ROUTING_ADDRESSES = 2
+
+# Randomised header fields as (name, bits), drawn together and sliced in this order
+IPV4_HEADER_FIELDS = (('ttl', 8), ('tos', 8), ('flags', 3), ('frag', 13), ('id', 16))
+IPV6_HEADER_FIELDS = (('tc', 8), ('fl', 20), ('hlim', 8))
+TCP_HEADER_FIELDS = (('seq', 32), ('ack', 32), ('window', 16), ('urgptr', 16))
+
+# Protocol names by value
+PROTOCOL_NAMES = {
+    info['value']: name for name, info in
+    list(INTERNET_PROTOCOLS_INFO.items()) + list(TRANSPORT_PROTOCOLS_INFO.items())
+}
+
 # Constants
 MAX_PORT = 65535
-PACKETS_PER_SEED = 100
+PACKETS_PER_SEED = 100 # Packets in the first generator cycle and after an anomaly
+SEED_GAMMA = 0x9E3779B97F4A7C15 # SplitMix64 increment
+SEED_MIX = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB) # SplitMix64 finaliser multipliers
+CYCLE_MAX_PACKETS = 1000000 # Most packets in an adaptive generator cycle
+CYCLE_INTERVAL = 5.0 # Longest an adaptive generator cycle should take in seconds
+CYCLE_GROWTH = 2 # Cycles grow by this factor while the target is stable
+DEFAULT_LENGTH_BUCKETS = 4
+DEFAULT_POOL_SIZE = 64
+DEFAULT_RING_SLOTS = 1024
+RING_SLOT_SIZE = 9018 # Largest frame, a VLAN tagged jumbo frame
+
+# Longest scope IP address (IPv6 range)
+MAX_SCOPE_IP_LENGTH = 79
 
 # Regex expressions
 # Specific IP address
@@ -74,10 +141,238 @@ REGEX_SCOPE_IP = "^((25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9]|[*])\\.){3}" \
 # MAC address
 REGEX_MAC = "^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})|([0-9a-fA-F]{4}" \
     "\\.[0-9a-fA-F]{4}\\.[0-9a-fA-F]{4})$"
+# CPU list (e.g. 0-3,8)
+REGEX_CPULIST = "^[0-9]+(-[0-9]+)?(,[0-9]+(-[0-9]+)?)*$"
 
 # Default values
 DEFAULT_IP_ADDRESS = "192.168.1.*"
+DEFAULT_IPV4_SCOPE = "*.*.*.*"
+DEFAULT_IPV6_SCOPE = "::/0" # Random source scope of IPv6 targets
 DEFAULT_MASK = 24
 
+# Metrics (name: help text)
+METRICS = {
+    'pynetfuzz_packets_sent_total': 'Packets sent by protocol and cast type',
+    'pynetfuzz_bytes_sent_total': 'Bytes sent by protocol and cast type',
+    'pynetfuzz_generate_seconds': 'Time to randomise packet details',
+    'pynetfuzz_build_seconds': 'Time to build packet layers',
+    'pynetfuzz_send_seconds': 'Time to send a packet',
+    'pynetfuzz_liveness_transitions_total': 'Target liveness state changes',
+    'pynetfuzz_target_online': 'Target liveness (1 online, 0 offline)',
+    'pynetfuzz_queue_depth': 'Items waiting in internal queues',
+    'pynetfuzz_ring_utilisation': 'Fraction of frame ring slots waiting on the sender',
+    'pynetfuzz_ring_stalls_total': 'Generator writes that waited for a free ring slot',
+    'pynetfuzz_core_packets_per_second': 'Packets per second handled by each pinned CPU',
+    'pynetfuzz_fragment_trains_total': 'Fragment trains sent by mode',
+    'pynetfuzz_fragment_responses_total': 'ICMP errors quoting a fragment train by mode',
+    'pynetfuzz_tx_dropped_total': 'Sent frames dropped by the kernel or missing from the '
+        'interface counters',
+    'pynetfuzz_tx_rate_limit': 'Packets per second the sender is paced to (0 unpaced)',
+}
+METRICS_LATENCY_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+CHECKPOINT_INTERVAL = 10000
+CHECKPOINT_VERSION = 1
+CHECKPOINT_LIVENESS_EVENTS = 256
+JOURNAL_CHUNK_RECORDS = 4096
+JOURNAL_MAGIC = b'PNFJ'
+JOURNAL_VERSION = 3
+
+PROFILE_SAMPLE_INTERVAL = 64
+PROFILE_STACK_DEPTH = 64
+PROFILE_STAGES = ( # Pipeline stages in order
+    'setup', # Generator validation and seeding
+    'generate', # Randomising hosts and packet details
+    'build', # Building or patching the frame
+    'send',
+    'journal',
+    'liveness',
+)
+
+CAMPAIGN_OPTIONS = ( # Options of the whole campaign, not of its phases
+    'metrics_port',
+    'journal',
+    'profile',
+    'profile_output',
+    'profile_interval',
+    'trace',
+    'trace_every',
+    'trace_interval',
+    'trace_filter',
+)
+CAMPAIGN_UNSUPPORTED_OPTIONS = (
+    'checkpoint',
+    'checkpoint_interval',
+    'resume',
+)
+
+TCP_FLAGS = {
+    'FIN': 0x01,
+    'SYN': 0x02,
+    'RST': 0x04,
+    'PSH': 0x08,
+    'ACK': 0x10,
+    'URG': 0x20,
+}
+TCP_STATE_SEGMENT_FLAGS = ( # Flags of fuzzed segments, drawn with equal chance
+    0x10, # ACK
+    0x18, # PSH ACK
+    0x18, # PSH ACK
+    0x30, # URG ACK
+    0x38, # URG PSH ACK
+    0x11, # FIN ACK
+    0x14, # RST ACK
+)
+TCP_STATE_CLOSED = 0
+TCP_STATE_SYN_SENT = 1
+TCP_STATE_ESTABLISHED = 2
+TCP_STATE_BASE_PORT = 10000 # Source port of the first connection
+TCP_STATE_MAX_CONNECTIONS = 50000
+TCP_STATE_TIMEOUT = 1.0 # Seconds waiting for handshake replies
+TCP_STATE_POLL_FRAMES = 4 # Frames read per connection by a poll without waiting
+TCP_STATE_WINDOW = 65535 # Window advertised to the target
+
+DISTRIBUTED_PORT = 7878
+DISTRIBUTED_TIMEOUT = 300.0 # Seconds waiting for every agent to connect
+DISTRIBUTED_STATS_INTERVAL = 1.0 # Seconds between agent stats reports
+DISTRIBUTED_AGENT_OPTIONS = ( # Options each agent sets for itself
+    'network_interface',
+    'metrics_port',
+    'journal',
+    'profile_output',
+    'affinity',
+    'cpus',
+)
+DISTRIBUTED_UNSUPPORTED_OPTIONS = (
+    'checkpoint',
+    'resume',
+    'corpus',
+)
+
+PAYLOAD_TYPES = ( # Payload strategies, mixed draws one of the others for each packet
+    'random',
+    'dns',
+    'http',
+    'ntp',
+    'pattern',
+    'format',
+    'overflow',
+    'mixed',
+)
+PAYLOAD_BUFFER_SIZE = 9018 # Payloads are rendered into a buffer of the largest frame
+PAYLOAD_PATTERNS = ( # Repeated to fill the payload
+    b'A',
+    b'\x00',
+    b'\xff',
+    b'\x7f',
+    b'\x80',
+    b'\xde\xad\xbe\xef',
+    b'\r\n',
+    bytes(range(256)),
+)
+PAYLOAD_FORMAT_STRINGS = (
+    b'%s',
+    b'%n',
+    b'%x',
+    b'%p',
+    b'%d',
+    b'%99999999s',
+    b'%.1024d',
+    b'%*.*s',
+    b'%@',
+    b'%%',
+)
+PAYLOAD_OVERFLOW_TOKENS = ( # Boundary values and path traversal
+    b'0',
+    b'-1',
+    b'65535',
+    b'65536',
+    b'2147483647',
+    b'2147483648',
+    b'4294967295',
+    b'4294967296',
+    b'18446744073709551616',
+    b'\xff\xff\xff\xff',
+    b'\x00\x00\x00\x80',
+    b'../',
+    b'\\..',
+)
+
+CORPUS_MAGIC = b'PNFC'
+CORPUS_VERSION = 1
+CORPUS_CHUNK_PACKETS = 10000 # Packets rendered by each pregenerate task
+CORPUS_VERIFY_BATCH = 1024 # Frames checksummed at a time by Corpus.verify
+CORPUS_UNSUPPORTED_OPTIONS = ( # Run options that have no effect on replayed frames
+    'journal',
+    'checkpoint',
+    'resume',
+    'workers',
+    'tcp_state',
+    'sweep',
+    'pool',
+)
+PREGENERATE_UNSUPPORTED_OPTIONS = (
+    'journal',
+    'checkpoint',
+    'resume',
+    'workers',
+    'tcp_state',
+    'corpus',
+)
+
+FRAGMENT_MODES = (
+    'in_order',
+    'reversed',
+    'overlapping',
+    'tiny',
+    'missing_last',
+)
+FRAGMENT_TYPES = FRAGMENT_MODES + ('mixed',) # Mixed draws a mode for each train
+FRAGMENT_MAX_UNITS = 64 # Largest fragment in 8 byte units
+FRAGMENT_TRACKED_TRAINS = 4096 # Latest trains responses are matched to
+FRAGMENT_POLL_FRAMES = 256 # Frames read by a poll without waiting
+FRAGMENT_ICMP_ERRORS = ( # ICMP types quoting the datagram's header
+    3, # Destination unreachable
+    4, # Source quench
+    5, # Redirect
+    11, # Time exceeded, code 1 reassembly timeout
+    12, # Parameter problem
+)
+FRAGMENT_UNSUPPORTED_OPTIONS = (
+    'workers',
+    'tcp_state',
+    'corpus',
+)
+
+TRACE_SAMPLE_INTERVAL = 1000 # Frames per traced frame without an interval or filter
+TRACE_FILTER_FIELDS = (
+    'int_protocol',
+    'trans_protocol',
+    'cast',
+    'min_length',
+    'max_length',
+)
+TRACE_PCAP_EXTENSIONS = ('.pcap', '.cap') # Trace files written as pcap, others as hexdumps
+
+TXMON_INTERVAL = 1.0 # Seconds between samples of the interface counters
+TXMON_COUNTERS = (
+    'tx_packets',
+    'tx_bytes',
+    'tx_errors',
+    'tx_dropped',
+    'tx_fifo_errors',
+)
+TXMON_SYSFS = '/sys/class/net'
+TXMON_PROCFS = '/proc/net/dev'
+TXMON_CHECK_FRAMES = 64 # Frames sent between pacing checks
+TXMON_DECREASE = 0.5 # Multiplier of the measured rate after drops
+TXMON_INCREASE = 1000.0 # Packets per second added to the paced rate after each clean sample
+TXMON_MIN_RATE = 100.0 # Slowest paced rate in packets per second
+TXMON_MISSING_TOLERANCE = 64 # Frames the backlog may grow by in a sample, e.g. still queued
+TXMON_UNPACE = 0.9 # Pacing is lifted when the sender falls below this share of the rate
+
+SESSION_CACHE_SIZE = 128 # Hosts and packet details kept by a Session
+
 LOGGING_FORMAT = "%(asctime)s [%(process)d] %(levelname)s: %(message)s"
 LOGGING_LEVEL = "info"
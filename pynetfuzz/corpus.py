@@ -0,0 +1,261 @@
+"""
+Contains Corpus class - pregenerated packet corpus files replayed at full rate
+"""
+# Python library imports
+from typing import Iterator
+import multiprocessing
+import mmap
+import os
+import struct
+# Package imports
+import pynetfuzz.exceptions as ex
+from .hosts import Host
+from .packet import PacketDetails
+from .packet_generator import packet_generator
+from .pool import PacketPool
+from .sweep import Sweep
+from .checksum import checksum, batch_checksums
+from .const import (
+    CAST_TYPES, PACKETS_PER_SEED, DEFAULT_POOL_SIZE, CORPUS_MAGIC, CORPUS_VERSION,
+    CORPUS_CHUNK_PACKETS, CORPUS_VERIFY_BATCH,
+)
+from .validation import valid_number
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+HEADER = struct.Struct('<4sHH3Q') # Magic, version, reserved, count, seed, index offset
+LENGTH = struct.Struct('<H') # Length prefix of each frame
+ENTRY = struct.Struct('<QHHBB2x') # Offset, checksum, int protocol, trans protocol, cast
+
+
+def render_chunk(path: str, target: Host, details: PacketDetails, source: Host, seed: int,
+        first: int, count: int, sweep: Sweep=None) -> bytes:
+    """ Worker process method, renders a chunk of the corpus into its own part file.
+    Packet i of the corpus is packet i % PACKETS_PER_SEED of the generator seeded with
+    seed + i // PACKETS_PER_SEED, so the corpus does not depend on the chunking.
+
+    Parameters:
+        path (str): Path of the chunk's part file
+        target (Host): Target Host object for packet generation
+        details (PacketDetails): Packet details for packet generation
+        source (Host): Source Host object for packet generation
+        seed (int): Seed of the corpus
+        first (int): Index of the chunk's first packet, a multiple of PACKETS_PER_SEED
+        count (int): Number of packets in the chunk
+        sweep (Sweep): Optional Sweep, packets take the strata of their index
+
+    Returns:
+        bytes: Index entries of the chunk, offsets relative to the part file
+    """
+    pool = PacketPool(DEFAULT_POOL_SIZE)
+    entries = bytearray()
+    offset, index = 0, first
+    with open(path, 'wb') as part:
+        while index < first + count:
+            for packet in packet_generator(target, details, source,
+                    seed + index // PACKETS_PER_SEED,
+                    max_packets=min(PACKETS_PER_SEED, first + count - index), sweep=sweep,
+                    start=index, pool=pool):
+                frame = packet.frame if packet.frame is not None else packet.raw()
+                packet_details = packet.details
+                entries += ENTRY.pack(offset, checksum(frame), packet_details.int_protocol,
+                    packet_details.trans_protocol, CAST_TYPES.index(packet_details.cast))
+                part.write(LENGTH.pack(len(frame)))
+                part.write(frame)
+                offset += LENGTH.size + len(frame)
+                pool.release(packet)
+                index += 1
+    return bytes(entries)
+
+
+def write_corpus(path: str, target: Host, details: PacketDetails, n_packets: int,
+        source: Host=None, seed: int=0, sweep: Sweep=None, processes: int=None,
+        chunk_packets: int=CORPUS_CHUNK_PACKETS) -> int:
+    """ Renders packets into a corpus file, in parallel chunks
+
+    Parameters:
+        path (str): Path of the corpus file, overwritten
+        target (Host): Target Host object for packet generation
+        details (PacketDetails): Packet details for packet generation
+        n_packets (int): Number of packets in the corpus
+        source (Host): Optional Source Host object for packet generation
+        seed (int): Seed of the corpus, see render_chunk
+        sweep (Sweep): Optional Sweep, packets take the strata of their index
+        processes (int): Number of generator processes (default: CPU count)
+        chunk_packets (int): Packets rendered by each task, rounded up to a whole number
+            of generators
+
+    Returns:
+        int: Number of packets written
+    """
+    n_packets = valid_number(n_packets, minimum=1)
+    processes = valid_number(processes or os.cpu_count() or 1, minimum=1)
+    chunk_packets = -(-valid_number(chunk_packets, minimum=1) // PACKETS_PER_SEED) * \
+        PACKETS_PER_SEED
+    source = source if source is not None else Host(None, None, None)
+    chunks = [(f'{path}.part{number}', target, details, source, seed, first,
+        min(chunk_packets, n_packets - first), sweep)
+        for number, first in enumerate(range(0, n_packets, chunk_packets))]
+    context = multiprocessing.get_context('spawn')
+    try:
+        with open(path, 'wb') as corpus, context.Pool(min(processes, len(chunks))) as pool:
+            corpus.write(HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, 0, 0, seed, 0))
+            index = bytearray()
+            # Parts are appended in order as they finish, their offsets moved to the file's
+            for chunk, entries in zip(chunks, pool.imap(star_render_chunk, chunks)):
+                base = corpus.tell()
+                for offset in range(0, len(entries), ENTRY.size):
+                    entry = ENTRY.unpack_from(entries, offset)
+                    index += ENTRY.pack(base + entry[0], *entry[1:])
+                with open(chunk[0], 'rb') as part:
+                    while True:
+                        block = part.read(1 << 20)
+                        if not block:
+                            break
+                        corpus.write(block)
+                os.remove(chunk[0])
+            index_offset = corpus.tell()
+            corpus.write(index)
+            corpus.seek(0)
+            corpus.write(HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, 0,
+                len(index) // ENTRY.size, seed, index_offset))
+    finally:
+        for chunk in chunks:
+            if os.path.exists(chunk[0]):
+                os.remove(chunk[0])
+    return n_packets
+
+
+def star_render_chunk(chunk: tuple) -> bytes:
+    """ Unpacks the arguments of render_chunk for Pool.imap"""
+    return render_chunk(*chunk)
+
+
+class Corpus():
+    """ Memory-mapped corpus of pregenerated frames.
+
+    The file is a 32 byte header, the length-prefixed frames and an index
+    of fixed-width entries (frame offset, checksum, protocols and cast), so
+    any frame can be found without reading the ones before it. Frames are
+    sent straight from the mapping without being copied.
+    """
+
+    def __init__(self, path: str) -> None:
+        """ Corpus class built-in initialiser, maps the file
+
+        Parameters:
+            path (str): Path of a corpus file written by write_corpus
+        """
+        self.path = path
+        with open(path, 'rb') as corpus:
+            header = corpus.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ex.CorpusFormatError(f'Not a corpus file, too short. ({path})')
+            magic, version, _, self.count, self.seed, index_offset = HEADER.unpack(header)
+            if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+                raise ex.CorpusFormatError(
+                    f'Not a version {CORPUS_VERSION} corpus file. ({path})')
+            if not self.count or \
+                    index_offset + self.count * ENTRY.size != os.path.getsize(path):
+                raise ex.CorpusFormatError(f'Corpus file is incomplete or empty. ({path})')
+            self.map = mmap.mmap(corpus.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        self.index = self.view[index_offset:]
+
+    def entry(self, number: int) -> tuple:
+        """ Gets the index entry of a frame
+
+        Parameters:
+            number (int): Number of the frame
+
+        Returns:
+            tuple: (offset, checksum, int_protocol, trans_protocol, cast index)
+        """
+        return ENTRY.unpack_from(self.index, (number % self.count) * ENTRY.size)
+
+    def frames(self, n_packets: int=None, start: int=0) -> Iterator[tuple]:
+        """ Reads frames in order, starting over at the end of the corpus. Each frame
+        view is released when the next one is requested.
+
+        Parameters:
+            n_packets (int): Number of frames to read (default: the whole corpus)
+            start (int): Number of the first frame
+
+        Returns:
+            Iterator: Yields (int_protocol, trans_protocol, cast index, frame memoryview)
+        """
+        n_packets = self.count if n_packets is None else n_packets
+        view, index, count = self.view, self.index, self.count
+        number = start % count
+        for _ in range(n_packets):
+            offset, _, int_protocol, trans_protocol, cast = \
+                ENTRY.unpack_from(index, number * ENTRY.size)
+            length = LENGTH.unpack_from(view, offset)[0]
+            frame = view[offset + LENGTH.size:offset + LENGTH.size + length]
+            try:
+                yield int_protocol, trans_protocol, cast, frame
+            finally:
+                frame.release()
+            number = number + 1 if number + 1 < count else 0
+
+    def verify(self, batch: int=CORPUS_VERIFY_BATCH) -> list:
+        """ Checks every frame against the checksum in its index entry, a batch of frames
+        at a time with NumPy
+
+        Parameters:
+            batch (int): Number of frames checked at a time
+
+        Returns:
+            list: Numbers of the frames that do not match their checksum
+        """
+        if np is None:
+            raise ImportError('NumPy is required to verify a corpus.')
+        entries = np.frombuffer(self.index, dtype=np.dtype([('offset', '<u8'),
+            ('checksum', '<u2'), ('int_protocol', '<u2'), ('trans_protocol', 'u1'),
+            ('cast', 'u1'), ('_pad', 'V2')]))
+        data = np.frombuffer(self.view, dtype=np.uint8)
+        bad = []
+        try:
+            starts = entries['offset'].astype(np.int64)
+            lengths = data[starts].astype(np.int64) | data[starts + 1].astype(np.int64) << 8
+            starts += LENGTH.size
+            for first in range(0, self.count, batch):
+                offsets, sizes = starts[first:first + batch], lengths[first:first + batch]
+                # Frames are zero padded to the longest, padding does not change the sum
+                columns = np.arange(sizes.max())
+                rows = np.where(columns < sizes[:, None],
+                    data[np.minimum(offsets[:, None] + columns, len(data) - 1)], 0)
+                mismatched = batch_checksums(rows) != entries['checksum'][first:first + batch]
+                bad += (np.flatnonzero(mismatched) + first).tolist()
+        finally:
+            del data, entries # The map can not be closed while arrays share it
+        return bad
+
+    def close(self) -> None:
+        """ Unmaps the file"""
+        self.index.release()
+        self.view.release()
+        self.map.close()
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return self.count
+
+    def __enter__(self):
+        """Built-in context manager enter method"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Built-in context manager exit method"""
+        self.close()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Corpus - Path: ({self.path}), Packets: ({self.count}), Seed: ({self.seed})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.path}, {self.count})'
@@ -0,0 +1,69 @@
+"""
+Contains CycleLength class - adaptive number of packets sent between liveness checks
+"""
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import PACKETS_PER_SEED, CYCLE_MAX_PACKETS, CYCLE_INTERVAL, CYCLE_GROWTH
+from .validation import valid_number
+
+
+class CycleLength():
+    """ Adaptive length of a run's generator cycles.
+
+    Every cycle ends with a liveness check (and a new generator), so short
+    cycles catch a failing target quickly but spend more of the run on the
+    checks. Cycles start at the minimum length and grow by CYCLE_GROWTH after
+    each cycle the target stayed online, up to the maximum number of packets
+    and to the number sent in the interval at the last cycle's rate. After an
+    anomaly, e.g. the target going offline, they drop back to the minimum.
+    """
+
+    def __init__(self, maximum: int=None, interval: float=None,
+            minimum: int=PACKETS_PER_SEED) -> None:
+        """ CycleLength class built-in initialiser
+
+        Parameters:
+            maximum (int): Most packets in a cycle (default: CYCLE_MAX_PACKETS), a maximum
+                at or below the minimum gives cycles of a fixed length
+            interval (float): Longest a cycle should take in seconds (default: CYCLE_INTERVAL)
+            minimum (int): Packets in the first cycle and in the cycle after an anomaly
+        """
+        self.maximum = valid_number(maximum if maximum is not None else CYCLE_MAX_PACKETS,
+            minimum=1)
+        self.minimum = min(valid_number(minimum, minimum=1), self.maximum)
+        self.interval = float(interval if interval is not None else CYCLE_INTERVAL)
+        if self.interval <= 0:
+            raise ex.CycleIntervalError(f'Cycle interval must be positive. ({interval})')
+        self.length = self.minimum
+        self.anomalies = 0
+
+    def update(self, packets: int, elapsed: float, stable: bool) -> int:
+        """ Sets the length of the next cycle from the one just completed
+
+        Parameters:
+            packets (int): Packets sent in the cycle
+            elapsed (float): Seconds the cycle took
+            stable (bool): False if the cycle ended with an anomaly
+
+        Returns:
+            int: Length of the next cycle
+        """
+        if not stable:
+            self.anomalies += 1
+            self.length = self.minimum
+            return self.length
+        length = min(self.length * CYCLE_GROWTH, self.maximum)
+        if packets > 0 and elapsed > 0:
+            length = min(length, int(packets / elapsed * self.interval))
+        self.length = max(length, self.minimum)
+        return self.length
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'CycleLength - Length: ({self.length}), Range: ({self.minimum}-' \
+            f'{self.maximum}), Interval: ({self.interval}s), Anomalies: ({self.anomalies})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.maximum}, {self.interval}, ' \
+            f'{self.minimum})'
@@ -0,0 +1,343 @@
+"""
+Contains Coordinator and Agent classes - distributed runs split between agents over TCP
+"""
+# Python library imports
+import json
+import logging
+import socket
+import threading
+import time
+# Package imports
+import pynetfuzz.exceptions as ex
+from .arguments import Args
+from .run import run
+from .const import (
+    DISTRIBUTED_PORT, DISTRIBUTED_TIMEOUT, DISTRIBUTED_STATS_INTERVAL,
+    DISTRIBUTED_AGENT_OPTIONS, DISTRIBUTED_UNSUPPORTED_OPTIONS,
+)
+from .validation import valid_number
+
+
+def send_message(connection: socket.socket, message: dict, lock: threading.Lock=None) -> None:
+    """ Sends a message as a line of JSON
+
+    Parameters:
+        connection (socket): Connected socket
+        message (dict): Message with a 'type' key
+        lock (Lock): Optional lock serialising writers of the socket
+    """
+    data = (json.dumps(message) + '\n').encode()
+    if lock is None:
+        connection.sendall(data)
+        return
+    with lock:
+        connection.sendall(data)
+
+
+def read_message(reader) -> dict:
+    """ Reads a line of JSON message
+
+    Parameters:
+        reader (file): Binary file of the connected socket
+
+    Returns:
+        dict: Message with a 'type' key, None once the connection is closed
+    """
+    line = reader.readline()
+    if not line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError as exception:
+        raise ex.DistributedProtocolError(f'Not a valid message. ({line!r})') from exception
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ex.DistributedProtocolError(f'Not a valid message. ({line!r})')
+    return message
+
+
+class Coordinator():
+    """ Splits a run between agents and stops them all when the target goes offline.
+
+    Once every agent has connected, each is assigned its share of the
+    packets with its own master seed (seed + agent index), its share of the
+    priority seeds and, for sweeps, its own shard, so no two agents send the
+    same packets. Agents report their
+    stats and liveness checks, and when any agent sees the target offline
+    every agent is told to stop.
+
+    Messages are lines of JSON over TCP:
+        agent -> coordinator: hello, stats, liveness, done
+        coordinator -> agent: assign, stop
+    """
+
+    def __init__(self, args: Args, agents: int, address: tuple=('0.0.0.0', DISTRIBUTED_PORT),
+            timeout: float=DISTRIBUTED_TIMEOUT) -> None:
+        """ Coordinator class built-in initialiser, starts listening for agents
+
+        Parameters:
+            args (Args): Arguments of the run, as for run. The agents set their own
+                network interface, metrics port, journal and profile output.
+            agents (int): Number of agents to split the run between
+            address (tuple): (host, port) to listen on, port 0 picks a free port
+            timeout (float): Seconds to wait for every agent to connect
+        """
+        unsupported = [key for key in DISTRIBUTED_UNSUPPORTED_OPTIONS
+            if getattr(args, key) is not None]
+        if unsupported:
+            raise ex.DistributedOptionsError(
+                f'{", ".join(unsupported)} are not supported in distributed runs.')
+        self.args = args
+        self.agents = valid_number(agents, minimum=1)
+        self.timeout = timeout
+        self.seed = args.seed if args.seed is not None else int(time.time())
+        self.stats = {}
+        self.reason = None
+        self.connections = []
+        self.lock = threading.Lock()
+        self.server = socket.create_server(address)
+
+    @property
+    def address(self) -> tuple:
+        """ Address the coordinator listens on
+
+        Returns:
+            tuple: (host, port)
+        """
+        return self.server.getsockname()[:2]
+
+    def assignments(self) -> list:
+        """ Splits the run's arguments between the agents
+
+        Returns:
+            list: Run arguments dict of each agent
+        """
+        share, extra = divmod(self.args.n_packets, self.agents)
+        shard, shards = self.args.shard if self.args.shard is not None else (0, 1)
+        assignments = []
+        for index in range(self.agents):
+            options = {key: value for key, value in vars(self.args).items()
+                if key not in DISTRIBUTED_AGENT_OPTIONS}
+            options['n_packets'] = share + (1 if index < extra else 0)
+            options['seed'] = self.seed + index
+            if self.args.seed_priority: # Each priority seed is run by one agent
+                options['seed_priority'] = list(self.args.seed_priority[index::self.agents])
+            if self.args.sweep: # Each agent sweeps its own shard of the strata
+                options['shard'] = (shard * self.agents + index, shards * self.agents)
+            assignments.append(options)
+        return assignments
+
+    def serve(self) -> dict:
+        """ Waits for the agents, assigns them their share and collects their reports
+        until all are done
+
+        Returns:
+            dict: Last stats of each agent by name
+        """
+        self.server.settimeout(self.timeout)
+        try:
+            while len(self.connections) < self.agents:
+                try:
+                    connection, _ = self.server.accept()
+                except socket.timeout as exception:
+                    raise ex.DistributedTimeoutError(
+                        f'Only {len(self.connections)} of {self.agents} agents connected '
+                        f'within {self.timeout}s.') from exception
+                connection.settimeout(None)
+                reader = connection.makefile('rb')
+                hello = read_message(reader)
+                if hello is None or hello['type'] != 'hello':
+                    raise ex.DistributedProtocolError(f'Agent did not say hello. ({hello})')
+                name = str(hello.get('agent') or f'agent{len(self.connections)}')
+                if name in self.stats:
+                    name = f'{name}-{len(self.connections)}'
+                self.stats[name] = {'sent': 0, 'elapsed': 0.0, 'online': None, 'done': False}
+                self.connections.append((name, connection, reader))
+                logging.info("Agent %s connected (%s/%s)", name, len(self.connections),
+                    self.agents)
+
+            threads = []
+            for (name, connection, reader), options in zip(self.connections,
+                    self.assignments()):
+                send_message(connection, {'type': 'assign', 'args': options}, self.lock)
+                logging.info("Agent %s assigned %s packets (Seed=%s)", name,
+                    options['n_packets'], options['seed'])
+                thread = threading.Thread(target=self.handle, args=(name, reader), daemon=True)
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        finally:
+            self.close()
+        return self.stats
+
+    def handle(self, name: str, reader) -> None:
+        """ Collects the reports of an agent until it is done or disconnects
+
+        Parameters:
+            name (str): Name of the agent
+            reader (file): Binary file of the agent's socket
+        """
+        stats = self.stats[name]
+        try:
+            while True:
+                message = read_message(reader)
+                if message is None:
+                    break
+                if message['type'] in ('stats', 'liveness', 'done'):
+                    stats['sent'] = message.get('sent', stats['sent'])
+                    stats['elapsed'] = message.get('elapsed', stats['elapsed'])
+                if message['type'] == 'liveness':
+                    stats['online'] = message['online']
+                    if not message['online']:
+                        logging.error("Agent %s: target is offline", name)
+                        self.stop(f'target offline (agent {name})')
+                elif message['type'] == 'done':
+                    stats['done'] = True
+                    logging.info("Agent %s done, sent %s", name, stats['sent'])
+                    break
+        except (OSError, ex.DistributedProtocolError) as exception:
+            logging.error("Agent %s: %s", name, exception)
+        if not stats['done']:
+            logging.error("Agent %s disconnected before it was done", name)
+
+    def stop(self, reason: str) -> None:
+        """ Tells every agent to stop, once
+
+        Parameters:
+            reason (str): Reason given to the agents
+        """
+        with self.lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+        logging.info("Stopping all agents: %s", reason)
+        for name, connection, _ in self.connections:
+            try:
+                send_message(connection, {'type': 'stop', 'reason': reason}, self.lock)
+            except OSError as exception:
+                logging.error("Agent %s: %s", name, exception)
+
+    def close(self) -> None:
+        """ Closes the agent connections and stops listening"""
+        for _, connection, reader in self.connections:
+            reader.close()
+            connection.close()
+        self.server.close()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Coordinator - Agents: ({len(self.connections)}/{self.agents}), ' \
+            f'Sent: ({sum(stats["sent"] for stats in self.stats.values())}), ' \
+            f'Stopped: ({self.reason})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.agents}, {self.address})'
+
+
+class Agent():
+    """ Runs the share of a distributed run assigned by a coordinator.
+
+    Stats are reported at most every DISTRIBUTED_STATS_INTERVAL seconds and
+    offline liveness checks straight away. The run stops after its current
+    generator cycle when the coordinator says so.
+    """
+
+    def __init__(self, address: tuple, network_interface: str, name: str=None,
+            options: dict=None) -> None:
+        """ Agent class built-in initialiser
+
+        Parameters:
+            address (tuple): (host, port) of the coordinator
+            network_interface (str): Name of the interface connected to the target
+            name (str): Optional name reported to the coordinator (default: hostname)
+            options (dict): Optional local run options, e.g. metrics_port or journal
+        """
+        self.address = address
+        self.name = name or socket.gethostname()
+        self.options = dict(options or {}, network_interface=network_interface)
+        self.stopped = threading.Event()
+        self.assignment = None
+        self.connection = None
+        self.lock = threading.Lock()
+        self.started = None
+        self.reported = 0.0
+        self.sent = 0
+
+    def serve(self) -> int:
+        """ Connects to the coordinator and runs the assigned share
+
+        Returns:
+            int: Number of packets sent
+        """
+        self.connection = socket.create_connection(self.address)
+        reader = self.connection.makefile('rb')
+        try:
+            send_message(self.connection, {'type': 'hello', 'agent': self.name}, self.lock)
+            message = read_message(reader)
+            if message is None or message['type'] != 'assign':
+                raise ex.DistributedProtocolError(f'Expected an assignment. ({message})')
+            self.assignment = dict(message['args'], **self.options)
+            for key in ('shard', 'cpus'): # Tuples are sent as JSON lists
+                if self.assignment.get(key) is not None:
+                    self.assignment[key] = tuple(self.assignment[key])
+            listener = threading.Thread(target=self.listen, args=(reader,), daemon=True)
+            listener.start()
+            self.started = time.time()
+            run(Args(self.assignment), monitor=self.monitor)
+            send_message(self.connection, {'type': 'done', 'sent': self.sent,
+                'elapsed': time.time() - self.started}, self.lock)
+        finally:
+            self.connection.shutdown(socket.SHUT_RDWR)
+            reader.close()
+            self.connection.close()
+        return self.sent
+
+    def listen(self, reader) -> None:
+        """ Waits for the coordinator to say stop
+
+        Parameters:
+            reader (file): Binary file of the coordinator's socket
+        """
+        try:
+            while True:
+                message = read_message(reader)
+                if message is None:
+                    break
+                if message['type'] == 'stop':
+                    logging.info("Stopped by the coordinator: %s", message.get('reason'))
+                    break
+        except (OSError, ValueError):
+            pass
+        self.stopped.set() # A lost coordinator stops the run too
+
+    def monitor(self, sent: int, online: bool) -> bool:
+        """ Reports the run's progress, called by the run after each liveness check
+
+        Parameters:
+            sent (int): Packets sent so far
+            online (bool): True if the target answered the liveness check
+
+        Returns:
+            bool: False once the run must stop
+        """
+        self.sent = sent
+        now = time.time()
+        if not online or now - self.reported >= DISTRIBUTED_STATS_INTERVAL:
+            self.reported = now
+            message = {'type': 'stats' if online else 'liveness', 'sent': sent,
+                'elapsed': now - self.started, 'online': online}
+            try:
+                send_message(self.connection, message, self.lock)
+            except OSError:
+                self.stopped.set()
+        return not self.stopped.is_set()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Agent - Name: ({self.name}), Coordinator: ({self.address[0]}:' \
+            f'{self.address[1]}), Sent: ({self.sent})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.name}, {self.address})'
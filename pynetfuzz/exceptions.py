@@ -39,6 +39,99 @@ class HostGetRemoteMacError(BaseValidationError):
     """Raised when failed to get remote MAC"""
 
 #--- PACKET EXCEPTIONS----
+class PacketAddressVersionError(BaseValidationError):
+    """Raised when an IP address is not of the packet's internet protocol version"""
+
+#--- POOL EXCEPTIONS----
+class PoolExhaustedError(BaseValidationError):
+    """Raised when every packet pool slot is waiting to be released"""
+
+#--- RING EXCEPTIONS----
+class RingFrameTooLargeError(BaseValidationError):
+    """Raised when a frame is larger than a ring slot"""
+
+class WorkerOptionsError(BaseValidationError):
+    """Raised when an option is not supported with generator worker processes"""
+
+class WorkerFailedError(BaseValidationError):
+    """Raised when a generator worker process exits with an error"""
+
+#--- AFFINITY EXCEPTIONS----
+class CpuNotAvailableError(BaseValidationError):
+    """Raised when a requested CPU is not available to the process"""
+
+#--- CAMPAIGN EXCEPTIONS----
+class CampaignFormatError(BaseValidationError):
+    """Raised when a campaign file or its structure is invalid"""
+
+class CampaignPhaseError(BaseValidationError):
+    """Raised when a campaign phase has an invalid option"""
+
+#--- DISTRIBUTED EXCEPTIONS----
+class DistributedOptionsError(BaseValidationError):
+    """Raised when a distributed run has options it does not support"""
+
+class DistributedProtocolError(BaseValidationError):
+    """Raised when a coordinator or agent receives an invalid message"""
+
+class DistributedTimeoutError(BaseValidationError):
+    """Raised when not every agent connected to the coordinator in time"""
+
+#--- TCP STATE EXCEPTIONS----
+class TcpStateCapacityError(BaseValidationError):
+    """Raised when a connection table has more connections than source ports"""
+
+class TcpStateHostError(BaseValidationError):
+    """Raised when the hosts of stateful TCP are not specific enough"""
+
+class TcpStateOptionsError(BaseValidationError):
+    """Raised when stateful TCP is combined with options it does not support"""
+
+#--- PAYLOAD EXCEPTIONS----
+class PayloadTypeError(BaseValidationError):
+    """Raised when a payload strategy does not exist"""
+
+class PayloadTemplateError(BaseValidationError):
+    """Raised when a payload template or dictionary is invalid"""
+
+#--- CYCLE EXCEPTIONS----
+class CycleIntervalError(BaseValidationError):
+    """Raised when a generator cycle interval is not a positive number of seconds"""
+
+#--- CORPUS EXCEPTIONS----
+class CorpusFormatError(BaseValidationError):
+    """Raised when a corpus file can not be read"""
+
+class CorpusOptionsError(BaseValidationError):
+    """Raised when a corpus replay is combined with options it does not support"""
+
+#--- FRAGMENT EXCEPTIONS----
+class FragmentModeError(BaseValidationError):
+    """Raised when a fragment mode does not exist"""
+
+class FragmentHostError(BaseValidationError):
+    """Raised when the target of fragment trains is not a specific IPv4 address"""
+
+class FragmentOptionsError(BaseValidationError):
+    """Raised when fragmenting is combined with options it does not support"""
+
+#--- TRACE EXCEPTIONS----
+class TraceFilterError(BaseValidationError):
+    """Raised when a trace filter is invalid"""
+
+class TraceIntervalError(BaseValidationError):
+    """Raised when a trace interval is negative"""
+
+#--- TX MONITOR EXCEPTIONS----
+class TxMonitorInterfaceError(BaseValidationError):
+    """Raised when the transmit counters of an interface can not be read"""
+
+class TxMonitorIntervalError(BaseValidationError):
+    """Raised when a transmit monitor interval is not a positive number of seconds"""
+
+#--- SESSION EXCEPTIONS----
+class FrozenObjectError(BaseValidationError):
+    """Raised when a cached session object is changed"""
 
 #--- PACKET INFO EXCEPTIONS----
 class PacketInfoTypeError(BaseValidationError):
@@ -59,6 +152,18 @@ class PacketDetailsMissingEntriesError(BaseValidationError):
 
 #--- RANDOMISER EXCEPTIONS----
 
+#--- CHECKSUM EXCEPTIONS----
+class ChecksumFieldLengthError(BaseValidationError):
+    """Raised when a patched checksum field has an invalid length"""
+
+#--- CHECKPOINT EXCEPTIONS----
+class CheckpointFormatError(BaseValidationError):
+    """Raised when a checkpoint file can not be read"""
+
+#--- JOURNAL EXCEPTIONS----
+class JournalFormatError(BaseValidationError):
+    """Raised when a journal file is not in the expected format"""
+
 #--- VALIDATION EXCEPTIONS----
 # IP address
 class IpAddressInvalidTypeError(BaseValidationError):
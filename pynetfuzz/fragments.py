@@ -0,0 +1,247 @@
+"""
+Contains Fragmenter class - IPv4 fragment trains and the target's reassembly responses
+"""
+# Python library imports
+from collections import OrderedDict
+import ipaddress
+import random
+import select
+import struct
+import time
+from scapy.config import conf
+# Package imports
+import pynetfuzz.exceptions as ex
+from .hosts import Host
+from .metrics import Metrics
+from .packet import send_frame
+from .checksum import checksum, frame_offsets
+from .const import (
+    FRAGMENT_MODES, FRAGMENT_TYPES, FRAGMENT_MAX_UNITS, FRAGMENT_TRACKED_TRAINS,
+    FRAGMENT_POLL_FRAMES, FRAGMENT_ICMP_ERRORS, INTERNET_PROTOCOLS_INFO,
+)
+
+IPV4 = INTERNET_PROTOCOLS_INFO['ipv4']['value']
+ICMP = 1
+MORE_FRAGMENTS = 0x2000
+
+
+class Fragmenter():
+    """ Splits generated IPv4 datagrams into fragment trains.
+
+    Each datagram is split into fragments of a drawn multiple of 8 bytes and
+    sent as a train in one of the FRAGMENT_MODES:
+        in_order: the fragments in order
+        reversed: the last fragment first
+        overlapping: every second fragment starts 8 bytes early, with
+            different bytes in the overlap
+        tiny: an 8 byte first fragment, splitting the transport header
+        missing_last: every fragment but the last, the target times out
+    Every train takes a new IP identification, mapped back to its mode when
+    the target answers with an ICMP error quoting it (e.g. a reassembly
+    timeout, type 11 code 1), so responses are counted per mode.
+
+    Fragments are drawn from their own generator, seeded from the seed and
+    packet number, so the packet generator's stream, and journals and
+    checkpoints of it, are the same with or without fragmenting.
+    """
+
+    def __init__(self, target: Host, mode: str='mixed', seed: int=0,
+            metrics: Metrics=None) -> None:
+        """ Fragmenter class built-in initialiser
+
+        Parameters:
+            target (Host): Target host, with a specific IPv4 address
+            mode (str): One of FRAGMENT_TYPES, mixed draws a mode for each train
+            seed (int): Seed the fragment sizes and overlaps are drawn from
+            metrics (Metrics): Optional Metrics object to record trains and responses in
+        """
+        if mode not in FRAGMENT_TYPES:
+            raise ex.FragmentModeError(
+                f'Not a fragment mode. Received: {mode}, Required: {FRAGMENT_TYPES}')
+        try:
+            address = ipaddress.ip_address(target.ip)
+        except ValueError as exception:
+            raise ex.FragmentHostError(
+                f'Fragmenting needs a specific target IPv4 address. ({target.ip})') \
+                from exception
+        if address.version != 4:
+            raise ex.FragmentHostError(f'Only IPv4 datagrams are fragmented. ({target.ip})')
+        self.target = target
+        self.mode = mode
+        self.seed = seed
+        self.metrics = metrics
+        self.packed_ip = address.packed
+        self.random = random.Random()
+        self.socket = None
+        self.trains = OrderedDict() # IP identification of the latest trains, to their mode
+        self.sent = dict.fromkeys(FRAGMENT_MODES, 0)
+        self.fragments = 0
+        self.responses = {} # (mode, ICMP type, ICMP code) to the number received
+
+    def start(self, interface: str) -> None:
+        """ Opens the layer 2 socket trains are sent and responses received on
+
+        Parameters:
+            interface (str): Name of the interface connected to the target
+        """
+        self.socket = conf.L2socket(iface=interface)
+
+    def train(self, frame: bytes, index: int) -> list:
+        """ Splits the datagram of a frame into a fragment train
+
+        Parameters:
+            frame (bytes): Ethernet frame of an IPv4 datagram
+            index (int): Packet number of the datagram in the run
+
+        Returns:
+            list: Fragment frames in the order they are sent, None if the frame is not an
+                IPv4 datagram of at least two fragments
+        """
+        ether_type, ip_offset, _, _ = frame_offsets(frame)
+        if ether_type != IPV4:
+            return None
+        header_length = (frame[ip_offset] & 0x0F) * 4
+        end = min(ip_offset + struct.unpack_from('!H', frame, ip_offset + 2)[0], len(frame))
+        payload = bytes(frame[ip_offset + header_length:end])
+        if header_length < 20 or len(payload) < 16:
+            return None
+        draw = self.random
+        draw.seed(self.seed << 32 | index)
+        mode = self.mode if self.mode != 'mixed' else draw.choice(FRAGMENT_MODES)
+        size = 8 * draw.randint(1, min(FRAGMENT_MAX_UNITS, (len(payload) - 1) // 8))
+        ident = draw.getrandbits(16)
+
+        pieces, offset = [], 0
+        if mode == 'tiny':
+            pieces.append((0, payload[:8]))
+            offset = 8
+        pieces.extend((start, payload[start:start + size])
+            for start in range(offset, len(payload), size))
+        if mode == 'overlapping':
+            pieces = [(start - 8, draw.getrandbits(64).to_bytes(8, 'big') + data)
+                if position % 2 else (start, data)
+                for position, (start, data) in enumerate(pieces)]
+        header = bytearray(frame[:ip_offset + header_length])
+        last = len(pieces) - 1
+        fragments = [self.fragment(header, ip_offset, ident, start, data, position < last)
+            for position, (start, data) in enumerate(pieces)]
+        if mode == 'reversed':
+            fragments.reverse()
+        elif mode == 'missing_last':
+            fragments.pop()
+
+        self.trains[ident] = mode
+        self.trains.move_to_end(ident)
+        if len(self.trains) > FRAGMENT_TRACKED_TRAINS:
+            self.trains.popitem(last=False)
+        self.sent[mode] += 1
+        if self.metrics is not None:
+            self.metrics.inc('pynetfuzz_fragment_trains_total', mode=mode)
+        return fragments
+
+    @staticmethod
+    def fragment(header: bytearray, ip_offset: int, ident: int, offset: int, data: bytes,
+            more: bool) -> bytearray:
+        """ Builds a fragment frame from the datagram's headers
+
+        Parameters:
+            header (bytearray): Ethernet, VLAN and IPv4 headers of the datagram
+            ip_offset (int): Offset of the IPv4 header
+            ident (int): IP identification of the train
+            offset (int): Offset of the data in the datagram's payload, a multiple of 8
+            data (bytes): Data of the fragment
+            more (bool): True to set the more fragments flag
+
+        Returns:
+            bytearray: Fragment frame
+        """
+        frame = header + data
+        header_length = len(header) - ip_offset
+        struct.pack_into('!HHH', frame, ip_offset + 2, header_length + len(data), ident,
+            (MORE_FRAGMENTS if more else 0) | offset // 8) # Don't fragment is cleared
+        struct.pack_into('!H', frame, ip_offset + 10, 0)
+        struct.pack_into('!H', frame, ip_offset + 10,
+            checksum(bytes(frame[ip_offset:ip_offset + header_length])))
+        return frame
+
+    def send(self, fragments: list) -> int:
+        """ Sends a fragment train back to back
+
+        Parameters:
+            fragments (list): Fragment frames, see train
+
+        Returns:
+            int: Bytes sent
+        """
+        length = 0
+        for fragment in fragments:
+            send_frame(self.socket, fragment)
+            length += len(fragment)
+        self.fragments += len(fragments)
+        return length
+
+    def poll(self, timeout: float=0.0) -> int:
+        """ Handles the frames received, waiting up to the timeout for more
+
+        Parameters:
+            timeout (float): Seconds to wait for frames
+
+        Returns:
+            int: Number of responses to the trains received
+        """
+        received, handled = sum(self.responses.values()), 0
+        deadline = time.monotonic() + timeout
+        while handled < FRAGMENT_POLL_FRAMES or time.monotonic() < deadline:
+            if not select.select([self.socket], [], [],
+                    max(0.0, deadline - time.monotonic()))[0]:
+                break
+            frame = self.socket.recv_raw()[1]
+            if frame is None:
+                break
+            handled += 1
+            self.receive(frame)
+        return sum(self.responses.values()) - received
+
+    def receive(self, frame: bytes) -> str:
+        """ Counts a received frame if it is the target's ICMP error about a train
+
+        Parameters:
+            frame (bytes): Received Ethernet frame
+
+        Returns:
+            str: Mode of the train, None if the frame is not a response to a train
+        """
+        ether_type, ip_offset, protocol, offset = frame_offsets(frame)
+        if ether_type != IPV4 or protocol != ICMP or len(frame) < offset + 28 or \
+                frame[ip_offset + 12:ip_offset + 16] != self.packed_ip:
+            return None
+        icmp_type, code = frame[offset], frame[offset + 1]
+        if icmp_type not in FRAGMENT_ICMP_ERRORS: # Errors quote the datagram's header
+            return None
+        mode = self.trains.get(struct.unpack_from('!H', frame, offset + 12)[0])
+        if mode is None:
+            return None
+        key = (mode, icmp_type, code)
+        self.responses[key] = self.responses.get(key, 0) + 1
+        if self.metrics is not None:
+            self.metrics.inc('pynetfuzz_fragment_responses_total', mode=mode,
+                icmp=f'{icmp_type}/{code}')
+        return mode
+
+    def close(self) -> None:
+        """ Closes the layer 2 socket"""
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        sent = ', '.join(f'{mode}: {count}' for mode, count in self.sent.items() if count)
+        responses = ', '.join(f'{mode} {icmp_type}/{code}: {count}'
+            for (mode, icmp_type, code), count in sorted(self.responses.items()))
+        return f'Fragmenter - Mode: ({self.mode}), Trains: ({sent}), ' \
+            f'Fragments: ({self.fragments}), Responses: ({responses})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.target.ip}, {self.mode}, {self.seed})'
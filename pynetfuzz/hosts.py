@@ -2,9 +2,11 @@
 Contains Host class - object to store and interface with local and remote hosts
 """
 # Python library imports
+import ipaddress
 from scapy.sendrecv import sr1
 from scapy.layers.l2 import getmacbyip
 from scapy.layers.inet import IP, ICMP
+from scapy.layers.inet6 import IPv6, ICMPv6EchoRequest, getmacbyip6
 import psutil
 # Package imports
 import pynetfuzz.exceptions as ex
@@ -74,7 +76,7 @@ class Host():
         return self.port is not None
 
     def ping_host(self) -> bool:
-        """ Pings host IP
+        """ Pings host IP, with an ICMPv6 echo request for IPv6 hosts
 
         Returns:
             bool: Returns true if ping is successful
@@ -83,7 +85,11 @@ class Host():
             raise ex.HostNoIpAddressError(
                 'Host has no IP address. You can not use ping_host without an IP address.')
 
-        return sr1(IP(dst=self.ip) / ICMP(), timeout=1, verbose=False) is not None
+        if ':' in self.ip:
+            request = IPv6(dst=self.ip) / ICMPv6EchoRequest()
+        else:
+            request = IP(dst=self.ip) / ICMP()
+        return sr1(request, timeout=1, verbose=False) is not None
 
     @staticmethod
     def get_local_ip(iface: str) -> str:
@@ -124,11 +130,14 @@ class Host():
         Returns:
             str: Uppercase string of the remote interface MAC address
         """
-        mac_addr = getmacbyip(ip).upper()
+        if ipaddress.ip_address(ip).version == 6:
+            mac_addr = getmacbyip6(ip)
+        else:
+            mac_addr = getmacbyip(ip)
         if mac_addr is None:
             raise ex.HostGetRemoteMacError(
                 'Can not get remote Mac address. Might be due to an incorrect IP address.')
-        return valid_mac(mac_addr)
+        return valid_mac(mac_addr.upper())
 
     def __str__(self) -> str:
         """Built-in str method"""
@@ -0,0 +1,251 @@
+"""
+Contains Journal class - fixed-width binary per-packet run journal
+"""
+# Python library imports
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterator
+from time import time_ns
+import ipaddress
+import struct
+import os
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import CAST_TYPES, JOURNAL_CHUNK_RECORDS, JOURNAL_MAGIC, JOURNAL_VERSION
+
+try:
+    import numpy as np
+except ImportError: # pragma: no cover
+    np = None
+
+# (name, struct format) of every record field, in file order
+JOURNAL_FIELDS = (
+    ('index', 'Q'), ('timestamp_ns', 'Q'), ('seed', 'Q'),
+    ('target_mac', 'Q'), ('source_mac', 'Q'),
+    ('target_ip_hi', 'Q'), ('target_ip_lo', 'Q'), ('source_ip_hi', 'Q'), ('source_ip_lo', 'Q'),
+    ('offset', 'I'), ('flow', 'I'), ('seq', 'I'), ('ack', 'I'),
+    ('int_protocol', 'H'), ('target_port', 'H'), ('source_port', 'H'),
+    ('length', 'H'), ('frag', 'H'), ('id', 'H'), ('window', 'H'), ('urgptr', 'H'),
+    ('trans_protocol', 'B'), ('cast', 'B'), ('flags', 'B'),
+    ('ttl', 'B'), ('tos', 'B'), ('ip_flags', 'B'), ('_pad', '2x'),
+)
+
+JournalRecord = namedtuple(
+    'JournalRecord', [name for name, _ in JOURNAL_FIELDS if not name.startswith('_')])
+
+
+class Journal():
+    """ Append-only, fixed-width binary journal of per-packet records.
+
+    The file is a 16 byte header followed by packed little-endian records, so it
+    can be memory-mapped as a NumPy structured array (see read_array). Records
+    are packed into a preallocated chunk and written to disk a chunk at a time.
+    IP addresses are stored as the high and low 64 bits of their 128 bit IPv6
+    form (IPv4 addresses have a high half of zero, see ip_address) and IPv6
+    traffic class and hop limit are stored in the tos and ttl fields. Cast
+    is stored as its index in CAST_TYPES.
+    """
+
+    HEADER = struct.Struct('<4sHH8x')
+    RECORD = struct.Struct('<' + ''.join(fmt for _, fmt in JOURNAL_FIELDS))
+    FLAG_VLAN = 0x01
+    FLAG_HEADERS = 0x02
+
+    def __init__(self, path: str, chunk_records: int=JOURNAL_CHUNK_RECORDS) -> None:
+        """ Journal class built-in initialiser
+
+        Parameters:
+            path (str): File path of the journal, records are appended
+            chunk_records (int): Number of records buffered before writing to disk
+        """
+        self.path = path
+        self.count = 0
+        if os.path.exists(path) and os.path.getsize(path):
+            self.check_header(path)
+            # A crash can leave a torn record at the end, drop it so appends stay aligned
+            size = os.path.getsize(path)
+            torn = (size - self.HEADER.size) % self.RECORD.size
+            if torn:
+                os.truncate(path, size - torn)
+            self._file = open(path, 'ab') # pylint: disable=consider-using-with
+        else:
+            self._file = open(path, 'wb') # pylint: disable=consider-using-with
+            self._file.write(self.HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.RECORD.size))
+        self._chunk = bytearray(self.RECORD.size * chunk_records)
+        self._offset = 0
+
+    def record(self, seed: int, index: int, offset: int, packet) -> None:
+        """ Appends a packet record to the journal, timestamped now
+
+        Parameters:
+            seed (int): Seed of the generator that created the packet
+            index (int): Index of the packet in the run
+            offset (int): Index of the packet within its generator
+            packet (Packet): Packet to record
+        """
+        details = packet.details
+        flags = (self.FLAG_VLAN if details.vlan else 0) | \
+            (self.FLAG_HEADERS if details.headers else 0)
+        ip_header = getattr(details, 'ip_header', None) if details.headers else None
+        tcp_header = getattr(details, 'tcp_header', None) if details.headers else None
+        ip_header = ip_header or {}
+        tcp_header = tcp_header or {}
+
+        self.RECORD.pack_into(self._chunk, self._offset,
+            index, time_ns(), seed,
+            self.mac_int(packet.target.mac), self.mac_int(packet.source.mac),
+            *self.ip_int(packet.target.ip), *self.ip_int(packet.source.ip),
+            offset, ip_header.get('fl', 0), tcp_header.get('seq', 0), tcp_header.get('ack', 0),
+            details.int_protocol, packet.target.port, packet.source.port,
+            details.length, ip_header.get('frag', 0), ip_header.get('id', 0),
+            tcp_header.get('window', 0), tcp_header.get('urgptr', 0),
+            details.trans_protocol, CAST_TYPES.index(details.cast), flags,
+            ip_header.get('ttl', ip_header.get('hlim', 0)),
+            ip_header.get('tos', ip_header.get('tc', 0)), ip_header.get('flags', 0))
+        self._offset += self.RECORD.size
+        self.count += 1
+        if self._offset == len(self._chunk):
+            self.flush()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def ip_int(ip: str) -> tuple:
+        """ Converts an IP address string to the (high, low) 64 bits of an integer"""
+        value = int(ipaddress.ip_address(ip))
+        return value >> 64, value & 0xFFFFFFFFFFFFFFFF
+
+    @staticmethod
+    def ip_address(high: int, low: int) -> str:
+        """ Converts the stored (high, low) halves of an address back to a string
+
+        Parameters:
+            high (int): High 64 bits, zero for IPv4 addresses
+            low (int): Low 64 bits
+
+        Returns:
+            str: IP address string
+        """
+        if not high and low <= 0xFFFFFFFF:
+            return str(ipaddress.IPv4Address(int(low)))
+        return str(ipaddress.IPv6Address((int(high) << 64) | int(low)))
+
+    @staticmethod
+    def mac_int(mac: str) -> int:
+        """ Converts a MAC address string in any supported format to an integer"""
+        return int(mac.replace(':', '').replace('-', '').replace('.', ''), 16)
+
+    def flush(self) -> None:
+        """ Writes buffered records to disk"""
+        if self._offset:
+            self._file.write(memoryview(self._chunk)[:self._offset])
+            self._offset = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """ Flushes buffered records and closes the journal"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    @classmethod
+    def check_header(cls, path: str) -> None:
+        """ Checks a journal file header is the current format
+
+        Parameters:
+            path (str): File path of the journal
+        """
+        with open(path, 'rb') as file:
+            header = file.read(cls.HEADER.size)
+        if len(header) < cls.HEADER.size:
+            raise ex.JournalFormatError(f'Journal header is truncated. ({path})')
+        magic, version, record_size = cls.HEADER.unpack(header)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or \
+                record_size != cls.RECORD.size:
+            raise ex.JournalFormatError(
+                f'Not a version {JOURNAL_VERSION} journal file. ({path}) '
+                f'Received: {magic} version {version}, record size {record_size}')
+
+    @classmethod
+    def read(cls, path: str) -> Iterator[JournalRecord]:
+        """ Reads records from a journal file without NumPy
+
+        Parameters:
+            path (str): File path of the journal
+
+        Returns:
+            Iterator: Yields JournalRecord named tuples
+        """
+        cls.check_header(path)
+        with open(path, 'rb') as file:
+            file.seek(cls.HEADER.size)
+            while True:
+                data = file.read(cls.RECORD.size * JOURNAL_CHUNK_RECORDS)
+                data = data[:len(data) - len(data) % cls.RECORD.size]
+                if not data:
+                    break
+                for record in cls.RECORD.iter_unpack(data):
+                    yield JournalRecord(*record)
+
+    @classmethod
+    def dtype(cls):
+        """ NumPy structured dtype matching the record layout
+
+        Returns:
+            numpy.dtype: Packed little-endian record dtype
+        """
+        if np is None:
+            raise ImportError('NumPy is required to read a journal as an array.')
+        codes = {'Q': '<u8', 'I': '<u4', 'H': '<u2', 'B': 'u1', '2x': 'V2'}
+        return np.dtype([(name, codes[fmt]) for name, fmt in JOURNAL_FIELDS])
+
+    @classmethod
+    def read_array(cls, path: str):
+        """ Memory-maps a journal file as a read-only NumPy structured array
+
+        Parameters:
+            path (str): File path of the journal
+
+        Returns:
+            numpy.memmap: Structured array with one element per record
+        """
+        cls.check_header(path)
+        dtype = cls.dtype()
+        count = (os.path.getsize(path) - cls.HEADER.size) // dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', offset=cls.HEADER.size, shape=(count,))
+
+    @staticmethod
+    def before(records, timestamp_ns: int, window_ns: int, **fields):
+        """ Selects records sent within a window before a point in time
+
+        Parameters:
+            records (numpy.ndarray): Journal structured array
+            timestamp_ns (int): End of the window (e.g. when the target went offline)
+            window_ns (int): Length of the window in nanoseconds
+            fields (int): Optional field values records must also match
+
+        Returns:
+            numpy.ndarray: Matching records
+        """
+        mask = (records['timestamp_ns'] >= timestamp_ns - window_ns) & \
+            (records['timestamp_ns'] <= timestamp_ns)
+        for name, value in fields.items():
+            mask &= records[name] == value
+        return records[mask]
+
+    def __enter__(self):
+        """Built-in context manager enter method"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Built-in context manager exit method"""
+        self.close()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Journal - Path: ({self.path}), Records: ({self.count})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.path}, {self.count})'
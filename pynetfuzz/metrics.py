@@ -0,0 +1,228 @@
+"""
+Contains Metrics class - run instrumentation exposed in Prometheus text format
+"""
+# Python library imports
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from bisect import bisect_left
+import threading
+# Package imports
+from .const import METRICS, METRICS_LATENCY_BUCKETS, PROTOCOL_NAMES
+
+
+class Metrics():
+    """ Instrumentation surface of counters, gauges and histograms.
+
+    Counters and histograms are kept in per-thread shards that only their own
+    thread writes to, so recording never takes a lock. Shards are summed when
+    the metrics are collected.
+    """
+
+    def __init__(self, buckets: tuple=METRICS_LATENCY_BUCKETS) -> None:
+        """ Metrics class built-in initialiser
+
+        Parameters:
+            buckets (tuple): Ascending histogram bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.gauges = {}
+        self.server = None
+        self._shards = []
+        self._local = threading.local()
+
+    def _shard(self) -> tuple:
+        """ Gets the calling thread's (counters, histograms) shard"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = ({}, {})
+            self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, value: int=1, **labels) -> None:
+        """ Increments a counter
+
+        Parameters:
+            name (str): Metric name
+            value (int): Amount to increment by
+            labels (str): Metric label values
+        """
+        counters = self._shard()[0]
+        key = (name, tuple(sorted(labels.items())))
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """ Records an observation in a histogram
+
+        Parameters:
+            name (str): Metric name
+            value (float): Observed value in seconds
+            labels (str): Metric label values
+        """
+        histograms = self._shard()[1]
+        key = (name, tuple(sorted(labels.items())))
+        histogram = histograms.get(key)
+        if histogram is None:
+            # Bucket counts (with +Inf last), then sum
+            histogram = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """ Sets a gauge to the current value
+
+        Parameters:
+            name (str): Metric name
+            value (float): Current value
+            labels (str): Metric label values
+        """
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def packet_sent(self, packet, length: int, seconds: float) -> None:
+        """ Records a sent packet's count, size and send latency
+
+        Parameters:
+            packet (Packet): Packet that was sent
+            length (int): Length of the frame sent in bytes, as returned by Packet.send
+            seconds (float): Time taken to send the packet
+        """
+        details = packet.details
+        self.frame_sent(details.int_protocol, details.trans_protocol, details.cast,
+            length, seconds)
+
+    def frame_sent(self, int_protocol: int, trans_protocol: int, cast: str, length: int,
+            seconds: float) -> None:
+        """ Records a sent frame's count, size and send latency
+
+        Parameters:
+            int_protocol (int): Internet protocol value of the frame
+            trans_protocol (int): Transport protocol value of the frame
+            cast (str): Cast type of the frame
+            length (int): Frame length in bytes
+            seconds (float): Time taken to send the frame
+        """
+        labels = {
+            'int_protocol': PROTOCOL_NAMES.get(int_protocol, int_protocol),
+            'trans_protocol': PROTOCOL_NAMES.get(trans_protocol, trans_protocol),
+            'cast': cast,
+        }
+        self.observe('pynetfuzz_send_seconds', seconds)
+        self.inc('pynetfuzz_packets_sent_total', **labels)
+        self.inc('pynetfuzz_bytes_sent_total', length, **labels)
+
+    def target_checked(self, was_online: bool, online: bool) -> None:
+        """ Records a target liveness check and any state transition
+
+        Parameters:
+            was_online (bool): Liveness state before the check
+            online (bool): Liveness state after the check
+        """
+        if online != was_online:
+            self.inc('pynetfuzz_liveness_transitions_total',
+                state='online' if online else 'offline')
+        self.set_gauge('pynetfuzz_target_online', int(online))
+
+    def collect(self) -> tuple:
+        """ Sums every thread's shard into a single view
+
+        Returns:
+            tuple: (counters, gauges, histograms) dicts keyed on (name, labels)
+        """
+        counters, histograms = {}, {}
+        for shard_counters, shard_histograms in list(self._shards):
+            for key, value in shard_counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, histogram in shard_histograms.copy().items():
+                histogram = list(histogram)
+                total = histograms.setdefault(key, [0] * len(histogram))
+                for index, value in enumerate(histogram):
+                    total[index] += value
+        return counters, self.gauges.copy(), histograms
+
+    def render(self) -> str:
+        """ Renders all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Prometheus formatted metrics
+        """
+        counters, gauges, histograms = self.collect()
+        lines, described = [], set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f'# HELP {name} {METRICS.get(name, name)}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(counters.items(), key=str):
+            describe(name, 'counter')
+            lines.append(f'{name}{self._labels(labels)} {value}')
+        for (name, labels), value in sorted(gauges.items(), key=str):
+            describe(name, 'gauge')
+            lines.append(f'{name}{self._labels(labels)} {value}')
+        for (name, labels), histogram in sorted(histograms.items(), key=str):
+            describe(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), histogram[:-1]):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{self._labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{self._labels(labels)} {histogram[-1]}')
+            lines.append(f'{name}_count{self._labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(labels: tuple) -> str:
+        """ Formats label pairs as a Prometheus label set"""
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+    def serve(self, port: int, host: str='127.0.0.1') -> ThreadingHTTPServer:
+        """ Serves the metrics on a /metrics HTTP endpoint from a daemon thread
+
+        Parameters:
+            port (int): Port to listen on (0 selects a free port)
+            host (str): Address to listen on
+
+        Returns:
+            ThreadingHTTPServer: Running HTTP server
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """ Request handler for the /metrics endpoint"""
+
+            def do_GET(self): # pylint: disable=invalid-name
+                """ Responds to GET requests"""
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                """ Silences per request logging"""
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server
+
+    def shutdown(self) -> None:
+        """ Stops the HTTP server if it is running"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        address = self.server.server_address if self.server is not None else None
+        return f'Metrics - Threads: ({len(self._shards)}), Serving: ({address})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.buckets})'
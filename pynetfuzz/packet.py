@@ -4,18 +4,87 @@ Contains packet related classes
 - PacketDetails (packet information storage class)
 """
 # Python library imports
+from functools import lru_cache
 from typing import Any
+import ipaddress
+import socket
+import struct
 from scapy.sendrecv import sendp
 from scapy.layers.l2 import Ether, Dot1Q
 from scapy.layers.inet import IP, UDP, TCP
-from scapy.utils import randstring
+from scapy.layers.inet6 import (
+    IPv6, IPv6ExtHdrHopByHop, IPv6ExtHdrRouting, IPv6ExtHdrFragment, IPv6ExtHdrDestOpt,
+    HBHOptUnknown,
+)
+from scapy.config import conf
 # Package imports
+import pynetfuzz.exceptions as ex
 from .hosts import Host
-from .const import TRANSPORT_PROTOCOLS_INFO
+from .payloads import render_payload
+from .checksum import (
+    frame_offsets, patch_field, patch_checksum, patch_payload, TRANSPORT_CHECKSUM_OFFSET
+)
+from .const import TRANSPORT_PROTOCOLS_INFO, INTERNET_PROTOCOLS_INFO, ETHER_TYPES
 from .validation import (
     valid_host, valid_packet_info, valid_complete_packet_details
 )
 
+# Scapy layer of each IPv6 extension header name
+IPV6_EXTENSION_LAYERS = {
+    'hop_by_hop': IPv6ExtHdrHopByHop,
+    'routing': IPv6ExtHdrRouting,
+    'fragment': IPv6ExtHdrFragment,
+    'destination': IPv6ExtHdrDestOpt,
+}
+
+
+@lru_cache(maxsize=4096)
+def ipv6_address(ip: str) -> str:
+    """ Gets the normalised form of an IPv6 address. IPv4 addresses are not mapped into
+    IPv6, IPv6 packets are only sent between IPv6 hosts.
+
+    Parameters:
+        ip (str): IPv6 address string
+
+    Returns:
+        str: Normalised IPv6 address string
+    """
+    address = ipaddress.ip_address(ip)
+    if address.version != 6:
+        raise ex.PacketAddressVersionError(
+            f'IPv6 packets require IPv6 addresses. Received: {ip}')
+    return str(address)
+
+
+@lru_cache(maxsize=4096)
+def mac_bytes(mac: str) -> bytes:
+    """ Converts a MAC address string in any supported format to its 6 bytes
+
+    Parameters:
+        mac (str): MAC address string
+
+    Returns:
+        bytes: MAC address bytes
+    """
+    if '.' in mac:
+        return bytes.fromhex(mac.replace('.', ''))
+    return bytes(int(octet, 16) for octet in mac.replace('-', ':').split(':'))
+
+
+def send_frame(l2_socket, frame) -> None:
+    """ Sends a serialised frame on an open layer 2 socket, without copying it when the
+    socket is backed by a raw socket
+
+    Parameters:
+        l2_socket (SuperSocket): Open Scapy layer 2 socket
+        frame (bytes): Serialised Ethernet frame, any buffer (e.g. memoryview)
+    """
+    outs = getattr(l2_socket, 'outs', None)
+    if isinstance(outs, socket.socket):
+        outs.send(frame)
+    else:
+        l2_socket.send(conf.raw_layer(load=bytes(frame)))
+
 
 class PacketDetails():
     """ Storage class for required packet information"""
@@ -42,7 +111,7 @@ class PacketDetails():
         if not isinstance(attribute, str):
             raise TypeError(
                 f'Attribute given is not a string. Received: {attribute} ({type(attribute)})')
-        value = getattr(self, attribute)
+        value = getattr(self, attribute, None)
         if value is not None:
             return value
         return default
@@ -80,48 +149,268 @@ class Packet():
             details (PacketDetails): Dictionary containing packet information
         """
         self.packet = None
+        self.layers = None
+        self.frame = None
+        self.corrupted = None
         self.target = valid_host(target)
         self.source = valid_host(source)
         self.details = valid_complete_packet_details(details)
 
     def add_ethernet_layer(self):
         """ Adds ethernet layer to packet attribute"""
-        self.packet = Ether(
-            src=self.source.mac, dst=self.target.mac, type=self.details.int_protocol)
-        if self.details.vlan:
-            self.packet /= Dot1Q(vlan=True)
+        ether_type = ETHER_TYPES[self.details.int_protocol]
+        if self.details.vlan: # Tag carries the ether type, Ether type is set to 0x8100
+            self.packet = Ether(src=self.source.mac, dst=self.target.mac) / \
+                Dot1Q(vlan=True, type=ether_type)
+        else:
+            self.packet = Ether(src=self.source.mac, dst=self.target.mac, type=ether_type)
 
     def add_ip_layer(self):
-        """ Adds internet protocol layer to packet attribute"""
-        self.packet /= IP(src=self.source.ip, dst=self.target.ip)
-        if self.details.headers:
-            for key, value in self.details.ip_header.items():
-                setattr(self.packet, key, value)
+        """ Adds internet protocol layer to packet attribute. IPv6 packets with random
+        headers carry their extension header chain, jumbo packets are IPv4."""
+        ip_header = self.details.ip_header if self.details.headers else {}
+        if self.is_ipv6():
+            self.packet /= IPv6(src=ipv6_address(self.source.ip),
+                dst=ipv6_address(self.target.ip), **ip_header)
+            chain = self.extensions()
+            fields = self.details.get('ip6_extension_fields') or ({},) * len(chain)
+            for name, values in zip(chain, fields):
+                self.packet /= self.extension_layer(name, values)
+        else:
+            self.packet /= IP(src=self.source.ip, dst=self.target.ip, **ip_header)
+
+    @staticmethod
+    def extension_layer(name: str, values: dict):
+        """ Creates an IPv6 extension header layer from its fuzzed fields
+
+        Parameters:
+            name (str): Extension header name
+            values (dict): Header fields, the options headers carry a single option
+                given by its otype and optdata (empty for default fields)
+
+        Returns:
+            Packet: Scapy extension header layer
+        """
+        layer = IPV6_EXTENSION_LAYERS[name]
+        if values and name in ('hop_by_hop', 'destination'):
+            return layer(options=[HBHOptUnknown(**values)])
+        return layer(**values)
 
     def add_transport_layer(self):
         """ Adds transport layer to packet attribute"""
         if self.is_udp():
             self.packet /= UDP(sport=self.source.port, dport=self.target.port)
         elif self.is_tcp():
-            self.packet /= TCP(sport=self.source.port, dport=self.target.port)
-            if self.details.headers:
-                for key, value in self.details.tcp_header.items():
-                    setattr(self.packet, key, value)
+            # Header fields are set on the TCP layer, IP has a flags field too
+            tcp_header = self.details.tcp_header if self.details.headers else {}
+            self.packet /= TCP(sport=self.source.port, dport=self.target.port, **tcp_header)
 
     def add_payload_layer(self):
-        """ Adds random payload to packet attribute"""
-        self.packet /= randstring(self.details.length)
+        """ Adds the payload, rendered by the details' payload strategy, to packet
+        attribute"""
+        self.packet /= bytes(render_payload(self.details.get('payload'), self.details.length))
 
     def add_all_layers(self):
         """ Adds all layers to packet attribute"""
+        self.frame = None
+        self.corrupted = None
         self.add_ethernet_layer()
         self.add_ip_layer()
         self.add_transport_layer()
         self.add_payload_layer()
+        self.add_bad_checksums()
+
+    def add_bad_checksums(self):
+        """ Builds the frame with deliberately wrong checksums if the details ask for them"""
+        masks = self.details.get('bad_checksum')
+        if masks:
+            if self.frame is None:
+                self.build_frame()
+            self.corrupt_checksums(*masks)
+            self.corrupted = masks
+
+    def update_layers(self) -> bool:
+        """ Updates the existing frame from the current target, source and details. The
+        frame is patched in place (see patch_frame) when it was built with the same
+        protocols, vlan tag and headers. The layers are rebuilt instead when there are
+        none yet, the structure differs from the last build or the packet has IPv6
+        extension headers, whose fuzzed contents change their length.
+
+        Returns:
+            bool: True if the existing frame was patched
+        """
+        structure = (self.details.int_protocol, self.details.trans_protocol,
+            self.details.vlan, bool(self.details.headers), self.extensions())
+        if self.frame is not None and self.layers == structure and not structure[-1]:
+            self.patch_frame()
+            return True
+        self.add_all_layers()
+        self.layers = structure
+        if self.frame is None:
+            self.build_frame()
+        return False
+
+    def patch_frame(self):
+        """ Rewrites the built frame for the current target, source and details without
+        serialising the layers. Addresses, ports, header fields, lengths and the payload
+        are written into the frame and the checksums updated incrementally (RFC 1624).
+        The frame must have been built with the same structure and no IPv6 extension
+        headers."""
+        if self.corrupted:
+            self.corrupt_checksums(*self.corrupted) # XOR masks undo themselves
+            self.corrupted = None
+        frame = self.frame
+        ip_offset, ip_checksum, transport_offset, transport_checksum = self.checksum_offsets()
+        checksums = (transport_checksum,)
+        optional = checksums if self.is_udp() else ()
+        payload_offset = transport_offset + (8 if self.is_udp() else \
+            (frame[transport_offset + 12] >> 4) * 4)
+        payload = render_payload(self.details.get('payload'), self.details.length)
+        old_length = len(frame) - transport_offset
+        new_length = payload_offset - transport_offset + len(payload)
+        headers = self.details.ip_header if self.details.headers else None
+
+        frame[0:12] = mac_bytes(self.target.mac) + mac_bytes(self.source.mac)
+        if self.is_ipv6():
+            if headers:
+                struct.pack_into('!I', frame, ip_offset,
+                    0x60000000 | headers['tc'] << 20 | headers['fl'])
+                frame[ip_offset + 7] = headers['hlim']
+            struct.pack_into('!H', frame, ip_offset + 4, new_length)
+        else:
+            version, tos, _, ident, fragment, ttl, protocol = \
+                struct.unpack_from('!BBHHHBB', frame, ip_offset)
+            if headers:
+                tos, ident, ttl = headers['tos'], headers['id'], headers['ttl']
+                fragment = headers['flags'] << 13 | headers['frag']
+            patch_field(frame, ip_offset, struct.pack('!BBHHHBB', version, tos,
+                transport_offset - ip_offset + new_length, ident, fragment, ttl, protocol),
+                (ip_checksum,))
+        self.patch_addresses(self.source.ip, self.target.ip)
+        # The transport length is part of the pseudo header
+        patch_checksum(frame, transport_checksum, old_length, new_length, bool(optional))
+        self.patch_ports(self.source.port, self.target.port)
+        if self.is_udp():
+            patch_field(frame, transport_offset + 4, struct.pack('!H', new_length), checksums,
+                optional)
+        elif self.details.headers:
+            tcp = self.details.tcp_header
+            patch_field(frame, transport_offset + 4, struct.pack('!II', tcp['seq'],
+                tcp['ack']), checksums)
+            patch_field(frame, transport_offset + 14, struct.pack('!H', tcp['window']),
+                checksums)
+            patch_field(frame, transport_offset + 18, struct.pack('!H', tcp['urgptr']),
+                checksums)
+            if 'flags' in tcp: # Set by stateful TCP, kept with the data offset
+                patch_field(frame, transport_offset + 12, struct.pack('!BB',
+                    frame[transport_offset + 12], tcp['flags']), checksums)
+        patch_payload(frame, payload_offset, payload, checksums, optional)
+        self.add_bad_checksums()
+
+    def extensions(self) -> tuple:
+        """ Gets the IPv6 extension header chain of the packet
+
+        Returns:
+            tuple: Extension header names, empty unless IPv6 with random headers
+        """
+        if not self.details.headers or not self.is_ipv6():
+            return ()
+        return tuple(self.details.get('ip6_extensions', ()))
 
-    def send(self, iface, verbose=False):
-        """ Sends packet attribute"""
-        sendp(self.packet, iface=iface, verbose=verbose)
+    def build_frame(self) -> bytearray:
+        """ Serialises the layers into a mutable frame that is sent instead of the layers.
+        Fields of the frame can then be patched without rebuilding the layers.
+
+        Returns:
+            bytearray: Built Ethernet frame
+        """
+        self.frame = bytearray(bytes(self.packet))
+        return self.frame
+
+    def checksum_offsets(self) -> tuple:
+        """ Locates the headers and checksums in the built frame
+
+        Returns:
+            tuple: (IP header offset, IP checksum offset or None, transport header offset,
+                transport checksum offset or None)
+        """
+        ether_type, ip_offset, protocol, transport_offset = frame_offsets(self.frame)
+        ip_checksum = ip_offset + 10 if ether_type != INTERNET_PROTOCOLS_INFO['ipv6']['value'] \
+            else None
+        transport_checksum = transport_offset + TRANSPORT_CHECKSUM_OFFSET[protocol] \
+            if protocol in TRANSPORT_CHECKSUM_OFFSET else None
+        return ip_offset, ip_checksum, transport_offset, transport_checksum
+
+    def patch_ports(self, sport: int, dport: int):
+        """ Rewrites the transport ports of the built frame, incrementally updating the
+        transport checksum (RFC 1624)
+
+        Parameters:
+            sport (int): New source port
+            dport (int): New destination port
+        """
+        _, _, transport_offset, transport_checksum = self.checksum_offsets()
+        checksums = (transport_checksum,) if transport_checksum is not None else ()
+        patch_field(self.frame, transport_offset, struct.pack('!HH', sport, dport), checksums,
+            checksums if self.is_udp() else ())
+
+    def patch_addresses(self, src: str, dst: str):
+        """ Rewrites the IP addresses of the built frame, incrementally updating the IPv4
+        header checksum and the transport checksum's pseudo header (RFC 1624)
+
+        Parameters:
+            src (str): New source IP address
+            dst (str): New destination IP address
+        """
+        ip_offset, ip_checksum, _, transport_checksum = self.checksum_offsets()
+        if ip_checksum is None: # IPv4 addresses can not be written into an IPv6 header
+            src, dst = ipv6_address(src), ipv6_address(dst)
+        addresses = ipaddress.ip_address(src).packed + ipaddress.ip_address(dst).packed
+        offset = ip_offset + (12 if ip_checksum is not None else 8)
+        patch_field(self.frame, offset, addresses,
+            tuple(value for value in (ip_checksum, transport_checksum) if value is not None),
+            (transport_checksum,) if self.is_udp() else ())
+
+    def corrupt_checksums(self, ip_mask: int, transport_mask: int):
+        """ Deliberately corrupts the checksums of the built frame
+
+        Parameters:
+            ip_mask (int): Non-zero value XORed into the IPv4 header checksum (0 to leave)
+            transport_mask (int): Non-zero value XORed into the transport checksum
+                (0 to leave)
+        """
+        _, ip_checksum, _, transport_checksum = self.checksum_offsets()
+        for offset, mask in ((ip_checksum, ip_mask), (transport_checksum, transport_mask)):
+            if offset is not None and mask:
+                value = struct.unpack_from('!H', self.frame, offset)[0]
+                struct.pack_into('!H', self.frame, offset, value ^ mask)
+
+    def raw(self) -> bytes:
+        """ Gets the bytes sent for the packet, the built frame if there is one
+
+        Returns:
+            bytes: Serialised Ethernet frame
+        """
+        return bytes(self.frame if self.frame is not None else self.packet)
+
+    def send(self, iface, verbose=False) -> int:
+        """ Sends packet attribute, or the built frame if there is one. The layers are
+        serialised once and the bytes sent as they are.
+
+        Returns:
+            int: Length of the sent frame in bytes
+        """
+        frame = self.raw()
+        sendp(conf.raw_layer(load=frame), iface=iface, verbose=verbose)
+        return len(frame)
+
+    def is_ipv6(self):
+        """ Checks if internet protocol is IPv6
+
+        Returns:
+            Bool: True if internet protocol is IPv6
+        """
+        return self.details.int_protocol == INTERNET_PROTOCOLS_INFO['ipv6']['value']
 
     def is_udp(self):
         """ Checks if transport protocol is UDP
@@ -2,17 +2,30 @@
 Contains Generator function - packet generator
 """
 #Python library imports
+from time import perf_counter_ns
 import logging
 # Package imports
 from .randomiser import Randomiser
 from .packet import Packet, PacketDetails
 from .hosts import Host
-from .const import PACKETS_PER_SEED
+from .sweep import Sweep
+from .metrics import Metrics
+from .profiling import Profiler
+from .pool import PacketPool
+from .casts import CastTable, CAST_TABLE
+from .scopes import compile_scope
+from .tcp_state import TcpState
+from .const import (
+    PACKETS_PER_SEED, DEFAULT_IPV4_SCOPE, DEFAULT_IPV6_SCOPE, TRANSPORT_PROTOCOLS_INFO,
+)
 from .validation import valid_packet_details
 
 
 def packet_generator(target: Host, details: PacketDetails,
-        source: Host=None, seed: int=None, max_packets: int=PACKETS_PER_SEED) -> Packet:
+        source: Host=None, seed: int=None, max_packets: int=PACKETS_PER_SEED,
+        sweep: Sweep=None, start: int=0, metrics: Metrics=None, state: tuple=None,
+        pool: PacketPool=None, casts: CastTable=CAST_TABLE, profiler: Profiler=None,
+        tcp_state: TcpState=None) -> Packet:
     """ Generator method to create randomised packets
 
     Parameters:
@@ -21,14 +34,37 @@ def packet_generator(target: Host, details: PacketDetails,
         source (Host): Optional Host object for packet generation
         seed (int): Value for Randomiser to create Suedo-random numbers
         max_packets (int): Value for max packets to be created from a single generator
+        sweep (Sweep): Optional Sweep object, packet details are taken from its strata
+            instead of being randomised
+        start (int): Sweep index of the first packet created by this generator
+        metrics (Metrics): Optional Metrics object to record generation and build latency
+        state (tuple): Optional random number generator state to continue from instead
+            of the start of the seed's sequence
+        pool (PacketPool): Optional PacketPool to take packets from instead of allocating
+            new ones. The consumer must release each packet back to the pool once sent.
+        casts (CastTable): Destination tables of broadcast and multicast packets, shared
+            between generators instead of being built for each one
+        profiler (Profiler): Optional Profiler to time the setup, generate and build stages
+            of sampled packets in
+        tcp_state (TcpState): Optional TcpState, TCP packets are then sent as segments of
+            its established connections
 
     Returns:
         Packet: Yields a created randomised packet
     """
+    if profiler is not None:
+        setup = perf_counter_ns()
     source =  source if source is not None else Host(None, None, None)
     details = valid_packet_details(details)
     randomiser = Randomiser(seed)
+    if state is not None:
+        randomiser.setstate(state)
     logging.info("Packet generator seed: %s", randomiser.seed)
+    # IPv6 packets are only sent to IPv6 targets, from IPv6 sources
+    if target.is_ip() and compile_scope(target.ip).version == 6:
+        protocols, scope = ('ipv6',), DEFAULT_IPV6_SCOPE
+    else:
+        protocols, scope = ('ipv4',), DEFAULT_IPV4_SCOPE
 
     random_target = Host(None, None, None)
     random_source = Host(None, None, None)
@@ -39,17 +75,48 @@ def packet_generator(target: Host, details: PacketDetails,
         'vlan': None,
         'headers': None})
 
+    tcp = TRANSPORT_PROTOCOLS_INFO['tcp']['value']
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if profiler is not None:
+        profiler.record('setup', setup)
     for _ in range(max_packets):
+        timed = profiler is not None and profiler.sample()
+        if metrics is not None or timed:
+            started = perf_counter_ns()
+        if pool is not None:
+            packet = pool.acquire()
+            random_target, random_source, random_details = \
+                packet.target, packet.source, packet.details
         # randomise hosts
-        random_target = randomiser.host(target, random_target)
-        random_source = randomiser.host(source, random_source)
+        random_target = randomiser.host(target, random_target, scope)
+        random_source = randomiser.host(source, random_source, scope)
         # randomise packet info
-        random_details = randomiser.packet_details(details, random_details)
+        if sweep is not None:
+            random_details = sweep.packet_details(start + _, randomiser, random_details)
+        else:
+            random_details = randomiser.packet_details(details, random_details, protocols)
+        # broadcast and multicast packets are sent to their cast's addresses
+        random_target = casts.destination(randomiser, random_details, random_target)
+        if tcp_state is not None and random_details.trans_protocol == tcp:
+            tcp_state.segment(randomiser, random_target, random_source, random_details)
+        if metrics is not None or timed:
+            generated = perf_counter_ns()
+        if timed:
+            profiler.record('generate', started)
 
         # create packet
-        packet = Packet(random_target, random_source, random_details)
-        packet.add_all_layers()
+        if pool is not None:
+            pool.build(packet)
+        else:
+            packet = Packet(random_target, random_source, random_details)
+            packet.add_all_layers()
+        if timed:
+            profiler.record('build', generated)
+        if metrics is not None:
+            metrics.observe('pynetfuzz_generate_seconds', (generated - started) / 1e9)
+            metrics.observe('pynetfuzz_build_seconds', (perf_counter_ns() - generated) / 1e9)
 
-        logging.debug("Generator Packet #%s: %s", _, packet)
+        if debug:
+            logging.debug("Generator Packet #%s: %s", _, packet)
 
         yield packet
@@ -0,0 +1,196 @@
+"""
+Contains payload strategies - protocol templates, patterns and dictionaries rendered into
+preallocated buffers
+"""
+# Python library imports
+import random
+import string
+import threading
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import (
+    PAYLOAD_TYPES, PAYLOAD_BUFFER_SIZE, PAYLOAD_PATTERNS, PAYLOAD_FORMAT_STRINGS,
+    PAYLOAD_OVERFLOW_TOKENS,
+)
+
+# Alphabets of the fuzzed fields of text protocols
+URL_ALPHABET = (string.ascii_letters + string.digits + "/-._~%?&=+;:@!$'()*,").encode()
+HOST_ALPHABET = (string.ascii_lowercase + string.digits + '.-').encode()
+DIGITS = string.digits.encode()
+
+
+def alphabet_table(alphabet: bytes) -> bytes:
+    """ Builds a bytes.translate table mapping every byte value into an alphabet
+
+    Parameters:
+        alphabet (bytes): Bytes a field may hold
+
+    Returns:
+        bytes: 256 byte translation table
+    """
+    return bytes(alphabet[value % len(alphabet)] for value in range(256))
+
+
+class PayloadStrategy():
+    """ Base payload strategy, renders a payload into the start of a buffer"""
+    name = None
+
+    def render(self, buffer: memoryview, length: int) -> None:
+        """ Writes a payload into buffer[:length]
+
+        Parameters:
+            buffer (memoryview): Writable buffer of at least length bytes
+            length (int): Payload length
+        """
+        raise NotImplementedError
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'{self.__class__.__name__} - Name: ({self.name})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.name})'
+
+
+class RandomPayload(PayloadStrategy):
+    """ Random bytes, drawn in a single call to the random number generator"""
+
+    def __init__(self, name: str='random') -> None:
+        """ RandomPayload class built-in initialiser
+
+        Parameters:
+            name (str): Name of the strategy
+        """
+        self.name = name
+
+    def render(self, buffer: memoryview, length: int) -> None:
+        """ Writes random bytes into buffer[:length], see PayloadStrategy.render"""
+        if length:
+            buffer[:length] = random.getrandbits(length * 8).to_bytes(length, 'big')
+
+
+class TemplatePayload(PayloadStrategy):
+    """ Protocol message skeleton with fuzzed fields.
+
+    The skeleton is copied into the buffer and its fields overwritten with
+    random bytes from one draw, mapped into each field's alphabet with a
+    translation table. Payloads shorter than the skeleton are truncated, and
+    longer ones padded with random bytes.
+    """
+
+    def __init__(self, name: str, skeleton: bytes, fields: tuple) -> None:
+        """ TemplatePayload class built-in initialiser
+
+        Parameters:
+            name (str): Name of the strategy
+            skeleton (bytes): Message with placeholder bytes in its fuzzed fields
+            fields (tuple): (offset, size, alphabet) of each fuzzed field, alphabet None
+                for any byte value
+        """
+        self.name = name
+        self.skeleton = bytes(skeleton)
+        self.fields = tuple((offset, size, alphabet_table(alphabet) if alphabet else None)
+            for offset, size, alphabet in fields)
+        for offset, size, _ in self.fields:
+            if offset < 0 or offset + size > len(self.skeleton):
+                raise ex.PayloadTemplateError(
+                    f'Field ({offset}, {size}) is outside the {name} template.')
+        self.field_bytes = sum(size for _, size, _ in self.fields)
+
+    def render(self, buffer: memoryview, length: int) -> None:
+        """ Writes the fuzzed message into buffer[:length], see PayloadStrategy.render"""
+        skeleton = len(self.skeleton)
+        buffer[:min(length, skeleton)] = self.skeleton[:length]
+        data = random.getrandbits((self.field_bytes + max(0, length - skeleton)) * 8) \
+            .to_bytes(self.field_bytes + max(0, length - skeleton), 'big')
+        position = 0
+        for offset, size, table in self.fields:
+            if offset >= length:
+                break
+            end = min(offset + size, length)
+            value = data[position:position + end - offset]
+            buffer[offset:end] = value.translate(table) if table is not None else value
+            position += size
+        if length > skeleton:
+            buffer[skeleton:length] = data[self.field_bytes:]
+
+
+class RepeatedPayload(PayloadStrategy):
+    """ One of a dictionary of tokens repeated to fill the payload. Each token is
+    repeated into a buffer once, so a payload is a single copy."""
+
+    def __init__(self, name: str, tokens: tuple, size: int=PAYLOAD_BUFFER_SIZE) -> None:
+        """ RepeatedPayload class built-in initialiser
+
+        Parameters:
+            name (str): Name of the strategy
+            tokens (tuple): Non-empty bytes tokens
+            size (int): Longest payload that is a copy, longer payloads are repeated
+        """
+        if not tokens or not all(tokens):
+            raise ex.PayloadTemplateError(f'The {name} tokens must not be empty.')
+        self.name = name
+        self.tokens = tuple(bytes(token) for token in tokens)
+        self.filled = tuple(token * (-(-size // len(token))) for token in self.tokens)
+
+    def render(self, buffer: memoryview, length: int) -> None:
+        """ Writes a repeated token into buffer[:length], see PayloadStrategy.render"""
+        index = random.randrange(len(self.tokens))
+        filled = self.filled[index]
+        if length > len(filled):
+            token = self.tokens[index]
+            filled = token * (-(-length // len(token)))
+        buffer[:length] = filled[:length]
+
+
+# DNS query for example.com, fuzzing the ID, flags, counts, type and class
+DNS_TEMPLATE = TemplatePayload('dns',
+    b'\x00\x00\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00'
+    b'\x07example\x03com\x00\x00\x01\x00\x01',
+    ((0, 2, None), (2, 2, None), (4, 8, None), (25, 4, None)))
+# HTTP request, fuzzing the path, host, user agent and content length
+HTTP_TEMPLATE = TemplatePayload('http',
+    b'GET /................ HTTP/1.1\r\nHost: ............\r\n'
+    b'User-Agent: ........\r\nContent-Length: ....\r\n\r\n',
+    ((5, 16, URL_ALPHABET), (38, 12, HOST_ALPHABET), (64, 8, URL_ALPHABET),
+        (90, 4, DIGITS)))
+# NTPv4 client request, fuzzing everything but the version and mode
+NTP_TEMPLATE = TemplatePayload('ntp',
+    b'\x23' + bytes(47),
+    ((1, 3, None), (4, 12, None), (40, 8, None)))
+
+# Payload strategies by name, mixed is drawn from these by the Randomiser
+PAYLOAD_STRATEGIES = {
+    'random': RandomPayload(),
+    'dns': DNS_TEMPLATE,
+    'http': HTTP_TEMPLATE,
+    'ntp': NTP_TEMPLATE,
+    'pattern': RepeatedPayload('pattern', PAYLOAD_PATTERNS),
+    'format': RepeatedPayload('format', PAYLOAD_FORMAT_STRINGS),
+    'overflow': RepeatedPayload('overflow', PAYLOAD_OVERFLOW_TOKENS),
+}
+PAYLOAD_STRATEGY_NAMES = tuple(PAYLOAD_STRATEGIES)
+
+BUFFERS = threading.local() # Each thread renders into its own buffer
+
+
+def render_payload(name: str, length: int) -> memoryview:
+    """ Renders a payload into the calling thread's preallocated buffer
+
+    Parameters:
+        name (str): Payload strategy name, None for random
+        length (int): Payload length
+
+    Returns:
+        memoryview: Rendered payload, only valid until the thread's next render
+    """
+    strategy = PAYLOAD_STRATEGIES.get(name or 'random')
+    if strategy is None:
+        raise ex.PayloadTypeError(
+            f'Not a payload strategy. Received: {name}, Required: {PAYLOAD_TYPES}')
+    buffer = getattr(BUFFERS, 'buffer', None)
+    if buffer is None or len(buffer) < length:
+        buffer = BUFFERS.buffer = memoryview(bytearray(max(length, PAYLOAD_BUFFER_SIZE)))
+    strategy.render(buffer, length)
+    return buffer[:length]
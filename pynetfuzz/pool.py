@@ -0,0 +1,114 @@
+"""
+Contains PacketPool class - fixed ring of reusable packet objects
+"""
+# Package imports
+import pynetfuzz.exceptions as ex
+from .hosts import Host
+from .packet import Packet, PacketDetails
+from .const import DEFAULT_POOL_SIZE
+from .validation import valid_number
+
+
+class PacketPool():
+    """ Pre-sized ring of reusable packets.
+
+    Every slot owns its Packet along with the target and source Host and the
+    PacketDetails it is built from, all allocated up front. A slot is handed
+    out by acquire and can not be handed out again until the sender releases
+    it, at which point its objects and Scapy layer tree are reused for a later
+    packet.
+    """
+
+    def __init__(self, size: int=DEFAULT_POOL_SIZE) -> None:
+        """ PacketPool class built-in initialiser
+
+        Parameters:
+            size (int): Number of packet slots in the ring
+        """
+        self.size = valid_number(size, minimum=1)
+        self.slots = [self._slot() for _ in range(self.size)]
+        self.in_use = [False] * self.size
+        self.index = {id(packet): slot for slot, packet in enumerate(self.slots)}
+        self.next = 0
+        self.acquired = 0
+        self.reused = 0
+
+    @staticmethod
+    def _slot() -> Packet:
+        """ Allocates an empty packet slot. Validation is skipped as the slot's hosts
+        and details are only populated later by the generator."""
+        packet = Packet.__new__(Packet)
+        packet.packet = None
+        packet.layers = None
+        packet.frame = None
+        packet.corrupted = None
+        packet.target = Host(None, None, None)
+        packet.source = Host(None, None, None)
+        packet.details = PacketDetails({
+            'trans_protocol': None,
+            'cast': None,
+            'int_protocol': None,
+            'vlan': None,
+            'headers': None})
+        return packet
+
+    def acquire(self) -> Packet:
+        """ Hands out the next slot in the ring
+
+        Returns:
+            Packet: Packet slot to populate and send
+        """
+        slot = self.next
+        if self.in_use[slot]:
+            raise ex.PoolExhaustedError(
+                f'Packet pool slot {slot} has not been released. '
+                f'All {self.size} slots are waiting on the sender.')
+        self.in_use[slot] = True
+        self.next = (slot + 1) % self.size
+        self.acquired += 1
+        return self.slots[slot]
+
+    def build(self, packet: Packet) -> Packet:
+        """ Builds an acquired slot's frame, patching its last frame where possible
+
+        Parameters:
+            packet (Packet): Acquired packet slot with populated hosts and details
+
+        Returns:
+            Packet: Built packet
+        """
+        if packet.update_layers():
+            self.reused += 1
+        return packet
+
+    def release(self, packet: Packet) -> None:
+        """ Returns a sent packet's slot to the ring
+
+        Parameters:
+            packet (Packet): Packet previously handed out by acquire
+        """
+        slot = self.index.get(id(packet))
+        if slot is None:
+            raise ex.InvalidPacketError('Packet was not acquired from this pool.')
+        self.in_use[slot] = False
+
+    def available(self) -> int:
+        """ Number of slots not waiting on the sender
+
+        Returns:
+            int: Number of free slots
+        """
+        return self.in_use.count(False)
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return self.size
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'PacketPool - Size: ({self.size}), Acquired: ({self.acquired}), ' \
+            f'Reused: ({self.reused})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.size})'
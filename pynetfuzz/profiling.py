@@ -0,0 +1,157 @@
+"""
+Contains Profiler class - sampled pipeline stage timing spans and whole run cProfile dumps
+"""
+# Python library imports
+from collections import defaultdict
+from time import perf_counter_ns
+import cProfile
+import pstats
+# Package imports
+from .const import PROFILE_SAMPLE_INTERVAL, PROFILE_STAGES, PROFILE_STACK_DEPTH
+from .validation import valid_number
+
+
+def collapse_stats(stats: pstats.Stats, max_depth: int=PROFILE_STACK_DEPTH) -> dict:
+    """ Converts cProfile statistics into collapsed stacks (flamegraph.pl / speedscope
+    format). cProfile only records caller to callee edges, so the time of a function
+    called from several stacks is split between them by the time each of its callers
+    spent in it.
+
+    Parameters:
+        stats (Stats): Loaded cProfile statistics
+        max_depth (int): Deepest stack to follow, deeper calls are folded into their parent
+
+    Returns:
+        dict: Microseconds of self time keyed on 'outer;...;inner' stack strings
+    """
+    entries = stats.stats
+    callees = defaultdict(list)
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge))
+
+    def name(function: tuple) -> str:
+        filename, line, label = function
+        if filename == '~':
+            return label
+        return f'{label} ({filename.rsplit("/", 1)[-1]}:{line})'
+
+    stacks = defaultdict(float)
+    pending = [((function,), entries[function][3], name(function))
+        for function, entry in entries.items() if not entry[4]]
+    while pending:
+        path, seconds, stack = pending.pop()
+        function = path[-1]
+        _, _, own, cumulative, _ = entries[function]
+        share = seconds / cumulative if cumulative > 0 else 0.0
+        stacks[stack] += own * share * 1e6
+        if len(path) >= max_depth:
+            stacks[stack] += (cumulative - own) * share * 1e6
+            continue
+        for callee, (_, _, _, edge_cumulative) in callees[function]:
+            if callee in path: # Recursion is folded into the outermost call
+                stacks[stack] += edge_cumulative * share * 1e6
+                continue
+            callee_seconds = edge_cumulative * share
+            if callee_seconds * 1e6 >= 1:
+                pending.append((path + (callee,), callee_seconds,
+                    stack + ';' + name(callee)))
+    return {stack: round(value) for stack, value in stacks.items() if round(value) > 0}
+
+
+class Profiler():
+    """ Per-stage timing spans of the packet pipeline, optionally with cProfile.
+
+    Only every `interval`-th packet is timed, the rest cost a counter
+    increment, so spans can stay on during full rate runs. The whole run can
+    also be profiled with cProfile and dumped as pstats and collapsed stacks.
+    """
+
+    def __init__(self, interval: int=PROFILE_SAMPLE_INTERVAL, output: str=None) -> None:
+        """ Profiler class built-in initialiser
+
+        Parameters:
+            interval (int): Time every interval-th packet's stages
+            output (str): Optional path prefix, the run is then profiled with cProfile and
+                <output>.pstats and <output>.collapsed written by dump
+        """
+        self.interval = valid_number(interval, minimum=1)
+        self.output = output
+        self.packets = 0
+        self.active = False
+        # Stage: [spans, total nanoseconds, longest nanoseconds]
+        self.stages = {stage: [0, 0, 0] for stage in PROFILE_STAGES}
+        self.profile = cProfile.Profile() if output is not None else None
+
+    def sample(self) -> bool:
+        """ Counts a packet and decides if its stages are timed
+
+        Returns:
+            bool: True if the packet's stages are timed
+        """
+        self.packets += 1
+        self.active = self.packets % self.interval == 0
+        return self.active
+
+    def record(self, stage: str, started: int) -> None:
+        """ Records a stage span ending now
+
+        Parameters:
+            stage (str): Pipeline stage name
+            started (int): perf_counter_ns value the span started at
+        """
+        elapsed = perf_counter_ns() - started
+        span = self.stages.get(stage)
+        if span is None:
+            span = self.stages[stage] = [0, 0, 0]
+        span[0] += 1
+        span[1] += elapsed
+        if elapsed > span[2]:
+            span[2] = elapsed
+
+    def start(self) -> None:
+        """ Starts cProfile if the run is profiled"""
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self) -> None:
+        """ Stops cProfile if the run is profiled"""
+        if self.profile is not None:
+            self.profile.disable()
+
+    def dump(self) -> tuple:
+        """ Writes the cProfile statistics as <output>.pstats and <output>.collapsed
+
+        Returns:
+            tuple: (pstats path, collapsed stacks path), None if the run is not profiled
+        """
+        if self.profile is None:
+            return None
+        paths = (f'{self.output}.pstats', f'{self.output}.collapsed')
+        self.profile.dump_stats(paths[0])
+        stacks = collapse_stats(pstats.Stats(paths[0]))
+        with open(paths[1], 'w', encoding='utf-8') as collapsed:
+            for stack, microseconds in sorted(stacks.items()):
+                collapsed.write(f'{stack} {microseconds}\n')
+        return paths
+
+    def report(self) -> list:
+        """ Summarises the timed stages
+
+        Returns:
+            list: (stage, spans, mean microseconds, longest microseconds, share of the timed
+                total) of each stage with spans
+        """
+        total = sum(span[1] for span in self.stages.values()) or 1
+        return [(stage, count, elapsed / count / 1e3, longest / 1e3, elapsed / total)
+            for stage, (count, elapsed, longest) in self.stages.items() if count]
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Profiler - Packets: ({self.packets}), Interval: ({self.interval}), ' + \
+            ', '.join(f'{stage}: ({mean:.1f}us, {share:.0%})'
+                for stage, _, mean, _, share in self.report())
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.interval}, {self.output})'
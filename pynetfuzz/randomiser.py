@@ -8,15 +8,80 @@ import random
 # Package imports
 from .hosts import Host
 from .packet import PacketDetails
+from .payloads import PAYLOAD_STRATEGY_NAMES
+from .scopes import compile_scope
 from .const import (
     TRANSPORT_PROTOCOLS_INFO, CAST_TYPES, INTERNET_PROTOCOLS,
-    TRANSPORT_PROTOCOLS, INTERNET_PROTOCOLS_INFO,
+    TRANSPORT_PROTOCOLS, INTERNET_PROTOCOLS_INFO, IPV6_EXTENSION_HEADERS,
+    IPV6_EXTENSION_LENGTH, IPV6_MAX_EXTENSIONS, IPV6_MAX_OPTION_UNITS,
+    IPV6_MAX_ROUTING_ADDRESSES, PROTOCOL_NAMES, DEFAULT_IPV4_SCOPE, DEFAULT_IPV6_SCOPE,
+    IPV4_HEADER_FIELDS, IPV6_HEADER_FIELDS, TCP_HEADER_FIELDS,
 )
 from .validation import (
     valid_scope_ip, valid_seed, valid_number,
 )
 
 
+class FieldLayout():
+    """ Bit layout of randomised header fields, drawn with a single random call.
+
+    Every field of every header is a slice of one getrandbits(total bits)
+    value, so a packet's headers cost one call into the generator and a
+    shift and mask per field, instead of a randint call per field.
+    """
+
+    def __init__(self, *headers: tuple) -> None:
+        """ FieldLayout class built-in initialiser
+
+        Parameters:
+            headers (tuple): Fields of each header as (name, bits) tuples, see
+                IPV4_HEADER_FIELDS
+        """
+        self.headers = headers
+        self.bits = sum(bits for fields in headers for _, bits in fields)
+        slices, shift = [], 0
+        for fields in headers:
+            header = []
+            for name, bits in fields:
+                header.append((name, shift, (1 << bits) - 1))
+                shift += bits
+            slices.append(tuple(header))
+        self.slices = tuple(slices)
+
+    def draw(self, *headers: dict) -> tuple:
+        """ Randomises the fields of each header
+
+        Parameters:
+            headers (dict): Header dicts to set the fields in, one for each header of
+                the layout
+
+        Returns:
+            tuple: The given header dicts
+        """
+        value = random.getrandbits(self.bits)
+        for header, fields in zip(headers, self.slices):
+            for name, shift, mask in fields:
+                header[name] = value >> shift & mask
+        return headers
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'FieldLayout - Headers: ({len(self.headers)}), Bits: ({self.bits})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} {self.headers}'
+
+
+# Header layouts by (IPv6, TCP)
+HEADER_LAYOUTS = {
+    (False, False): FieldLayout(IPV4_HEADER_FIELDS),
+    (False, True): FieldLayout(IPV4_HEADER_FIELDS, TCP_HEADER_FIELDS),
+    (True, False): FieldLayout(IPV6_HEADER_FIELDS),
+    (True, True): FieldLayout(IPV6_HEADER_FIELDS, TCP_HEADER_FIELDS),
+}
+
+
 class Randomiser():
     """ Random values generator class"""
 
@@ -34,13 +99,15 @@ class Randomiser():
         """ Generate a randomised IP address string
 
         Parameters:
-            ip_str (str): IP address string to randomise '*' characters
+            ip_str (str): Scope IP address string to randomise, either '*' characters,
+                a CIDR, a range or an IPv6 scope (compiled once then cached)
 
         Returns:
             str: Randomised IP address string
         """
-        ip_str = valid_scope_ip(ip_str)
-        return '.'.join([str(self.bit_8()) if byte == '*' else byte for byte in ip_str.split('.')])
+        if not isinstance(ip_str, str):
+            valid_scope_ip(ip_str)
+        return compile_scope(ip_str).draw()
 
     def mac(self) -> str:
         """ Generate a randomised MAC address string
@@ -48,7 +115,9 @@ class Randomiser():
         Returns:
             str: Randomised MAC address string
         """
-        return '00:' + ':'.join([hex(self.bit_8())[2:].upper() for octet in range(5)])
+        value = random.getrandbits(40) # All five octets in one draw
+        return '00:' + ':'.join([hex(value >> shift & 0xFF)[2:].upper()
+            for shift in (32, 24, 16, 8, 0)])
 
     def port(self) -> int:
         """ Generate a randomised Port number
@@ -58,36 +127,37 @@ class Randomiser():
         """
         return self.bit_16()
 
-    def host(self, host: Host, random_host: Host) -> Host:
+    def host(self, host: Host, random_host: Host, scope: str=DEFAULT_IPV4_SCOPE) -> Host:
         """ Generate a randomised host from a given Host object
 
         Parameters:
             host (Host): Host object containing host info
             random_host (Host): Host object to be randomised
+            scope (str): Scope IP address drawn from when the host has no IP address
 
         Returns:
             random_host: Randomised Host object
         """
-        random_host.ip = self.ipaddr(host.ip) if host.is_ip() else self.ipaddr()
-        if not host.is_mac():
-            random_host.mac = self.mac()
-        if not host.is_port():
-            random_host.port = self.port()
+        random_host.ip = self.ipaddr(host.ip) if host.is_ip() else self.ipaddr(scope)
+        random_host.mac = host.mac if host.is_mac() else self.mac()
+        random_host.port = host.port if host.is_port() else self.port()
 
         return random_host
 
-    def packet_details(self, details: PacketDetails,
-            random_details: PacketDetails) -> PacketDetails:
+    def packet_details(self, details: PacketDetails, random_details: PacketDetails,
+            protocols: tuple=INTERNET_PROTOCOLS) -> PacketDetails:
         """ Generate randomised packet details from a given PacketDetails object
 
         Parameters:
             details (PacketDetails): PacketDetails object containing given packet details
             random_details (PacketDetails): PacketDetails object to be randomised
+            protocols (tuple): Internet protocol names chosen from when the details
+                have no internet protocol
 
         Returns:
             random_details (PacketDetails): Randomised PacketDetails object
         """
-        int_str = self.choose(INTERNET_PROTOCOLS)
+        int_str = self.choose(protocols)
         trans_str = self.choose(TRANSPORT_PROTOCOLS)
 
         random_details.int_protocol = details.get(
@@ -105,45 +175,144 @@ class Randomiser():
         if min_length is None:
             min_length = 0
         max_length = details.get('max_length')
-        if max_length is None:
-            max_length = INTERNET_PROTOCOLS_INFO[int_str]['max_length'] - \
-                INTERNET_PROTOCOLS_INFO[int_str]['header_length'] - \
-                TRANSPORT_PROTOCOLS_INFO[trans_str]['header_length']
+        if max_length is None: # Limited by the protocols actually used
+            int_info = INTERNET_PROTOCOLS_INFO[PROTOCOL_NAMES[random_details.int_protocol]]
+            trans_info = TRANSPORT_PROTOCOLS_INFO[PROTOCOL_NAMES[random_details.trans_protocol]]
+            max_length = int_info['max_length'] - int_info['header_length'] - \
+                trans_info['header_length']
         random_details.set('length', self.rand(min_length, max_length))
 
         if random_details.get('headers', None):
-            # Randomise IP header
-            if random_details.get('int_protocol') == INTERNET_PROTOCOLS_INFO['ipv6']['value']:
-                random_details.set(
-                    'ip_header',
-                    { #ipv6
-                        'tc': self.bit_8(), # Traffic class
-                        'fl': self.bit_20(), # Flow Label
-                        'hlim': self.bit_8(), # Identification
-                    })
-            else:
-                random_details.set(
-                    'ip_header',
-                    { #ipv4 or jumbo
-                        'ttl': self.bit_8(), # TTL
-                        'tos': self.bit_8(), # DSCP
-                        'flags': self.bit_3(), # Flags
-                        'frag': self.bit_13(), # Fragmentation offset
-                        'id': self.bit_16(), # Identification
-                    })
-            # Random TCP header
-            if random_details.get('trans_protocol') == TRANSPORT_PROTOCOLS_INFO['tcp']['value']:
-                random_details.set(
-                    'tcp_header',
-                    {
-                    'seq': self.bit_32(), # sequence number
-                    'ack': self.bit_32(), # Acknowledgment number
-                    'window': self.bit_16(), # Window size
-                    'urgptr': self.bit_16(), # urgent pointer
-                    })
+            self.headers(random_details)
+
+        self.bad_checksum(details, random_details)
+        self.payload(details, random_details)
+
+        return random_details
+
+    def bad_checksum(self, details: PacketDetails,
+            random_details: PacketDetails) -> PacketDetails:
+        """ Generate randomised checksum corruption masks if the given details ask for them
+
+        Parameters:
+            details (PacketDetails): PacketDetails object containing given packet details
+            random_details (PacketDetails): PacketDetails object to be randomised
 
+        Returns:
+            random_details (PacketDetails): PacketDetails object with bad_checksum set
+        """
+        if details.get('bad_checksum'):
+            # Corrupt the IP checksum, the transport checksum or both
+            mask = self.rand(1, 0xFFFE)
+            random_details.set('bad_checksum', self.choose(((mask, 0), (0, mask), (mask, mask))))
+        else:
+            random_details.set('bad_checksum', None)
         return random_details
 
+    def payload(self, details: PacketDetails, random_details: PacketDetails) -> PacketDetails:
+        """ Generate the payload strategy for given packet details, mixed payloads draw
+        one of the strategies for each packet
+
+        Parameters:
+            details (PacketDetails): PacketDetails object containing given packet details
+            random_details (PacketDetails): PacketDetails object to be randomised
+
+        Returns:
+            random_details (PacketDetails): PacketDetails object with payload set
+        """
+        payload = details.get('payload')
+        if payload == 'mixed':
+            payload = self.choose(PAYLOAD_STRATEGY_NAMES)
+        random_details.set('payload', payload)
+        return random_details
+
+    def headers(self, random_details: PacketDetails) -> PacketDetails:
+        """ Generate randomised IP and TCP header fields for given packet details
+
+        Parameters:
+            random_details (PacketDetails): PacketDetails object with protocols set
+
+        Returns:
+            random_details (PacketDetails): PacketDetails object with randomised headers
+        """
+        # Header dicts are reused between packets when they hold the same fields
+        ip_header = getattr(random_details, 'ip_header', None)
+        ipv6 = random_details.get('int_protocol') == INTERNET_PROTOCOLS_INFO['ipv6']['value']
+        if ip_header is None or ('tc' if ipv6 else 'ttl') not in ip_header:
+            ip_header = {}
+        random_details.set('ip_header', ip_header)
+        # Random TCP header
+        if random_details.get('trans_protocol') == TRANSPORT_PROTOCOLS_INFO['tcp']['value']:
+            tcp_header = getattr(random_details, 'tcp_header', None)
+            if tcp_header is None:
+                tcp_header = {}
+            random_details.set('tcp_header', tcp_header)
+            HEADER_LAYOUTS[ipv6, True].draw(ip_header, tcp_header)
+        else:
+            HEADER_LAYOUTS[ipv6, False].draw(ip_header)
+        if ipv6:
+            self.extensions(random_details)
+
+        return random_details
+
+    def extensions(self, random_details: PacketDetails) -> PacketDetails:
+        """ Generate a randomised IPv6 extension header chain with fuzzed header fields
+        for given packet details. The payload length is trimmed so the extension
+        headers still fit the MTU.
+
+        Parameters:
+            random_details (PacketDetails): PacketDetails object with protocols set
+
+        Returns:
+            random_details (PacketDetails): PacketDetails object with an extension chain
+        """
+        names = tuple(IPV6_EXTENSION_HEADERS)
+        chain = tuple(self.choose(names) for _ in range(self.index(IPV6_MAX_EXTENSIONS + 1)))
+        fields, length = [], 0
+        for name in chain:
+            if name == 'fragment':
+                fields.append({'offset': self.bit_13(), 'res2': self.bit_2(),
+                    'm': self.rand(0, 1), 'id': self.bit_32()})
+                length += IPV6_EXTENSION_LENGTH
+            elif name == 'routing':
+                addresses = [self.ipaddr(DEFAULT_IPV6_SCOPE)
+                    for _ in range(self.rand(0, IPV6_MAX_ROUTING_ADDRESSES))]
+                fields.append({'type': self.bit_8(), 'segleft': self.bit_8(),
+                    'addresses': addresses})
+                length += IPV6_EXTENSION_LENGTH + 16 * len(addresses)
+            else: # A single option filling the options header (2 bytes + 2 byte option)
+                units = self.rand(1, IPV6_MAX_OPTION_UNITS)
+                fields.append({'otype': self.rand(1, 255),
+                    'optdata': self.data(units * IPV6_EXTENSION_LENGTH - 4)})
+                length += units * IPV6_EXTENSION_LENGTH
+        random_details.set('ip6_extensions', chain)
+        random_details.set('ip6_extension_fields', tuple(fields))
+
+        trans_info = TRANSPORT_PROTOCOLS_INFO[PROTOCOL_NAMES[random_details.trans_protocol]]
+        max_length = INTERNET_PROTOCOLS_INFO['ipv6']['max_length'] - \
+            INTERNET_PROTOCOLS_INFO['ipv6']['header_length'] - \
+            trans_info['header_length'] - length
+        random_details.set('length', max(0, min(random_details.get('length', 0), max_length)))
+        return random_details
+
+    @staticmethod
+    def getstate() -> tuple:
+        """ Gets the internal state of the random number generator
+
+        Returns:
+            tuple: Random number generator state
+        """
+        return random.getstate()
+
+    @staticmethod
+    def setstate(state: tuple) -> None:
+        """ Restores the internal state of the random number generator
+
+        Parameters:
+            state (tuple): Random number generator state from getstate
+        """
+        random.setstate(state)
+
     @staticmethod
     def boolean() -> bool:
         """ Generate a boolean value
@@ -202,14 +371,26 @@ class Randomiser():
 
         return random.randint(minimum, maximum)
 
+    @staticmethod
+    def data(length: int) -> bytes:
+        """ Generate randomised bytes
+
+        Parameters:
+            length (int): Number of bytes
+
+        Returns:
+            bytes: Randomised bytes
+        """
+        return random.getrandbits(length * 8).to_bytes(length, 'big') if length else b''
+
     @staticmethod
     def bit_32() -> int:
         """ Generate a randomised positive 32 bit value
 
         Returns:
-            int: Randomised value between 0 and 32 bit
+            int: Randomised value between 0 and 2^32 - 1
         """
-        return random.randint(0, 2147483647)
+        return random.getrandbits(32)
 
     @staticmethod
     def bit_20() -> int:
@@ -218,7 +399,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 20 bit
         """
-        return random.randint(0, 1048575)
+        return random.getrandbits(20)
 
     @staticmethod
     def bit_16() -> int:
@@ -227,7 +408,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 16 bit
         """
-        return random.randint(0, 65535)
+        return random.getrandbits(16)
 
     @staticmethod
     def bit_13() -> int:
@@ -236,7 +417,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 13 bit
         """
-        return random.randint(0, 8191)
+        return random.getrandbits(13)
 
     @staticmethod
     def bit_8() -> int:
@@ -245,7 +426,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 8 bit
         """
-        return random.randint(0, 255)
+        return random.getrandbits(8)
 
     @staticmethod
     def bit_3() -> int:
@@ -254,7 +435,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 3 bit
         """
-        return random.randint(0, 7)
+        return random.getrandbits(3)
 
     @staticmethod
     def bit_2() -> int:
@@ -263,7 +444,7 @@ class Randomiser():
         Returns:
             int: Randomised value between 0 and 2 bit
         """
-        return random.randint(0, 3)
+        return random.getrandbits(2)
 
     def __str__(self) -> str:
         """Built-in str method"""
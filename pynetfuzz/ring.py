@@ -0,0 +1,191 @@
+"""
+Contains FrameRing class - shared memory ring of serialised frames between processes
+"""
+# Python library imports
+from multiprocessing import shared_memory
+import struct
+import time
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import DEFAULT_RING_SLOTS, RING_SLOT_SIZE
+from .validation import valid_number
+
+
+class FrameRing():
+    """ Single producer, single consumer ring of fixed-size frame slots in shared memory.
+
+    A generator process writes serialised frames into slots and a sender
+    process reads them in place, so frames are never pickled between them.
+    The producer only writes the head index and the consumer only writes the
+    tail index, so neither side takes a lock. Indices are free running 64 bit
+    counters kept on separate cache lines, written with aligned 8 byte stores
+    after the slot they publish. A full ring is backpressure, the producer
+    waits for the consumer to release a slot.
+
+    Each slot holds a header (frame length, generator offset, seed, internet
+    protocol, transport protocol, cast index) followed by the frame.
+    """
+
+    HEAD = 0
+    STALLS = 8
+    TAIL = 64
+    HEADER_SIZE = 128
+    INDEX = struct.Struct('<Q')
+    SLOT_HEADER = struct.Struct('<IIQHBB4x')
+
+    def __init__(self, slots: int=DEFAULT_RING_SLOTS, slot_size: int=RING_SLOT_SIZE,
+            name: str=None) -> None:
+        """ FrameRing class built-in initialiser
+
+        Parameters:
+            slots (int): Number of frame slots in the ring
+            slot_size (int): Largest frame a slot can hold in bytes
+            name (str): Name of an existing ring's shared memory to attach to, a new
+                ring is created when not given
+        """
+        self.slots = valid_number(slots, minimum=1)
+        self.slot_size = valid_number(slot_size, minimum=1)
+        # Slots are padded to whole cache lines
+        self.stride = -(-(self.SLOT_HEADER.size + self.slot_size) // 64) * 64
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner,
+            size=self.HEADER_SIZE + self.stride * self.slots if self.owner else 0)
+        self.buffer = self.memory.buf
+        if self.owner:
+            self.buffer[:self.HEADER_SIZE] = bytes(self.HEADER_SIZE)
+        self.name = self.memory.name
+        self.high_water = 0
+
+    def _load(self, offset: int) -> int:
+        """ Reads a header index"""
+        return self.INDEX.unpack_from(self.buffer, offset)[0]
+
+    def _store(self, offset: int, value: int) -> None:
+        """ Writes a header index"""
+        self.INDEX.pack_into(self.buffer, offset, value)
+
+    def put(self, frame: bytes, seed: int=0, offset: int=0, int_protocol: int=0,
+            trans_protocol: int=0, cast: int=0) -> bool:
+        """ Writes a frame into the next free slot (producer only)
+
+        Parameters:
+            frame (bytes): Serialised frame
+            seed (int): Seed of the generator that created the frame
+            offset (int): Index of the frame within its generator
+            int_protocol (int): Internet protocol value of the frame
+            trans_protocol (int): Transport protocol value of the frame
+            cast (int): Index of the frame's cast type in CAST_TYPES
+
+        Returns:
+            bool: False if the ring is full
+        """
+        if len(frame) > self.slot_size:
+            raise ex.RingFrameTooLargeError(
+                f'Frame does not fit in a ring slot. Received: {len(frame)} bytes, '
+                f'slot size {self.slot_size} bytes')
+        head = self._load(self.HEAD)
+        if head - self._load(self.TAIL) >= self.slots:
+            return False
+        start = self.HEADER_SIZE + (head % self.slots) * self.stride
+        self.SLOT_HEADER.pack_into(self.buffer, start, len(frame), offset, seed,
+            int_protocol, trans_protocol, cast)
+        start += self.SLOT_HEADER.size
+        self.buffer[start:start + len(frame)] = frame
+        self._store(self.HEAD, head + 1) # Publish only once the slot is written
+        return True
+
+    def put_wait(self, frame: bytes, *args, stop=None, timeout: float=None) -> bool:
+        """ Writes a frame, waiting while the ring is full (producer only)
+
+        Parameters:
+            frame (bytes): Serialised frame
+            args (int): Slot header values, as for put
+            stop (Event): Optional event that abandons the wait when set
+            timeout (float): Optional seconds to wait before giving up
+
+        Returns:
+            bool: False if the frame was not written
+        """
+        if self.put(frame, *args):
+            return True
+        self._store(self.STALLS, self._load(self.STALLS) + 1)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        delay = 0.0
+        while not self.put(frame, *args):
+            if (stop is not None and stop.is_set()) or \
+                    (deadline is not None and time.monotonic() > deadline):
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2 or 0.00001, 0.001)
+        return True
+
+    def peek(self):
+        """ Reads the oldest unreleased frame in place (consumer only). The frame view
+        is only valid until release is called.
+
+        Returns:
+            tuple: (seed, offset, int_protocol, trans_protocol, cast, frame memoryview),
+                None if the ring is empty
+        """
+        tail = self._load(self.TAIL)
+        used = self._load(self.HEAD) - tail
+        if not used:
+            return None
+        self.high_water = max(self.high_water, used)
+        start = self.HEADER_SIZE + (tail % self.slots) * self.stride
+        length, offset, seed, int_protocol, trans_protocol, cast = \
+            self.SLOT_HEADER.unpack_from(self.buffer, start)
+        start += self.SLOT_HEADER.size
+        return seed, offset, int_protocol, trans_protocol, cast, \
+            self.buffer[start:start + length]
+
+    def release(self) -> None:
+        """ Frees the oldest slot for the producer (consumer only)"""
+        self._store(self.TAIL, self._load(self.TAIL) + 1)
+
+    def used(self) -> int:
+        """ Number of slots written and not yet released
+
+        Returns:
+            int: Used slots
+        """
+        return self._load(self.HEAD) - self._load(self.TAIL)
+
+    def utilisation(self) -> float:
+        """ Fraction of slots in use
+
+        Returns:
+            float: Used slots over total slots (0 to 1)
+        """
+        return self.used() / self.slots
+
+    def stalls(self) -> int:
+        """ Number of writes that had to wait for a free slot
+
+        Returns:
+            int: Backpressure stalls
+        """
+        return self._load(self.STALLS)
+
+    def close(self) -> None:
+        """ Detaches from the ring, the creating side also frees the shared memory"""
+        if self.buffer is None:
+            return
+        self.buffer.release()
+        self.buffer = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return self.slots
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'FrameRing - Name: ({self.name}), Slots: ({self.slots}), ' \
+            f'High water: ({self.high_water}), Stalls: ({self.stalls()})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.name}, {self.slots}, {self.slot_size})'
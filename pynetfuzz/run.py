@@ -2,17 +2,44 @@
 Contains main run method and logging setup
 """
 # Python library imports
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Callable
+from time import perf_counter_ns
 import logging
 import time
+import os
+from scapy.config import conf
 # Package imports
 from .arguments import Args
 from .hosts import Host
 from .packet_generator import packet_generator
-from .packet import PacketDetails
-from .const import LOGGING_FORMAT, LOGGING_LEVEL
+from .packet import PacketDetails, send_frame
+from .sweep import Sweep
+from .metrics import Metrics
+from .journal import Journal
+from .checkpoint import Checkpoint
+from .campaign import Campaign, PhasePlan
+from .profiling import Profiler
+from .pool import PacketPool
+from .tcp_state import TcpState
+from .fragments import Fragmenter
+from .tracing import Tracer
+from .txmon import TxMonitor
+from .seeds import SeedSchedule
+from .corpus import Corpus
+from .cycle import CycleLength
+from .randomiser import Randomiser
+from .workers import WorkerGroup
+from .affinity import CpuPlacement, pin
+from .const import (
+    LOGGING_FORMAT, LOGGING_LEVEL, PACKETS_PER_SEED,
+    CHECKPOINT_INTERVAL, DEFAULT_RING_SLOTS, CAST_TYPES,
+    PROFILE_SAMPLE_INTERVAL,
+)
 
 
-def run(args: Args) -> None:
+def run(args: Args, plan: PhasePlan=None, monitor: Callable=None) -> None:
     """ Main run method, setups up logging, generates and sends packets.
     Can be imported and run from a script or run via commandline (PyNetFuzz.py)
 
@@ -20,54 +47,478 @@ def run(args: Args) -> None:
         args (Args): An object containing all required arguments to run.
             Contains: target_ip, source_ip, network_interface, n_packets,
                 target_mac, source_mac, target_port, source_port, int_protocol,
-                trans_protocol, cast, headers, vlan, min_length , max_length, seed
+                trans_protocol, cast, headers, vlan, min_length , max_length, seed,
+                sweep, buckets, shard, metrics_port, journal, checkpoint,
+                checkpoint_interval, resume, pool, bad_checksum, workers, ring_slots,
+                affinity, cpus, profile, profile_output, profile_interval, tcp_state,
+                corpus, cycle_length, cycle_interval, payload, fragments, trace,
+                trace_every, trace_interval, trace_filter, tx_monitor, seed_priority,
+                seed_skip
+        plan (PhasePlan): Optional prebuilt plan of the args, see Session.plan
+        monitor (Callable): Optional callable given (packets sent, target online) after
+            each liveness check, the run stops when it returns False
     """
-    configure_logging()
+    execute([plan if plan is not None else PhasePlan('run', args)], args, monitor)
+
+
+def run_campaign(campaign: Campaign) -> None:
+    """ Campaign run method, runs every phase of a compiled campaign in order in this
+    process. Logging, metrics, the journal and profiling are set up once for the whole
+    campaign.
+
+    Parameters:
+        campaign (Campaign): Compiled campaign, see Campaign.from_file
+    """
+    execute(campaign.phases, campaign.options)
+
+
+def execute(phases: list, options: Args, monitor: Callable=None) -> None:
+    """ Sets up logging and the run's metrics, journal, profiler and tracer, then sends
+    the packets of each phase in order
+
+    Parameters:
+        phases (list): PhasePlan of each phase
+        options (Args): Arguments holding the metrics_port, journal, profile and trace
+            options
+        monitor (Callable): Optional run monitor, see run
+    """
+    listener = configure_logging()
     logging.info("starting PyNetFuzzing...")
-    target, source = Host(args.target_ip, args.target_mac, args.target_port), \
-        Host(args.source_ip, args.source_mac, args.source_port)
-    packet_details = PacketDetails({
-        'int_protocol': args.int_protocol,
-        'trans_protocol': args.trans_protocol,
-        'cast': args.cast,
-        'headers': args.headers,
-        'vlan': args.vlan,
-        'min_length': args.min_length,
-        'max_length': args.max_length,
-    })
+    metrics, journal, profiler, tracer = None, None, None, None
+    try:
+        if options.metrics_port is not None:
+            metrics = Metrics()
+            metrics.serve(options.metrics_port)
+            logging.info("%s", metrics)
+        journal = Journal(options.journal) if options.journal is not None else None
+        if options.profile or options.profile_output is not None:
+            profiler = Profiler(options.profile_interval or PROFILE_SAMPLE_INTERVAL,
+                options.profile_output)
+            profiler.start()
+        if options.trace is not None:
+            tracer = Tracer(options.trace, options.trace_every, options.trace_interval,
+                options.trace_filter)
+        for plan in phases:
+            if len(phases) > 1:
+                logging.info("Starting campaign %s", plan)
+            send_packets(plan, listener, metrics, journal, profiler, monitor, tracer)
+    finally:
+        # Buffered journal records and queued log records survive errors and Ctrl-C
+        if profiler is not None:
+            profiler.stop()
+            report_profile(profiler)
+        if journal is not None:
+            journal.close()
+        if tracer is not None:
+            tracer.close()
+            logging.info("%s", tracer)
+        if metrics is not None:
+            metrics.shutdown()
+        listener.stop()
+
+
+def send_packets(plan: PhasePlan, listener: QueueListener, metrics: Metrics=None,
+        journal: Journal=None, profiler: Profiler=None, monitor: Callable=None,
+        tracer: Tracer=None) -> None:
+    """ Generates and sends the packets of a run or campaign phase, then logs and prints
+    the results
+
+    Parameters:
+        plan (PhasePlan): Compiled run or phase, its args are as for run
+        listener (QueueListener): Started logging listener
+        metrics (Metrics): Optional Metrics object to record the run in
+        journal (Journal): Optional Journal to record every sent packet in
+        profiler (Profiler): Optional Profiler to time the pipeline stages in
+        monitor (Callable): Optional run monitor, see run
+        tracer (Tracer): Optional Tracer to write sampled frames to
+    """
+    args, target, source = plan.args, plan.target, plan.source
+    packet_details, sweep = plan.details, plan.sweep
     logging.info("Target(%s)", target)
     logging.info("Source(%s)", source)
     logging.info("PacketDetails(%s)", packet_details)
+    if sweep is not None:
+        logging.info("%s", sweep)
 
-    packet_count, gen_count, start_time = 0, 0, time.time()
-    while packet_count < args.n_packets:
+    placement = None
+    if args.affinity or args.cpus is not None:
+        placement = CpuPlacement(args.workers or 0,
+            args.network_interface if args.affinity else None, args.cpus)
+        pin(placement.sender)
+        logging.info("%s", placement)
 
-        if not target.is_online():
-            logging.error("Target is offline (%s)", target.ip)
+    # Workers take packets from their own pools
+    pool = PacketPool(args.pool) if args.pool is not None and args.workers is None else None
 
-        logging.info("Starting packet generator (Pkt=%s, Gen=%s)", packet_count, gen_count)
-        for packet in packet_generator(target, packet_details, source, args.seed):
-            packet.send(args.network_interface)
-            packet_count += 1
+    if args.resume is not None:
+        checkpoint = Checkpoint.load(args.resume)
+        logging.info("Resuming from %s", checkpoint)
+    else:
+        checkpoint = Checkpoint(args.seed)
+    checkpoint_path = args.checkpoint if args.checkpoint is not None else args.resume
+    resuming = checkpoint.state is not None
+    checkpoint_interval = args.checkpoint_interval or CHECKPOINT_INTERVAL
+    # Every cycle takes a new seed of the schedule, a resumed run keeps its master seed
+    seeds = SeedSchedule(checkpoint.master if checkpoint.master is not None else
+        args.seed if args.seed is not None else int(time.time()),
+        args.seed_priority, args.seed_skip)
+    checkpoint.master = seeds.master
+    logging.info("%s", seeds)
+
+    packet_count, gen_count = checkpoint.packet_count, checkpoint.gen_count
+    start_time = time.time() - checkpoint.elapsed
+    # Stateful TCP reads the target's replies and reconnects after every cycle
+    cycle = CycleLength(args.cycle_length if args.tcp_state is None else PACKETS_PER_SEED,
+        args.cycle_interval)
+    if resuming:
+        cycle.length = checkpoint.cycle
+    tcp_state = None
+    if args.tcp_state is not None:
+        tcp_state = TcpState(target, source, args.tcp_state)
+        tcp_state.start(args.network_interface)
+        logging.info("Established %s TCP connections", tcp_state.handshake())
+    fragmenter = None
+    if args.fragments is not None:
+        fragmenter = Fragmenter(target, args.fragments,
+            args.seed if args.seed is not None else int(time.time()), metrics)
+        fragmenter.start(args.network_interface)
+    tx_monitor = None
+    if args.tx_monitor is not None:
+        tx_monitor = TxMonitor(args.network_interface, args.tx_monitor, metrics)
+    try:
+        if args.corpus is not None:
+            packet_count, gen_count = send_from_corpus(args, target, metrics, profiler,
+                monitor, cycle, tracer, tx_monitor)
+        elif args.workers is not None:
+            packet_count, gen_count = send_from_workers(args, target, source, packet_details,
+                sweep, metrics, placement.worker_cpus if placement is not None else None,
+                profiler, monitor, cycle, tracer, tx_monitor, seeds)
+        else:
+            # Each cycle ends with a liveness check, the first starts after one
+            check_target(target, metrics, checkpoint, profiler)
+            if tx_monitor is not None:
+                if fragmenter is not None:
+                    tx_monitor.attach(fragmenter.socket)
+                tx_monitor.start()
+            while packet_count < args.n_packets:
+
+                if metrics is not None:
+                    metrics.set_gauge('pynetfuzz_queue_depth', listener.queue.qsize(),
+                        queue='logging')
+                if tcp_state is not None: # Replies since the last cycle, then reconnect
+                    tcp_state.poll()
+                    tcp_state.handshake(0.0)
+                if fragmenter is not None: # Responses to the trains of the last cycle
+                    fragmenter.poll()
+
+                if resuming: # Continue the generator the checkpoint was taken in
+                    seed, first, state = checkpoint.seed, checkpoint.offset, checkpoint.state
+                    resuming = False
+                else:
+                    seed, first, state = seeds.seed(gen_count), 0, None
+                cycle_start, cycle_started = packet_count, time.time()
+                logging.info("Starting packet generator (Pkt=%s, Gen=%s, Cycle=%s, Seed=%s)",
+                    packet_count, gen_count, cycle.length, seed)
+                for offset, packet in enumerate(packet_generator(target, packet_details, source,
+                        seed, max_packets=cycle.length - first, sweep=sweep,
+                        start=packet_count, metrics=metrics, state=state, pool=pool,
+                        profiler=profiler, tcp_state=tcp_state), first):
+                    timed = profiler is not None and profiler.active
+                    if metrics is not None or timed:
+                        started = perf_counter_ns()
+                    train = fragmenter.train(packet.raw(), packet_count) \
+                        if fragmenter is not None else None
+                    if train is not None: # The datagram is sent as a train of fragments
+                        length = fragmenter.send(train)
+                    else:
+                        length = packet.send(args.network_interface)
+                    if timed:
+                        profiler.record('send', started)
+                    if metrics is not None:
+                        metrics.packet_sent(packet, length, (perf_counter_ns() - started) / 1e9)
+                    if tracer is not None and tracer.sample(packet.details.int_protocol,
+                            packet.details.trans_protocol, packet.details.cast, length):
+                        tracer.write(packet_count, packet.details.int_protocol,
+                            packet.details.trans_protocol, packet.details.cast, packet.raw())
+                    if journal is not None:
+                        if timed:
+                            recorded = perf_counter_ns()
+                        journal.record(seed, packet_count, offset, packet)
+                        if timed:
+                            profiler.record('journal', recorded)
+                    if pool is not None:
+                        pool.release(packet)
+                    packet_count += 1
+                    if tx_monitor is not None:
+                        tx_monitor.pace(len(train) if train is not None else 1)
 
-            if packet_count >= args.n_packets:
-                break
+                    if checkpoint_path is not None and packet_count % checkpoint_interval == 0:
+                        checkpoint.update(seed, offset + 1, Randomiser.getstate(), packet_count,
+                            gen_count, time.time() - start_time, cycle.length)
+                        if journal is not None: # The journal holds every packet counted
+                            journal.flush()
+                        checkpoint.save(checkpoint_path)
 
-        gen_count += 1
-        logging.info("Terminated packet generator (Pkt=%s, Gen=%s)", packet_count, gen_count)
+                    if packet_count >= args.n_packets:
+                        break
 
-        if not target.is_online():
-            logging.error("Target is offline (%s)", target.ip)
+                gen_count += 1
+                logging.info("Terminated packet generator (Pkt=%s, Gen=%s)",
+                    packet_count, gen_count)
+
+                online = check_target(target, metrics, checkpoint, profiler)
+                cycle.update(packet_count - cycle_start, time.time() - cycle_started, online)
+                if monitor is not None and not monitor(packet_count, online):
+                    logging.info("Run stopped by its monitor (Pkt=%s)", packet_count)
+                    break
+    finally:
+        if tcp_state is not None:
+            logging.info("%s", tcp_state)
+            tcp_state.close()
+        if fragmenter is not None:
+            fragmenter.poll()
+            logging.info("%s", fragmenter)
+            fragmenter.close()
 
     # Output results
     time_diff = time.time() - start_time
     message = f"[Completed] Sent: {packet_count}, Time: {time_diff}s"
+    if sweep is not None:
+        message += f", Strata: {sweep.coverage(packet_count)}/{len(sweep)}"
+    if pool is not None:
+        logging.info("%s", pool)
+    logging.info("%s", cycle)
+    if tx_monitor is not None:
+        logging.info("%s", tx_monitor)
+    if placement is not None:
+        logging.info("Core %s (sender): %.1f pkt/s", placement.sender,
+            packet_count / time_diff if time_diff > 0 else 0.0)
     logging.info(message)
     print(message)
 
-def configure_logging():
-    """ Configure logging to default file"""
-    logging.basicConfig(filename=f'logs/{int(time.time())}.log',
-        format=LOGGING_FORMAT, level=logging.INFO)
-    logger=logging.getLogger()
+    if checkpoint_path is not None:
+        checkpoint.update(None, 0, None, packet_count, gen_count, time_diff, cycle.length)
+        if journal is not None:
+            journal.flush()
+        checkpoint.save(checkpoint_path)
+
+
+def send_from_workers(args: Args, target: Host, source: Host, details: PacketDetails,
+        sweep: Sweep=None, metrics: Metrics=None, cpus: list=None,
+        profiler: Profiler=None, monitor: Callable=None, cycle: CycleLength=None,
+        tracer: Tracer=None, tx_monitor: TxMonitor=None, seeds: SeedSchedule=None) -> tuple:
+    """ Generates packets in worker processes and sends their frames straight from the
+    workers' shared memory rings
+
+    Parameters:
+        args (Args): Run arguments
+        target (Host): Target Host object
+        source (Host): Source Host object
+        details (PacketDetails): Packet details for packet generation
+        sweep (Sweep): Optional Sweep split between the workers
+        metrics (Metrics): Optional Metrics object to record sends and ring usage in
+        cpus (list): Optional CPU to pin each worker to
+        profiler (Profiler): Optional Profiler to time the sender's stages in, the workers'
+            stages are not timed
+        monitor (Callable): Optional run monitor, see run
+        cycle (CycleLength): Optional adaptive number of packets between liveness checks
+            (default: PACKETS_PER_SEED)
+        tracer (Tracer): Optional Tracer to write sampled frames to
+        tx_monitor (TxMonitor): Optional TxMonitor to compare sends with the interface's
+            counters and pace the sender with
+        seeds (SeedSchedule): Optional seed schedule of the workers' cycles (default: from
+            args.seed, args.seed_priority and args.seed_skip)
+
+    Returns:
+        tuple: (packets sent, generators completed)
+    """
+    cycle = cycle if cycle is not None else CycleLength(PACKETS_PER_SEED)
+    if seeds is None:
+        seeds = SeedSchedule(args.seed if args.seed is not None else int(time.time()),
+            args.seed_priority, args.seed_skip)
+    workers = WorkerGroup(args.workers, args.ring_slots or DEFAULT_RING_SLOTS)
+    logging.info("Starting %s generator workers (Master seed=%s)", args.workers, seeds.master)
+    l2_socket = conf.L2socket(iface=args.network_interface)
+    packet_count, started_workers = 0, time.time()
+    checked, checked_at = 0, started_workers
+    frames = workers.frames()
+    try:
+        workers.start(target, details, source, seeds, args.n_packets, sweep, args.pool, cpus)
+        check_target(target, metrics, profiler=profiler)
+        if tx_monitor is not None:
+            tx_monitor.attach(l2_socket)
+            tx_monitor.start()
+        for _, _, _, int_protocol, trans_protocol, cast, frame in frames:
+            timed = profiler is not None and profiler.sample()
+            if metrics is not None or timed:
+                started = perf_counter_ns()
+            send_frame(l2_socket, frame)
+            if timed:
+                profiler.record('send', started)
+            if metrics is not None:
+                metrics.frame_sent(int_protocol, trans_protocol, CAST_TYPES[cast], len(frame),
+                    (perf_counter_ns() - started) / 1e9)
+            if tracer is not None:
+                tracer.trace(packet_count, int_protocol, trans_protocol, CAST_TYPES[cast], frame)
+            packet_count += 1
+            if tx_monitor is not None:
+                tx_monitor.pace()
+            if packet_count - checked >= cycle.length:
+                online = check_target(target, metrics, profiler=profiler)
+                now = time.time()
+                cycle.update(packet_count - checked, now - checked_at, online)
+                checked, checked_at = packet_count, now
+                if metrics is not None:
+                    workers.update_metrics(metrics)
+                if monitor is not None and not monitor(packet_count, online):
+                    logging.info("Run stopped by its monitor (Pkt=%s)", packet_count)
+                    break
+    finally:
+        logging.info("%s", workers)
+        for (worker, cpu), rate in workers.throughput(time.time() - started_workers).items():
+            logging.info("Core %s (worker %s): %.1f pkt/s", cpu, worker, rate)
+            if metrics is not None:
+                metrics.set_gauge('pynetfuzz_core_packets_per_second', rate,
+                    cpu=str(cpu), role=f'worker{worker}')
+        l2_socket.close()
+        frames.close() # Releases the frame view still exported from a ring
+        workers.close()
+    online = check_target(target, metrics)
+    if monitor is not None:
+        monitor(packet_count, online)
+    return packet_count, -(-packet_count // PACKETS_PER_SEED)
+
+
+def send_from_corpus(args: Args, target: Host, metrics: Metrics=None,
+        profiler: Profiler=None, monitor: Callable=None, cycle: CycleLength=None,
+        tracer: Tracer=None, tx_monitor: TxMonitor=None) -> tuple:
+    """ Sends the frames of a pregenerated corpus straight from its memory map, starting
+    over at its end until n_packets are sent
+
+    Parameters:
+        args (Args): Run arguments, args.corpus is the corpus file path
+        target (Host): Target Host object
+        metrics (Metrics): Optional Metrics object to record sends in
+        profiler (Profiler): Optional Profiler to time the send stage in
+        monitor (Callable): Optional run monitor, see run
+        cycle (CycleLength): Optional adaptive number of packets between liveness checks
+            (default: PACKETS_PER_SEED)
+        tracer (Tracer): Optional Tracer to write sampled frames to
+        tx_monitor (TxMonitor): Optional TxMonitor to compare sends with the interface's
+            counters and pace the sender with
+
+    Returns:
+        tuple: (packets sent, corpus generators replayed)
+    """
+    cycle = cycle if cycle is not None else CycleLength(PACKETS_PER_SEED)
+    corpus = Corpus(args.corpus)
+    logging.info("Replaying %s", corpus)
+    l2_socket = conf.L2socket(iface=args.network_interface)
+    packet_count, checked, checked_at = 0, 0, time.time()
+    frames = corpus.frames(args.n_packets)
+    try:
+        check_target(target, metrics, profiler=profiler)
+        if tx_monitor is not None:
+            tx_monitor.attach(l2_socket)
+            tx_monitor.start()
+        for int_protocol, trans_protocol, cast, frame in frames:
+            timed = profiler is not None and profiler.sample()
+            if metrics is not None or timed:
+                started = perf_counter_ns()
+            send_frame(l2_socket, frame)
+            if timed:
+                profiler.record('send', started)
+            if metrics is not None:
+                metrics.frame_sent(int_protocol, trans_protocol, CAST_TYPES[cast], len(frame),
+                    (perf_counter_ns() - started) / 1e9)
+            if tracer is not None:
+                tracer.trace(packet_count, int_protocol, trans_protocol, CAST_TYPES[cast], frame)
+            packet_count += 1
+            if tx_monitor is not None:
+                tx_monitor.pace()
+            if packet_count - checked >= cycle.length:
+                online = check_target(target, metrics, profiler=profiler)
+                now = time.time()
+                cycle.update(packet_count - checked, now - checked_at, online)
+                checked, checked_at = packet_count, now
+                if monitor is not None and not monitor(packet_count, online):
+                    logging.info("Run stopped by its monitor (Pkt=%s)", packet_count)
+                    break
+    finally:
+        l2_socket.close()
+        frames.close() # Releases the frame view still exported from the map
+        corpus.close()
+    if packet_count > checked:
+        online = check_target(target, metrics)
+        if monitor is not None:
+            monitor(packet_count, online)
+    return packet_count, -(-packet_count // PACKETS_PER_SEED)
+
+
+def check_target(target: Host, metrics: Metrics=None, checkpoint: Checkpoint=None,
+        profiler: Profiler=None) -> bool:
+    """ Checks if the target is online, logging and recording liveness
+
+    Parameters:
+        target (Host): Target host to check
+        metrics (Metrics): Optional Metrics object to record liveness in
+        checkpoint (Checkpoint): Optional Checkpoint to record liveness changes in
+        profiler (Profiler): Optional Profiler to time the check in
+
+    Returns:
+        bool: Returns true if target is online
+    """
+    if profiler is not None:
+        started = perf_counter_ns()
+    was_online = target.online
+    online = target.is_online()
+    if profiler is not None:
+        profiler.record('liveness', started)
+    if not online:
+        logging.error("Target is offline (%s)", target.ip)
+    if metrics is not None:
+        metrics.target_checked(was_online, online)
+    if checkpoint is not None:
+        checkpoint.record_liveness(time.time(), online)
+    return online
+
+
+def report_profile(profiler: Profiler) -> None:
+    """ Logs and prints the timed pipeline stages and writes any cProfile dumps
+
+    Parameters:
+        profiler (Profiler): Stopped Profiler of the run
+    """
+    lines = [f"[Profile] Sampled 1 in {profiler.interval} of {profiler.packets} packets"]
+    for stage, spans, mean, longest, share in profiler.report():
+        lines.append(f"  {stage:<10} spans: {spans:>8}, mean: {mean:>10.1f}us, "
+            f"max: {longest:>10.1f}us, share: {share:>6.1%}")
+    paths = profiler.dump()
+    if paths is not None:
+        lines.append(f"  cProfile: {paths[0]}, collapsed stacks: {paths[1]}")
+    for line in lines:
+        logging.info(line)
+        print(line)
+
+
+def configure_logging() -> QueueListener:
+    """ Configure asynchronous logging to default file. Records are put on a queue
+    by the caller and written to file by a background listener thread.
+
+    Returns:
+        QueueListener: Started listener, stop it to flush remaining records
+    """
+    os.makedirs('logs', exist_ok=True)
+    file_handler = logging.FileHandler(f'logs/{int(time.time())}.log')
+    file_handler.setFormatter(logging.Formatter(LOGGING_FORMAT))
+    log_queue = SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
     logger.setLevel(LOGGING_LEVEL.upper())
+    return listener
@@ -0,0 +1,140 @@
+"""
+Contains IpScope class - IP address scopes compiled to integer ranges
+"""
+# Python library imports
+from functools import lru_cache
+import ipaddress
+import random
+# Package imports
+from .validation import valid_scope_ip
+
+
+class IpScope():
+    """ IP address scope compiled once into integers.
+
+    Wildcard and CIDR scopes compile to a base address and a mask of the
+    randomised bits, so an address is drawn with a single getrandbits call as
+    base | (bits & mask). Wildcards may sit in any octet so the mask need not be
+    contiguous. Range scopes compile to a base address and a span, drawn as
+    base + randrange(span).
+    """
+
+    def __init__(self, scope: str) -> None:
+        """ IpScope class built-in initialiser
+
+        Parameters:
+            scope (str): Wildcard, CIDR, range or IPv6 scope IP address string
+        """
+        self.scope = valid_scope_ip(scope)
+        self.span = 0
+        if '-' in self.scope:
+            first, last = (ipaddress.ip_address(part) for part in self.scope.split('-'))
+            self.version, self.base, self.mask = first.version, int(first), 0
+            self.span = int(last) - int(first) + 1
+        elif '/' in self.scope:
+            network = ipaddress.ip_network(self.scope)
+            self.version, self.base = network.version, int(network.network_address)
+            self.mask = int(network.hostmask)
+        elif ':' in self.scope:
+            address = ipaddress.ip_address(self.scope)
+            self.version, self.base, self.mask = address.version, int(address), 0
+        else:
+            self.version, self.base, self.mask = 4, 0, 0
+            for octet in self.scope.split('.'):
+                self.base, self.mask = self.base << 8, self.mask << 8
+                if octet == '*':
+                    self.mask |= 0xFF
+                else:
+                    self.base |= int(octet)
+        self.bits = 32 if self.version == 4 else 128
+        self.width = self.mask.bit_length() # Random bits needed per draw
+        # Fixed addresses are formatted once and never draw from the generator
+        self.fixed = self.string(self.base) if not self.mask and self.span <= 1 else None
+
+    def draw_int(self) -> int:
+        """ Draws a random address in the scope
+
+        Returns:
+            int: Randomised IP address integer
+        """
+        if self.span:
+            return self.base + random.randrange(self.span)
+        return self.base | (random.getrandbits(self.width) & self.mask)
+
+    def draw(self) -> str:
+        """ Draws a random address in the scope
+
+        Returns:
+            str: Randomised IP address string
+        """
+        if self.fixed is not None:
+            return self.fixed
+        return self.string(self.draw_int())
+
+    def batch(self, count: int) -> list:
+        """ Draws many random addresses in the scope. Masked scopes take every
+        address from the bits of a single getrandbits call.
+
+        Parameters:
+            count (int): Number of addresses to draw
+
+        Returns:
+            list: Randomised IP address integers
+        """
+        if self.span:
+            return [self.base + random.randrange(self.span) for _ in range(count)]
+        if count <= 0:
+            return []
+        bits = random.getrandbits(self.width * count)
+        return [self.base | ((bits >> (self.width * index)) & self.mask)
+            for index in range(count)]
+
+    def string(self, value: int) -> str:
+        """ Formats an address integer of the scope's version
+
+        Parameters:
+            value (int): IP address integer
+
+        Returns:
+            str: IP address string
+        """
+        if self.version == 4:
+            return f'{value >> 24}.{(value >> 16) & 0xFF}.{(value >> 8) & 0xFF}.{value & 0xFF}'
+        return str(ipaddress.IPv6Address(value))
+
+    def __contains__(self, address: str) -> bool:
+        """Built-in contains method"""
+        value = int(ipaddress.ip_address(address))
+        if self.span:
+            return self.base <= value < self.base + self.span
+        return value & ~self.mask == self.base
+
+    def size(self) -> int:
+        """ Number of addresses in the scope
+
+        Returns:
+            int: Number of addresses
+        """
+        return self.span or 1 << bin(self.mask).count('1')
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'IpScope - Scope: ({self.scope}), Version: ({self.version}), ' \
+            f'Addresses: ({self.size()})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.scope})'
+
+
+@lru_cache(maxsize=256)
+def compile_scope(scope: str) -> IpScope:
+    """ Compiles a scope IP address string, each distinct scope is compiled once
+
+    Parameters:
+        scope (str): Wildcard, CIDR, range or IPv6 scope IP address string
+
+    Returns:
+        IpScope: Compiled scope
+    """
+    return IpScope(scope)
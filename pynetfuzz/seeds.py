@@ -0,0 +1,102 @@
+"""
+Contains SeedSchedule class - reproducible per-cycle seeds derived from a master seed
+"""
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import SEED_GAMMA, SEED_MIX
+from .validation import valid_seed
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def splitmix64(master: int, index: int) -> int:
+    """ SplitMix64 output of a master seed, the index-th value of its sequence. Every
+    output is found directly from its index, without generating the ones before it.
+
+    Parameters:
+        master (int): Master seed
+        index (int): Position in the sequence
+
+    Returns:
+        int: 64 bit output
+    """
+    value = (master + (index + 1) * SEED_GAMMA) & MASK_64
+    value = ((value ^ (value >> 30)) * SEED_MIX[0]) & MASK_64
+    value = ((value ^ (value >> 27)) * SEED_MIX[1]) & MASK_64
+    return value ^ (value >> 31)
+
+
+class SeedSchedule():
+    """ Seeds of a run's generator cycles, drawn from a master seed.
+
+    Reusing one seed for every cycle repeats the same packets, so cycle n
+    takes the n-th seed of the schedule instead: the priority seeds first,
+    in the given order, then the master seed's SplitMix64 sequence (shifted
+    to 63 bits, the largest seed allowed), passing over skipped seeds and
+    seeds already run as priorities. The same master seed always gives the
+    same schedule, so any cycle of a run can be generated again from the
+    master seed and its number.
+    """
+
+    def __init__(self, master: int, priority: tuple=None, skip: tuple=None) -> None:
+        """ SeedSchedule class built-in initialiser
+
+        Parameters:
+            master (int): Master seed of the run
+            priority (tuple): Optional seeds run before the derived ones, in order
+            skip (tuple): Optional seeds never run, e.g. already explored by other runs
+        """
+        self.master = valid_seed(master)
+        if self.master is None:
+            raise ex.SeedInvalidTypeError('A seed schedule needs a master seed.')
+        self.skip = frozenset(valid_seed(seed) for seed in skip or ())
+        self.priority = tuple(seed for seed in dict.fromkeys(valid_seed(seed)
+            for seed in priority or ()) if seed not in self.skip)
+        self.excluded = self.skip | frozenset(self.priority)
+        self.cursor = (0, 0) # Position and sequence index of the last derived seed found
+
+    def derived(self, index: int) -> int:
+        """ Gets a seed of the master seed's sequence, whether skipped or not
+
+        Parameters:
+            index (int): Position in the sequence
+
+        Returns:
+            int: 63 bit seed
+        """
+        return splitmix64(self.master, index) >> 1
+
+    def seed(self, cycle: int) -> int:
+        """ Gets the seed of a generator cycle. Consecutive cycles are found in constant
+        time, any other cycle by walking the sequence from the start.
+
+        Parameters:
+            cycle (int): Number of the cycle in the run, from 0
+
+        Returns:
+            int: Seed of the cycle
+        """
+        if cycle < len(self.priority):
+            return self.priority[cycle]
+        target = cycle - len(self.priority)
+        position, index = self.cursor if self.cursor[0] <= target else (0, 0)
+        if not self.excluded: # Nothing to pass over, the position is the index
+            return self.derived(target)
+        while True:
+            seed = self.derived(index)
+            if seed not in self.excluded:
+                if position == target:
+                    self.cursor = (position, index)
+                    return seed
+                position += 1
+            index += 1
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'SeedSchedule - Master: ({self.master}), Priority: ({len(self.priority)}), ' \
+            f'Skip: ({len(self.skip)})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.master}, {self.priority}, ' \
+            f'{tuple(sorted(self.skip))})'
@@ -0,0 +1,179 @@
+"""
+Contains Session class - cached, immutable Host and PacketDetails objects for library use
+"""
+# Python library imports
+from functools import lru_cache
+import re
+# Package imports
+import pynetfuzz.exceptions as ex
+from .arguments import Args
+from .campaign import PhasePlan
+from .hosts import Host
+from .packet import PacketDetails
+from .run import run
+from .const import SESSION_CACHE_SIZE
+from .validation import valid_number
+
+
+class FrozenHost(Host):
+    """ Pre-validated Host that can not be changed once built, only its online
+    state is updated by liveness checks.
+    """
+    __slots__ = ('frozen',)
+
+    def __init__(self, ip: str, mac: str, port: str, interface: str=None) -> None:
+        """ FrozenHost class built-in initialiser, as for Host"""
+        super().__init__(ip, mac, port, interface)
+        self.frozen = True
+
+    def __setattr__(self, name: str, value) -> None:
+        """Built-in setattr method"""
+        if getattr(self, 'frozen', False) and name != 'online':
+            raise ex.FrozenObjectError(
+                f'Session hosts can not be changed. ({name}={value})')
+        super().__setattr__(name, value)
+
+
+class FrozenPacketDetails(PacketDetails):
+    """ Pre-validated PacketDetails that can not be changed once built"""
+    __slots__ = ('frozen',)
+
+    def __init__(self, info: dict) -> None:
+        """ FrozenPacketDetails class built-in initialiser, as for PacketDetails"""
+        super().__init__(info)
+        self.frozen = True
+
+    def __setattr__(self, name: str, value) -> None:
+        """Built-in setattr method"""
+        if getattr(self, 'frozen', False):
+            raise ex.FrozenObjectError(
+                f'Session packet details can not be changed. ({name}={value})')
+        super().__setattr__(name, value)
+
+
+def normalise_host(ip: str, mac: str, port: str, interface: str=None) -> tuple:
+    """ Normalises host inputs, so equivalent inputs share a cache entry. Invalid
+    inputs are passed through unchanged to be rejected by Host.
+
+    Parameters:
+        ip (str): IP address string
+        mac (str): MAC address string, or 'self' to look it up
+        port (str): Port value
+        interface (str): Optional local interface name
+
+    Returns:
+        tuple: (ip, mac, port, interface)
+    """
+    if isinstance(ip, str):
+        ip = ip.strip().upper()
+    if isinstance(mac, str):
+        mac = mac.strip()
+        digits = re.sub('[:.-]', '', mac)
+        if mac.lower() == 'self':
+            mac = 'self'
+        elif len(digits) == 12 and re.fullmatch('[0-9A-Fa-f]+', digits):
+            mac = ':'.join(digits[index:index + 2] for index in range(0, 12, 2)).upper()
+    if isinstance(port, str) and port.strip().isdigit():
+        port = int(port)
+    return ip, mac, port, interface
+
+
+class Session():
+    """ Keeps validated hosts and packet details hot between runs.
+
+    Hosts and packet details are built once per normalised input and kept in
+    LRU caches, so repeated runs against the same targets skip validation
+    and remote MAC lookups (mac='self'). The cached objects are frozen as
+    they are shared by every run of the session.
+    """
+
+    def __init__(self, maxsize: int=SESSION_CACHE_SIZE) -> None:
+        """ Session class built-in initialiser
+
+        Parameters:
+            maxsize (int): Most hosts and most packet details kept in the caches
+        """
+        self.maxsize = valid_number(maxsize, minimum=1)
+        self.cached_host = lru_cache(maxsize=self.maxsize)(FrozenHost)
+        self.cached_details = lru_cache(maxsize=self.maxsize)(self.build_details)
+
+    def host(self, ip: str, mac: str, port: str, interface: str=None) -> FrozenHost:
+        """ Gets the cached host of the inputs, building it on first use
+
+        Parameters:
+            ip (str): IP address string
+            mac (str): MAC address string, or 'self' to look it up
+            port (str): Port value
+            interface (str): Optional local interface name
+
+        Returns:
+            FrozenHost: Validated host
+        """
+        return self.cached_host(*normalise_host(ip, mac, port, interface))
+
+    def details(self, info: dict) -> FrozenPacketDetails:
+        """ Gets the cached packet details of the info, building them on first use
+
+        Parameters:
+            info (dict): dict containing packet required info, with hashable values
+
+        Returns:
+            FrozenPacketDetails: Validated packet details
+        """
+        if not isinstance(info, dict):
+            raise ex.PacketInfoTypeError(
+                f'Not a valid packet info data type. Received: {info} ({type(info)})')
+        return self.cached_details(tuple(sorted(info.items())))
+
+    @staticmethod
+    def build_details(items: tuple) -> FrozenPacketDetails:
+        """ Builds packet details from sorted info items
+
+        Parameters:
+            items (tuple): Sorted (key, value) pairs of the packet info
+
+        Returns:
+            FrozenPacketDetails: Validated packet details
+        """
+        return FrozenPacketDetails(dict(items))
+
+    def plan(self, args: Args, name: str='run') -> PhasePlan:
+        """ Compiles arguments into a run plan from the cached hosts and details
+
+        Parameters:
+            args (Args|dict): Arguments as for run
+            name (str): Name of the plan
+
+        Returns:
+            PhasePlan: Compiled run plan
+        """
+        if isinstance(args, dict):
+            args = Args(args)
+        return PhasePlan(name, args,
+            target=self.host(args.target_ip, args.target_mac, args.target_port),
+            source=self.host(args.source_ip, args.source_mac, args.source_port),
+            factory=self.details)
+
+    def run(self, args: Args) -> None:
+        """ Runs with the session's cached hosts and details
+
+        Parameters:
+            args (Args|dict): Arguments as for run
+        """
+        plan = self.plan(args)
+        run(plan.args, plan)
+
+    def clear(self) -> None:
+        """ Empties the caches, hosts are then looked up again"""
+        self.cached_host.cache_clear()
+        self.cached_details.cache_clear()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        hosts, details = self.cached_host.cache_info(), self.cached_details.cache_info()
+        return f'Session - Hosts: ({hosts.currsize}, hits={hosts.hits}), ' \
+            f'Details: ({details.currsize}, hits={details.hits})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.maxsize})'
@@ -0,0 +1,189 @@
+"""
+Contains Sweep class - exhaustive, stratified enumeration of the packet field space
+"""
+# Python library imports
+from itertools import product
+import copy
+import math
+from typing import Iterator
+# Package imports
+from .randomiser import Randomiser
+from .packet import PacketDetails
+from .const import (
+    INTERNET_PROTOCOLS, INTERNET_PROTOCOLS_INFO, TRANSPORT_PROTOCOLS,
+    TRANSPORT_PROTOCOLS_INFO, CAST_TYPES, DEFAULT_LENGTH_BUCKETS,
+)
+from .validation import valid_packet_details, valid_number
+
+
+class Sweep():
+    """ Stratified sweep over every (int_protocol, trans_protocol, cast, vlan,
+    headers) combination and length bucket.
+
+    Each combination and length bucket pair is a stratum. Packet indices are
+    counted in mixed radix over the dimensions and every digit is offset by the
+    sum of the faster digits. This is a permutation of the strata in which every
+    dimension, including the length bucket, keeps cycling, so any prefix of a
+    run covers each dimension as evenly as possible. Workers shard the
+    iteration space by taking every `shards`-th index starting at `shard`, so
+    the union of all shards covers the same strata as a single worker would.
+    """
+
+    def __init__(self, details: PacketDetails, buckets: int=DEFAULT_LENGTH_BUCKETS,
+            shard: int=0, shards: int=1) -> None:
+        """ Sweep class built-in initialiser
+
+        Parameters:
+            details (PacketDetails): Initial packet details. Attributes set to None
+                are swept, any other value is held fixed.
+            buckets (int): Number of length buckets to stratify packet lengths into
+            shard (int): Index of this worker's shard (0 <= shard < shards)
+            shards (int): Total number of workers sharing the sweep
+        """
+        details = valid_packet_details(details)
+        self.buckets = valid_number(buckets, minimum=1)
+        self.shards = valid_number(shards, minimum=1)
+        self.shard = valid_number(shard, minimum=0, maximum=self.shards - 1)
+        self.min_length = details.get('min_length')
+        self.max_length = details.get('max_length')
+        self.details = details
+
+        # Dimensions ordered fastest varying first
+        self.dimensions = (
+            self._dimension(details, 'int_protocol',
+                [INTERNET_PROTOCOLS_INFO[name]['value'] for name in INTERNET_PROTOCOLS]),
+            self._dimension(details, 'trans_protocol',
+                [TRANSPORT_PROTOCOLS_INFO[name]['value'] for name in TRANSPORT_PROTOCOLS]),
+            self._dimension(details, 'cast', CAST_TYPES),
+            self._dimension(details, 'vlan', (False, True)),
+            self._dimension(details, 'headers', (False, True)),
+            tuple(range(self.buckets)),
+        )
+        self.size = 1
+        for dimension in self.dimensions:
+            self.size *= len(dimension)
+
+    @staticmethod
+    def _dimension(details: PacketDetails, attribute: str, values: tuple) -> tuple:
+        """ Values a dimension is swept over, a single value if the attribute is fixed"""
+        value = details.get(attribute)
+        return (value,) if value is not None else tuple(values)
+
+    def combinations(self) -> Iterator[tuple]:
+        """ Lazy Cartesian product of every stratum in the sweep
+
+        Returns:
+            Iterator: Yields (int_protocol, trans_protocol, cast, vlan, headers, bucket)
+        """
+        return product(*self.dimensions)
+
+    def stratum(self, index: int) -> tuple:
+        """ Gets the stratum a local packet index is assigned to
+
+        Parameters:
+            index (int): Packet index local to this shard
+
+        Returns:
+            tuple: (int_protocol, trans_protocol, cast, vlan, headers, bucket)
+        """
+        position = (index * self.shards + self.shard) % self.size
+        stratum, carried = [], 0
+        for dimension in self.dimensions:
+            position, digit = divmod(position, len(dimension))
+            # Offsetting each digit by the faster digits keeps slow dimensions cycling
+            stratum.append(dimension[(digit + carried) % len(dimension)])
+            carried += digit
+        return tuple(stratum)
+
+    def length_range(self, int_protocol: int, trans_protocol: int, bucket: int) -> tuple:
+        """ Gets the inclusive payload length range of a length bucket
+
+        Parameters:
+            int_protocol (int): Internet protocol value
+            trans_protocol (int): Transport protocol value
+            bucket (int): Length bucket index
+
+        Returns:
+            tuple: (minimum, maximum) payload length of the bucket
+        """
+        int_info = next(info for info in INTERNET_PROTOCOLS_INFO.values()
+            if info['value'] == int_protocol)
+        trans_info = next(info for info in TRANSPORT_PROTOCOLS_INFO.values()
+            if info['value'] == trans_protocol)
+        minimum = self.min_length if self.min_length is not None else 0
+        maximum = self.max_length if self.max_length is not None else \
+            int_info['max_length'] - int_info['header_length'] - trans_info['header_length']
+
+        span = maximum - minimum + 1
+        low = minimum + (span * bucket) // self.buckets
+        high = minimum + (span * (bucket + 1)) // self.buckets - 1
+        return min(low, maximum), max(min(high, maximum), min(low, maximum))
+
+    def packet_details(self, index: int, randomiser: Randomiser,
+            random_details: PacketDetails) -> PacketDetails:
+        """ Generate packet details for the stratum of a local packet index
+
+        Parameters:
+            index (int): Packet index local to this shard
+            randomiser (Randomiser): Randomiser used for values within the stratum
+            random_details (PacketDetails): PacketDetails object to be populated
+
+        Returns:
+            random_details (PacketDetails): Populated PacketDetails object
+        """
+        int_protocol, trans_protocol, cast, vlan, headers, bucket = self.stratum(index)
+        random_details.int_protocol = int_protocol
+        random_details.trans_protocol = trans_protocol
+        random_details.cast = cast
+        random_details.vlan = vlan
+        random_details.headers = headers
+        random_details.set('length', randomiser.rand(
+            *self.length_range(int_protocol, trans_protocol, bucket)))
+        if headers:
+            randomiser.headers(random_details)
+        randomiser.bad_checksum(self.details, random_details)
+        randomiser.payload(self.details, random_details)
+        return random_details
+
+    def split(self, worker: int, workers: int) -> 'Sweep':
+        """ Splits this shard between workers, interleaving so the workers together
+        cover the same strata as this shard would alone
+
+        Parameters:
+            worker (int): Index of the worker (0 <= worker < workers)
+            workers (int): Number of workers sharing this shard
+
+        Returns:
+            Sweep: Sweep of the worker's share of the shard
+        """
+        workers = valid_number(workers, minimum=1)
+        worker = valid_number(worker, minimum=0, maximum=workers - 1)
+        sweep = copy.copy(self)
+        sweep.shard, sweep.shards = worker * self.shards + self.shard, workers * self.shards
+        return sweep
+
+    def coverage(self, n_packets: int) -> int:
+        """ Number of distinct strata this shard has covered after sending n_packets
+
+        Parameters:
+            n_packets (int): Packets sent by this shard
+
+        Returns:
+            int: Number of distinct strata covered
+        """
+        # The shard's indices walk a cycle of size / gcd(shards, size) strata
+        return min(n_packets, self.size // math.gcd(self.shards, self.size))
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return self.size
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Sweep - Strata: ({self.size}), Buckets: ({self.buckets}), ' \
+            f'Shard: ({self.shard}/{self.shards})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.size}, {self.buckets}, ' \
+            f'{self.shard}, {self.shards})'
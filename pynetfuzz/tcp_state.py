@@ -0,0 +1,437 @@
+"""
+Contains ConnectionTable and TcpState classes - stateful TCP fuzzing of established connections
+"""
+# Python library imports
+from array import array
+import ipaddress
+import select
+import struct
+import time
+from scapy.config import conf
+from scapy.layers.l2 import Ether
+from scapy.layers.inet import IP, TCP
+from scapy.layers.inet6 import IPv6
+# Package imports
+import pynetfuzz.exceptions as ex
+from .hosts import Host
+from .packet import PacketDetails, ipv6_address
+from .randomiser import Randomiser
+from .checksum import frame_offsets
+from .const import (
+    MAX_PORT, TCP_FLAGS, TCP_STATE_BASE_PORT, TCP_STATE_MAX_CONNECTIONS,
+    TCP_STATE_SEGMENT_FLAGS, TCP_STATE_TIMEOUT, TCP_STATE_POLL_FRAMES, TCP_STATE_WINDOW,
+    TCP_STATE_CLOSED, TCP_STATE_SYN_SENT, TCP_STATE_ESTABLISHED, TRANSPORT_PROTOCOLS_INFO,
+    INTERNET_PROTOCOLS_INFO,
+)
+from .validation import valid_number, valid_port
+
+SEQUENCE_MASK = 0xFFFFFFFF
+
+
+class ConnectionTable():
+    """ Fixed size table of TCP connections held in typed arrays.
+
+    Each connection is a row of the arrays, its source port is the table's
+    base port plus the row, so a connection costs a few bytes and no Python
+    object. Sequence numbers wrap at 2^32.
+    """
+
+    def __init__(self, capacity: int, base_port: int=TCP_STATE_BASE_PORT) -> None:
+        """ ConnectionTable class built-in initialiser
+
+        Parameters:
+            capacity (int): Number of connections
+            base_port (int): Source port of the first connection
+        """
+        self.capacity = valid_number(capacity, minimum=1, maximum=TCP_STATE_MAX_CONNECTIONS)
+        self.base_port = valid_port(base_port)
+        if self.base_port + self.capacity - 1 > MAX_PORT:
+            raise ex.TcpStateCapacityError(
+                f'Not enough source ports for {self.capacity} connections from port '
+                f'{self.base_port}.')
+        self.state = bytearray(self.capacity)
+        self.snd_nxt = array('I', [0]) * self.capacity # Next sequence number sent
+        self.rcv_nxt = array('I', [0]) * self.capacity # Next sequence number expected
+        self.window = array('H', [0]) * self.capacity # Target's advertised window
+        # Rows of the established connections, and the position of each row in it
+        self.established = array('H')
+        self.position = array('i', [-1]) * self.capacity
+
+    def port(self, row: int) -> int:
+        """ Gets the source port of a connection
+
+        Parameters:
+            row (int): Row of the connection
+
+        Returns:
+            int: Source port of the connection
+        """
+        return self.base_port + row
+
+    def row(self, port: int) -> int:
+        """ Gets the connection of a source port
+
+        Parameters:
+            port (int): Source port
+
+        Returns:
+            int: Row of the connection, -1 if the port is not the table's
+        """
+        row = port - self.base_port
+        return row if 0 <= row < self.capacity else -1
+
+    def open(self, row: int, isn: int) -> None:
+        """ Records a SYN sent for a connection
+
+        Parameters:
+            row (int): Row of the connection
+            isn (int): Initial sequence number of the SYN
+        """
+        self.close(row)
+        self.state[row] = TCP_STATE_SYN_SENT
+        self.snd_nxt[row] = (isn + 1) & SEQUENCE_MASK # The SYN takes one sequence number
+
+    def establish(self, row: int, seq: int, window: int) -> None:
+        """ Records the target's SYN-ACK of a connection
+
+        Parameters:
+            row (int): Row of the connection
+            seq (int): Target's initial sequence number
+            window (int): Target's advertised window
+        """
+        self.state[row] = TCP_STATE_ESTABLISHED
+        self.rcv_nxt[row] = (seq + 1) & SEQUENCE_MASK
+        self.window[row] = window
+        if self.position[row] < 0:
+            self.position[row] = len(self.established)
+            self.established.append(row)
+
+    def close(self, row: int) -> None:
+        """ Records a connection closed
+
+        Parameters:
+            row (int): Row of the connection
+        """
+        self.state[row] = TCP_STATE_CLOSED
+        position = self.position[row]
+        if position >= 0: # Swap the last established connection into its place
+            last = self.established.pop()
+            if last != row:
+                self.established[position] = last
+                self.position[last] = position
+            self.position[row] = -1
+
+    def advance(self, row: int, length: int) -> None:
+        """ Records data sent in order on a connection
+
+        Parameters:
+            row (int): Row of the connection
+            length (int): Sequence numbers taken by the segment
+        """
+        self.snd_nxt[row] = (self.snd_nxt[row] + length) & SEQUENCE_MASK
+
+    def receive(self, row: int, seq: int, length: int, window: int) -> bool:
+        """ Records a segment received on an established connection
+
+        Parameters:
+            row (int): Row of the connection
+            seq (int): Sequence number of the segment
+            length (int): Sequence numbers taken by the segment (data and FIN)
+            window (int): Target's advertised window
+
+        Returns:
+            bool: True if the segment was the next in order
+        """
+        self.window[row] = window
+        if seq != self.rcv_nxt[row]:
+            return False
+        self.rcv_nxt[row] = (seq + length) & SEQUENCE_MASK
+        return True
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return len(self.established)
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'ConnectionTable - Established: ({len(self.established)}), ' \
+            f'Capacity: ({self.capacity}), Ports: ({self.base_port}-' \
+            f'{self.base_port + self.capacity - 1})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.capacity}, {self.base_port})'
+
+
+class TcpState():
+    """ Stateful TCP fuzzing of one target port.
+
+    Connections are opened with a handshake from the table's source ports,
+    then each generated TCP packet is turned into a segment of an
+    established connection, with its sequence and acknowledgment numbers in
+    the connection's window, so it passes the target's state checks and
+    reaches deeper into its stack. Packets are built by the Packet class as
+    usual, only the hosts and TCP fields are taken from the connection.
+
+    The local kernel does not know the connections and answers the target's
+    SYN-ACKs with a RST, outgoing RSTs from the table's ports should be
+    dropped while fuzzing (e.g. iptables -A OUTPUT -p tcp --tcp-flags RST RST
+    --sport 10000:59999 -j DROP).
+    """
+
+    def __init__(self, target: Host, source: Host, connections: int,
+            base_port: int=TCP_STATE_BASE_PORT) -> None:
+        """ TcpState class built-in initialiser
+
+        Parameters:
+            target (Host): Target host, with an IP address, MAC address and port
+            source (Host): Local host, with an IP address and MAC address
+            connections (int): Number of concurrent connections
+            base_port (int): Source port of the first connection
+        """
+        for name, host in (('Target', target), ('Source', source)):
+            try:
+                ipaddress.ip_address(host.ip)
+            except ValueError as exception:
+                raise ex.TcpStateHostError(
+                    f'{name} host needs a specific IP address for stateful TCP. '
+                    f'({host.ip})') from exception
+            if not host.is_mac():
+                raise ex.TcpStateHostError(
+                    f'{name} host needs a MAC address for stateful TCP. ({host.ip})')
+        if not target.is_port():
+            raise ex.TcpStateHostError('Stateful TCP needs a target port.')
+        self.target = target
+        self.source = source
+        address = ipaddress.ip_address(target.ip)
+        self.ipv6 = address.version == 6
+        self.packed_ip = address.packed
+        self.table = ConnectionTable(connections, base_port)
+        self.socket = None
+        self.sent = 0
+        self.received = 0
+        self.resets = 0
+
+    def start(self, interface: str) -> None:
+        """ Opens the layer 2 socket handshakes are sent and replies received on
+
+        Parameters:
+            interface (str): Name of the interface connected to the target
+        """
+        self.socket = conf.L2socket(iface=interface)
+
+    def handshake(self, timeout: float=TCP_STATE_TIMEOUT) -> int:
+        """ Sends a SYN from every connection not established and handles the replies.
+        Replies arriving after the timeout are handled by the next poll.
+
+        Parameters:
+            timeout (float): Seconds to wait for replies
+
+        Returns:
+            int: Number of established connections
+        """
+        table = self.table
+        for row in range(table.capacity): # Unanswered SYNs are sent again
+            if table.state[row] != TCP_STATE_ESTABLISHED:
+                isn = Randomiser.bit_32()
+                table.open(row, isn)
+                self.send(self.frame(row, TCP_FLAGS['SYN'], isn, 0))
+        self.poll(timeout)
+        return len(table)
+
+    def poll(self, timeout: float=0.0) -> int:
+        """ Handles the frames received, waiting up to the timeout for more, and answers
+        them if needed
+
+        Parameters:
+            timeout (float): Seconds to wait for frames
+
+        Returns:
+            int: Number of segments received from the target
+        """
+        received, handled = self.received, 0
+        deadline = time.monotonic() + timeout
+        # Busy interfaces are read until the deadline, then for a few frames per connection
+        while handled < self.table.capacity * TCP_STATE_POLL_FRAMES or \
+                time.monotonic() < deadline:
+            if not select.select([self.socket], [], [],
+                    max(0.0, deadline - time.monotonic()))[0]:
+                break
+            frame = self.socket.recv_raw()[1]
+            if frame is None:
+                break
+            handled += 1
+            reply = self.receive(frame)
+            if reply is not None:
+                self.send(reply)
+        return self.received - received
+
+    def send(self, frame: bytes) -> None:
+        """ Sends a handshake or acknowledgment frame
+
+        Parameters:
+            frame (bytes): Built Ethernet frame
+        """
+        self.socket.send(frame)
+        self.sent += 1
+
+    def receive(self, frame: bytes) -> bytes:
+        """ Updates the table from a received frame
+
+        Parameters:
+            frame (bytes): Received Ethernet frame
+
+        Returns:
+            bytes: ACK frame to send in reply, None if no reply is needed
+        """
+        ether_type, ip_offset, protocol, offset = frame_offsets(frame)
+        if protocol != TRANSPORT_PROTOCOLS_INFO['tcp']['value'] or len(frame) < offset + 20:
+            return None
+        if self.ipv6:
+            if ether_type != INTERNET_PROTOCOLS_INFO['ipv6']['value'] or \
+                    frame[ip_offset + 8:ip_offset + 24] != self.packed_ip:
+                return None
+            end = ip_offset + 40 + struct.unpack_from('!H', frame, ip_offset + 4)[0]
+        else:
+            if ether_type != INTERNET_PROTOCOLS_INFO['ipv4']['value'] or \
+                    frame[ip_offset + 12:ip_offset + 16] != self.packed_ip:
+                return None
+            end = ip_offset + struct.unpack_from('!H', frame, ip_offset + 2)[0]
+        sport, dport, seq, ack, offset_flags, window = \
+            struct.unpack_from('!HHIIHH', frame, offset)
+        row = self.table.row(dport)
+        if sport != self.target.port or row < 0:
+            return None
+        self.received += 1
+        flags, state = offset_flags & 0xFF, self.table.state[row]
+        if flags & TCP_FLAGS['RST']:
+            self.resets += 1
+            self.table.close(row)
+            return None
+        syn_ack = TCP_FLAGS['SYN'] | TCP_FLAGS['ACK']
+        if flags & syn_ack == syn_ack:
+            if state == TCP_STATE_SYN_SENT and ack == self.table.snd_nxt[row]:
+                self.table.establish(row, seq, window)
+            elif state != TCP_STATE_ESTABLISHED:
+                return None
+            # SYN-ACKs are answered again if the ACK was lost
+            return self.frame(row, TCP_FLAGS['ACK'], self.table.snd_nxt[row],
+                self.table.rcv_nxt[row])
+        if state != TCP_STATE_ESTABLISHED:
+            return None
+        length = max(0, end - offset - (offset_flags >> 12) * 4) + \
+            (1 if flags & TCP_FLAGS['FIN'] else 0)
+        self.table.receive(row, seq, length, window)
+        if length: # Data and FINs are acknowledged, or the target keeps retransmitting
+            return self.frame(row, TCP_FLAGS['ACK'], self.table.snd_nxt[row],
+                self.table.rcv_nxt[row])
+        return None
+
+    def frame(self, row: int, flags: int, seq: int, ack: int) -> bytes:
+        """ Builds a handshake or acknowledgment frame of a connection
+
+        Parameters:
+            row (int): Row of the connection
+            flags (int): TCP flags
+            seq (int): Sequence number
+            ack (int): Acknowledgment number
+
+        Returns:
+            bytes: Built Ethernet frame
+        """
+        if self.ipv6:
+            ip_layer = IPv6(src=ipv6_address(self.source.ip), dst=ipv6_address(self.target.ip))
+        else:
+            ip_layer = IP(src=self.source.ip, dst=self.target.ip)
+        return bytes(Ether(src=self.source.mac, dst=self.target.mac) / ip_layer / \
+            TCP(sport=self.table.port(row), dport=self.target.port, flags=flags, seq=seq,
+                ack=ack, window=TCP_STATE_WINDOW))
+
+    def segment(self, randomiser: Randomiser, random_target: Host, random_source: Host,
+            random_details: PacketDetails) -> PacketDetails:
+        """ Turns randomised TCP packet details into a fuzzed segment of an established
+        connection. The sequence number is mostly the next in order, otherwise
+        elsewhere in the target's window or just behind it, with the flags drawn from
+        TCP_STATE_SEGMENT_FLAGS. A SYN is sent from a closed connection when none are
+        established.
+
+        Parameters:
+            randomiser (Randomiser): Randomiser the segment fields are drawn from
+            random_target (Host): Randomised target host, set to the target
+            random_source (Host): Randomised source host, set to the connection's
+            random_details (PacketDetails): Randomised TCP packet details
+
+        Returns:
+            random_details (PacketDetails): Packet details of the segment
+        """
+        table = self.table
+        random_target.ip, random_target.mac, random_target.port = \
+            self.target.ip, self.target.mac, self.target.port
+        random_source.ip, random_source.mac = self.source.ip, self.source.mac
+        random_details.cast = 'unicast'
+        if not random_details.get('headers') or random_details.get('tcp_header') is None:
+            random_details.headers = True
+            randomiser.headers(random_details)
+        # The IP header must not stop the segment before TCP sees it
+        ip_header = random_details.ip_header
+        if self.ipv6:
+            ip_header['hlim'] = 64
+            random_details.set('ip6_extensions', ())
+            random_details.set('ip6_extension_fields', ())
+        else:
+            ip_header['ttl'], ip_header['flags'], ip_header['frag'] = 64, 2, 0 # Don't fragment
+        tcp_header = random_details.tcp_header
+        valid = not random_details.get('bad_checksum')
+
+        if not table.established:
+            row = randomiser.rand(0, table.capacity - 1)
+            isn = randomiser.bit_32()
+            if valid:
+                table.open(row, isn)
+            random_source.port = table.port(row)
+            tcp_header['flags'], tcp_header['seq'], tcp_header['ack'] = TCP_FLAGS['SYN'], isn, 0
+            random_details.set('length', 0)
+            return random_details
+
+        row = table.established[randomiser.rand(0, len(table.established) - 1)]
+        window = max(table.window[row], 1)
+        length = min(random_details.get('length', 0), window)
+        flags = randomiser.choose(TCP_STATE_SEGMENT_FLAGS)
+        place = randomiser.rand(0, 7)
+        offset = 0 if place < 6 else randomiser.rand(1, window) if place == 6 else \
+            -randomiser.rand(1, window)
+        random_source.port = table.port(row)
+        tcp_header['flags'] = flags
+        tcp_header['seq'] = (table.snd_nxt[row] + offset) & SEQUENCE_MASK
+        tcp_header['ack'] = table.rcv_nxt[row]
+        random_details.set('length', length)
+        if valid and offset == 0:
+            if flags & TCP_FLAGS['RST']:
+                table.close(row)
+            else:
+                table.advance(row, length + (1 if flags & TCP_FLAGS['FIN'] else 0))
+                if flags & TCP_FLAGS['FIN']: # Connections are reopened once closed
+                    table.close(row)
+        return random_details
+
+    def close(self) -> None:
+        """ Resets the established connections and closes the socket"""
+        if self.socket is None:
+            return
+        for row in list(self.table.established):
+            self.send(self.frame(row, TCP_FLAGS['RST'] | TCP_FLAGS['ACK'],
+                self.table.snd_nxt[row], self.table.rcv_nxt[row]))
+            self.table.close(row)
+        self.socket.close()
+        self.socket = None
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'TcpState - Target: ({self.target.ip}:{self.target.port}), ' \
+            f'Established: ({len(self.table)}/{self.table.capacity}), Sent: ({self.sent}), ' \
+            f'Received: ({self.received}), Resets: ({self.resets})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.target.ip}, {self.target.port}, ' \
+            f'{self.table.capacity})'
@@ -0,0 +1,177 @@
+"""
+Contains Tracer class - sampled frames written to a hexdump or pcap trace file
+"""
+# Python library imports
+import struct
+import time
+# Package imports
+import pynetfuzz.exceptions as ex
+from .const import (
+    TRACE_SAMPLE_INTERVAL, TRACE_FILTER_FIELDS, TRACE_PCAP_EXTENSIONS, PROTOCOL_NAMES,
+    INTERNET_PROTOCOLS_INFO, TRANSPORT_PROTOCOLS_INFO, CAST_TYPES,
+)
+from .validation import valid_number
+
+PCAP_HEADER = struct.Struct('<IHHiIII') # Magic, version, zone, accuracy, snap length, link
+PCAP_RECORD = struct.Struct('<IIII') # Seconds, microseconds, captured and frame lengths
+PCAP_MAGIC = 0xA1B2C3D4
+PCAP_SNAPLEN = 65535
+PCAP_ETHERNET = 1
+
+
+def parse_filter(spec: str) -> dict:
+    """ Parses a trace filter of comma separated field=value terms, e.g.
+    trans_protocol=tcp,min_length=1000. The fields are TRACE_FILTER_FIELDS.
+
+    Parameters:
+        spec (str): Trace filter
+
+    Returns:
+        dict: Value of each filtered field, protocols as their values
+    """
+    match = {}
+    for term in str(spec).split(','):
+        field, separator, value = (part.strip().lower() for part in term.partition('='))
+        if not separator or not value or field not in TRACE_FILTER_FIELDS:
+            raise ex.TraceFilterError(
+                f'Not a trace filter term. Received: {term}, Required: <field>=<value> with '
+                f'a field of {TRACE_FILTER_FIELDS}')
+        try:
+            if field == 'cast':
+                if value not in CAST_TYPES:
+                    raise ValueError(value)
+                match[field] = value
+            elif field == 'int_protocol' and value in INTERNET_PROTOCOLS_INFO:
+                match[field] = INTERNET_PROTOCOLS_INFO[value]['value']
+            elif field == 'trans_protocol' and value in TRANSPORT_PROTOCOLS_INFO:
+                match[field] = TRANSPORT_PROTOCOLS_INFO[value]['value']
+            else:
+                match[field] = int(value, 0)
+        except ValueError as exception:
+            raise ex.TraceFilterError(f'Not a valid {field} value. ({value})') from exception
+    return match
+
+
+class Tracer():
+    """ Sampled packet tracing to a side channel file.
+
+    Logging every packet at debug level formats each one and throttles the
+    run, so instead frames are sampled: those matching the filter, then
+    every `every`-th of them, at most one per `interval` seconds. Frames not
+    sampled cost a counter increment and are never copied. Sampled frames
+    are written as a hexdump, or as a pcap file when the path ends in .pcap.
+    """
+
+    def __init__(self, path: str, every: int=None, interval: float=None,
+            match: dict=None) -> None:
+        """ Tracer class built-in initialiser
+
+        Parameters:
+            path (str): Path of the trace file, pcap if it ends in .pcap or .cap
+            every (int): Trace every Nth matching frame (default: 1 with an interval or
+                filter, otherwise TRACE_SAMPLE_INTERVAL)
+            interval (float): Optional least seconds between traced frames
+            match (dict): Optional filter, see parse_filter, given as a dict or string
+        """
+        self.match = parse_filter(match) if isinstance(match, str) else dict(match or {})
+        unknown = set(self.match) - set(TRACE_FILTER_FIELDS)
+        if unknown:
+            raise ex.TraceFilterError(f'Not trace filter fields. ({", ".join(sorted(unknown))})')
+        if every is None:
+            every = 1 if interval is not None or self.match else TRACE_SAMPLE_INTERVAL
+        self.every = valid_number(every, minimum=1)
+        self.interval = float(interval) if interval is not None else 0.0
+        if self.interval < 0:
+            raise ex.TraceIntervalError(f'Trace interval can not be negative. ({interval})')
+        self.path = path
+        self.pcap = str(path).lower().endswith(TRACE_PCAP_EXTENSIONS)
+        self.frames = 0
+        self.matched = 0
+        self.traced = 0
+        self.next_trace = 0.0
+        self.file = open(path, 'wb')
+        if self.pcap:
+            self.file.write(PCAP_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, PCAP_SNAPLEN,
+                PCAP_ETHERNET))
+
+    def sample(self, int_protocol: int, trans_protocol: int, cast: str, length: int) -> bool:
+        """ Counts a sent frame and decides if it is traced
+
+        Parameters:
+            int_protocol (int): Internet protocol value of the frame
+            trans_protocol (int): Transport protocol value of the frame
+            cast (str): Cast type of the frame
+            length (int): Frame length in bytes
+
+        Returns:
+            bool: True if the frame should be written with write
+        """
+        self.frames += 1
+        match = self.match
+        if match and not (match.get('int_protocol', int_protocol) == int_protocol and
+                match.get('trans_protocol', trans_protocol) == trans_protocol and
+                match.get('cast', cast) == cast and
+                match.get('min_length', length) <= length <= match.get('max_length', length)):
+            return False
+        self.matched += 1
+        if self.matched % self.every:
+            return False
+        if self.interval:
+            now = time.monotonic()
+            if now < self.next_trace:
+                return False
+            self.next_trace = now + self.interval
+        return True
+
+    def write(self, index: int, int_protocol: int, trans_protocol: int, cast: str,
+            frame: bytes) -> None:
+        """ Writes a sampled frame to the trace file
+
+        Parameters:
+            index (int): Packet number of the frame in the run
+            int_protocol (int): Internet protocol value of the frame
+            trans_protocol (int): Transport protocol value of the frame
+            cast (str): Cast type of the frame
+            frame (bytes): Serialised Ethernet frame, any buffer
+        """
+        self.traced += 1
+        now = time.time()
+        if self.pcap:
+            length = len(frame)
+            self.file.write(PCAP_RECORD.pack(int(now), int(now % 1 * 1e6),
+                min(length, PCAP_SNAPLEN), length))
+            self.file.write(frame[:PCAP_SNAPLEN])
+            return
+        frame = bytes(frame)
+        lines = [f'# Packet {index} at {now:.6f}: {PROTOCOL_NAMES.get(int_protocol, int_protocol)}'
+            f' {PROTOCOL_NAMES.get(trans_protocol, trans_protocol)} {cast}, {len(frame)} bytes']
+        lines.extend(f'{offset:04x}  {frame[offset:offset + 16].hex(" ")}'
+            for offset in range(0, len(frame), 16))
+        self.file.write(('\n'.join(lines) + '\n\n').encode())
+
+    def trace(self, index: int, int_protocol: int, trans_protocol: int, cast: str,
+            frame: bytes) -> bool:
+        """ Samples a frame and writes it if it is traced, see sample and write
+
+        Returns:
+            bool: True if the frame was traced
+        """
+        if not self.sample(int_protocol, trans_protocol, cast, len(frame)):
+            return False
+        self.write(index, int_protocol, trans_protocol, cast, frame)
+        return True
+
+    def close(self) -> None:
+        """ Flushes and closes the trace file"""
+        if not self.file.closed:
+            self.file.close()
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'Tracer - Path: ({self.path}), Traced: ({self.traced}/{self.frames}), ' \
+            f'Every: ({self.every}), Interval: ({self.interval}s), Filter: ({self.match})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.path}, {self.every}, ' \
+            f'{self.interval}, {self.match})'
@@ -0,0 +1,230 @@
+"""
+Contains TxMonitor class - interface transmit counters against the run's sends, with paced
+sending when the kernel drops frames
+"""
+# Python library imports
+import logging
+import os
+import socket
+import time
+# Package imports
+import pynetfuzz.exceptions as ex
+from .metrics import Metrics
+from .const import (
+    TXMON_INTERVAL, TXMON_COUNTERS, TXMON_SYSFS, TXMON_PROCFS, TXMON_CHECK_FRAMES,
+    TXMON_DECREASE, TXMON_INCREASE, TXMON_MIN_RATE, TXMON_MISSING_TOLERANCE, TXMON_UNPACE,
+)
+
+# Columns of the transmit counters in /proc/net/dev, after the interface name
+PROC_NET_DEV_COLUMNS = {
+    'tx_bytes': 8,
+    'tx_packets': 9,
+    'tx_errors': 10,
+    'tx_dropped': 11,
+    'tx_fifo_errors': 12,
+}
+
+
+def read_sysfs(interface: str, root: str=TXMON_SYSFS) -> dict:
+    """ Reads the transmit counters of an interface from sysfs
+
+    Parameters:
+        interface (str): Interface name
+        root (str): Directory of the interfaces
+
+    Returns:
+        dict: Value of each of TXMON_COUNTERS
+    """
+    counters = {}
+    for counter in TXMON_COUNTERS:
+        with open(os.path.join(root, interface, 'statistics', counter), encoding='ascii') \
+                as value:
+            counters[counter] = int(value.read())
+    return counters
+
+
+def read_proc_net_dev(interface: str, path: str=TXMON_PROCFS) -> dict:
+    """ Reads the transmit counters of an interface from /proc/net/dev
+
+    Parameters:
+        interface (str): Interface name
+        path (str): Path of the net/dev file
+
+    Returns:
+        dict: Value of each of TXMON_COUNTERS
+    """
+    with open(path, encoding='ascii') as net_dev:
+        for line in net_dev:
+            name, separator, values = line.partition(':')
+            if separator and name.strip() == interface:
+                values = values.split()
+                return {counter: int(values[PROC_NET_DEV_COLUMNS[counter]])
+                    for counter in TXMON_COUNTERS}
+    raise ex.TxMonitorInterfaceError(f'Interface not found in {path}. ({interface})')
+
+
+class TxMonitor():
+    """ Transmit counters of an interface sampled against the run's own sends.
+
+    Every interval the interface's counters are read from sysfs, or from
+    /proc/net/dev without sysfs, and compared with the frames the run sent
+    since the last sample. Frames dropped or failed by the kernel, and sent
+    frames that never reached tx_packets (dropped before the driver, e.g. by
+    a full qdisc), slow the sender down: its rate is cut to TXMON_DECREASE of
+    the rate just measured, then raised by TXMON_INCREASE packets a second
+    after each sample without drops, and pacing is lifted once the sender no
+    longer reaches the limit. Other traffic on the interface adds to its
+    counters, so missing frames are undercounted on a busy interface, never
+    overcounted.
+    """
+
+    def __init__(self, interface: str, interval: float=None, metrics: Metrics=None) -> None:
+        """ TxMonitor class built-in initialiser
+
+        Parameters:
+            interface (str): Name of the interface the run sends on
+            interval (float): Seconds between samples (default: TXMON_INTERVAL)
+            metrics (Metrics): Optional Metrics object to record drops and the send rate in
+        """
+        self.interval = float(interval if interval is not None else TXMON_INTERVAL)
+        if self.interval <= 0:
+            raise ex.TxMonitorIntervalError(
+                f'Transmit monitor interval must be positive. ({interval})')
+        self.interface = interface
+        self.metrics = metrics
+        self.socket = None
+        self.sndbuf = None
+        self.rate = None # Packets per second the sender is held to, None when unpaced
+        self.frames = 0
+        self.dropped = 0
+        self.missing = 0
+        self.socket_errors = 0
+        self.samples = 0
+        self.decreases = 0
+        self.counters = None
+        self.sent = 0 # Frames sent at the last sample
+        self.backlog = 0 # Frames sent but not counted by the interface
+        self.sampled_at = 0.0
+        self.paced_frames, self.paced_at = 0, 0.0
+        self.next_check = 0
+
+    def attach(self, l2_socket) -> None:
+        """ Watches the send buffer and pending errors of the run's layer 2 socket
+
+        Parameters:
+            l2_socket (SuperSocket): Open Scapy layer 2 socket
+        """
+        outs = getattr(l2_socket, 'outs', None)
+        if isinstance(outs, socket.socket):
+            self.socket = outs
+            self.sndbuf = outs.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+
+    def read_counters(self) -> dict:
+        """ Reads the interface's transmit counters, see read_sysfs
+
+        Returns:
+            dict: Value of each of TXMON_COUNTERS
+        """
+        try:
+            return read_sysfs(self.interface)
+        except OSError:
+            try:
+                return read_proc_net_dev(self.interface)
+            except OSError as exception:
+                raise ex.TxMonitorInterfaceError(
+                    f'No transmit counters for the interface. ({self.interface})') \
+                    from exception
+
+    def start(self) -> None:
+        """ Takes the first sample, before the run's first send"""
+        self.counters = self.read_counters()
+        self.sampled_at = self.paced_at = time.monotonic()
+        self.sent = self.paced_frames = self.frames
+        self.next_check = self.frames + TXMON_CHECK_FRAMES
+
+    def pace(self, frames: int=1) -> None:
+        """ Counts frames sent, every TXMON_CHECK_FRAMES samples the counters when the
+        interval is up and holds the sender to the paced rate
+
+        Parameters:
+            frames (int): Frames just sent
+        """
+        self.frames += frames
+        if self.frames < self.next_check:
+            return
+        self.next_check = self.frames + TXMON_CHECK_FRAMES
+        now = time.monotonic()
+        if self.rate is not None: # Paced before sampling, the sample measures the paced rate
+            delay = self.paced_at + (self.frames - self.paced_frames) / self.rate - now
+            if delay > 0:
+                time.sleep(delay)
+                now = time.monotonic()
+        if now - self.sampled_at >= self.interval:
+            self.sample(now)
+
+    def sample(self, now: float=None) -> int:
+        """ Compares the counters with the frames sent since the last sample and adjusts
+        the paced rate
+
+        Parameters:
+            now (float): time.monotonic of the sample (default: now)
+
+        Returns:
+            int: Frames dropped since the last sample
+        """
+        now = now if now is not None else time.monotonic()
+        counters = self.read_counters()
+        delta = {counter: counters[counter] - self.counters[counter]
+            for counter in TXMON_COUNTERS}
+        sent, elapsed = self.frames - self.sent, now - self.sampled_at
+        dropped = delta['tx_dropped'] + delta['tx_errors'] + delta['tx_fifo_errors']
+        if self.socket is not None and \
+                self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            self.socket_errors += 1
+            dropped += 1
+        # Frames still queued are counted by a later sample, a backlog growing by more
+        # than the tolerance is lost and never will be
+        backlog = max(0, self.backlog + sent - delta['tx_packets'])
+        missing = backlog - self.backlog
+        if missing > TXMON_MISSING_TOLERANCE:
+            backlog = self.backlog
+        else:
+            missing = 0
+        self.backlog = backlog
+        self.counters, self.sent, self.sampled_at = counters, self.frames, now
+        self.dropped += dropped
+        self.missing += missing
+        self.samples += 1
+
+        measured = sent / elapsed if elapsed > 0 else 0.0
+        if dropped + missing:
+            self.rate = max(TXMON_MIN_RATE, measured * TXMON_DECREASE)
+            self.decreases += 1
+            logging.warning("%s frames dropped on %s (%s missing), pacing to %.0f pkt/s",
+                dropped + missing, self.interface, missing, self.rate)
+        elif self.rate is not None:
+            if measured < self.rate * TXMON_UNPACE: # The sender no longer reaches the limit
+                self.rate = None
+                logging.info("No frames dropped on %s, pacing lifted", self.interface)
+            else:
+                self.rate += TXMON_INCREASE
+        self.paced_frames, self.paced_at = self.frames, now
+        if self.metrics is not None:
+            if dropped:
+                self.metrics.inc('pynetfuzz_tx_dropped_total', dropped, stage='kernel')
+            if missing:
+                self.metrics.inc('pynetfuzz_tx_dropped_total', missing, stage='missing')
+            self.metrics.set_gauge('pynetfuzz_tx_rate_limit', self.rate or 0.0)
+        return dropped + missing
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        rate = f'{self.rate:.0f} pkt/s' if self.rate is not None else 'unpaced'
+        return f'TxMonitor - Interface: ({self.interface}), Sent: ({self.frames}), ' \
+            f'Dropped: ({self.dropped}), Missing: ({self.missing}), Socket errors: ' \
+            f'({self.socket_errors}), Send buffer: ({self.sndbuf}), Rate: ({rate}), ' \
+            f'Decreases: ({self.decreases})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.interface}, {self.interval})'
@@ -4,12 +4,13 @@ Contains validation methods for parsing values
 # Python library imports
 from __future__ import annotations
 from typing import TYPE_CHECKING, Union
+import ipaddress
 import re
 import sys
 # Package imports
 import pynetfuzz.exceptions as ex
 from .const import (
-    REGEX_SPECIFIC_IP, REGEX_SCOPE_IP, REGEX_MAC,
+    REGEX_SPECIFIC_IP, REGEX_SCOPE_IP, REGEX_MAC, MAX_SCOPE_IP_LENGTH,
     MAX_PORT, TRANSPORT_PROTOCOLS_INFO,
 )
 
@@ -52,12 +53,14 @@ def valid_specific_ip(string: str, minimum: int=7, maximum: int= 17) -> str:
 
 
 def valid_scope_ip(string: str, minimum: int=7, maximum: int= 17) -> str:
-    """ Validation test for a scope IP address
+    """ Validation test for a scope IP address. Scopes are either wildcard
+    (X.X.X.*), CIDR (X.X.X.X/N), range (X.X.X.X-X.X.X.X) or IPv6 (address, prefix
+    or range) forms.
 
     Parameters:
         string (str): IP address
-        minimum (int): Minimum length of IP address
-        maximum (int): Maximum length of IP address
+        minimum (int): Minimum length of a wildcard IP address
+        maximum (int): Maximum length of a wildcard IP address
 
     Returns:
         str: Valid IP address
@@ -70,6 +73,8 @@ def valid_scope_ip(string: str, minimum: int=7, maximum: int= 17) -> str:
             f'Not a valid IP address type. Received: {string} ({type(string)})'
             f'Required to be in standard format X.X.X.X'
         )
+    if any(char in string for char in '/-:'):
+        return valid_extended_scope_ip(string)
     if len(string) > maximum:
         raise ex.IpAddressTooLongValueError(
             f'Not a valid IP address, cannot be longer than {maximum} chars '
@@ -85,6 +90,41 @@ def valid_scope_ip(string: str, minimum: int=7, maximum: int= 17) -> str:
     return string.upper()
 
 
+def valid_extended_scope_ip(string: str, maximum: int=MAX_SCOPE_IP_LENGTH) -> str:
+    """ Validation test for a CIDR, range or IPv6 scope IP address. CIDR scopes are
+    strict, host bits must not be set (192.168.1.254/24 is invalid).
+
+    Parameters:
+        string (str): IP address scope
+        maximum (int): Maximum length of the scope
+
+    Returns:
+        str: Valid IP address scope
+    """
+    if len(string) > maximum:
+        raise ex.IpAddressTooLongValueError(
+            f'Not a valid IP address scope, cannot be longer than {maximum} chars '
+            f'(len={len(string)})')
+    try:
+        if '-' in string:
+            first, last = (ipaddress.ip_address(part) for part in string.split('-'))
+            if first.version != last.version or first > last:
+                raise ex.IpScopeAddressInvalidValueError(
+                    f'Not a valid IP address range. ("{string}") Required to be '
+                    f'ascending addresses of the same version X.X.X.X-X.X.X.X')
+        elif '/' in string:
+            ipaddress.ip_network(string, strict=True)
+        else:
+            ipaddress.ip_address(string)
+    except ValueError as exception:
+        if isinstance(exception, ex.BaseValidationError):
+            raise
+        raise ex.IpScopeAddressInvalidFormatError(
+            f'Not a valid IP address scope. ("{string}") Required to be in format '
+            f'X.X.X.X/N, X.X.X.X-X.X.X.X or an IPv6 address or prefix') from exception
+    return string.upper()
+
+
 def valid_mac(string: str, minimum: int=12, maximum: int= 17) -> str:
     """ Validation test for a MAC address
 
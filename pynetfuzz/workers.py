@@ -0,0 +1,219 @@
+"""
+Contains WorkerGroup class - generator worker processes feeding the sender through frame rings
+"""
+# Python library imports
+from typing import Iterator
+import multiprocessing
+import time
+# Package imports
+import pynetfuzz.exceptions as ex
+from .hosts import Host
+from .packet import PacketDetails
+from .packet_generator import packet_generator
+from .pool import PacketPool
+from .ring import FrameRing
+from .sweep import Sweep
+from .metrics import Metrics
+from .affinity import pin
+from .seeds import SeedSchedule
+from .const import CAST_TYPES, PACKETS_PER_SEED, DEFAULT_RING_SLOTS, RING_SLOT_SIZE
+from .validation import valid_number
+
+
+def generator_worker(ring_name: str, slots: int, slot_size: int, worker: int, workers: int,
+        target: Host, details: PacketDetails, source: Host, seeds: SeedSchedule,
+        n_packets: int, sweep: Sweep, pool_size: int, stop, cpu: int=None) -> None:
+    """ Worker process method, generates packets and writes their frames into a ring.
+    Worker w of W takes cycles w, w + W, ... of the seed schedule, one per generator.
+
+    Parameters:
+        ring_name (str): Shared memory name of the worker's ring
+        slots (int): Number of slots in the ring
+        slot_size (int): Slot size of the ring
+        worker (int): Index of the worker
+        workers (int): Number of workers
+        target (Host): Target Host object for packet generation
+        details (PacketDetails): Packet details for packet generation
+        source (Host): Source Host object for packet generation
+        seeds (SeedSchedule): Seed schedule shared by the workers
+        n_packets (int): Number of packets this worker generates
+        sweep (Sweep): Optional Sweep of the worker's share of the strata
+        pool_size (int): Optional PacketPool size to reuse packets from
+        stop (Event): Event set by the sender to stop the worker early
+        cpu (int): Optional CPU to pin the worker to
+    """
+    pin(cpu)
+    ring = FrameRing(slots, slot_size, name=ring_name)
+    pool = PacketPool(pool_size) if pool_size else None
+    written, cycle = 0, 0
+    try:
+        while written < n_packets and not stop.is_set():
+            cycle_seed = seeds.seed(worker + cycle * workers)
+            for offset, packet in enumerate(packet_generator(target, details, source,
+                    cycle_seed, max_packets=min(PACKETS_PER_SEED, n_packets - written),
+                    sweep=sweep, start=written, pool=pool)):
+                frame = packet.frame if packet.frame is not None else packet.raw()
+                packet_details = packet.details
+                if not ring.put_wait(frame, cycle_seed, offset, packet_details.int_protocol,
+                        packet_details.trans_protocol, CAST_TYPES.index(packet_details.cast),
+                        stop=stop):
+                    return
+                if pool is not None:
+                    pool.release(packet)
+                written += 1
+            cycle += 1
+    finally:
+        ring.close()
+
+
+class WorkerGroup():
+    """ Generator worker processes, each writing frames into its own FrameRing.
+
+    The sender reads the rings round-robin in place. Each ring has one
+    producer and one consumer so no locks are needed. The packets to send are
+    split evenly between the workers and so are the strata of a sweep.
+    """
+
+    def __init__(self, workers: int, slots: int=DEFAULT_RING_SLOTS,
+            slot_size: int=RING_SLOT_SIZE) -> None:
+        """ WorkerGroup class built-in initialiser
+
+        Parameters:
+            workers (int): Number of generator worker processes
+            slots (int): Number of frame slots in each worker's ring
+            slot_size (int): Largest frame a slot can hold in bytes
+        """
+        self.workers = valid_number(workers, minimum=1)
+        self.rings = [FrameRing(slots, slot_size) for _ in range(self.workers)]
+        self.processes = []
+        self.stop_event = None
+        self.cpus = [None] * self.workers
+        self.counts = [0] * self.workers
+        self._stalls = [0] * self.workers
+
+    def start(self, target: Host, details: PacketDetails, source: Host, seeds: SeedSchedule,
+            n_packets: int, sweep: Sweep=None, pool_size: int=None, cpus: list=None) -> None:
+        """ Starts the worker processes
+
+        Parameters:
+            target (Host): Target Host object for packet generation
+            details (PacketDetails): Packet details for packet generation
+            source (Host): Source Host object for packet generation
+            seeds (SeedSchedule): Seed schedule of the workers
+            n_packets (int): Total number of packets to generate
+            sweep (Sweep): Optional Sweep split between the workers
+            pool_size (int): Optional PacketPool size used by each worker
+            cpus (list): Optional CPU to pin each worker to
+        """
+        if cpus is not None:
+            self.cpus = list(cpus)
+        # Spawned rather than forked, the parent runs logging and metrics threads
+        context = multiprocessing.get_context('spawn')
+        self.stop_event = context.Event()
+        for worker, ring in enumerate(self.rings):
+            quota = n_packets // self.workers + (worker < n_packets % self.workers)
+            process = context.Process(target=generator_worker, daemon=True, args=(
+                ring.name, ring.slots, ring.slot_size, worker, self.workers, target, details,
+                source, seeds, quota, sweep.split(worker, self.workers) if sweep else None,
+                pool_size, self.stop_event, self.cpus[worker]))
+            process.start()
+            self.processes.append(process)
+
+    def frames(self) -> Iterator[tuple]:
+        """ Reads frames from the rings round-robin until every worker has finished.
+        Each frame view is released back to its ring when the next one is requested,
+        close the iterator before closing the group to release the last one.
+        A worker exiting with an error raises WorkerFailedError once its ring is empty.
+
+        Returns:
+            Iterator: Yields (worker, seed, offset, int_protocol, trans_protocol, cast index,
+                frame memoryview)
+        """
+        delay = 0.0
+        while True:
+            found = False
+            for worker, ring in enumerate(self.rings):
+                entry = ring.peek()
+                if entry is None:
+                    continue
+                found, delay = True, 0.0
+                self.counts[worker] += 1
+                try:
+                    yield (worker,) + entry
+                finally:
+                    entry[-1].release()
+                    ring.release()
+            if not found:
+                self.check_workers()
+                if not any(process.is_alive() for process in self.processes) and \
+                        not any(ring.used() for ring in self.rings):
+                    return
+                time.sleep(delay)
+                delay = min(delay * 2 or 0.00001, 0.001)
+
+    def check_workers(self) -> None:
+        """ Checks no worker has exited with an error after its ring was read empty"""
+        failed = [(worker, process.exitcode) for worker, process in enumerate(self.processes)
+            if process.exitcode not in (None, 0) and not self.rings[worker].used()]
+        if failed:
+            raise ex.WorkerFailedError('Generator workers exited with errors. ' +
+                ', '.join(f'(worker {worker}: exit code {code})' for worker, code in failed))
+
+    def throughput(self, seconds: float) -> dict:
+        """ Frames per second received from each worker
+
+        Parameters:
+            seconds (float): Time the workers ran for
+
+        Returns:
+            dict: Frames per second keyed on (worker, CPU)
+        """
+        return {(worker, self.cpus[worker]): count / seconds if seconds > 0 else 0.0
+            for worker, count in enumerate(self.counts)}
+
+    def update_metrics(self, metrics: Metrics) -> None:
+        """ Records ring utilisation and backpressure stalls
+
+        Parameters:
+            metrics (Metrics): Metrics object to record in
+        """
+        for worker, ring in enumerate(self.rings):
+            metrics.set_gauge('pynetfuzz_ring_utilisation', ring.utilisation(), ring=str(worker))
+            stalls = ring.stalls()
+            if stalls > self._stalls[worker]:
+                metrics.inc('pynetfuzz_ring_stalls_total', stalls - self._stalls[worker],
+                    ring=str(worker))
+                self._stalls[worker] = stalls
+
+    def stop(self, timeout: float=5.0) -> None:
+        """ Stops the worker processes
+
+        Parameters:
+            timeout (float): Seconds to wait for each worker before terminating it
+        """
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    def close(self) -> None:
+        """ Stops the workers and frees the rings"""
+        self.stop()
+        for ring in self.rings:
+            ring.close()
+
+    def __len__(self) -> int:
+        """Built-in len method"""
+        return self.workers
+
+    def __str__(self) -> str:
+        """Built-in str method"""
+        return f'WorkerGroup - Workers: ({self.workers}), Rings: ' \
+            f'({", ".join(str(ring) for ring in self.rings)})'
+
+    def __repr__(self) -> str:
+        """Built-in repr method"""
+        return f'Object: {self.__class__.__name__} ({self.workers})'
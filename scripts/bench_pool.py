@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark packet generation with and without a PacketPool.
+Reports time per packet, Scapy layer allocations and tracemalloc peak memory.
+
+Usage: python scripts/bench_pool.py [N packets] [pool size]
+"""
+# Python library imports
+import os
+import sys
+import time
+import tracemalloc
+import scapy.packet
+# Package imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pynetfuzz.hosts import Host # pylint: disable=wrong-import-position
+from pynetfuzz.packet import PacketDetails # pylint: disable=wrong-import-position
+from pynetfuzz.packet_generator import packet_generator # pylint: disable=wrong-import-position
+from pynetfuzz.pool import PacketPool # pylint: disable=wrong-import-position
+
+
+def count_layer_allocations():
+    """ Wraps Scapy's Packet initialiser to count layer objects created
+
+    Returns:
+        list: Single item list holding the running allocation count
+    """
+    counter = [0]
+    original = scapy.packet.Packet.__init__
+
+    def counting_init(self, *args, **kwargs):
+        counter[0] += 1
+        original(self, *args, **kwargs)
+
+    scapy.packet.Packet.__init__ = counting_init
+    return counter
+
+
+def bench(n_packets: int, counter: list, pool: PacketPool=None) -> tuple:
+    """ Generates and builds n_packets, as the sender would, releasing pooled packets
+
+    Returns:
+        tuple: (seconds, layer allocations, peak traced bytes)
+    """
+    target = Host('192.168.1.*', None, None)
+    details = PacketDetails({'int_protocol': 0x800, 'trans_protocol': 0x06, 'cast': None,
+        'vlan': False, 'headers': True, 'min_length': None, 'max_length': None})
+    allocations = counter[0]
+    tracemalloc.start()
+    start = time.perf_counter()
+    for packet in packet_generator(target, details, seed=1, max_packets=n_packets, pool=pool):
+        bytes(packet.packet)
+        if pool is not None:
+            pool.release(packet)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, counter[0] - allocations, peak
+
+
+def main():
+    """ Benchmark run method"""
+    n_packets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    counter = count_layer_allocations()
+
+    for name, pool in (('allocating', None), (f'pooled ({pool_size})', PacketPool(pool_size))):
+        seconds, allocations, peak = bench(n_packets, counter, pool)
+        print(f'{name:>14}: {seconds / n_packets * 1e6:8.1f} us/pkt, '
+            f'{allocations / n_packets:6.2f} layer allocs/pkt, peak {peak / 1024:8.1f} KiB')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark drawing randomised header fields one randint call per field against a single
+getrandbits call per packet sliced by a FieldLayout.
+Reports time per packet's headers for IPv4 + TCP and IPv6 + TCP.
+
+Usage: python scripts/bench_randomiser.py [N packets]
+"""
+# Python library imports
+import os
+import random
+import sys
+import time
+# Package imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pynetfuzz.const import ( # pylint: disable=wrong-import-position
+    IPV4_HEADER_FIELDS, IPV6_HEADER_FIELDS, TCP_HEADER_FIELDS,
+)
+from pynetfuzz.randomiser import FieldLayout # pylint: disable=wrong-import-position
+
+
+def per_field(n_packets: int, ip_fields: tuple) -> float:
+    """ Draws every field with its own randint call, as the bit_* methods used to
+
+    Returns:
+        float: Seconds taken
+    """
+    ip_header, tcp_header = {}, {}
+    randint = random.randint
+    start = time.perf_counter()
+    for _ in range(n_packets):
+        for name, bits in ip_fields:
+            ip_header[name] = randint(0, (1 << bits) - 1)
+        for name, bits in TCP_HEADER_FIELDS:
+            tcp_header[name] = randint(0, (1 << bits) - 1)
+    return time.perf_counter() - start
+
+
+def layout(n_packets: int, ip_fields: tuple) -> float:
+    """ Draws every field of a packet's headers from one getrandbits call
+
+    Returns:
+        float: Seconds taken
+    """
+    ip_header, tcp_header = {}, {}
+    field_layout = FieldLayout(ip_fields, TCP_HEADER_FIELDS)
+    start = time.perf_counter()
+    for _ in range(n_packets):
+        field_layout.draw(ip_header, tcp_header)
+    return time.perf_counter() - start
+
+
+def main():
+    """ Benchmark run method"""
+    n_packets = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for name, ip_fields in (('ipv4 + tcp', IPV4_HEADER_FIELDS), ('ipv6 + tcp', IPV6_HEADER_FIELDS)):
+        random.seed(1)
+        old = per_field(n_packets, ip_fields)
+        random.seed(1)
+        new = layout(n_packets, ip_fields)
+        print(f'{name:>10}: per field {old / n_packets * 1e6:6.2f} us/pkt, '
+            f'layout {new / n_packets * 1e6:6.2f} us/pkt, {old / new:5.1f}x')
+
+
+if __name__ == "__main__":
+    main()
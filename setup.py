@@ -11,4 +11,7 @@ setup(
         'psutil==5.8.0',
         'scapy==2.4.5'
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
 )
\ No newline at end of file
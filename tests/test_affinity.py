@@ -0,0 +1,88 @@
+"""
+Unit tests for CPU affinity methods and CpuPlacement class
+"""
+import unittest
+import tempfile
+import os
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz import affinity
+# Module under test
+from pynetfuzz.affinity import CpuPlacement, parse_cpulist
+
+# Testing the CPU affinity methods
+class TestAffinity(unittest.TestCase):
+    """ Testing CPU affinity methods and CpuPlacement class"""
+
+    def setUp(self):
+        """ Builds a fake sysfs with a NIC on NUMA node 1"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.sysfs = (affinity.SYSFS_NET, affinity.SYSFS_NODE)
+        affinity.SYSFS_NET = os.path.join(self.directory.name, 'net')
+        affinity.SYSFS_NODE = os.path.join(self.directory.name, 'node')
+        self.available = affinity.available_cpus()
+        files = {
+            'net/eth0/device/numa_node': '1',
+            'net/veth0/device/numa_node': '-1',
+            'node/node0/cpulist': '0-3',
+            'node/node1/cpulist': ','.join(str(cpu) for cpu in self.available),
+        }
+        for path, value in files.items():
+            path = os.path.join(self.directory.name, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write(value + '\n')
+
+    def tearDown(self):
+        """ Restores the sysfs paths"""
+        affinity.SYSFS_NET, affinity.SYSFS_NODE = self.sysfs
+        self.directory.cleanup()
+
+    def test_parse_cpulist(self):
+        """ Test kernel cpulist parsing"""
+        self.assertEqual(parse_cpulist('0-3,8,10-11\n'), (0, 1, 2, 3, 8, 10, 11))
+        self.assertEqual(parse_cpulist('5'), (5,))
+        self.assertEqual(parse_cpulist(''), ())
+
+    def test_numa_node(self):
+        """ Test the interface NUMA node and node CPUs are read from sysfs"""
+        self.assertEqual(affinity.interface_numa_node('eth0'), 1)
+        self.assertIsNone(affinity.interface_numa_node('veth0'))
+        self.assertIsNone(affinity.interface_numa_node('missing0'))
+        self.assertEqual(affinity.node_cpus(0), (0, 1, 2, 3))
+        self.assertEqual(affinity.node_cpus(7), ())
+
+    def test_placement(self):
+        """ Test the sender and workers are placed on the interface's node CPUs"""
+        placement = CpuPlacement(3, 'eth0')
+        self.assertEqual(placement.node, 1)
+        self.assertEqual(placement.cpus, self.available)
+        self.assertEqual(placement.sender, self.available[0])
+        self.assertEqual(len(placement.worker_cpus), 3)
+        for cpu in placement.worker_cpus:
+            self.assertIn(cpu, self.available)
+        placement = CpuPlacement(1, 'veth0', cpus=self.available[-1:])
+        self.assertEqual((placement.node, placement.sender, placement.worker_cpus),
+            (None, self.available[-1], [self.available[-1]]))
+        self.assertTrue(placement.shared)
+        if len(self.available) > 1:
+            # Workers share the CPUs left after the sender's
+            placement = CpuPlacement(4, cpus=self.available[:2])
+            self.assertEqual(placement.worker_cpus, [self.available[1]] * 4)
+            self.assertTrue(placement.shared)
+            self.assertFalse(CpuPlacement(1, cpus=self.available[:2]).shared)
+        with self.assertRaises(ex.CpuNotAvailableError):
+            CpuPlacement(1, cpus=(max(self.available) + 1,))
+
+    def test_pin(self):
+        """ Test pinning the process to a CPU"""
+        original = os.sched_getaffinity(0)
+        try:
+            self.assertTrue(affinity.pin(self.available[-1]))
+            self.assertEqual(os.sched_getaffinity(0), {self.available[-1]})
+            self.assertFalse(affinity.pin(None))
+        finally:
+            os.sched_setaffinity(0, original)
+
+if __name__ == "__main__":
+    unittest.main()
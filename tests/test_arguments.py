@@ -26,6 +26,14 @@ class TestArgumentParser(unittest.TestCase):
         self.assertEqual((result.target_ip, result.source_ip), ('10.10.255.1', '192.168.1.*'))
         result = parse_args(['0.0.0.0', 'eth0', '1000', '-sip', '0.0.0.*'])
         self.assertEqual((result.target_ip, result.source_ip), ('0.0.0.0', '0.0.0.*'))
+        result = parse_args(['10.10.255.1', 'eth0', '1000', '-sip', '10.0.0.0/12'])
+        self.assertEqual(result.source_ip, '10.0.0.0/12')
+        result = parse_args(['10.10.255.1', 'eth0', '1000', '-sip', '10.0.0.5-10.0.3.200'])
+        self.assertEqual(result.source_ip, '10.0.0.5-10.0.3.200')
+        result = parse_args(['10.10.255.1', 'eth0', '1000', '-sip', 'fd00::/8'])
+        self.assertEqual(result.source_ip, 'FD00::/8')
+        result = parse_args(['fd00::1', 'eth0', '1000', '-sip', 'fd00::/8'])
+        self.assertEqual((result.target_ip, result.source_ip), ('fd00::1', 'FD00::/8'))
 
     def test_invalid_ip_arg(self):
         """ Test invalid ip argument parsing"""
@@ -53,6 +61,14 @@ class TestArgumentParser(unittest.TestCase):
             parse_args(['', 'eth0', '1000', '-sip', '192.168.1.254'])
         with self.assertRaises(SystemExit):
             parse_args(['192.168.1.254', 'eth0', '1000', '-sip', ''])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-sip', '10.0.3.200-10.0.0.5'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-sip', 'fd00::/200'])
+        with self.assertRaises(SystemExit):
+            parse_args(['fd00::/8', 'eth0', '1000'])
+        with self.assertRaises(SystemExit):
+            parse_args(['fd00:::1', 'eth0', '1000'])
 
     def test_valid_interface_name_arg(self):
         """ Test valid interface name argument parsing"""
@@ -155,13 +171,12 @@ class TestArgumentParser(unittest.TestCase):
         result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'iPv6'])
         self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['ipv6']['value'])
 
-        # Temporarily removed jumbo frames
-        # result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'jumbo'])
-        # self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
-        # result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'JUMBO'])
-        # self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
-        # result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'jUmBo'])
-        # self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
+        result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'jumbo'])
+        self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
+        result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'JUMBO'])
+        self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
+        result = parse_args(['192.168.10.100', 'eth0', '1000', '-ip', 'jUmBo'])
+        self.assertEqual(result.int_protocol, const.INTERNET_PROTOCOLS_INFO['jumbo']['value'])
 
     def test_invalid_internet_protocol_arg(self):
         """ Test invalid internet protocol argument parsing"""
@@ -273,5 +288,42 @@ class TestArgumentParser(unittest.TestCase):
         with self.assertRaises(SystemExit):
             parse_args(['192.168.1.254', 'eth0', '1000', '-s', '-10'])
 
+    def test_valid_sweep_args(self):
+        """ Test valid sweep argument parsing"""
+        result = parse_args(['192.168.1.254', 'eth0', '1000'])
+        self.assertEqual((result.sweep, result.buckets, result.shard),
+            (False, const.DEFAULT_LENGTH_BUCKETS, None))
+        result = parse_args(['192.168.1.254', 'eth0', '1000', '-sw', '-b', '8', '-sh', '2/4'])
+        self.assertEqual((result.sweep, result.buckets, result.shard), (True, 8, (2, 4)))
+
+    def test_invalid_sweep_args(self):
+        """ Test invalid sweep argument parsing"""
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-sw', '-b', '0'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-sw', '-sh', '4/4'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-sw', '-sh', '1-4'])
+
+    def test_valid_affinity_args(self):
+        """ Test valid worker and affinity argument parsing"""
+        result = parse_args(['192.168.1.254', 'eth0', '1000'])
+        self.assertEqual((result.workers, result.affinity, result.cpus), (None, False, None))
+        result = parse_args(['192.168.1.254', 'eth0', '1000', '-w', '4', '-af',
+            '-cpu', '0-3,8,10-11'])
+        self.assertEqual((result.workers, result.affinity, result.cpus),
+            (4, True, (0, 1, 2, 3, 8, 10, 11)))
+
+    def test_invalid_affinity_args(self):
+        """ Test invalid worker and affinity argument parsing"""
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-w', '0'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-cpu', '3-0'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-cpu', '0,,1'])
+        with self.assertRaises(SystemExit):
+            parse_args(['192.168.1.254', 'eth0', '1000', '-cpu', 'all'])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for Campaign and PhasePlan classes
+"""
+import json
+import logging
+import os
+import tempfile
+import unittest
+# Package imports
+from pynetfuzz import const
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.hosts import Host
+from pynetfuzz.arguments import Args
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.campaign import Campaign, PhasePlan, load_campaign, yaml
+
+
+# Testing the Campaign Class
+class TestCampaign(unittest.TestCase):
+    """ Testing Campaign and PhasePlan classes and methods"""
+
+    @staticmethod
+    def get_config(**kwargs):
+        """ Method to create a two phase campaign configuration"""
+        config = {
+            'target_ip': '10.0.0.1',
+            'network_interface': 'lo',
+            'seed': 7,
+            'phases': [
+                {'name': 'tcp small', 'n_packets': 30, 'int_protocol': 'ipv4',
+                    'trans_protocol': 'tcp', 'max_length': 64, 'vlan': True},
+                {'name': 'udp sweep', 'n_packets': 20, 'trans_protocol': 'UDP',
+                    'headers': False, 'sweep': True, 'buckets': 2},
+            ]}
+        config.update(kwargs)
+        return config
+
+    def test_compile(self):
+        """ Test phases are validated and compiled with the campaign defaults"""
+        campaign = Campaign(self.get_config(journal='run.journal'))
+        self.assertEqual(len(campaign), 2)
+        first, second = campaign.phases
+        self.assertEqual((first.name, first.args.n_packets, first.args.seed), ('tcp small', 30, 7))
+        self.assertEqual(first.details.trans_protocol,
+            const.TRANSPORT_PROTOCOLS_INFO['tcp']['value'])
+        self.assertEqual((first.details.max_length, first.details.vlan), (64, True))
+        self.assertIsNone(first.sweep)
+        self.assertEqual(second.details.int_protocol,
+            const.INTERNET_PROTOCOLS_INFO['ipv4']['value'])
+        self.assertEqual((second.details.headers, second.details.vlan), (False, False))
+        self.assertEqual(second.sweep.buckets, 2)
+        self.assertEqual(campaign.options.journal, 'run.journal')
+        self.assertEqual(second.args.journal, 'run.journal')
+        self.assertEqual(str(campaign), 'Campaign - Phases: (2), Packets: (50)')
+
+    def test_invalid_config(self):
+        """ Test invalid campaigns are rejected before anything is sent"""
+        with self.assertRaises(ex.CampaignFormatError):
+            Campaign({'phases': []})
+        with self.assertRaises(ex.CampaignFormatError):
+            Campaign(['phase'])
+        with self.assertRaises(ex.CampaignFormatError):
+            Campaign(self.get_config(phases=['phase']))
+        with self.assertRaises(ex.CampaignFormatError): # Campaign option in a phase
+            Campaign(self.get_config(phases=[{'n_packets': 1, 'journal': 'a'}]))
+        with self.assertRaises(ex.CampaignFormatError):
+            Campaign(self.get_config(checkpoint='run.checkpoint'))
+        with self.assertRaises(ex.CampaignPhaseError):
+            Campaign(self.get_config(phases=[{'n_packets': 1, 'int_protocol': 'ipx'}]))
+        with self.assertRaises(ex.CampaignPhaseError):
+            Campaign(self.get_config(phases=[{'n_packets': 1, 'vlan': 'yes'}]))
+        with self.assertRaises(ex.CampaignPhaseError):
+            Campaign(self.get_config(phases=[{'n_packets': 1, 'colour': 'red'}]))
+        with self.assertRaises(ex.CampaignPhaseError): # Missing packet count
+            Campaign(self.get_config(phases=[{'name': 'empty'}]))
+        with self.assertRaises(ex.InternetProtocolInvalidValueError):
+            Campaign(self.get_config(phases=[{'n_packets': 1, 'int_protocol': 'ipv6'}]))
+
+    def test_phase_plan(self):
+        """ Test a phase plan takes the internet protocol from the target"""
+        plan = PhasePlan('v6', Args({'target_ip': 'fd00::1', 'n_packets': 1}))
+        self.assertEqual(plan.details.int_protocol,
+            const.INTERNET_PROTOCOLS_INFO['ipv6']['value'])
+        with self.assertRaises(ex.WorkerOptionsError):
+            PhasePlan('workers', Args({'target_ip': '10.0.0.1', 'n_packets': 1,
+                'workers': 2, 'journal': 'run.journal'}))
+
+    def test_load_campaign(self):
+        """ Test campaign files are loaded"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'campaign.json')
+            with open(path, 'w', encoding='utf-8') as campaign_file:
+                json.dump(self.get_config(), campaign_file)
+            self.assertEqual(len(Campaign.from_file(path)), 2)
+            with open(path, 'w', encoding='utf-8') as campaign_file:
+                campaign_file.write('{"phases": [')
+            with self.assertRaises(ex.CampaignFormatError):
+                load_campaign(path)
+            path = os.path.join(directory, 'campaign.yaml')
+            with open(path, 'w', encoding='utf-8') as campaign_file:
+                campaign_file.write('phases:\n  - n_packets: 1\n')
+            if yaml is None:
+                with self.assertRaises(ex.CampaignFormatError):
+                    load_campaign(path)
+            else:
+                self.assertEqual(load_campaign(path), {'phases': [{'n_packets': 1}]})
+
+    def test_run_campaign(self):
+        """ Test every phase is sent in one process"""
+        sent = []
+        sendp, ping_host, cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        packet.sendp = lambda frame, **kwargs: sent.append(frame)
+        Host.ping_host = lambda host: True
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                run.run_campaign(Campaign(self.get_config()))
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host = sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(len(sent), 50)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for CastTable class
+"""
+import inspect
+import unittest
+from scapy.layers.l2 import Ether
+# Package imports
+from pynetfuzz import const
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.randomiser import Randomiser
+from pynetfuzz.packet_generator import packet_generator
+# Module under test
+from pynetfuzz.casts import CastTable, CAST_TABLE, multicast_mac
+
+# Testing the CastTable Class
+class TestCastTable(unittest.TestCase):
+    """ Testing CastTable class and methods"""
+
+    IPV4_VALUE = const.INTERNET_PROTOCOLS_INFO['ipv4']['value']
+    IPV6_VALUE = const.INTERNET_PROTOCOLS_INFO['ipv6']['value']
+    JUMBO_VALUE = const.INTERNET_PROTOCOLS_INFO['jumbo']['value']
+
+    @staticmethod
+    def get_details(int_protocol, cast):
+        """ Static method for creating test packet details
+
+        Returns:
+            PacketDetails: Details with the given protocol and cast
+        """
+        return PacketDetails({'int_protocol': int_protocol, 'trans_protocol': 17,
+            'cast': cast, 'vlan': False, 'headers': False, 'length': 0})
+
+    def test_multicast_mac(self):
+        """ Test multicast MAC derivation"""
+        self.assertEqual(multicast_mac('224.0.0.1'), '01:00:5E:00:00:01')
+        self.assertEqual(multicast_mac('239.255.255.250'), '01:00:5E:7F:FF:FA')
+        self.assertEqual(multicast_mac('224.128.0.1'), '01:00:5E:00:00:01') # 23 bits
+        self.assertEqual(multicast_mac('FF02::1'), '33:33:00:00:00:01')
+        self.assertEqual(multicast_mac('FF02::1:FF00:1234'), '33:33:FF:00:12:34')
+
+    def test_tables(self):
+        """ Test tables of each cast type and internet protocol"""
+        casts = CastTable()
+        self.assertIsNone(casts.table(self.IPV4_VALUE, 'unicast'))
+        self.assertEqual(casts.table(self.IPV4_VALUE, 'broadcast'),
+            (('255.255.255.255', 'FF:FF:FF:FF:FF:FF'),))
+        self.assertEqual(casts.table(self.IPV6_VALUE, 'broadcast'),
+            (('ff02::1', '33:33:00:00:00:01'),))
+        self.assertEqual(casts.table(self.JUMBO_VALUE, 'multicast'),
+            casts.table(self.IPV4_VALUE, 'multicast'))
+        for ip, mac in casts.table(self.IPV4_VALUE, 'multicast'):
+            self.assertTrue(ip.startswith(('224.', '239.')))
+            self.assertTrue(mac.startswith('01:00:5E'))
+        for ip, mac in casts.table(self.IPV6_VALUE, 'multicast'):
+            self.assertTrue(ip.startswith('ff0'))
+            self.assertTrue(mac.startswith('33:33'))
+
+    def test_destination(self):
+        """ Test destination addresses are drawn from the cast's table"""
+        casts = CastTable()
+        randomiser = Randomiser(1)
+        target = Host('192.168.1.1', '00:E7:EE:E7:61:5E', '80')
+        casts.destination(randomiser, self.get_details(self.IPV4_VALUE, 'unicast'), target)
+        self.assertEqual((target.ip, target.mac), ('192.168.1.1', '00:E7:EE:E7:61:5E'))
+
+    def test_shared_table(self):
+        """ Test generators share the module's table unless given their own"""
+        self.assertIs(inspect.signature(packet_generator).parameters['casts'].default,
+            CAST_TABLE)
+        self.assertEqual(len(CAST_TABLE), len(CastTable()))
+        casts.destination(randomiser, self.get_details(self.IPV4_VALUE, 'broadcast'), target)
+        self.assertEqual((target.ip, target.mac), ('255.255.255.255', 'FF:FF:FF:FF:FF:FF'))
+        casts.destination(randomiser, self.get_details(self.IPV6_VALUE, 'multicast'), target)
+        self.assertIn((target.ip, target.mac), casts.table(self.IPV6_VALUE, 'multicast'))
+
+    def test_generator(self):
+        """ Test generated frames carry cast destinations while the target is unchanged"""
+        target = Host('192.168.1.1', '00:E7:EE:E7:61:5E', '80')
+        details = PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': False, 'headers': False, 'min_length': None, 'max_length': 64})
+        seen = set()
+        for packet in packet_generator(target, details, seed=7, max_packets=200):
+            destination = Ether(bytes(packet.packet)).dst.upper()
+            seen.add(packet.details.cast)
+            if packet.details.cast == 'unicast':
+                self.assertEqual(destination, '00:E7:EE:E7:61:5E')
+            elif packet.details.cast == 'broadcast' and \
+                    packet.details.int_protocol != self.IPV6_VALUE:
+                self.assertEqual(destination, 'FF:FF:FF:FF:FF:FF')
+            else:
+                self.assertTrue(destination.startswith(('01:00:5E', '33:33')))
+        self.assertEqual(seen, set(const.CAST_TYPES))
+        self.assertEqual((target.ip, target.mac), ('192.168.1.1', '00:E7:EE:E7:61:5E'))
+
+    def test_shared_table(self):
+        """ Test generators share the module's table unless given their own"""
+        self.assertIs(inspect.signature(packet_generator).parameters['casts'].default,
+            CAST_TABLE)
+        self.assertEqual(len(CAST_TABLE), len(CastTable()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for Checkpoint class
+"""
+import unittest
+import tempfile
+import os
+# Package imports
+from pynetfuzz import const
+import pynetfuzz.exceptions as ex
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.randomiser import Randomiser
+from pynetfuzz.packet_generator import packet_generator
+# Module under test
+from pynetfuzz.checkpoint import Checkpoint
+
+# Testing the Checkpoint Class
+class TestCheckpoint(unittest.TestCase):
+    """ Testing Checkpoint class and methods"""
+
+    @staticmethod
+    def get_test_generator(seed, max_packets, state=None):
+        """ Static method for creating a test packet generator
+
+        Returns:
+            Generator: Packet generator with test hosts and details
+        """
+        return packet_generator(
+            Host("192.168.1.1", "00:E7:EE:E7:61:5E", "8080"),
+            PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+                'vlan': False, 'headers': True, 'min_length': None, 'max_length': None}),
+            seed=seed, max_packets=max_packets, state=state)
+
+    def test_save_and_load(self):
+        """ Test checkpoint round trips through a file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.checkpoint')
+            Randomiser(5)
+            checkpoint = Checkpoint(5)
+            for timestamp, online in ((1.5, True), (2.5, True), (3.5, False)):
+                checkpoint.record_liveness(timestamp, online)
+            checkpoint.update(5, 40, Randomiser.getstate(), 1040, 10, 12.5, 800)
+            checkpoint.master = 3
+            checkpoint.save(path)
+            self.assertEqual(os.listdir(directory), ['run.checkpoint'])
+
+            loaded = Checkpoint.load(path)
+            self.assertEqual(
+                (loaded.seed, loaded.offset, loaded.packet_count, loaded.gen_count,
+                    loaded.elapsed, loaded.cycle, list(loaded.liveness)),
+                (5, 40, 1040, 10, 12.5, 800, [(1.5, True), (3.5, False)]))
+            self.assertEqual(loaded.master, 3)
+            self.assertEqual(loaded.state, Randomiser.getstate())
+
+    def test_liveness_bounded(self):
+        """ Test only the most recent liveness transitions are kept"""
+        checkpoint = Checkpoint(5)
+        for timestamp in range(const.CHECKPOINT_LIVENESS_EVENTS * 3):
+            checkpoint.record_liveness(float(timestamp), timestamp % 2 == 0)
+        self.assertEqual(len(checkpoint.liveness), const.CHECKPOINT_LIVENESS_EVENTS)
+        self.assertEqual(checkpoint.liveness[-1][0], const.CHECKPOINT_LIVENESS_EVENTS * 3 - 1)
+
+    def test_invalid_load(self):
+        """ Test invalid checkpoint files"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.checkpoint')
+            with self.assertRaises(ex.CheckpointFormatError):
+                Checkpoint.load(path)
+            with open(path, 'w') as file:
+                file.write('{"version": 0}')
+            with self.assertRaises(ex.CheckpointFormatError):
+                Checkpoint.load(path)
+
+    def test_resume_generator(self):
+        """ Test a generator resumed from a checkpoint continues with the exact next packet"""
+        seed, split = 99, 40
+        expected = [bytes(packet.packet) for packet in self.get_test_generator(seed, 100)]
+
+        generator = self.get_test_generator(seed, 100)
+        for _ in range(split):
+            next(generator)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.checkpoint')
+            checkpoint = Checkpoint(seed)
+            checkpoint.update(seed, split, Randomiser.getstate(), split, 0, 0.0)
+            checkpoint.save(path)
+            generator.close()
+            Randomiser(1) # Disturb the random state as a new process would
+            checkpoint = Checkpoint.load(path)
+
+        resumed = [bytes(packet.packet) for packet in self.get_test_generator(
+            checkpoint.seed, 100 - checkpoint.offset, checkpoint.state)]
+        self.assertEqual(resumed, expected[split:])
+
+if __name__ == "__main__":
+    unittest.main()
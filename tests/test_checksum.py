@@ -0,0 +1,148 @@
+"""
+Unit tests for checksum methods
+"""
+import unittest
+import random
+from scapy.layers.l2 import Ether
+from scapy.layers.inet import IP, TCP, UDP
+from scapy.layers.inet6 import IPv6
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.packet import Packet, PacketDetails
+from pynetfuzz.hosts import Host
+# Module under test
+from pynetfuzz import checksum
+from pynetfuzz.checksum import np
+
+# Testing the checksum methods
+class TestChecksum(unittest.TestCase):
+    """ Testing checksum methods"""
+
+    @staticmethod
+    def get_test_packet(trans_protocol, vlan=False):
+        """ Static method for building a test packet
+
+        Returns:
+            Packet: Built packet with test hosts and details
+        """
+        packet = Packet(
+            Host("192.168.1.1", "00:E7:EE:E7:61:5E", "8080"),
+            Host("192.168.1.100", "99:00:A9:4F:3D:7E", "999"),
+            PacketDetails({'int_protocol': 2048, 'trans_protocol': trans_protocol,
+                'cast': 'unicast', 'vlan': vlan, 'headers': False, 'length': 101}))
+        packet.add_all_layers()
+        return packet
+
+    def test_checksum(self):
+        """ Test full checksum (RFC 1071 example data)"""
+        data = bytes([0x00, 0x01, 0xf2, 0x03, 0xf4, 0xf5, 0xf6, 0xf7])
+        self.assertEqual(checksum.ones_complement_sum(data), 0xddf2)
+        self.assertEqual(checksum.checksum(data), 0x220d)
+        self.assertEqual(checksum.checksum(b'\x01'), checksum.checksum(b'\x01\x00'))
+
+    def test_update(self):
+        """ Test incremental updates match recomputing the checksum"""
+        rng = random.Random(3)
+        for _ in range(200):
+            data = bytearray(rng.getrandbits(8) for _ in range(40))
+            old_checksum = checksum.checksum(data)
+            offset = rng.randrange(0, 36, 2)
+            new_field = bytes(rng.getrandbits(8) for _ in range(4))
+            new_checksum = checksum.update(old_checksum, bytes(data[offset:offset + 4]), new_field)
+            data[offset:offset + 4] = new_field
+            self.assertIn(checksum.ones_complement_sum(data) + new_checksum, (0xFFFF, 0x1FFFE))
+        with self.assertRaises(ex.ChecksumFieldLengthError):
+            checksum.update(0, b'\x00\x01', b'\x00')
+
+    def test_zero_checksums(self):
+        """ Test only UDP treats a zero checksum as no checksum"""
+        for optional, expected in (((), 0xFFFE), ((0,), 0)):
+            frame = bytearray(b'\x00\x00\x12\x34\xed\xcb') # Valid checksum of zero
+            checksum.patch_field(frame, 2, b'\x12\x35', (0,), optional)
+            self.assertEqual(frame[:2], expected.to_bytes(2, 'big'))
+        frame = bytearray(b'\x00\x01\x12\x34\xed\xca')
+        checksum.patch_field(frame, 2, b'\x12\x35', (0,), (0,))
+        self.assertEqual(frame[:2], b'\xff\xff') # UDP sends a zero result as 0xFFFF
+
+    def test_patch_payload(self):
+        """ Test replacing a payload of another length updates the checksum"""
+        rng = random.Random(4)
+        for length in (0, 1, 7, 64, 301):
+            frame = bytearray(b'\x00\x00' + bytes(rng.getrandbits(8) for _ in range(40)))
+            frame[:2] = checksum.checksum(frame).to_bytes(2, 'big')
+            payload = bytes(rng.getrandbits(8) for _ in range(length))
+            checksum.patch_payload(frame, 20, payload, (0,))
+            self.assertEqual(frame[20:], payload)
+            self.assertEqual(checksum.checksum(frame), 0)
+
+    @unittest.skipUnless(np, 'NumPy is not installed')
+    def test_batch_checksums(self):
+        """ Test vectorised checksums match per frame checksums"""
+        rng = np.random.default_rng(5)
+        frames = rng.integers(0, 256, size=(50, 61), dtype=np.uint8)
+        result = checksum.batch_checksums(frames, 3)
+        self.assertEqual(list(result), [checksum.checksum(bytes(row[3:])) for row in frames])
+
+    def test_patch_frame(self):
+        """ Test patched frames carry the checksums Scapy computes from scratch"""
+        for trans_protocol, layer in ((6, TCP), (17, UDP)):
+            for vlan in (False, True):
+                packet = self.get_test_packet(trans_protocol, vlan)
+                packet.build_frame()
+                packet.patch_ports(1234, 53)
+                packet.patch_addresses("10.20.30.40", "172.16.0.9")
+                patched = Ether(bytes(packet.frame))
+
+                expected = patched.copy()
+                del expected[IP].chksum
+                del expected[layer].chksum
+                expected = Ether(bytes(expected))
+                self.assertEqual((patched[layer].sport, patched[layer].dport), (1234, 53))
+                self.assertEqual((patched[IP].src, patched[IP].dst), ("10.20.30.40", "172.16.0.9"))
+                self.assertEqual(patched[IP].chksum, expected[IP].chksum)
+                self.assertEqual(patched[layer].chksum, expected[layer].chksum)
+
+    def test_patch_ipv6_extension_chain(self):
+        """ Test headers are located through an IPv6 extension chain when patching"""
+        packet = Packet(
+            Host("2001:db8::1", "00:E7:EE:E7:61:5E", "8080"),
+            Host("2001:db8::100", "99:00:A9:4F:3D:7E", "999"),
+            PacketDetails({'int_protocol': 0x86DD, 'trans_protocol': 17, 'cast': 'unicast',
+                'vlan': True, 'headers': True, 'length': 33,
+                'ip_header': {'tc': 0, 'fl': 0, 'hlim': 64},
+                'ip6_extensions': ('hop_by_hop', 'fragment', 'destination')}))
+        packet.add_all_layers()
+        frame = packet.build_frame()
+        _, ip_offset, protocol, transport_offset = checksum.frame_offsets(frame)
+        self.assertEqual((ip_offset, protocol, transport_offset), (18, 17, 18 + 40 + 24))
+
+        packet.patch_ports(1234, 53)
+        packet.patch_addresses("2001:db8::40", "2001:db8::9")
+        patched = Ether(bytes(packet.frame))
+        expected = patched.copy()
+        del expected[UDP].chksum
+        expected = Ether(bytes(expected))
+        self.assertEqual((patched[UDP].sport, patched[UDP].dport), (1234, 53))
+        self.assertEqual((patched[IPv6].src, patched[IPv6].dst),
+            ("2001:db8::40", "2001:db8::9"))
+        with self.assertRaises(ex.PacketAddressVersionError):
+            packet.patch_addresses("10.20.30.40", "2001:db8::9")
+        self.assertEqual(patched[UDP].chksum, expected[UDP].chksum)
+
+    def test_corrupt_checksums(self):
+        """ Test deliberately corrupted checksums"""
+        packet = self.get_test_packet(6)
+        good = Ether(bytes(packet.build_frame()))
+        packet.corrupt_checksums(0x00FF, 0)
+        bad = Ether(bytes(packet.frame))
+        self.assertEqual(bad[IP].chksum, good[IP].chksum ^ 0x00FF)
+        self.assertEqual(bad[TCP].chksum, good[TCP].chksum)
+
+        packet.details.set('bad_checksum', (0, 0x0F0F))
+        packet.add_all_layers()
+        bad = Ether(bytes(packet.frame))
+        self.assertEqual(bad[IP].chksum, good[IP].chksum)
+        self.assertNotEqual(bad[TCP].chksum, good[TCP].chksum)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Unit tests for Corpus class and corpus files
+"""
+import logging
+import os
+import tempfile
+import unittest
+from scapy.config import conf
+# Package imports
+from pynetfuzz import run
+from pynetfuzz.arguments import Args, parse_pregenerate_args
+from pynetfuzz.campaign import PhasePlan
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+from pynetfuzz.const import CAST_TYPES
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.corpus import Corpus, write_corpus, render_chunk, np
+
+TARGET = Host('10.0.0.1', None, None)
+
+
+class Capture():
+    """ Layer 2 socket stand-in recording the sent frames"""
+    sent = []
+
+    def __init__(self, iface=None):
+        self.iface = iface
+
+    def send(self, frame):
+        """ Records a frame"""
+        Capture.sent.append(bytes(frame))
+
+    def close(self):
+        """ Nothing to close"""
+
+
+# Testing the Corpus Class
+class TestCorpus(unittest.TestCase):
+    """ Testing corpus files and the Corpus class and methods"""
+
+    def setUp(self):
+        """ Writes corpus files in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.corpus')
+        self.details = PacketDetails({'int_protocol': None, 'trans_protocol': None,
+            'cast': None, 'vlan': None, 'headers': None, 'min_length': None,
+            'max_length': 300})
+
+    def tearDown(self):
+        """ Removes the corpus files"""
+        self.directory.cleanup()
+
+    def test_render_chunk(self):
+        """ Test a chunk holds the packets of seed + cycle in order"""
+        part = self.path + '.part0'
+        entries = render_chunk(part, TARGET, self.details, Host(None, None, None), 7, 100, 150)
+        self.assertEqual(len(entries), 150 * 16)
+        expected = [packet.raw() for packet in packet_generator(TARGET, self.details,
+            seed=8, max_packets=100)]
+        with open(part, 'rb') as chunk:
+            data = chunk.read()
+        self.assertEqual(data[2:2 + len(expected[0])], expected[0])
+        self.assertEqual(int.from_bytes(data[:2], 'little'), len(expected[0]))
+
+    def test_write(self):
+        """ Test the corpus does not depend on the number of processes or chunks"""
+        write_corpus(self.path, TARGET, self.details, 250, seed=3, processes=1)
+        with open(self.path, 'rb') as corpus:
+            single = corpus.read()
+        write_corpus(self.path, TARGET, self.details, 250, seed=3, processes=2,
+            chunk_packets=100)
+        with open(self.path, 'rb') as corpus:
+            self.assertEqual(corpus.read(), single)
+        self.assertEqual(os.listdir(self.directory.name), ['test.corpus'])
+        expected = [(packet.details.int_protocol, packet.details.trans_protocol,
+            CAST_TYPES.index(packet.details.cast), packet.raw())
+            for packet in packet_generator(TARGET, self.details, seed=5, max_packets=50)]
+        with Corpus(self.path) as corpus:
+            self.assertEqual((len(corpus), corpus.seed), (250, 3))
+            frames = [(int_protocol, trans_protocol, cast, bytes(frame))
+                for int_protocol, trans_protocol, cast, frame in corpus.frames(50, start=200)]
+        self.assertEqual(frames, expected)
+
+    def test_frames(self):
+        """ Test frames start over at the end of the corpus and views are released"""
+        write_corpus(self.path, TARGET, self.details, 10, seed=1, processes=1)
+        corpus = Corpus(self.path)
+        frames = [bytes(frame) for _, _, _, frame in corpus.frames(25)]
+        self.assertEqual(frames[:10], frames[10:20])
+        self.assertEqual(frames[:5], frames[20:])
+        views = corpus.frames()
+        next(views)
+        views.close()
+        corpus.close()
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_verify(self):
+        """ Test corrupted frames fail their checksums"""
+        write_corpus(self.path, TARGET, self.details, 30, seed=2, processes=1)
+        with Corpus(self.path) as corpus:
+            self.assertEqual(corpus.verify(batch=7), [])
+            offset = corpus.entry(12)[0]
+        with open(self.path, 'r+b') as corpus_file:
+            corpus_file.seek(offset + 20)
+            byte = corpus_file.read(1)
+            corpus_file.seek(offset + 20)
+            corpus_file.write(bytes([byte[0] ^ 0x01]))
+        with Corpus(self.path) as corpus:
+            self.assertEqual(corpus.verify(batch=7), [12])
+
+    def test_invalid_file(self):
+        """ Test files that are not complete corpus files are rejected"""
+        with open(self.path, 'wb') as corpus_file:
+            corpus_file.write(b'PNFC')
+        with self.assertRaises(ex.CorpusFormatError):
+            Corpus(self.path)
+        write_corpus(self.path, TARGET, self.details, 5, processes=1)
+        with open(self.path, 'r+b') as corpus_file:
+            corpus_file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ex.CorpusFormatError):
+            Corpus(self.path)
+        with open(self.path, 'r+b') as corpus_file:
+            corpus_file.write(b'XXXX')
+        with self.assertRaises(ex.CorpusFormatError):
+            Corpus(self.path)
+
+
+# Testing corpus replays
+class TestCorpusRun(unittest.TestCase):
+    """ Testing corpus options and replays"""
+
+    def test_options(self):
+        """ Test options that do not apply to replays are rejected"""
+        args = {'target_ip': '10.0.0.1', 'network_interface': 'lo', 'n_packets': 1,
+            'corpus': 'test.corpus'}
+        PhasePlan('corpus', Args(dict(args, sweep=False)))
+        for option in ({'workers': 2}, {'journal': 'a'}, {'sweep': True}):
+            with self.assertRaises(ex.CorpusOptionsError):
+                PhasePlan('corpus', Args(dict(args, **option)))
+        args = parse_pregenerate_args(['a.corpus', '-p', '2', '10.0.0.1', 'eth0', '100'])
+        self.assertEqual((args.file, args.processes, args.run.n_packets), ('a.corpus', 2, 100))
+        with self.assertRaises(SystemExit):
+            parse_pregenerate_args(['a.corpus', '10.0.0.1', 'eth0', '100', '-cp', 'b'])
+
+    def test_run(self):
+        """ Test a run replays the corpus frames in order"""
+        l2socket, ping_host, cwd = conf.L2socket, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        Capture.sent = []
+        conf.L2socket, Host.ping_host = Capture, lambda host: True
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                details = PacketDetails({'int_protocol': None, 'trans_protocol': None,
+                    'cast': None, 'vlan': None, 'headers': None, 'min_length': None,
+                    'max_length': None})
+                write_corpus('run.corpus', TARGET, details, 150, seed=4, processes=1)
+                with Corpus('run.corpus') as corpus:
+                    frames = [bytes(frame) for _, _, _, frame in corpus.frames(230)]
+                run.run(Args({'target_ip': '10.0.0.1', 'network_interface': 'lo',
+                    'n_packets': 230, 'corpus': 'run.corpus'}))
+                os.chdir(cwd)
+        finally:
+            conf.L2socket, Host.ping_host = l2socket, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(Capture.sent, frames)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Unit tests for CycleLength class
+"""
+import logging
+import os
+import tempfile
+import unittest
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args
+from pynetfuzz.checkpoint import Checkpoint
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.cycle import CycleLength
+
+
+class Interrupted(Exception):
+    """ Raised by the patched send to stop a run part way through a cycle"""
+
+
+# Testing the CycleLength Class
+class TestCycleLength(unittest.TestCase):
+    """ Testing CycleLength class and methods"""
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            CycleLength(0)
+        with self.assertRaises(ex.CycleIntervalError):
+            CycleLength(1000, 0)
+
+    def test_update(self):
+        """ Test cycles grow while stable and drop back after anomalies"""
+        cycle = CycleLength(1000, 10.0)
+        self.assertEqual(cycle.length, 100)
+        self.assertEqual([cycle.update(cycle.length, 0.1, True) for _ in range(5)],
+            [200, 400, 800, 1000, 1000])
+        self.assertEqual(cycle.update(1000, 1.0, False), 100)
+        self.assertEqual(cycle.anomalies, 1)
+
+    def test_interval(self):
+        """ Test cycles are held to the interval at the measured rate"""
+        cycle = CycleLength(100000, 2.0)
+        cycle.length = 5000
+        self.assertEqual(cycle.update(5000, 5.0, True), 2000)
+        self.assertEqual(cycle.update(2000, 100.0, True), 100) # Never below the minimum
+
+    def test_fixed(self):
+        """ Test a maximum at or below the minimum gives fixed cycles"""
+        cycle = CycleLength(50)
+        self.assertEqual((cycle.length, cycle.update(50, 0.01, True)), (50, 50))
+
+
+# Testing adaptive cycles in runs
+class TestCycleRun(unittest.TestCase):
+    """ Testing adaptive cycles, liveness checks and checkpoints in runs"""
+
+    def setUp(self):
+        """ Patches sending and liveness, runs in a temporary directory"""
+        self.sent, self.pings, self.limit = [], 0, None
+        self.sendp, self.ping_host, self.cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        self.handlers, self.level = logger.handlers[:], logger.level
+        packet.sendp = self.send
+        Host.ping_host = lambda host: self.ping()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        """ Restores sending, liveness, logging and the directory"""
+        packet.sendp, Host.ping_host = self.sendp, self.ping_host
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+        logger = logging.getLogger()
+        logger.handlers[:], logger.level = self.handlers, self.level
+
+    def send(self, frame, **kwargs):
+        """ Records a frame, failing once the limit is reached"""
+        if self.limit is not None and len(self.sent) >= self.limit:
+            raise Interrupted()
+        self.sent.append(bytes(frame))
+
+    def ping(self):
+        """ Counts liveness checks"""
+        self.pings += 1
+        return True
+
+    @staticmethod
+    def get_args(**kwargs):
+        """ Method to create the arguments of a run"""
+        args = {'target_ip': '10.0.0.1', 'network_interface': 'lo', 'n_packets': 1500,
+            'seed': 12, 'cycle_interval': 60.0}
+        args.update(kwargs)
+        return Args(args)
+
+    def test_liveness_checks(self):
+        """ Test cycles of 100, 200, 400 and 800 packets take five liveness checks"""
+        run.run(self.get_args())
+        self.assertEqual((len(self.sent), self.pings), (1500, 5))
+        self.sent, self.pings = [], 0
+        run.run(self.get_args(cycle_length=100))
+        self.assertEqual((len(self.sent), self.pings), (1500, 16))
+
+    def test_resume(self):
+        """ Test a run resumed part way through a grown cycle sends the same packets"""
+        run.run(self.get_args())
+        expected, self.sent, self.limit = self.sent, [], 650
+        with self.assertRaises(Interrupted):
+            run.run(self.get_args(checkpoint='run.checkpoint', checkpoint_interval=250))
+        checkpoint = Checkpoint.load('run.checkpoint')
+        self.assertEqual((checkpoint.packet_count, checkpoint.offset, checkpoint.cycle),
+            (500, 200, 400))
+        self.sent, self.limit = [], None
+        run.run(self.get_args(resume='run.checkpoint'))
+        self.assertEqual(self.sent, expected[500:])
+
+if __name__ == "__main__":
+    unittest.main()
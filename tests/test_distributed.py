@@ -0,0 +1,130 @@
+"""
+Unit tests for Coordinator and Agent classes
+"""
+import io
+import logging
+import os
+import tempfile
+import threading
+import unittest
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz.arguments import Args, parse_coordinator_args, parse_agent_args
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.distributed import Coordinator, Agent, read_message
+
+
+# Testing the Coordinator and Agent Classes
+class TestDistributed(unittest.TestCase):
+    """ Testing Coordinator and Agent classes and methods on localhost"""
+
+    def setUp(self):
+        """ Patches sending and liveness, runs in a temporary directory"""
+        self.sent, self.online = [], True
+        self.sendp, self.ping_host, self.cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        self.handlers, self.level = logger.handlers[:], logger.level
+        packet.sendp = lambda frame, **kwargs: self.sent.append(frame)
+        Host.ping_host = lambda host: self.online
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        """ Restores sending, liveness, logging and the directory"""
+        packet.sendp, Host.ping_host = self.sendp, self.ping_host
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+        logger = logging.getLogger()
+        logger.handlers[:], logger.level = self.handlers, self.level
+
+    @staticmethod
+    def get_args(**kwargs):
+        """ Method to create the arguments of a distributed run"""
+        args = {'target_ip': '10.0.0.1', 'network_interface': 'eth9', 'n_packets': 250,
+            'seed': 40}
+        args.update(kwargs)
+        return Args(args)
+
+    def run_agents(self, coordinator, count):
+        """ Method to serve a coordinator with agents in threads"""
+        agents = [Agent(coordinator.address, 'lo', f'node{index}') for index in range(count)]
+        threads = [threading.Thread(target=agent.serve) for agent in agents]
+        for thread in threads:
+            thread.start()
+        stats = coordinator.serve()
+        for thread in threads:
+            thread.join(30)
+        return agents, stats
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            Coordinator(self.get_args(), 0, ('127.0.0.1', 0))
+        with self.assertRaises(ex.DistributedOptionsError):
+            Coordinator(self.get_args(checkpoint='run.checkpoint'), 2, ('127.0.0.1', 0))
+
+    def test_assignments(self):
+        """ Test agents get disjoint seeds, shards and shares of the packets"""
+        coordinator = Coordinator(self.get_args(sweep=True, shard=(1, 2), journal='a',
+            seed_priority=(7, 8, 9, 10)), 3, ('127.0.0.1', 0))
+        coordinator.close()
+        assignments = coordinator.assignments()
+        self.assertEqual([options['n_packets'] for options in assignments], [84, 83, 83])
+        self.assertEqual([options['seed'] for options in assignments], [40, 41, 42])
+        self.assertEqual([options['shard'] for options in assignments],
+            [(3, 6), (4, 6), (5, 6)])
+        self.assertEqual([options['seed_priority'] for options in assignments],
+            [[7, 10], [8], [9]])
+        self.assertTrue(all('network_interface' not in options and 'journal' not in options
+            for options in assignments))
+
+    def test_run(self):
+        """ Test the packets are split between agents on localhost"""
+        coordinator = Coordinator(self.get_args(), 2, ('127.0.0.1', 0))
+        agents, stats = self.run_agents(coordinator, 2)
+        self.assertEqual(len(self.sent), 250)
+        self.assertEqual(sorted(stats), ['node0', 'node1'])
+        self.assertEqual([stats[name]['sent'] for name in ('node0', 'node1')], [125, 125])
+        self.assertTrue(all(stats[name]['done'] for name in stats))
+        # Agents are assigned in the order they connect
+        self.assertEqual(sorted(agent.assignment['seed'] for agent in agents), [40, 41])
+        self.assertEqual(agents[0].assignment['network_interface'], 'lo')
+        self.assertIsNone(coordinator.reason)
+
+    def test_target_offline(self):
+        """ Test every agent is stopped once one sees the target offline"""
+        self.online = False
+        coordinator = Coordinator(self.get_args(n_packets=1000000), 2, ('127.0.0.1', 0))
+        _, stats = self.run_agents(coordinator, 2)
+        self.assertTrue(coordinator.reason.startswith('target offline'))
+        self.assertLess(len(self.sent), 1000)
+        self.assertTrue(all(stats[name]['done'] and stats[name]['online'] is False
+            for name in stats))
+
+    def test_timeout(self):
+        """ Test the coordinator gives up when agents do not connect"""
+        coordinator = Coordinator(self.get_args(), 1, ('127.0.0.1', 0), timeout=0.1)
+        with self.assertRaises(ex.DistributedTimeoutError):
+            coordinator.serve()
+
+    def test_read_message(self):
+        """ Test messages are lines of JSON objects with a type"""
+        self.assertEqual(read_message(io.BytesIO(b'{"type": "stop"}\n')), {'type': 'stop'})
+        self.assertIsNone(read_message(io.BytesIO(b'')))
+        for line in (b'stop\n', b'[1]\n', b'{"sent": 1}\n'):
+            with self.assertRaises(ex.DistributedProtocolError):
+                read_message(io.BytesIO(line))
+
+    def test_parse_args(self):
+        """ Test the coordinator and agent command line arguments"""
+        args = parse_coordinator_args(['3', '-l', '[::1]:9000', '10.0.0.1', 'eth0', '100',
+            '-s', '5'])
+        self.assertEqual((args.agents, args.listen, args.run.seed), (3, ('::1', 9000), 5))
+        args = parse_agent_args(['node:7878', 'eth1', '-j', 'a.journal'])
+        self.assertEqual((args.coordinator, args.network_interface, args.journal),
+            (('node', 7878), 'eth1', 'a.journal'))
+
+if __name__ == "__main__":
+    unittest.main()
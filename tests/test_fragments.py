@@ -0,0 +1,199 @@
+"""
+Unit tests for Fragmenter class
+"""
+import logging
+import os
+import socket
+import struct
+import tempfile
+import unittest
+from scapy.config import conf
+from scapy.layers.l2 import Ether
+from scapy.layers.inet import IP, UDP, ICMP
+from scapy.layers.inet6 import IPv6
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args
+from pynetfuzz.campaign import PhasePlan
+from pynetfuzz.checksum import frame_offsets
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.fragments import Fragmenter
+
+TARGET = Host('10.0.0.1', '00:11:22:33:44:55', 53)
+PAYLOAD = bytes(range(200))
+
+
+class Loopback():
+    """ Layer 2 socket stand-in recording the sent frames, the target's responses are
+    read from a socket pair"""
+    sent = []
+
+    def __init__(self, iface=None):
+        self.iface = iface
+        self.local, self.remote = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def fileno(self):
+        """ File descriptor the responses are read from"""
+        return self.local.fileno()
+
+    def send(self, frame):
+        """ Records a frame"""
+        Loopback.sent.append(bytes(frame))
+
+    def recv_raw(self):
+        """ Reads a response"""
+        return None, self.local.recv(65535), None
+
+    def close(self):
+        """ Closes the socket pair"""
+        self.local.close()
+        self.remote.close()
+
+
+def datagram(frame: bytes) -> tuple:
+    """ Gets the IP identification, flags, offset and data of an IPv4 frame"""
+    _, ip_offset, _, _ = frame_offsets(frame)
+    header_length = (frame[ip_offset] & 0x0F) * 4
+    total, ident, flags_offset = struct.unpack_from('!HHH', frame, ip_offset + 2)
+    return ident, flags_offset >> 13, (flags_offset & 0x1FFF) * 8, \
+        frame[ip_offset + header_length:ip_offset + total]
+
+
+# Testing the Fragmenter Class
+class TestFragmenter(unittest.TestCase):
+    """ Testing Fragmenter class and methods"""
+
+    def setUp(self):
+        """ Builds an IPv4 datagram"""
+        self.frame = bytes(Ether(dst=TARGET.mac) / IP(src='10.0.0.2', dst=TARGET.ip, flags=2) / \
+            UDP(sport=1000, dport=53) / PAYLOAD)
+        self.payload = bytes(IP(self.frame[14:]).payload)
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.FragmentModeError):
+            Fragmenter(TARGET, 'sideways')
+        with self.assertRaises(ex.FragmentHostError):
+            Fragmenter(Host('10.0.0.*', None, None))
+        with self.assertRaises(ex.FragmentHostError):
+            Fragmenter(Host('fe80::1', None, None))
+
+    def test_in_order(self):
+        """ Test fragments reassemble into the datagram, with valid header checksums"""
+        train = Fragmenter(TARGET, 'in_order', seed=1).train(self.frame, 0)
+        self.assertGreater(len(train), 1)
+        fragments = [datagram(fragment) for fragment in train]
+        self.assertEqual(len({ident for ident, _, _, _ in fragments}), 1)
+        self.assertEqual([flags for _, flags, _, _ in fragments],
+            [1] * (len(train) - 1) + [0]) # More fragments, don't fragment is cleared
+        self.assertEqual(b''.join(data for _, _, _, data in fragments), self.payload)
+        self.assertTrue(all(len(data) % 8 == 0 for _, _, _, data in fragments[:-1]))
+        for fragment in train:
+            header = IP(bytes(fragment[14:]))
+            checksum = header.chksum
+            del header.chksum
+            self.assertEqual(IP(bytes(header)).chksum, checksum)
+
+    def test_modes(self):
+        """ Test each mode reorders, overlaps, shrinks or drops the in order fragments"""
+        in_order = [datagram(fragment)
+            for fragment in Fragmenter(TARGET, 'in_order', seed=1).train(self.frame, 0)]
+        train = Fragmenter(TARGET, 'reversed', seed=1).train(self.frame, 0)
+        self.assertEqual([datagram(fragment) for fragment in train], in_order[::-1])
+        train = Fragmenter(TARGET, 'missing_last', seed=1).train(self.frame, 0)
+        self.assertEqual([datagram(fragment) for fragment in train], in_order[:-1])
+        train = [datagram(fragment)
+            for fragment in Fragmenter(TARGET, 'tiny', seed=1).train(self.frame, 0)]
+        self.assertEqual((train[0][2], train[0][3], train[1][2]), (0, self.payload[:8], 8))
+        train = [datagram(fragment)
+            for fragment in Fragmenter(TARGET, 'overlapping', seed=1).train(self.frame, 0)]
+        for position, (_, _, offset, data) in enumerate(train):
+            if position % 2: # Starts 8 bytes into the previous fragment
+                self.assertEqual((offset + 8, data[8:]), in_order[position][2:])
+                self.assertEqual(offset + 8, train[position - 1][2] + len(train[position - 1][3]))
+            else:
+                self.assertEqual((offset, data), in_order[position][2:])
+
+    def test_trains(self):
+        """ Test trains depend on the seed and packet number, and other frames are skipped"""
+        fragmenter = Fragmenter(TARGET, 'mixed', seed=2)
+        first = fragmenter.train(self.frame, 5)
+        self.assertEqual(Fragmenter(TARGET, 'mixed', seed=2).train(self.frame, 5), first)
+        self.assertNotEqual(fragmenter.train(self.frame, 6), first)
+        self.assertEqual(sum(fragmenter.sent.values()), 2)
+        ipv6 = bytes(Ether() / IPv6(dst='fe80::1') / UDP() / PAYLOAD)
+        short = bytes(Ether() / IP(dst=TARGET.ip) / UDP() / b'1234567')
+        self.assertEqual((fragmenter.train(ipv6, 7), fragmenter.train(short, 8)), (None, None))
+
+    def test_responses(self):
+        """ Test ICMP errors quoting a train are counted by mode"""
+        fragmenter = Fragmenter(TARGET, 'missing_last', seed=3)
+        Loopback.sent = []
+        conf_socket, conf.L2socket = conf.L2socket, Loopback
+        try:
+            fragmenter.start('lo')
+        finally:
+            conf.L2socket = conf_socket
+        train = fragmenter.train(self.frame, 0)
+        fragmenter.send(train)
+        self.assertEqual(Loopback.sent, [bytes(fragment) for fragment in train])
+        quoted = bytes(train[0][14:14 + 28])
+        for source, icmp_type, code in (('10.0.0.1', 11, 1), ('10.0.0.9', 11, 1),
+                ('10.0.0.1', 0, 0), ('10.0.0.1', 3, 3)):
+            fragmenter.socket.remote.send(bytes(Ether() / IP(src=source, dst='10.0.0.2') / \
+                ICMP(type=icmp_type, code=code) / quoted))
+        self.assertEqual(fragmenter.poll(0.1), 2)
+        self.assertEqual(fragmenter.responses, {('missing_last', 11, 1): 1,
+            ('missing_last', 3, 3): 1})
+        self.assertIn('missing_last 11/1: 1', str(fragmenter))
+        fragmenter.close()
+
+
+# Testing fragment trains in runs
+class TestFragmentRun(unittest.TestCase):
+    """ Testing fragment options and trains sent by runs"""
+
+    def test_options(self):
+        """ Test options fragmenting does not support are rejected"""
+        args = {'target_ip': '10.0.0.1', 'network_interface': 'lo', 'n_packets': 1,
+            'fragments': 'tiny'}
+        PhasePlan('fragments', Args(args))
+        for option in ({'workers': 2}, {'corpus': 'a'}, {'target_ip': 'fe80::1'}):
+            with self.assertRaises(ex.FragmentOptionsError):
+                PhasePlan('fragments', Args(dict(args, **option)))
+
+    def test_run(self):
+        """ Test a run sends the datagrams it would send unfragmented as fragment trains"""
+        l2socket, sendp, ping_host, cwd = conf.L2socket, packet.sendp, Host.ping_host, \
+            os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        expected = []
+        conf.L2socket, Host.ping_host = Loopback, lambda host: True
+        packet.sendp = lambda frame, **kwargs: expected.append(bytes(frame))
+        args = {'target_ip': '10.0.0.1', 'network_interface': 'lo', 'n_packets': 30,
+            'seed': 9, 'trans_protocol': 0x11, 'min_length': 100, 'max_length': 600}
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                run.run(Args(args))
+                Loopback.sent = []
+                run.run(Args(dict(args, fragments='in_order')))
+                os.chdir(cwd)
+        finally:
+            conf.L2socket, packet.sendp, Host.ping_host = l2socket, sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        trains = {}
+        for frame in Loopback.sent:
+            ident, _, offset, data = datagram(frame)
+            trains.setdefault(ident, []).append((offset, data))
+        self.assertEqual(len(expected), 30)
+        self.assertEqual([b''.join(data for _, data in train) for train in trains.values()],
+            [datagram(frame)[3] for frame in expected])
+
+if __name__ == "__main__":
+    unittest.main()
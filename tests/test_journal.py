@@ -0,0 +1,128 @@
+"""
+Unit tests for Journal class
+"""
+import unittest
+import tempfile
+import os
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.packet import Packet, PacketDetails
+from pynetfuzz.hosts import Host
+# Module under test
+from pynetfuzz.journal import Journal, np
+
+# Testing the Journal Class
+class TestJournal(unittest.TestCase):
+    """ Testing Journal class and methods"""
+
+    @staticmethod
+    def get_test_packet(length, trans_protocol=17):
+        """ Static method for building a test packet
+
+        Returns:
+            Packet: Packet with test hosts and details
+        """
+        info = {'int_protocol': 2048, 'trans_protocol': trans_protocol, 'cast': 'multicast',
+            'vlan': True, 'headers': True, 'length': length,
+            'ip_header': {'ttl': 222, 'tos': 173, 'flags': 1, 'frag': 3557, 'id': 23671}}
+        if trans_protocol == 6:
+            info['tcp_header'] = {
+                'seq': 1192725307, 'ack': 67273815, 'window': 53003, 'urgptr': 37447}
+        return Packet(
+            Host("192.168.1.1", "00:E7:EE:E7:61:5E", "8080"),
+            Host("192.168.1.100", "99:00:A9:4F:3D:7E", "999"),
+            PacketDetails(info))
+
+    def test_record_and_read(self):
+        """ Test records are written in chunks and read back"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.journal')
+            with Journal(path, chunk_records=2) as journal:
+                for index in range(5):
+                    journal.record(42, index, index % 3, self.get_test_packet(100 + index, 6))
+                # Header and two full chunks written, one record buffered
+                self.assertEqual(os.path.getsize(path),
+                    Journal.HEADER.size + Journal.RECORD.size * 4)
+            self.assertEqual(os.path.getsize(path),
+                Journal.HEADER.size + Journal.RECORD.size * 5)
+
+            records = list(Journal.read(path))
+            self.assertEqual(len(records), 5)
+            record = records[4]
+            self.assertEqual((record.seed, record.index, record.offset, record.length),
+                (42, 4, 1, 104))
+            self.assertEqual((record.target_ip_hi, record.target_ip_lo), (0, 0xC0A80101))
+            self.assertEqual(Journal.ip_address(record.source_ip_hi, record.source_ip_lo),
+                '192.168.1.100')
+            self.assertEqual(record.target_mac, 0x00E7EEE7615E)
+            self.assertEqual((record.target_port, record.source_port), (8080, 999))
+            self.assertEqual((record.ttl, record.tos, record.ip_flags, record.frag, record.id),
+                (222, 173, 1, 3557, 23671))
+            self.assertEqual((record.seq, record.ack, record.window, record.urgptr),
+                (1192725307, 67273815, 53003, 37447))
+            self.assertEqual(record.flags, Journal.FLAG_VLAN | Journal.FLAG_HEADERS)
+
+    def test_append(self):
+        """ Test reopening a journal appends records"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.journal')
+            for seed in (1, 2):
+                with Journal(path) as journal:
+                    journal.record(seed, 0, 0, self.get_test_packet(50))
+            self.assertEqual([record.seed for record in Journal.read(path)], [1, 2])
+            # A torn partial record is dropped before appending
+            with open(path, 'ab') as file:
+                file.write(b'\x00' * (Journal.RECORD.size // 2))
+            with Journal(path) as journal:
+                journal.record(3, 0, 0, self.get_test_packet(50))
+            self.assertEqual(os.path.getsize(path),
+                Journal.HEADER.size + Journal.RECORD.size * 3)
+            self.assertEqual([record.seed for record in Journal.read(path)], [1, 2, 3])
+
+    def test_ipv6_addresses(self):
+        """ Test IPv6 addresses are stored in full"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.journal')
+            packet = self.get_test_packet(50)
+            packet.target = Host('2001:db8::1:2', '00:E7:EE:E7:61:5E', '80')
+            packet.source = Host('fd00::ffff:1', '99:00:A9:4F:3D:7E', '999')
+            with Journal(path) as journal:
+                journal.record(1, 0, 0, packet)
+            record = next(Journal.read(path))
+            self.assertEqual(Journal.ip_address(record.target_ip_hi, record.target_ip_lo),
+                '2001:db8::1:2')
+            self.assertEqual(Journal.ip_address(record.source_ip_hi, record.source_ip_lo),
+                'fd00::ffff:1')
+
+    def test_invalid_file(self):
+        """ Test files that are not journals are rejected"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.journal')
+            with open(path, 'wb') as file:
+                file.write(b'0123456789abcdefghij')
+            with self.assertRaises(ex.JournalFormatError):
+                Journal(path)
+            with self.assertRaises(ex.JournalFormatError):
+                list(Journal.read(path))
+
+    @unittest.skipUnless(np, 'NumPy is not installed')
+    def test_read_array(self):
+        """ Test journal is memory-mapped as a structured array and queried"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.journal')
+            with Journal(path) as journal:
+                for index in range(10):
+                    journal.record(7, index, index, self.get_test_packet(60, (6, 17)[index % 2]))
+            records = Journal.read_array(path)
+            self.assertEqual(len(records), 10)
+            self.assertEqual(list(records['index']), list(range(10)))
+            self.assertEqual(records[3]['length'], 60)
+
+            end = int(records['timestamp_ns'][-1])
+            selected = Journal.before(records, end, 10**9, trans_protocol=6)
+            self.assertEqual(list(selected['index']), [0, 2, 4, 6, 8])
+            self.assertEqual(len(Journal.before(records, end, 10**9, trans_protocol=1)), 0)
+            del records, selected
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for Metrics class
+"""
+import unittest
+import threading
+import urllib.request
+import urllib.error
+# Package imports
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+# Module under test
+from pynetfuzz.metrics import Metrics
+
+# Testing the Metrics Class
+class TestMetrics(unittest.TestCase):
+    """ Testing Metrics class and methods"""
+
+    def test_counters(self):
+        """ Test counters are summed across threads"""
+        metrics = Metrics()
+
+        def worker():
+            for _ in range(1000):
+                metrics.inc('pynetfuzz_packets_sent_total', cast='unicast')
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.inc('pynetfuzz_bytes_sent_total', 1500)
+
+        counters = metrics.collect()[0]
+        self.assertEqual(
+            counters[('pynetfuzz_packets_sent_total', (('cast', 'unicast'),))], 4000)
+        self.assertEqual(counters[('pynetfuzz_bytes_sent_total', ())], 1500)
+
+    def test_histograms(self):
+        """ Test histogram bucket counts and sum"""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            metrics.observe('pynetfuzz_send_seconds', value)
+        histogram = metrics.collect()[2][('pynetfuzz_send_seconds', ())]
+        self.assertEqual(histogram[:-1], [2, 1, 1])
+        self.assertAlmostEqual(histogram[-1], 2.65)
+
+    def test_render(self):
+        """ Test Prometheus text exposition format"""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.inc('pynetfuzz_packets_sent_total', 2, trans_protocol='tcp')
+        metrics.set_gauge('pynetfuzz_queue_depth', 5, queue='logging')
+        metrics.observe('pynetfuzz_send_seconds', 0.5)
+        lines = metrics.render().splitlines()
+        self.assertIn('# TYPE pynetfuzz_packets_sent_total counter', lines)
+        self.assertIn('pynetfuzz_packets_sent_total{trans_protocol="tcp"} 2', lines)
+        self.assertIn('pynetfuzz_queue_depth{queue="logging"} 5', lines)
+        self.assertIn('pynetfuzz_send_seconds_bucket{le="0.1"} 0', lines)
+        self.assertIn('pynetfuzz_send_seconds_bucket{le="1.0"} 1', lines)
+        self.assertIn('pynetfuzz_send_seconds_bucket{le="+Inf"} 1', lines)
+        self.assertIn('pynetfuzz_send_seconds_count 1', lines)
+
+    def test_packet_sent(self):
+        """ Test sent packets are counted with the length of the frame actually sent"""
+        metrics = Metrics()
+        target = Host('192.168.1.1', '00:E7:EE:E7:61:5E', '80')
+        details = PacketDetails({'int_protocol': 0x800, 'trans_protocol': 17,
+            'cast': 'unicast', 'vlan': False, 'headers': False, 'min_length': None,
+            'max_length': 64})
+        packet = next(packet_generator(target, details, seed=1, max_packets=1))
+        metrics.packet_sent(packet, 106, 0.001)
+        labels = (('cast', 'unicast'), ('int_protocol', 'ipv4'), ('trans_protocol', 'udp'))
+        counters = metrics.collect()[0]
+        self.assertEqual(counters[('pynetfuzz_packets_sent_total', labels)], 1)
+        self.assertEqual(counters[('pynetfuzz_bytes_sent_total', labels)], 106)
+
+    def test_target_checked(self):
+        """ Test liveness transitions are only counted on state changes"""
+        metrics = Metrics()
+        metrics.target_checked(False, True)
+        metrics.target_checked(True, True)
+        metrics.target_checked(True, False)
+        counters, gauges, _ = metrics.collect()
+        self.assertEqual(counters[
+            ('pynetfuzz_liveness_transitions_total', (('state', 'online'),))], 1)
+        self.assertEqual(counters[
+            ('pynetfuzz_liveness_transitions_total', (('state', 'offline'),))], 1)
+        self.assertEqual(gauges[('pynetfuzz_target_online', ())], 0)
+
+    def test_serve(self):
+        """ Test metrics are served on the /metrics endpoint"""
+        metrics = Metrics()
+        metrics.inc('pynetfuzz_packets_sent_total')
+        server = metrics.serve(0)
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            with urllib.request.urlopen(f'{url}/metrics', timeout=5) as response:
+                self.assertEqual(response.status, 200)
+                self.assertIn(b'pynetfuzz_packets_sent_total 1', response.read())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'{url}/other', timeout=5)
+        finally:
+            metrics.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
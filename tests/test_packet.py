@@ -1,9 +1,11 @@
 """
 Unit tests for Packet class
 """
+import ipaddress
 import unittest
 from scapy.layers.l2 import Ether
 from scapy.layers.inet import IP, UDP, TCP
+from scapy.layers.inet6 import IPv6, IPv6ExtHdrRouting, IPv6ExtHdrFragment
 from scapy.packet import Raw
 # Package imports
 from pynetfuzz import const
@@ -19,6 +21,7 @@ class TestArgumentParser(unittest.TestCase):
 
     TCP_VALUE = const.TRANSPORT_PROTOCOLS_INFO['tcp']['value']
     UDP_VALUE = const.TRANSPORT_PROTOCOLS_INFO['udp']['value']
+    IPV6_VALUE = const.INTERNET_PROTOCOLS_INFO['ipv6']['value']
 
     def check_class_attributes(self, packet, test_target, test_source, test_packet_details):
         """ Method to check packet class attributes are correct"""
@@ -47,7 +50,11 @@ class TestArgumentParser(unittest.TestCase):
         """ Method to check packet layers are correct and present"""
         packet_layers = packet.packet.layers()
         self.assertTrue(Ether in packet_layers) # Ether layer
-        self.assertTrue(IP in packet_layers) # IP layer
+        if test_packet_details.int_protocol == self.IPV6_VALUE:
+            self.assertTrue(IPv6 in packet_layers) # IPv6 layer
+            self.assertFalse(IP in packet_layers)
+        else:
+            self.assertTrue(IP in packet_layers) # IP layer
         if test_packet_details.trans_protocol == self.TCP_VALUE:
             self.assertTrue(TCP in packet_layers)
         elif test_packet_details.trans_protocol == self.UDP_VALUE:
@@ -59,9 +66,16 @@ class TestArgumentParser(unittest.TestCase):
         ether_layer = packet.packet.getlayer(Ether)
         self.assertEqual(
             (ether_layer.dst, ether_layer.src), (test_target.mac, test_source.mac))
-        ip_layer = packet.packet.getlayer(IP)
-        self.assertEqual(
-            (ip_layer.dst, ip_layer.src), (test_target.ip, test_source.ip))
+        if test_packet_details.int_protocol == self.IPV6_VALUE:
+            ip_layer = packet.packet.getlayer(IPv6)
+            self.assertEqual(
+                (ip_layer.dst, ip_layer.src),
+                (str(ipaddress.ip_address(test_target.ip)),
+                    str(ipaddress.ip_address(test_source.ip))))
+        else:
+            ip_layer = packet.packet.getlayer(IP)
+            self.assertEqual(
+                (ip_layer.dst, ip_layer.src), (test_target.ip, test_source.ip))
         if test_packet_details.trans_protocol == self.TCP_VALUE:
             trans_layer = packet.packet.getlayer(TCP)
         elif test_packet_details.trans_protocol == self.UDP_VALUE:
@@ -95,8 +109,8 @@ class TestArgumentParser(unittest.TestCase):
 
     def test_valid_packet_ip6_udp_headers(self):
         """ Test valid packet - Contains (IPv6, UDP, Headers)"""
-        test_target_host = Host("255.255.255.255", "FF-FF-FF-FF-FF-FF", "65535")
-        test_source_host = Host("0.0.0.0", "00:00:00:00:00:00", "1")
+        test_target_host = Host("FF02::1", "33-33-00-00-00-01", "65535")
+        test_source_host = Host("::", "00:00:00:00:00:00", "1")
         test_packet_details = PacketDetails({
             'int_protocol': 34525,
             'trans_protocol': 17,
@@ -104,7 +118,8 @@ class TestArgumentParser(unittest.TestCase):
             'vlan': True,
             'headers': True,
             'length': 50,
-            'ip_header': {'ttl': 123, 'tos': 154, 'flags': 0, 'frag': 4567, 'id': 20921,}})
+            'ip_header': {'tc': 123, 'fl': 456789, 'hlim': 154},
+            'ip6_extensions': ()})
         packet = Packet(test_target_host, test_source_host, test_packet_details)
         self.check_class_attributes(packet, test_target_host, test_source_host, test_packet_details)
         packet.add_all_layers()
@@ -132,8 +147,8 @@ class TestArgumentParser(unittest.TestCase):
 
     def test_valid_packet_ip6_udp(self):
         """ Test valid packet - Contains (IPv6, UDP, No Headers)"""
-        test_target_host = Host("99.0.255.255", "00:12:67:99:0A:FF", "674")
-        test_source_host = Host("9.1.1.123", "9F:12:11:74:A9:F1", "643")
+        test_target_host = Host("FF02::FB", "33:33:00:00:00:FB", "674")
+        test_source_host = Host("2001:db8::7b", "9F:12:11:74:A9:F1", "643")
         test_packet_details = PacketDetails({
             'int_protocol': 34525,
             'trans_protocol': 17,
@@ -148,6 +163,113 @@ class TestArgumentParser(unittest.TestCase):
         self.check_packet_attributes(packet, test_target_host,
             test_source_host, test_packet_details)
 
+    def test_valid_packet_ip6_extension_headers(self):
+        """ Test valid packet - Contains (IPv6, TCP, Headers, Extension headers)"""
+        test_target_host = Host("2001:db8::1", "00:E7:EE:E7:61:5E", "80")
+        test_source_host = Host("fe80::2", "99:00:A9:4F:3D:7E", "4000")
+        test_packet_details = PacketDetails({
+            'int_protocol': 34525,
+            'trans_protocol': 6,
+            'cast': 'unicast',
+            'vlan': True,
+            'headers': True,
+            'length': 100,
+            'ip_header': {'tc': 1, 'fl': 2, 'hlim': 3},
+            'ip6_extensions': ('routing', 'fragment'),
+            'tcp_header': {'seq': 1, 'ack': 2, 'window': 3, 'urgptr': 4}})
+        packet = Packet(test_target_host, test_source_host, test_packet_details)
+        packet.add_all_layers()
+        self.check_packet_layers(packet, test_packet_details)
+        self.check_packet_attributes(packet, test_target_host,
+            test_source_host, test_packet_details)
+        ip_layer = packet.packet.getlayer(IPv6)
+        self.assertEqual((ip_layer.tc, ip_layer.fl, ip_layer.hlim), (1, 2, 3))
+        self.assertEqual(ip_layer.payload.__class__, IPv6ExtHdrRouting)
+        self.assertEqual(ip_layer.payload.payload.__class__, IPv6ExtHdrFragment)
+        self.assertEqual(ip_layer.payload.payload.payload.__class__, TCP)
+        # Wire format dissects back through the chain
+        self.assertTrue(TCP in Ether(bytes(packet.packet)))
+
+    def test_valid_packet_jumbo(self):
+        """ Test valid packet - Contains (Jumbo, UDP, No Headers)"""
+        test_target_host = Host("10.0.0.1", "00:E7:EE:E7:61:5E", "80")
+        test_source_host = Host("10.0.0.2", "99:00:A9:4F:3D:7E", "4000")
+        test_packet_details = PacketDetails({
+            'int_protocol': const.INTERNET_PROTOCOLS_INFO['jumbo']['value'],
+            'trans_protocol': 17,
+            'cast': 'unicast',
+            'vlan': False,
+            'headers': False,
+            'length': 9000 - 20 - 8})
+        packet = Packet(test_target_host, test_source_host, test_packet_details)
+        packet.add_all_layers()
+        self.check_packet_layers(packet, test_packet_details)
+        self.check_packet_attributes(packet, test_target_host,
+            test_source_host, test_packet_details)
+        self.assertEqual(packet.packet.getlayer(Ether).type, 0x800)
+        self.assertEqual(len(bytes(packet.packet.getlayer(IP))), 9000)
+
+    def test_update_layers_extension_chain(self):
+        """ Test frames with extension headers are rebuilt instead of patched"""
+        test_packet_details = PacketDetails({
+            'int_protocol': 34525,
+            'trans_protocol': 17,
+            'cast': 'unicast',
+            'vlan': False,
+            'headers': True,
+            'length': 10,
+            'ip_header': {'tc': 1, 'fl': 2, 'hlim': 3},
+            'ip6_extensions': ()})
+        packet = Packet(Host("2001:db8::1", "00:E7:EE:E7:61:5E", "80"),
+            Host("2001:db8::2", "99:00:A9:4F:3D:7E", "4000"), test_packet_details)
+        self.assertFalse(packet.update_layers())
+        self.assertTrue(packet.update_layers())
+        test_packet_details.ip6_extensions = ('destination', 'routing')
+        test_packet_details.ip6_extension_fields = (
+            {'otype': 0x1E, 'optdata': b'\xAA' * 12},
+            {'type': 0, 'segleft': 1, 'addresses': ['2001:db8::3']})
+        self.assertFalse(packet.update_layers())
+        self.assertFalse(packet.update_layers())
+        self.assertEqual(len(bytes(packet.packet)), 14 + 40 + 16 + 24 + 8 + 10)
+
+    def test_extension_fields(self):
+        """ Test fuzzed extension header fields are sent"""
+        test_packet_details = PacketDetails({
+            'int_protocol': 34525,
+            'trans_protocol': 17,
+            'cast': 'unicast',
+            'vlan': False,
+            'headers': True,
+            'length': 10,
+            'ip_header': {'tc': 1, 'fl': 2, 'hlim': 3},
+            'ip6_extensions': ('hop_by_hop', 'fragment'),
+            'ip6_extension_fields': (
+                {'otype': 0xC9, 'optdata': b'\x01\x02\x03\x04'},
+                {'offset': 100, 'res2': 1, 'm': 1, 'id': 0xDEADBEEF})})
+        packet = Packet(Host("2001:db8::1", "00:E7:EE:E7:61:5E", "80"),
+            Host("2001:db8::2", "99:00:A9:4F:3D:7E", "4000"), test_packet_details)
+        packet.add_all_layers()
+        frame = bytes(packet.packet)
+        # Hop-by-hop: next header, length, option type, option length, option data
+        self.assertEqual(frame[54:62], bytes((44, 0, 0xC9, 4, 1, 2, 3, 4)))
+        fragment = IPv6ExtHdrFragment(frame[62:70])
+        self.assertEqual((fragment.offset, fragment.res2, fragment.m, fragment.id),
+            (100, 1, 1, 0xDEADBEEF))
+
+    def test_ipv6_requires_ipv6_hosts(self):
+        """ Test IPv4 hosts are not mapped into IPv6 packets"""
+        test_packet_details = PacketDetails({
+            'int_protocol': 34525,
+            'trans_protocol': 17,
+            'cast': 'unicast',
+            'vlan': False,
+            'headers': False,
+            'length': 10})
+        packet = Packet(Host("10.0.0.1", "00:E7:EE:E7:61:5E", "80"),
+            Host("2001:db8::2", "99:00:A9:4F:3D:7E", "4000"), test_packet_details)
+        with self.assertRaises(ex.PacketAddressVersionError):
+            packet.add_all_layers()
+
     def test_invalid_host(self):
         """ Test invalid host as a parameter to Packet class"""
         test_packet_details = PacketDetails({
@@ -0,0 +1,90 @@
+"""
+Unit tests for payload strategies
+"""
+import random
+import unittest
+from scapy.layers.l2 import Ether
+from scapy.packet import Raw
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+from pynetfuzz.pool import PacketPool
+from pynetfuzz.randomiser import Randomiser
+# Module under test
+from pynetfuzz.payloads import (
+    TemplatePayload, RepeatedPayload, render_payload, PAYLOAD_STRATEGY_NAMES,
+    URL_ALPHABET, HOST_ALPHABET,
+)
+
+# Testing the payload strategies
+class TestPayloads(unittest.TestCase):
+    """ Testing payload strategies and rendering"""
+
+    def test_random(self):
+        """ Test random payloads are reproducible from the seed"""
+        random.seed(3)
+        first = bytes(render_payload(None, 100))
+        random.seed(3)
+        self.assertEqual(bytes(render_payload('random', 100)), first)
+        self.assertEqual((len(first), bytes(render_payload('random', 0))), (100, b''))
+
+    def test_templates(self):
+        """ Test templates keep their skeleton and fuzz their fields in their alphabets"""
+        random.seed(4)
+        http = bytes(render_payload('http', 98))
+        self.assertTrue(http.startswith(b'GET /') and http.endswith(b'\r\n\r\n'))
+        self.assertTrue(all(byte in URL_ALPHABET for byte in http[5:21]))
+        self.assertTrue(all(byte in HOST_ALPHABET for byte in http[38:50]))
+        self.assertTrue(http[90:94].isdigit())
+        dns = bytes(render_payload('dns', 40))
+        self.assertEqual(dns[12:25], b'\x07example\x03com\x00')
+        self.assertEqual(len(dns), 40)
+        self.assertEqual(bytes(render_payload('ntp', 3))[:1], b'\x23')
+
+    def test_repeated(self):
+        """ Test tokens are repeated to fill payloads of any length"""
+        strategy = RepeatedPayload('test', (b'%n',), size=8)
+        buffer = memoryview(bytearray(20))
+        strategy.render(buffer, 11)
+        self.assertEqual(bytes(buffer[:11]), b'%n%n%n%n%n%')
+        self.assertIn(bytes(render_payload('format', 2)), (b'%s', b'%n', b'%x', b'%p',
+            b'%d', b'%9', b'%.', b'%*', b'%@', b'%%'))
+
+    def test_invalid(self):
+        """ Test unknown strategies and invalid templates"""
+        with self.assertRaises(ex.PayloadTypeError):
+            render_payload('mixed', 10)
+        with self.assertRaises(ex.PayloadTemplateError):
+            TemplatePayload('test', b'abc', ((2, 2, None),))
+        with self.assertRaises(ex.PayloadTemplateError):
+            RepeatedPayload('test', (b'',))
+
+    def test_mixed(self):
+        """ Test mixed payloads draw a strategy for each packet"""
+        randomiser, random_details = Randomiser(5), PacketDetails({'int_protocol': None,
+            'trans_protocol': None, 'cast': None, 'vlan': None, 'headers': None})
+        details = PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': None, 'headers': None, 'payload': 'mixed'})
+        drawn = {randomiser.payload(details, random_details).payload for _ in range(100)}
+        self.assertEqual(drawn, set(PAYLOAD_STRATEGY_NAMES))
+
+    def test_generator(self):
+        """ Test generated payloads, pooled frames are patched with the same payloads"""
+        details = PacketDetails({'int_protocol': None, 'trans_protocol': 0x11, 'cast': None,
+            'vlan': False, 'headers': False, 'min_length': 98, 'max_length': 300,
+            'payload': 'http'})
+        target = Host('192.168.1.1', None, 80)
+        expected = [packet.raw() for packet in packet_generator(target, details, seed=6,
+            max_packets=50)]
+        self.assertTrue(all(Ether(frame)[Raw].load.startswith(b'GET /')
+            for frame in expected))
+        pool, pooled = PacketPool(4), []
+        for packet in packet_generator(target, details, seed=6, max_packets=50, pool=pool):
+            pooled.append(packet.raw())
+            pool.release(packet)
+        self.assertEqual(pooled, expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for PacketPool class
+"""
+import unittest
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+# Module under test
+from pynetfuzz.pool import PacketPool
+
+# Testing the PacketPool Class
+class TestPacketPool(unittest.TestCase):
+    """ Testing PacketPool class and methods"""
+
+    @staticmethod
+    def get_test_generator(seed, pool=None, **kwargs):
+        """ Static method for creating a test packet generator
+
+        Returns:
+            Generator: Packet generator with test hosts and details
+        """
+        info = {'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': False, 'headers': True, 'min_length': None, 'max_length': 200}
+        info.update(kwargs)
+        return packet_generator(Host("192.168.1.*", None, "8080"), PacketDetails(info),
+            seed=seed, max_packets=200, pool=pool)
+
+    def test_acquire_release(self):
+        """ Test slots are handed out in ring order and recycled once released"""
+        pool = PacketPool(2)
+        first, second = pool.acquire(), pool.acquire()
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.available(), 0)
+        with self.assertRaises(ex.PoolExhaustedError):
+            pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters and release"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            PacketPool(0)
+        with self.assertRaises(ex.InvalidPacketError):
+            PacketPool(1).release(PacketPool(1).acquire())
+
+    def test_pooled_generator(self):
+        """ Test pooled packets match freshly allocated ones and reuse layers"""
+        seed = 1234
+        expected = [packet.raw() for packet in self.get_test_generator(seed)]
+
+        pool = PacketPool(4)
+        pooled = []
+        for packet in self.get_test_generator(seed, pool):
+            pooled.append(packet.raw())
+            pool.release(packet)
+        self.assertEqual(pooled, expected)
+        self.assertEqual(pool.acquired, 200)
+        self.assertTrue(pool.reused > 0)
+
+    def test_patched_frames(self):
+        """ Test frames patched in place match frames serialised from scratch"""
+        for seed, kwargs in ((1, {'headers': False}), (2, {'vlan': True}),
+                (3, {'bad_checksum': True}), (4, {'max_length': None, 'headers': False})):
+            expected = [packet.raw() for packet in self.get_test_generator(seed, **kwargs)]
+            pool = PacketPool(1)
+            pooled = []
+            for packet in self.get_test_generator(seed, pool, **kwargs):
+                pooled.append(packet.raw())
+                pool.release(packet)
+            self.assertEqual(pooled, expected)
+
+    def test_unreleased_generator(self):
+        """ Test generator stops when the sender does not release packets"""
+        generator = self.get_test_generator(1, PacketPool(3))
+        for _ in range(3):
+            next(generator)
+        with self.assertRaises(ex.PoolExhaustedError):
+            next(generator)
+
+if __name__ == "__main__":
+    unittest.main()
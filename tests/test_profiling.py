@@ -0,0 +1,87 @@
+"""
+Unit tests for Profiler class
+"""
+import os
+import tempfile
+import unittest
+import pstats
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+# Module under test
+from pynetfuzz.profiling import Profiler, collapse_stats
+
+
+def inner(count):
+    """ Leaf function for profiling"""
+    return sum(range(count))
+
+
+def outer(count):
+    """ Function calling the leaf function for profiling"""
+    return [inner(count) for _ in range(20)]
+
+
+# Testing the Profiler Class
+class TestProfiler(unittest.TestCase):
+    """ Testing Profiler class and methods"""
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            Profiler(0)
+
+    def test_sampling(self):
+        """ Test only every interval-th packet is timed"""
+        profiler = Profiler(4)
+        self.assertEqual([profiler.sample() for _ in range(8)],
+            [False, False, False, True, False, False, False, True])
+        self.assertEqual(profiler.packets, 8)
+
+    def test_generator_stages(self):
+        """ Test the generator times the stages of sampled packets"""
+        profiler = Profiler(5)
+        details = PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': False, 'headers': True, 'min_length': None, 'max_length': 64})
+        list(packet_generator(Host('10.0.0.1', '00:11:22:33:44:55', '80'), details,
+            seed=3, max_packets=50, profiler=profiler))
+        report = {stage: spans for stage, spans, _, _, _ in profiler.report()}
+        self.assertEqual(report, {'setup': 1, 'generate': 10, 'build': 10})
+        self.assertAlmostEqual(sum(row[4] for row in profiler.report()), 1.0)
+
+    def test_collapse_stats(self):
+        """ Test collapsed stacks attribute time to the calling stack"""
+        profiler = Profiler(output='unused')
+        profiler.start()
+        outer(20000)
+        profiler.stop()
+        profiler.profile.create_stats()
+        stacks = collapse_stats(pstats.Stats(profiler.profile))
+        leaf = [stack for stack in stacks if stack.split(';')[-1].startswith('inner ')]
+        self.assertEqual(len(leaf), 1)
+        self.assertIn('outer (test_profiling.py:', leaf[0])
+        self.assertTrue(leaf[0].index('outer') < leaf[0].index('inner'))
+        self.assertTrue(all(microseconds > 0 for microseconds in stacks.values()))
+
+    def test_dump(self):
+        """ Test the run is dumped as pstats and collapsed stacks"""
+        self.assertIsNone(Profiler().dump())
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler(output=os.path.join(directory, 'run'))
+            profiler.start()
+            outer(5000)
+            profiler.stop()
+            stats_path, collapsed_path = profiler.dump()
+            self.assertGreater(pstats.Stats(stats_path).total_calls, 20)
+            with open(collapsed_path, encoding='utf-8') as collapsed:
+                lines = collapsed.read().splitlines()
+            self.assertTrue(lines)
+            for line in lines:
+                stack, microseconds = line.rsplit(' ', 1)
+                self.assertTrue(stack)
+                self.assertGreater(int(microseconds), 0)
+
+if __name__ == "__main__":
+    unittest.main()
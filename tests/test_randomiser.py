@@ -3,9 +3,11 @@ Unit tests for Randomiser class
 """
 import unittest
 # Package imports
+from pynetfuzz import const
+from pynetfuzz.packet import PacketDetails
 import pynetfuzz.exceptions as ex
 # Module under test
-from pynetfuzz.randomiser import Randomiser
+from pynetfuzz.randomiser import Randomiser, FieldLayout
 
 # Testing the Randomiser Class
 class TestRandomiser(unittest.TestCase):
@@ -29,16 +31,27 @@ class TestRandomiser(unittest.TestCase):
 
     def test_valid_ip(self):
         """ Test valid ip randomise method"""
-        # Random int (0-255) Sequence: 68 32 130 60 253 230 241 194
+        # Random bits (getrandbits(32)) Sequence (hex): 22 65 B1 F5
         seed = 1
         # Correct random IP generation
         self.assertEqual(Randomiser(seed).ipaddr("192.168.1.24"), "192.168.1.24")
-        self.assertEqual(Randomiser(seed).ipaddr("192.168.1.*"), "192.168.1.68")
-        self.assertEqual(Randomiser(seed).ipaddr("192.168.*.*"), "192.168.68.32")
-        self.assertEqual(Randomiser(seed).ipaddr("192.*.*.*"), "192.68.32.130")
-        self.assertEqual(Randomiser(seed).ipaddr("*.*.*.*"), "68.32.130.60")
-        self.assertEqual(Randomiser(seed).ipaddr(), "68.32.130.60")
+        self.assertEqual(Randomiser(seed).ipaddr("192.168.1.*"), "192.168.1.34")
+        self.assertEqual(Randomiser(seed).ipaddr("192.168.*.*"), "192.168.34.101")
+        self.assertEqual(Randomiser(seed).ipaddr("192.*.*.*"), "192.34.101.177")
+        self.assertEqual(Randomiser(seed).ipaddr("*.*.*.*"), "34.101.177.245")
+        self.assertEqual(Randomiser(seed).ipaddr(), "34.101.177.245")
         self.assertEqual(Randomiser(seed).ipaddr(), Randomiser(seed).ipaddr("*.*.*.*"))
+        # CIDR, range and IPv6 scopes
+        randomiser = Randomiser(seed)
+        for _ in range(100):
+            self.assertTrue(randomiser.ipaddr("10.0.0.0/12").startswith("10."))
+            self.assertLess(int(randomiser.ipaddr("10.0.0.0/12").split('.')[1]), 16)
+            address = tuple(int(octet) for octet in randomiser.ipaddr(
+                "10.0.0.5-10.0.3.200").split('.'))
+            self.assertTrue((10, 0, 0, 5) <= address <= (10, 0, 3, 200))
+            self.assertTrue(randomiser.ipaddr("2001:db8::/32").startswith("2001:db8:"))
+        self.assertEqual(Randomiser(seed).ipaddr("10.1.2.3/32"), "10.1.2.3")
+        self.assertEqual(Randomiser(seed).ipaddr("2001:db8::1"), "2001:db8::1")
 
     def test_invalid_ipaddr(self):
         """ Test invalid ipaddr randomise method"""
@@ -62,25 +75,31 @@ class TestRandomiser(unittest.TestCase):
             Randomiser(seed).ipaddr("198.63.154.256")
         with self.assertRaises(ex.IpAddressTooLongValueError):
             Randomiser(seed).ipaddr("39wrnvkdsnv.4903wr.fosief.309")
+        # Incorrect CIDR, range and IPv6 scope tests
+        with self.assertRaises(ex.IpScopeAddressInvalidFormatError):
+            Randomiser(seed).ipaddr("192.168.1.254/24") # Host bits set
+        with self.assertRaises(ex.IpScopeAddressInvalidFormatError):
+            Randomiser(seed).ipaddr("192.168.1.0/33")
+        with self.assertRaises(ex.IpScopeAddressInvalidFormatError):
+            Randomiser(seed).ipaddr("2001:db8::g")
+        with self.assertRaises(ex.IpScopeAddressInvalidValueError):
+            Randomiser(seed).ipaddr("10.0.3.200-10.0.0.5")
+        with self.assertRaises(ex.IpScopeAddressInvalidValueError):
+            Randomiser(seed).ipaddr("10.0.0.5-2001:db8::1")
 
     def test_mac(self):
         """ Test mac address randomise method"""
         seeds = {
-            # Seed: 11 - Random int (0-255) Sequence (dec): 231 238 231 97 94
-            # Seed: 11 - Random int (0-255) Sequence (hex): E7 EE E7 61 5E
-            11: "00:E7:EE:E7:61:5E",
-            # Seed: 21 - Random int (0-255) Sequence (dec): 84 214 214 144 245
-            # Seed: 21 - Random int (0-255) Sequence (hex): 54 D6 D6 90 F5
-            21: "00:54:D6:D6:90:F5",
-            # Seed: 31 - Random int (0-255) Sequence (dec): 6 240 57 201 72
-            # Seed: 31 - Random int (0-255) Sequence (hex): 6 F0 39 C9 48
-            31: "00:6:F0:39:C9:48",
-            # Seed: 41 - Random int (0-255) Sequence (dec): 195 170 118 85 197
-            # Seed: 41 - Random int (0-255) Sequence (hex): C3 AA 76 55 C5
-            41: "00:C3:AA:76:55:C5",
-            # Seed: 51 - Random int (0-255) Sequence (dec): 124 82 125 118 130
-            # Seed: 51 - Random int (0-255) Sequence (hex): 7C 52 7D 76 82
-            51: "00:7C:52:7D:76:82",
+            # Seed: 11 - Random bits (getrandbits(40)) Octets (hex): DD 73 CF 25 6D
+            11: "00:DD:73:CF:25:6D",
+            # Seed: 21 - Random bits (getrandbits(40)) Octets (hex): 6B 2A 3A 21 7
+            21: "00:6B:2A:3A:21:7",
+            # Seed: 31 - Random bits (getrandbits(40)) Octets (hex): 78 3 24 AA C3
+            31: "00:78:3:24:AA:C3",
+            # Seed: 41 - Random bits (getrandbits(40)) Octets (hex): 55 61 8A 92 61
+            41: "00:55:61:8A:92:61",
+            # Seed: 51 - Random bits (getrandbits(40)) Octets (hex): D6 3E 57 2E F
+            51: "00:D6:3E:57:2E:F",
         }
         for seed, result in seeds.items():
             self.assertEqual(Randomiser(seed).mac(), result)
@@ -187,23 +206,106 @@ class TestRandomiser(unittest.TestCase):
 
     def test_bit(self):
         """ Test bit randomise method"""
-        seed = 111 # Random int (0, bit)
+        seed = 111 # Random bits (getrandbits(bit))
         # Correct random choice generation
         randomiser = Randomiser(seed)
-        self.assertEqual(randomiser.bit_32(), 913810597)
-        self.assertEqual(randomiser.bit_20(), 662646)
-        self.assertEqual(randomiser.bit_16(), 64739)
-        self.assertEqual(randomiser.bit_13(), 3181)
-        self.assertEqual(randomiser.bit_8(), 203)
-        self.assertEqual(randomiser.bit_3(), 6)
+        self.assertEqual(randomiser.bit_32(), 3552670516)
+        self.assertEqual(randomiser.bit_20(), 994806)
+        self.assertEqual(randomiser.bit_16(), 13943)
+        self.assertEqual(randomiser.bit_13(), 7546)
+        self.assertEqual(randomiser.bit_8(), 241)
+        self.assertEqual(randomiser.bit_3(), 2)
         self.assertEqual(randomiser.bit_2(), 1)
-        self.assertEqual(randomiser.bit_32(), 831557934)
-        self.assertEqual(randomiser.bit_20(), 884253)
-        self.assertEqual(randomiser.bit_16(), 30107)
-        self.assertEqual(randomiser.bit_13(), 3003)
-        self.assertEqual(randomiser.bit_8(), 237)
-        self.assertEqual(randomiser.bit_3(), 6)
-        self.assertEqual(randomiser.bit_2(), 3)
+        self.assertEqual(randomiser.bit_32(), 834120599)
+        self.assertEqual(randomiser.bit_20(), 416900)
+        self.assertEqual(randomiser.bit_16(), 27326)
+        self.assertEqual(randomiser.bit_13(), 5055)
+        self.assertEqual(randomiser.bit_8(), 207)
+        self.assertEqual(randomiser.bit_3(), 1)
+        self.assertEqual(randomiser.bit_2(), 2)
+        # Full 32 bit range
+        self.assertTrue(any(randomiser.bit_32() > 0x7FFFFFFF for _ in range(64)))
+
+    @staticmethod
+    def get_details(**kwargs):
+        """ Method to create packet details with unset fields randomised"""
+        info = {'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': None, 'headers': None}
+        info.update(kwargs)
+        return PacketDetails(info)
+
+    def test_packet_details_length(self):
+        """ Test lengths are limited by the protocols actually used"""
+        randomiser = Randomiser(5)
+        jumbo = const.INTERNET_PROTOCOLS_INFO['jumbo']['value']
+        ipv4 = const.INTERNET_PROTOCOLS_INFO['ipv4']['value']
+        protocols = set()
+        for _ in range(200):
+            details = randomiser.packet_details(self.get_details(), self.get_details())
+            protocols.add(details.int_protocol)
+            self.assertLessEqual(details.length, 1500 - 20 - 8)
+            details = randomiser.packet_details(
+                self.get_details(int_protocol=ipv4), self.get_details())
+            self.assertLessEqual(details.length, 1500 - 20 - 8)
+        # Jumbo frames are only sent when asked for
+        self.assertNotIn(jumbo, protocols)
+        lengths = [randomiser.packet_details(self.get_details(int_protocol=jumbo),
+            self.get_details()).length for _ in range(200)]
+        self.assertGreater(max(lengths), 1500)
+        details = randomiser.packet_details(self.get_details(), self.get_details(), ('ipv6',))
+        self.assertEqual(details.int_protocol, const.INTERNET_PROTOCOLS_INFO['ipv6']['value'])
+
+    def test_extensions(self):
+        """ Test extension header fields are fuzzed and the chain fits the MTU"""
+        randomiser = Randomiser(8)
+        lengths = {'fragment': 8}
+        for _ in range(200):
+            details = randomiser.extensions(self.get_details(
+                int_protocol=0x86DD, trans_protocol=17, length=1452))
+            chain, fields = details.ip6_extensions, details.ip6_extension_fields
+            self.assertEqual(len(chain), len(fields))
+            total = 0
+            for name, values in zip(chain, fields):
+                if name == 'routing':
+                    total += 8 + 16 * len(values['addresses'])
+                elif name in ('hop_by_hop', 'destination'):
+                    self.assertEqual((len(values['optdata']) + 4) % 8, 0)
+                    total += len(values['optdata']) + 4
+                else:
+                    self.assertEqual(set(values), {'offset', 'res2', 'm', 'id'})
+                    total += lengths[name]
+            self.assertEqual(details.length, min(1452, 1500 - 40 - 8 - total))
+
+    def test_field_layout(self):
+        """ Test header fields are sliced from a single draw"""
+        layout = FieldLayout((('a', 3), ('b', 13)), (('c', 32),))
+        self.assertEqual((layout.bits, str(layout)), (48, 'FieldLayout - Headers: (2), Bits: (48)'))
+        Randomiser(5)
+        value = Randomiser.data(6)
+        Randomiser(5)
+        first, second = layout.draw({}, {'d': 1})
+        value = int.from_bytes(value, 'big')
+        self.assertEqual(first, {'a': value & 0x7, 'b': value >> 3 & 0x1FFF})
+        self.assertEqual(second, {'c': value >> 16, 'd': 1})
+
+    def test_headers(self):
+        """ Test every header field is randomised within its bits"""
+        randomiser = Randomiser(12)
+        tops = set()
+        for int_protocol, fields in ((0x800, const.IPV4_HEADER_FIELDS),
+                (0x86DD, const.IPV6_HEADER_FIELDS)):
+            for _ in range(100):
+                details = randomiser.headers(self.get_details(int_protocol=int_protocol,
+                    trans_protocol=0x06, length=100))
+                for header, header_fields in ((details.ip_header, fields),
+                        (details.tcp_header, const.TCP_HEADER_FIELDS)):
+                    self.assertEqual(set(header), {name for name, _ in header_fields})
+                    for name, bits in header_fields:
+                        self.assertLess(header[name], 1 << bits)
+                        tops.add((name, header[name] >> (bits - 1)))
+        # The top bit of every field is drawn, e.g. TCP sequence numbers above 2^31
+        self.assertIn(('seq', 1), tops)
+        self.assertEqual(len(tops), 2 * (5 + 3 + 4))
 
 if __name__ == "__main__":
     unittest.main()
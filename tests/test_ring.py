@@ -0,0 +1,134 @@
+"""
+Unit tests for FrameRing and WorkerGroup classes
+"""
+import unittest
+import multiprocessing
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.seeds import SeedSchedule
+from pynetfuzz.workers import WorkerGroup
+# Module under test
+from pynetfuzz.ring import FrameRing
+
+
+def produce(name, count):
+    """ Writes count numbered frames into an attached ring from another process"""
+    ring = FrameRing(4, 64, name=name)
+    for index in range(count):
+        ring.put_wait(bytes([index % 256]) * (index % 60 + 1), 0, index)
+    ring.close()
+
+
+# Testing the FrameRing Class
+class TestFrameRing(unittest.TestCase):
+    """ Testing FrameRing class and methods"""
+
+    def test_put_peek_release(self):
+        """ Test frames are read back in order with their slot header"""
+        ring = FrameRing(2, 16)
+        try:
+            self.assertIsNone(ring.peek())
+            self.assertTrue(ring.put(b'first', 7, 1, 0x800, 6, 2))
+            self.assertTrue(ring.put(b'second', 7, 2, 0x86DD, 17, 0))
+            self.assertFalse(ring.put(b'third')) # Full
+            self.assertEqual((ring.used(), ring.utilisation()), (2, 1.0))
+            seed, offset, int_protocol, trans_protocol, cast, frame = ring.peek()
+            self.assertEqual((seed, offset, int_protocol, trans_protocol, cast, bytes(frame)),
+                (7, 1, 0x800, 6, 2, b'first'))
+            frame.release()
+            ring.release()
+            self.assertTrue(ring.put(b'third'))
+            self.assertEqual(bytes(ring.peek()[-1]), b'second')
+            ring.release()
+            self.assertEqual(bytes(ring.peek()[-1]), b'third')
+            ring.release()
+            self.assertIsNone(ring.peek())
+            with self.assertRaises(ex.RingFrameTooLargeError):
+                ring.put(bytes(17))
+        finally:
+            ring.close()
+
+    def test_backpressure(self):
+        """ Test a full ring makes the producer wait and counts the stall"""
+        ring = FrameRing(1, 8)
+        try:
+            ring.put(b'a')
+            self.assertFalse(ring.put_wait(b'b', timeout=0.01))
+            self.assertEqual(ring.stalls(), 1)
+        finally:
+            ring.close()
+
+    def test_cross_process(self):
+        """ Test a producer process attached by name hands every frame over in order"""
+        ring = FrameRing(4, 64)
+        context = multiprocessing.get_context('spawn')
+        process = context.Process(target=produce, args=(ring.name, 300))
+        process.start()
+        try:
+            received = 0
+            while received < 300:
+                entry = ring.peek()
+                if entry is None:
+                    continue
+                frame = entry[-1]
+                self.assertEqual((entry[1], bytes(frame)),
+                    (received, bytes([received % 256]) * (received % 60 + 1)))
+                frame.release()
+                ring.release()
+                received += 1
+            process.join(10)
+            self.assertLessEqual(ring.high_water, 4)
+        finally:
+            process.join(10)
+            ring.close()
+
+    def test_worker_group(self):
+        """ Test worker processes together send the requested number of frames"""
+        workers = WorkerGroup(2, slots=8)
+        try:
+            workers.start(Host('10.0.0.1', '00:11:22:33:44:55', '80'),
+                PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+                    'vlan': False, 'headers': True, 'min_length': None, 'max_length': 100}),
+                Host(None, None, None), SeedSchedule(5), 101)
+            seen = {0: 0, 1: 0}
+            for worker, seed, _, _, _, _, frame in workers.frames():
+                # Worker w of 2 takes cycles w and w + 2 of the schedule
+                self.assertIn(seed, (SeedSchedule(5).seed(worker),
+                    SeedSchedule(5).seed(worker + 2)))
+                self.assertGreater(len(frame), 14)
+                seen[worker] += 1
+            self.assertEqual(seen, {0: 51, 1: 50})
+        finally:
+            workers.close()
+
+    def test_worker_failed(self):
+        """ Test a worker exiting with an error is raised instead of ending the frames"""
+        workers = WorkerGroup(1, slots=4, slot_size=32) # Too small for any frame
+        try:
+            workers.start(Host('10.0.0.1', '00:11:22:33:44:55', '80'),
+                PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+                    'vlan': False, 'headers': False, 'min_length': 100, 'max_length': 100}),
+                Host(None, None, None), SeedSchedule(5), 10)
+            with self.assertRaises(ex.WorkerFailedError):
+                list(workers.frames())
+        finally:
+            workers.close()
+
+    def test_frames_closed_early(self):
+        """ Test the group closes once the frame iterator is closed mid-frame"""
+        workers = WorkerGroup(1, slots=4)
+        workers.start(Host('10.0.0.1', '00:11:22:33:44:55', '80'),
+            PacketDetails({'int_protocol': None, 'trans_protocol': None, 'cast': None,
+                'vlan': False, 'headers': False, 'min_length': None, 'max_length': 100}),
+            Host(None, None, None), SeedSchedule(5), 50)
+        frames = workers.frames()
+        frame = next(frames)[-1]
+        frames.close()
+        with self.assertRaises(ValueError):
+            len(frame) # Released
+        workers.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for IpScope class
+"""
+import unittest
+import ipaddress
+# Package imports
+import pynetfuzz.exceptions as ex
+from pynetfuzz.randomiser import Randomiser
+# Module under test
+from pynetfuzz.scopes import IpScope, compile_scope
+
+# Testing the IpScope Class
+class TestIpScope(unittest.TestCase):
+    """ Testing IpScope class and methods"""
+
+    def test_compile(self):
+        """ Test scopes compile to integer base, mask and span"""
+        scope = IpScope('192.168.*.1')
+        self.assertEqual((scope.version, scope.base, scope.mask, scope.span),
+            (4, 0xC0A80001, 0x0000FF00, 0))
+        scope = IpScope('10.0.0.0/12')
+        self.assertEqual((scope.base, scope.mask, scope.size()), (0x0A000000, 0x000FFFFF, 1 << 20))
+        scope = IpScope('10.0.0.5-10.0.3.200')
+        self.assertEqual((scope.base, scope.mask, scope.span), (0x0A000005, 0, 964))
+        scope = IpScope('2001:db8::/32')
+        self.assertEqual((scope.version, scope.mask), (6, (1 << 96) - 1))
+        self.assertEqual(IpScope('192.168.1.1').fixed, '192.168.1.1')
+        self.assertIs(compile_scope('10.0.0.0/8'), compile_scope('10.0.0.0/8'))
+        with self.assertRaises(ex.IpScopeAddressInvalidFormatError):
+            IpScope('192.168.1.254/24')
+
+    def test_draw(self):
+        """ Test drawn addresses are inside their scope"""
+        Randomiser(1)
+        for string in ('192.*.1.*', '10.0.0.0/12', '10.0.0.5-10.0.3.200', 'fd00::/8',
+                '2001:db8::1-2001:db8::ff', '*.*.*.*'):
+            scope = IpScope(string)
+            for _ in range(200):
+                self.assertIn(scope.draw(), scope)
+        self.assertNotIn('10.16.0.0', IpScope('10.0.0.0/12'))
+        self.assertNotIn('10.0.3.201', IpScope('10.0.0.5-10.0.3.200'))
+
+    def test_batch(self):
+        """ Test batched draws are inside their scope and use a single draw"""
+        Randomiser(1)
+        for string in ('192.168.*.*', '10.0.0.0/12', '10.0.0.5-10.0.3.200', 'fd00::/8'):
+            scope = IpScope(string)
+            values = scope.batch(500)
+            self.assertEqual(len(values), 500)
+            for value in values:
+                self.assertIn(str(ipaddress.ip_address(value)), scope)
+            # A 964 address range repeats addresses within 500 draws
+            self.assertGreater(len(set(values)), min(400, scope.size() // 3))
+        self.assertEqual(IpScope('10.0.0.0/12').batch(0), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for SeedSchedule class
+"""
+import logging
+import os
+import sys
+import tempfile
+import unittest
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args, parse_args
+from pynetfuzz.hosts import Host
+from pynetfuzz.journal import Journal
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.seeds import SeedSchedule, splitmix64
+
+
+# Testing the SeedSchedule Class
+class TestSeedSchedule(unittest.TestCase):
+    """ Testing SeedSchedule class and methods"""
+
+    def test_splitmix64(self):
+        """ Test outputs match the SplitMix64 reference sequence"""
+        self.assertEqual([splitmix64(0, index) for index in range(2)],
+            [0xE220A8397B1DCDAF, 0x6E789E6AA1B965F4])
+        self.assertNotEqual(splitmix64(1, 0), splitmix64(0, 0))
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.SeedInvalidTypeError):
+            SeedSchedule(None)
+        with self.assertRaises(ex.SeedInvalidTypeError):
+            SeedSchedule(1, priority=([5],))
+        with self.assertRaises(ex.SeedInvalidValueError):
+            SeedSchedule(1, skip=(sys.maxsize + 1,))
+
+    def test_derived(self):
+        """ Test cycles take distinct, reproducible seeds of the master seed"""
+        seeds = [SeedSchedule(7).seed(cycle) for cycle in range(1000)]
+        self.assertEqual(seeds, [SeedSchedule(7).seed(cycle) for cycle in range(1000)])
+        self.assertEqual(len(set(seeds)), 1000)
+        self.assertTrue(all(0 <= seed <= sys.maxsize for seed in seeds))
+        self.assertNotEqual(seeds[:10], [SeedSchedule(8).seed(cycle) for cycle in range(10)])
+
+    def test_priority_and_skip(self):
+        """ Test priority seeds run first and skipped seeds never run"""
+        derived = [SeedSchedule(7).seed(cycle) for cycle in range(6)]
+        schedule = SeedSchedule(7, priority=(4, derived[2], 4, 9), skip=(9, derived[0]))
+        self.assertEqual(schedule.priority, (4, derived[2]))
+        self.assertEqual([schedule.seed(cycle) for cycle in range(6)],
+            [4, derived[2], derived[1], derived[3], derived[4], derived[5]])
+        # Cycles out of order give the same seeds as cycles in order
+        self.assertEqual([schedule.seed(cycle) for cycle in (5, 2, 4, 3)],
+            [derived[5], derived[1], derived[4], derived[3]])
+        self.assertEqual(str(schedule),
+            'SeedSchedule - Master: (7), Priority: (2), Skip: (2)')
+
+    def test_parse_args(self):
+        """ Test seed lists are parsed from comma separated seeds"""
+        args = parse_args(['10.0.0.1', 'lo', '1', '-spr', '5, 16', '-ssk', '3'])
+        self.assertEqual((args.seed_priority, args.seed_skip), ((5, 16), (3,)))
+        with self.assertRaises(SystemExit):
+            parse_args(['10.0.0.1', 'lo', '1', '-ssk', '3,-1'])
+
+
+# Testing seed schedules in runs
+class TestSeedRun(unittest.TestCase):
+    """ Testing runs take a new seed every cycle"""
+
+    def run_journal(self, **options) -> list:
+        """ Runs 300 packets with a journal
+
+        Returns:
+            list: Seed of each journal record
+        """
+        sendp, ping_host, cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        packet.sendp = lambda frame, **kwargs: None
+        Host.ping_host = lambda host: True
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                run.run(Args({'target_ip': '10.0.0.1', 'network_interface': 'lo',
+                    'n_packets': 300, 'seed': 11, 'cycle_length': 100, 'journal': 'run.journal',
+                    **options}))
+                seeds = [record.seed for record in Journal.read('run.journal')]
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host = sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        return seeds
+
+    def test_run(self):
+        """ Test every cycle of a run takes the next seed of the schedule"""
+        schedule = SeedSchedule(11)
+        expected = [schedule.seed(cycle) for cycle in range(3)]
+        self.assertEqual(self.run_journal(),
+            [seed for seed in expected for _ in range(100)])
+        self.assertEqual(self.run_journal(seed_priority=(5,), seed_skip=(expected[0],)),
+            [seed for seed in (5, expected[1], expected[2]) for _ in range(100)])
+
+if __name__ == "__main__":
+    unittest.main()
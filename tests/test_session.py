@@ -0,0 +1,125 @@
+"""
+Unit tests for Session class
+"""
+import logging
+import os
+import tempfile
+import unittest
+# Package imports
+from pynetfuzz import const
+from pynetfuzz import packet
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.session import Session, FrozenHost, FrozenPacketDetails, normalise_host
+
+
+# Testing the Session Class
+class TestSession(unittest.TestCase):
+    """ Testing Session class and methods"""
+
+    def setUp(self):
+        """ Counts remote MAC lookups instead of sending ARP requests"""
+        self.lookups = []
+        self.get_remote_mac = Host.get_remote_mac
+        Host.get_remote_mac = staticmethod(
+            lambda ip: self.lookups.append(ip) or '00:11:22:33:44:55')
+
+    def tearDown(self):
+        """ Restores the remote MAC lookup"""
+        Host.get_remote_mac = self.get_remote_mac
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            Session(0)
+
+    def test_normalise_host(self):
+        """ Test equivalent host inputs are normalised to the same key"""
+        self.assertEqual(normalise_host(' fd00::a ', '00-11-22-aa-bb-cc', '80'),
+            ('FD00::A', '00:11:22:AA:BB:CC', 80, None))
+        self.assertEqual(normalise_host('10.0.0.1', 'SELF', None), ('10.0.0.1', 'self', None, None))
+        self.assertEqual(normalise_host('10.0.0.1', '0011.22aa.bbcc', 'x')[1:3],
+            ('00:11:22:AA:BB:CC', 'x'))
+
+    def test_cached_hosts(self):
+        """ Test hosts are built and looked up once per normalised input"""
+        session = Session()
+        host = session.host('10.0.0.1', 'self', '80')
+        self.assertIsInstance(host, FrozenHost)
+        self.assertIs(session.host('10.0.0.1', 'self', 80), host)
+        self.assertEqual(self.lookups, ['10.0.0.1'])
+        self.assertIs(session.host('10.0.0.2', '00-11-22-33-44-55', None),
+            session.host('10.0.0.2', '00:11:22:33:44:55', None))
+        with self.assertRaises(ex.PortInvalidValueError):
+            session.host('10.0.0.1', 'self', '0')
+        session.clear()
+        session.host('10.0.0.1', 'self', '80')
+        self.assertEqual(len(self.lookups), 2)
+
+    def test_frozen(self):
+        """ Test cached objects can not be changed, except a host's online state"""
+        session = Session()
+        host = session.host('10.0.0.1', '00:11:22:33:44:55', '80')
+        with self.assertRaises(ex.FrozenObjectError):
+            host.ip = '10.0.0.2'
+        host.online = True
+        self.assertEqual(str(host), 'IP: 10.0.0.1, MAC: 00:11:22:33:44:55, Port: 80, '
+            'Interface: None, Online: True')
+        details = session.details({'int_protocol': None, 'trans_protocol': None,
+            'cast': None, 'vlan': False, 'headers': True})
+        self.assertIsInstance(details, FrozenPacketDetails)
+        with self.assertRaises(ex.FrozenObjectError):
+            details.set('vlan', True)
+        self.assertNotIn('frozen', str(details))
+
+    def test_cached_details(self):
+        """ Test packet details are validated once per info"""
+        session = Session(maxsize=1)
+        info = {'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': False, 'headers': True}
+        details = session.details(info)
+        self.assertIs(session.details(dict(reversed(list(info.items())))), details)
+        self.assertIsNot(session.details({**info, 'vlan': True}), details)
+        with self.assertRaises(ex.PacketInfoMissingEntriesError):
+            session.details({'vlan': False})
+        with self.assertRaises(ex.PacketInfoTypeError):
+            session.details(None)
+
+    def test_plan(self):
+        """ Test plans of the same arguments share hosts and details"""
+        session = Session()
+        args = {'target_ip': '10.0.0.1', 'target_mac': 'self', 'n_packets': 1}
+        first, second = session.plan(args), session.plan(dict(args, n_packets=2))
+        self.assertIs(first.target, second.target)
+        self.assertIs(first.source, second.source)
+        self.assertIs(first.details, second.details)
+        self.assertEqual(first.details.int_protocol,
+            const.INTERNET_PROTOCOLS_INFO['ipv4']['value'])
+        self.assertEqual(self.lookups, ['10.0.0.1'])
+
+    def test_run(self):
+        """ Test a session runs repeatedly with one remote MAC lookup"""
+        sent = []
+        sendp, ping_host, cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        packet.sendp = lambda frame, **kwargs: sent.append(frame)
+        Host.ping_host = lambda host: True
+        session = Session()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                for _ in range(2):
+                    session.run({'target_ip': '10.0.0.1', 'target_mac': 'self',
+                        'network_interface': 'lo', 'n_packets': 5, 'seed': 1})
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host = sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(len(sent), 10)
+        self.assertEqual(self.lookups, ['10.0.0.1'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit tests for Sweep class
+"""
+import unittest
+# Package imports
+from pynetfuzz import const
+import pynetfuzz.exceptions as ex
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.randomiser import Randomiser
+# Module under test
+from pynetfuzz.sweep import Sweep
+
+# Testing the Sweep Class
+class TestSweep(unittest.TestCase):
+    """ Testing Sweep class and methods"""
+
+    IPV4_VALUE = const.INTERNET_PROTOCOLS_INFO['ipv4']['value']
+    TCP_VALUE = const.TRANSPORT_PROTOCOLS_INFO['tcp']['value']
+
+    @staticmethod
+    def get_details(**kwargs):
+        """ Static method for building initial packet details
+
+        Returns:
+            PacketDetails: Initial packet details with every field swept
+        """
+        info = {'int_protocol': None, 'trans_protocol': None, 'cast': None,
+            'vlan': None, 'headers': None, 'min_length': None, 'max_length': None}
+        info.update(kwargs)
+        return PacketDetails(info)
+
+    def test_valid_size(self):
+        """ Test number of strata in the sweep"""
+        self.assertEqual(len(Sweep(self.get_details(), buckets=4)), 2 * 2 * 3 * 2 * 2 * 4)
+        self.assertEqual(
+            len(Sweep(self.get_details(int_protocol=self.IPV4_VALUE, vlan=False), buckets=1)),
+            2 * 3 * 2)
+        self.assertEqual(
+            len(list(Sweep(self.get_details(), buckets=2).combinations())),
+            len(Sweep(self.get_details(), buckets=2)))
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            Sweep(self.get_details(), buckets=0)
+        with self.assertRaises(ex.IntegerTooLargeError):
+            Sweep(self.get_details(), shard=2, shards=2)
+        with self.assertRaises(ex.InvalidPacketDetailsError):
+            Sweep({})
+
+    def test_full_coverage(self):
+        """ Test any run of len(sweep) indices covers every stratum exactly once"""
+        sweep = Sweep(self.get_details(), buckets=3)
+        strata = [sweep.stratum(index) for index in range(len(sweep))]
+        self.assertEqual(set(strata), set(sweep.combinations()))
+        self.assertEqual(len(set(strata)), len(sweep))
+
+    def test_interleaved_prefix(self):
+        """ Test a partial run covers each dimension uniformly"""
+        sweep = Sweep(self.get_details(), buckets=4)
+        prefix = [sweep.stratum(index) for index in range(12)]
+        int_protocols = [stratum[0] for stratum in prefix]
+        casts = [stratum[2] for stratum in prefix]
+        self.assertEqual(int_protocols.count(self.IPV4_VALUE), 6)
+        for cast in const.CAST_TYPES:
+            self.assertEqual(casts.count(cast), 4)
+        # Slow dimensions cycle too, a quarter of the sweep sees every header and bucket
+        prefix = [sweep.stratum(index) for index in range(len(sweep) // 4)]
+        headers = [stratum[4] for stratum in prefix]
+        buckets = [stratum[5] for stratum in prefix]
+        self.assertEqual(headers.count(True), len(prefix) // 2)
+        for bucket in range(4):
+            self.assertTrue(len(prefix) // 8 <= buckets.count(bucket) <= 3 * len(prefix) // 8)
+
+    def test_split(self):
+        """ Test workers splitting a shard together cover the shard's strata"""
+        sweep = Sweep(self.get_details(), buckets=2, shard=1, shards=2)
+        workers = [sweep.split(worker, 3) for worker in range(3)]
+        strata = set()
+        for index in range(len(sweep) // 6):
+            for worker in workers:
+                strata.add(worker.stratum(index))
+        self.assertEqual(strata, {sweep.stratum(index) for index in range(len(sweep) // 2)})
+        self.assertEqual((workers[2].shard, workers[2].shards), (5, 6))
+
+    def test_sharding(self):
+        """ Test shards are disjoint and together cover every stratum"""
+        shards = 3
+        sweeps = [Sweep(self.get_details(), buckets=2, shard=shard, shards=shards)
+            for shard in range(shards)]
+        per_shard = len(sweeps[0]) // shards
+        strata = [sweep.stratum(index) for sweep in sweeps for index in range(per_shard)]
+        self.assertEqual(len(set(strata)), len(sweeps[0]))
+        self.assertEqual(sweeps[0].coverage(per_shard), per_shard)
+        self.assertEqual(sweeps[0].coverage(per_shard * 2), per_shard)
+        sweep = Sweep(self.get_details(), buckets=1, shard=1, shards=5)
+        self.assertEqual(sweep.coverage(1000), len(sweep))
+
+    def test_length_range(self):
+        """ Test length buckets partition the valid length range"""
+        sweep = Sweep(self.get_details(min_length=100, max_length=499), buckets=4)
+        ranges = [sweep.length_range(self.IPV4_VALUE, self.TCP_VALUE, bucket)
+            for bucket in range(4)]
+        self.assertEqual(ranges, [(100, 199), (200, 299), (300, 399), (400, 499)])
+        sweep = Sweep(self.get_details(), buckets=1)
+        self.assertEqual(sweep.length_range(self.IPV4_VALUE, self.TCP_VALUE, 0), (0, 1460))
+
+    def test_packet_details(self):
+        """ Test packet details are populated from the stratum"""
+        sweep = Sweep(self.get_details(), buckets=4)
+        random_details = self.get_details()
+        randomiser = Randomiser(1)
+        for index in range(len(sweep)):
+            int_protocol, trans_protocol, cast, vlan, headers, bucket = sweep.stratum(index)
+            details = sweep.packet_details(index, randomiser, random_details)
+            self.assertEqual(
+                (details.int_protocol, details.trans_protocol, details.cast,
+                    details.vlan, details.headers),
+                (int_protocol, trans_protocol, cast, vlan, headers))
+            minimum, maximum = sweep.length_range(int_protocol, trans_protocol, bucket)
+            self.assertTrue(minimum <= details.length <= maximum)
+            if headers:
+                self.assertTrue(isinstance(details.ip_header, dict))
+            self.assertIsNone(details.bad_checksum)
+
+    def test_bad_checksum(self):
+        """ Test swept packet details carry checksum corruption when asked for"""
+        sweep = Sweep(self.get_details(bad_checksum=True), buckets=2)
+        random_details = self.get_details()
+        randomiser = Randomiser(1)
+        for index in range(len(sweep)):
+            details = sweep.packet_details(index, randomiser, random_details)
+            self.assertTrue(any(details.bad_checksum))
+
+if __name__ == "__main__":
+    unittest.main()
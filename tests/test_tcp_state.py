@@ -0,0 +1,232 @@
+"""
+Unit tests for ConnectionTable and TcpState classes
+"""
+import logging
+import os
+import socket
+import tempfile
+import unittest
+from scapy.layers.l2 import Ether
+from scapy.layers.inet import IP, TCP
+# Package imports
+from pynetfuzz import const
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args
+from pynetfuzz.campaign import PhasePlan
+from pynetfuzz.hosts import Host
+from pynetfuzz.packet import PacketDetails
+from pynetfuzz.packet_generator import packet_generator
+from pynetfuzz.pool import PacketPool
+from pynetfuzz.randomiser import Randomiser
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.tcp_state import ConnectionTable, TcpState
+
+TARGET = ('10.0.0.1', '00:11:22:33:44:55', 80)
+SOURCE = ('10.0.0.2', '00:AA:BB:CC:DD:EE')
+
+
+class Loopback():
+    """ Layer 2 socket stand-in, the target answers SYNs with a SYN-ACK"""
+
+    def __init__(self):
+        self.local, self.remote = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sent = []
+
+    def fileno(self):
+        """ File descriptor the replies are read from"""
+        return self.local.fileno()
+
+    def send(self, frame):
+        """ Records a frame and answers SYNs"""
+        self.sent.append(frame)
+        segment = Ether(frame)[TCP]
+        if segment.flags == 'S':
+            self.reply(segment.sport, 'SA', 5000, segment.seq + 1)
+
+    def reply(self, port, flags, seq, ack, data=b''):
+        """ Sends a segment from the target"""
+        self.remote.send(bytes(Ether(src=TARGET[1], dst=SOURCE[1]) / \
+            IP(src=TARGET[0], dst=SOURCE[0]) / \
+            TCP(sport=TARGET[2], dport=port, flags=flags, seq=seq, ack=ack, window=1000) / data))
+
+    def recv_raw(self):
+        """ Reads a reply"""
+        return None, self.local.recv(65535), None
+
+    def close(self):
+        """ Closes the socket pair"""
+        self.local.close()
+        self.remote.close()
+
+
+# Testing the ConnectionTable Class
+class TestConnectionTable(unittest.TestCase):
+    """ Testing ConnectionTable class and methods"""
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            ConnectionTable(0)
+        with self.assertRaises(ex.TcpStateCapacityError):
+            ConnectionTable(100, 65500)
+
+    def test_connections(self):
+        """ Test connections are opened, established and closed in the arrays"""
+        table = ConnectionTable(4, 20000)
+        self.assertEqual((table.port(3), table.row(20003), table.row(20004)), (20003, 3, -1))
+        for row in range(4):
+            table.open(row, 0xFFFFFFFF)
+            table.establish(row, 100 + row, 512)
+        self.assertEqual(list(table.established), [0, 1, 2, 3])
+        self.assertEqual((table.snd_nxt[0], table.rcv_nxt[2]), (0, 103))
+        table.close(1)
+        self.assertEqual((list(table.established), table.position[3]), ([0, 3, 2], 1))
+        self.assertEqual(table.state[1], const.TCP_STATE_CLOSED)
+        table.advance(0, 10)
+        self.assertEqual(table.snd_nxt[0], 10)
+        self.assertTrue(table.receive(2, 103, 5, 256))
+        self.assertFalse(table.receive(2, 103, 5, 256))
+        self.assertEqual((table.rcv_nxt[2], table.window[2], len(table)), (108, 256, 3))
+
+
+# Testing the TcpState Class
+class TestTcpState(unittest.TestCase):
+    """ Testing TcpState class and methods"""
+
+    def setUp(self):
+        """ Creates a TcpState on a loopback socket"""
+        self.tcp_state = TcpState(Host(*TARGET), Host(*SOURCE, None), 8)
+        self.socket = self.tcp_state.socket = Loopback()
+
+    def tearDown(self):
+        """ Closes the loopback socket"""
+        self.socket.close()
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.TcpStateHostError):
+            TcpState(Host('10.0.0.*', TARGET[1], 80), Host(*SOURCE, None), 1)
+        with self.assertRaises(ex.TcpStateHostError):
+            TcpState(Host(*TARGET), Host(SOURCE[0], None, None), 1)
+        with self.assertRaises(ex.TcpStateHostError):
+            TcpState(Host(*TARGET[:2], None), Host(*SOURCE, None), 1)
+
+    def test_handshake(self):
+        """ Test SYN-ACKs establish connections and are acknowledged"""
+        self.assertEqual(self.tcp_state.handshake(0.1), 8)
+        acks = [Ether(frame)[TCP] for frame in self.socket.sent[8:]]
+        self.assertEqual([str(segment.flags) for segment in acks], ['A'] * 8)
+        self.assertTrue(all(segment.ack == 5001 for segment in acks))
+        self.assertEqual(self.tcp_state.received, 8)
+
+    def test_receive(self):
+        """ Test data is acknowledged, RSTs close and other hosts are ignored"""
+        self.tcp_state.handshake(0.1)
+        table = self.tcp_state.table
+        self.socket.reply(table.port(2), 'PA', 5001, table.snd_nxt[2], b'hello')
+        self.assertEqual(self.tcp_state.poll(0.1), 1)
+        self.assertEqual(table.rcv_nxt[2], 5006)
+        self.assertEqual(Ether(self.socket.sent[-1])[TCP].ack, 5006)
+        self.socket.reply(table.port(3), 'R', 5001, 0)
+        self.tcp_state.poll(0.1)
+        self.assertEqual((len(table), self.tcp_state.resets), (7, 1))
+        frame = Ether(src=TARGET[1]) / IP(src='10.0.0.9', dst=SOURCE[0]) / \
+            TCP(sport=80, dport=table.port(4), flags='R')
+        self.assertIsNone(self.tcp_state.receive(bytes(frame)))
+        self.assertEqual(len(table), 7)
+
+    def test_segment(self):
+        """ Test segments are SYNs until connections are established, then in window"""
+        randomiser = Randomiser(1)
+        target, source = Host(None, None, None), Host(None, None, None)
+        details = PacketDetails({'int_protocol': 0x800, 'trans_protocol': 6,
+            'cast': 'broadcast', 'vlan': False, 'headers': False, 'length': 0})
+        self.tcp_state.segment(randomiser, target, source, details)
+        self.assertEqual(details.tcp_header['flags'], const.TCP_FLAGS['SYN'])
+        self.assertEqual((target.ip, target.port, source.ip, details.cast),
+            (TARGET[0], 80, SOURCE[0], 'unicast'))
+        self.tcp_state.handshake(0.1)
+        table = self.tcp_state.table
+        while len(table):
+            details.set('length', 5000)
+            snd_nxt = list(table.snd_nxt)
+            self.tcp_state.segment(randomiser, target, source, details)
+            row, tcp = table.row(source.port), details.tcp_header
+            self.assertEqual(tcp['ack'], table.rcv_nxt[row])
+            self.assertLessEqual(details.length, 1000) # The target's window
+            self.assertLessEqual(min((tcp['seq'] - snd_nxt[row]) % 2 ** 32,
+                (snd_nxt[row] - tcp['seq']) % 2 ** 32), 1000)
+            self.assertEqual((details.ip_header['frag'], details.ip_header['ttl']), (0, 64))
+
+
+# Testing stateful TCP runs
+class TestStatefulRun(unittest.TestCase):
+    """ Testing stateful TCP in the generator and run"""
+
+    def test_phase_plan(self):
+        """ Test stateful TCP options are checked and the source taken from the interface"""
+        args = {'target_ip': '127.0.0.1', 'target_mac': TARGET[1], 'target_port': '80',
+            'network_interface': 'lo', 'n_packets': 1, 'tcp_state': 4}
+        plan = PhasePlan('tcp', Args(args))
+        self.assertEqual((plan.source.ip, plan.details.trans_protocol, plan.details.cast),
+            ('127.0.0.1', 6, 'unicast'))
+        with self.assertRaises(ex.TcpStateOptionsError):
+            PhasePlan('udp', Args(dict(args, trans_protocol=0x11)))
+        with self.assertRaises(ex.TcpStateOptionsError):
+            PhasePlan('workers', Args(dict(args, workers=2)))
+        with self.assertRaises(ex.TcpStateHostError):
+            PhasePlan('port', Args(dict(args, target_port=None)))
+
+    def test_generator(self):
+        """ Test generated and pooled packets are segments of the connections"""
+        tcp_state = TcpState(Host(*TARGET), Host(*SOURCE, None), 4)
+        tcp_state.socket = Loopback()
+        tcp_state.handshake(0.1)
+        details = PacketDetails({'int_protocol': None, 'trans_protocol': 6, 'cast': None,
+            'vlan': None, 'headers': None, 'min_length': None, 'max_length': 200})
+        for pool in (None, PacketPool(4)):
+            for generated in packet_generator(Host(*TARGET), details, seed=2, max_packets=40,
+                    pool=pool, tcp_state=tcp_state):
+                segment = Ether(generated.raw())
+                self.assertEqual((segment[IP].dst, segment[TCP].dport), (TARGET[0], 80))
+                self.assertIn(tcp_state.table.row(segment[TCP].sport), range(4))
+                self.assertEqual(segment[TCP].flags.value, generated.details.tcp_header['flags'])
+                if pool is not None:
+                    pool.release(generated)
+        tcp_state.socket.close()
+
+    def test_run(self):
+        """ Test a run fuzzes established connections and resets them at the end"""
+        sent, loopback = [], Loopback()
+        sendp, ping_host, start, cwd = packet.sendp, Host.ping_host, TcpState.start, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        packet.sendp = lambda frame, **kwargs: sent.append(frame)
+        Host.ping_host = lambda host: True
+        def start_loopback(tcp_state, interface):
+            tcp_state.socket = loopback
+        TcpState.start = start_loopback
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                run.run(Args({'target_ip': TARGET[0], 'target_mac': TARGET[1],
+                    'target_port': '80', 'source_ip': SOURCE[0], 'source_mac': SOURCE[1],
+                    'network_interface': 'lo', 'n_packets': 20, 'seed': 3, 'tcp_state': 16}))
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host, TcpState.start = sendp, ping_host, start
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(len(sent), 20)
+        for frame in sent:
+            segment = Ether(bytes(frame))[TCP]
+            self.assertEqual(segment.dport, 80)
+            self.assertIn(segment.sport, range(const.TCP_STATE_BASE_PORT,
+                const.TCP_STATE_BASE_PORT + 16))
+        resets = [frame for frame in loopback.sent if Ether(frame)[TCP].flags == 'RA']
+        self.assertTrue(resets)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for Tracer class
+"""
+import logging
+import os
+import tempfile
+import unittest
+from scapy.utils import rdpcap
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args, parse_args
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.tracing import Tracer, parse_filter
+
+FRAME = bytes(range(40))
+
+
+# Testing the Tracer Class
+class TestTracer(unittest.TestCase):
+    """ Testing Tracer class and methods"""
+
+    def setUp(self):
+        """ Writes trace files in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'trace')
+
+    def tearDown(self):
+        """ Removes the trace files"""
+        self.directory.cleanup()
+
+    def test_parse_filter(self):
+        """ Test filters are parsed into protocol values, cast types and lengths"""
+        self.assertEqual(parse_filter('int_protocol=IPv6, trans_protocol=tcp,cast=broadcast,'
+            'min_length=0x40'), {'int_protocol': 0x86DD, 'trans_protocol': 0x06,
+            'cast': 'broadcast', 'min_length': 64})
+        self.assertEqual(parse_filter('trans_protocol=17'), {'trans_protocol': 17})
+        for spec in ('cast', 'ttl=3', 'cast=anycast', 'max_length=big', 'cast=unicast,'):
+            with self.assertRaises(ex.TraceFilterError):
+                parse_filter(spec)
+        self.assertEqual(parse_args(['10.0.0.1', 'lo', '1', '-trf', 'cast=unicast'])
+            .trace_filter, {'cast': 'unicast'})
+        with self.assertRaises(SystemExit):
+            parse_args(['10.0.0.1', 'lo', '1', '-trf', 'ttl=1'])
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.IntegerTooSmallError):
+            Tracer(self.path, 0)
+        with self.assertRaises(ex.TraceIntervalError):
+            Tracer(self.path, interval=-1)
+        with self.assertRaises(ex.TraceFilterError):
+            Tracer(self.path, match={'ttl': 1})
+
+    def test_sample(self):
+        """ Test frames are sampled 1 in N, by filter and by time"""
+        tracer = Tracer(self.path, 3)
+        self.assertEqual([tracer.sample(0x800, 0x11, 'unicast', 60) for _ in range(7)],
+            [False, False, True, False, False, True, False])
+        tracer.close()
+        tracer = Tracer(self.path, match='trans_protocol=tcp,min_length=100')
+        self.assertEqual((tracer.every, tracer.sample(0x800, 0x06, 'unicast', 100),
+            tracer.sample(0x800, 0x11, 'unicast', 100), tracer.sample(0x800, 0x06, 'unicast',
+            99)), (1, True, False, False))
+        tracer.close()
+        tracer = Tracer(self.path, interval=60.0)
+        self.assertEqual([tracer.sample(0x800, 0x06, 'unicast', 60) for _ in range(3)],
+            [True, False, False])
+        self.assertEqual((tracer.frames, tracer.matched), (3, 3))
+        tracer.close()
+
+    def test_hexdump(self):
+        """ Test traced frames are written as hexdumps"""
+        tracer = Tracer(self.path, 1)
+        self.assertTrue(tracer.trace(7, 0x800, 0x11, 'unicast', memoryview(FRAME)))
+        tracer.close()
+        with open(self.path, encoding='utf-8') as trace:
+            lines = trace.read().splitlines()
+        self.assertTrue(lines[0].startswith('# Packet 7 at '))
+        self.assertTrue(lines[0].endswith(': ipv4 udp unicast, 40 bytes'))
+        self.assertEqual(lines[1:4], ['0000  ' + FRAME[:16].hex(' '),
+            '0010  ' + FRAME[16:32].hex(' '), '0020  ' + FRAME[32:].hex(' ')])
+
+    def test_pcap(self):
+        """ Test traced frames are written as pcap files"""
+        tracer = Tracer(self.path + '.pcap', 2)
+        for index in range(5):
+            tracer.trace(index, 0x800, 0x11, 'unicast', FRAME[index:])
+        tracer.close()
+        self.assertEqual([bytes(frame) for frame in rdpcap(self.path + '.pcap')],
+            [FRAME[1:], FRAME[3:]])
+        self.assertEqual(str(tracer).split(', ')[1], 'Traced: (2/5)')
+
+
+# Testing tracing in runs
+class TestTraceRun(unittest.TestCase):
+    """ Testing sampled frames traced by runs"""
+
+    def test_run(self):
+        """ Test a run traces every Nth frame it sends"""
+        sendp, ping_host, cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        sent = []
+        packet.sendp = lambda frame, **kwargs: sent.append(bytes(frame))
+        Host.ping_host = lambda host: True
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                run.run(Args({'target_ip': '10.0.0.1', 'network_interface': 'lo',
+                    'n_packets': 250, 'seed': 3, 'pool': 8, 'trace': 'run.pcap',
+                    'trace_every': 10}))
+                traced = [bytes(frame) for frame in rdpcap('run.pcap')]
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host = sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(traced, sent[9::10])
+
+if __name__ == "__main__":
+    unittest.main()
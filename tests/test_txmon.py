@@ -0,0 +1,141 @@
+"""
+Unit tests for TxMonitor class
+"""
+import logging
+import os
+import tempfile
+import time
+import unittest
+# Package imports
+from pynetfuzz import packet
+from pynetfuzz import run
+from pynetfuzz.arguments import Args
+from pynetfuzz.const import TXMON_COUNTERS
+from pynetfuzz.hosts import Host
+import pynetfuzz.exceptions as ex
+# Module under test
+from pynetfuzz.txmon import TxMonitor, read_sysfs, read_proc_net_dev
+
+NET_DEV = """Inter-|   Receive                                   |  Transmit
+ face |bytes packets errs drop fifo frame compressed multicast|bytes packets errs drop fifo ...
+    lo: 1000 10 0 0 0 0 0 0 1000 10 0 0 0 0 0 0
+  eth0: 5000 50 1 2 3 0 0 0 9000 90 4 5 6 0 0 0
+"""
+
+
+# Testing the TxMonitor Class
+class TestTxMonitor(unittest.TestCase):
+    """ Testing TxMonitor class and methods"""
+
+    def setUp(self):
+        """ Replaces the interface counters with scripted ones"""
+        self.read_counters = TxMonitor.read_counters
+        self.counters = dict.fromkeys(TXMON_COUNTERS, 0)
+        TxMonitor.read_counters = lambda monitor: dict(self.counters)
+
+    def tearDown(self):
+        """ Restores the interface counters"""
+        TxMonitor.read_counters = self.read_counters
+
+    def test_read(self):
+        """ Test counters are read from sysfs and /proc/net/dev"""
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'eth0', 'statistics'))
+            for value, counter in enumerate(TXMON_COUNTERS):
+                with open(os.path.join(directory, 'eth0', 'statistics', counter), 'w',
+                        encoding='ascii') as statistic:
+                    statistic.write(f'{value}\n')
+            self.assertEqual(read_sysfs('eth0', directory),
+                {counter: value for value, counter in enumerate(TXMON_COUNTERS)})
+            with self.assertRaises(OSError):
+                read_sysfs('eth1', directory)
+            path = os.path.join(directory, 'dev')
+            with open(path, 'w', encoding='ascii') as net_dev:
+                net_dev.write(NET_DEV)
+            self.assertEqual(read_proc_net_dev('eth0', path), {'tx_packets': 90,
+                'tx_bytes': 9000, 'tx_errors': 4, 'tx_dropped': 5, 'tx_fifo_errors': 6})
+            with self.assertRaises(ex.TxMonitorInterfaceError):
+                read_proc_net_dev('eth1', path)
+
+    def test_invalid_init(self):
+        """ Test invalid initialising parameters"""
+        with self.assertRaises(ex.TxMonitorIntervalError):
+            TxMonitor('eth0', 0)
+
+    def send(self, monitor: TxMonitor, frames: int, transmitted: int, **counters) -> None:
+        """ Counts frames sent by the run and by the interface"""
+        monitor.frames += frames
+        self.counters['tx_packets'] += transmitted
+        for counter, value in counters.items():
+            self.counters[counter] += value
+
+    def test_aimd(self):
+        """ Test drops halve the rate, clean samples raise it until pacing is lifted"""
+        monitor = TxMonitor('eth0')
+        monitor.start()
+        monitor.sampled_at = 0.0
+        self.send(monitor, 1000, 1000)
+        self.assertEqual((monitor.sample(1.0), monitor.rate), (0, None))
+        self.send(monitor, 1000, 990, tx_dropped=10)
+        self.assertEqual((monitor.sample(2.0), monitor.rate), (10, 500.0))
+        self.send(monitor, 500, 500)
+        self.assertEqual((monitor.sample(3.0), monitor.rate), (0, 1500.0))
+        self.send(monitor, 500, 500)
+        self.assertEqual((monitor.sample(4.0), monitor.rate), (0, None))
+        self.assertEqual((monitor.dropped, monitor.decreases, monitor.samples), (10, 1, 4))
+
+    def test_missing(self):
+        """ Test frames missing from the interface are lost once the backlog outgrows the
+        tolerance, frames still queued are not"""
+        monitor = TxMonitor('eth0')
+        monitor.start()
+        monitor.sampled_at = 0.0
+        self.send(monitor, 1000, 960)
+        self.assertEqual((monitor.sample(1.0), monitor.backlog), (0, 40))
+        self.send(monitor, 0, 40)
+        self.assertEqual((monitor.sample(2.0), monitor.backlog), (0, 0))
+        self.send(monitor, 1000, 800)
+        self.assertEqual((monitor.sample(3.0), monitor.backlog, monitor.rate), (200, 0, 500.0))
+        self.assertEqual(monitor.missing, 200)
+
+    def test_pace(self):
+        """ Test the sender is held to the paced rate"""
+        monitor = TxMonitor('eth0', 60.0)
+        monitor.start()
+        monitor.rate = 2000.0
+        started = time.monotonic()
+        for _ in range(128):
+            self.counters['tx_packets'] += 1
+            monitor.pace()
+        self.assertGreaterEqual(time.monotonic() - started, 0.06)
+        self.assertEqual((monitor.frames, monitor.samples), (128, 0))
+
+    def test_run(self):
+        """ Test a run paces itself when the interface drops frames"""
+        sendp, ping_host, cwd = packet.sendp, Host.ping_host, os.getcwd()
+        logger = logging.getLogger()
+        handlers, level = logger.handlers[:], logger.level
+        sent = []
+
+        def send(frame, **kwargs):
+            sent.append(frame)
+            self.counters['tx_packets'] += 1
+            self.counters['tx_dropped'] += len(sent) % 2
+        packet.sendp, Host.ping_host = send, lambda host: True
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                with self.assertLogs(level='WARNING') as logs:
+                    run.run(Args({'target_ip': '10.0.0.1', 'network_interface': 'eth0',
+                        'n_packets': 500, 'seed': 1, 'tx_monitor': 0.001}))
+                os.chdir(cwd)
+        finally:
+            packet.sendp, Host.ping_host = sendp, ping_host
+            os.chdir(cwd)
+            logger.handlers[:], logger.level = handlers, level
+        self.assertEqual(len(sent), 500)
+        # Every sample sees drops, so the rate is halved down to the slowest
+        self.assertIn('pacing to 100 pkt/s', logs.output[-1])
+
+if __name__ == "__main__":
+    unittest.main()